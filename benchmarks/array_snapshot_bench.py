@@ -0,0 +1,77 @@
+"""
+Conversion time of a 50 level get_orderbook snapshot and 100 recent trades
+from base 1e18 strings to numbers: the Python loop callers used before
+(fromSuiBase per value) versus OrderbookArrays and TradeArrays refreshing
+preallocated NumPy arrays.
+
+Usage:
+    python benchmarks/array_snapshot_bench.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bluefin_v2_client import OrderbookArrays, TradeArrays
+from sui_utils import fromSuiBase
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), "payloads")
+
+
+def load_snapshot():
+    with open(os.path.join(PAYLOADS, "orderbook_depth_update.json")) as f:
+        return json.load(f)["data"]
+
+
+def make_trades(snapshot, count=100):
+    levels = snapshot["bids"] + snapshot["asks"]
+    return [
+        {
+            "id": i,
+            "time": 1718612345678 + i,
+            "price": levels[i % len(levels)][0],
+            "quantity": levels[i % len(levels)][1],
+            "side": "BUY" if i % 2 else "SELL",
+        }
+        for i in range(count)
+    ]
+
+
+def convert_loop(snapshot, trades):
+    bids = [[fromSuiBase(price), fromSuiBase(size)] for price, size in snapshot["bids"]]
+    asks = [[fromSuiBase(price), fromSuiBase(size)] for price, size in snapshot["asks"]]
+    trades = [
+        (t["id"], t["time"], fromSuiBase(t["price"]), fromSuiBase(t["quantity"]), t["side"])
+        for t in trades
+    ]
+    return bids, asks, trades
+
+
+def main(iterations=2000):
+    snapshot = load_snapshot()
+    trades = make_trades(snapshot)
+    cases = {
+        "python loop": lambda: convert_loop(snapshot, trades),
+    }
+    for dtype in ("float64", "int64"):
+        book = OrderbookArrays(capacity=len(snapshot["bids"]), dtype=dtype)
+        trade_arrays = TradeArrays(capacity=len(trades), dtype=dtype)
+        cases["numpy " + dtype] = (
+            lambda book=book, trade_arrays=trade_arrays: (
+                book.update(snapshot),
+                trade_arrays.update(trades),
+            )
+        )
+
+    print("{} bid, {} ask levels and {} trades".format(
+        len(snapshot["bids"]), len(snapshot["asks"]), len(trades)
+    ))
+    for name, case in cases.items():
+        seconds = timeit.timeit(case, number=iterations)
+        print("{:<14} {:>8.1f} us".format(name, seconds / iterations * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,90 @@
+"""
+Orders signed per second by BluefinClient.create_signed_orders as the number
+of signing workers grows, for thread and process pools.
+
+Usage:
+    python benchmarks/batch_signing_bench.py [batch_size] [rounds]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bluefin_v2_client import (
+    BluefinClient,
+    Networks,
+    MARKET_SYMBOLS,
+    ORDER_SIDE,
+    ORDER_TYPE,
+    OrderSignatureRequest,
+)
+
+TEST_ACCT_KEY = (
+    "negative repeat fold noodle symptom spirit spend trophy merge ethics math erupt"
+)
+TEST_CONTRACTS = {
+    "auxiliaryContractsAddresses": {"objects": {}},
+    "ETH-PERP": {
+        "Perpetual": {
+            "id": "0x3ff3b4ac6de2d5a0c1d7e3e6d0a5c7d9ab2fb9bf1e2e0a99c6b0d61c33a8c8a0"
+        }
+    },
+}
+WORKERS = [1, 2, 4, 8]
+
+
+def ladder(batch_size):
+    return [
+        OrderSignatureRequest(
+            symbol=MARKET_SYMBOLS.ETH,
+            price=1770 + i * 0.1,
+            quantity=0.02,
+            side=ORDER_SIDE.BUY if i % 2 else ORDER_SIDE.SELL,
+            orderType=ORDER_TYPE.LIMIT,
+            leverage=4,
+        )
+        for i in range(batch_size)
+    ]
+
+
+def measure(client, batch_size, rounds):
+    client.create_signed_orders(ladder(batch_size))  # warm up pool workers
+    elapsed = 0.0
+    for _ in range(rounds):
+        requests = ladder(batch_size)
+        start = time.perf_counter()
+        client.create_signed_orders(requests)
+        elapsed += time.perf_counter() - start
+    return batch_size * rounds / elapsed
+
+
+async def main(batch_size=200, rounds=20):
+    client = BluefinClient(True, Networks["SUI_STAGING"], TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(TEST_CONTRACTS)
+
+    single = ladder(batch_size)
+    start = time.perf_counter()
+    for req in single:
+        client.create_signed_order(req)
+    baseline = batch_size / (time.perf_counter() - start)
+
+    print("batch size: {}, rounds: {}".format(batch_size, rounds))
+    print("{:<28}{:>12}".format("mode", "orders/s"))
+    print("{:<28}{:>12.0f}".format("create_signed_order loop", baseline))
+    for use_processes in (False, True):
+        for workers in WORKERS:
+            client.set_signing_pool(workers, use_processes)
+            rate = measure(client, batch_size, rounds)
+            mode = "{} pool, {} workers".format(
+                "process" if use_processes else "thread", workers
+            )
+            print("{:<28}{:>12.0f}".format(mode, rate))
+
+    await client.close_connections()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*args))
@@ -0,0 +1,123 @@
+"""
+Throughput of the schema compiled BCS codec against the append based
+BCSSerializer calls it replaces: the RFQ Quote signed by quote initiators, the
+object refs of transaction inputs and gas payment, and reading back a
+TransactionData merging 500 coins (there was no decoder before).
+
+Usage:
+    python benchmarks/bcs_bench.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bluefin_rfq_client import QUOTE_BCS
+from sui_utils.bcs import _digest_to_wire
+from sui_utils import (
+    BASE58_ALPHABET,
+    OBJECT_REF,
+    TRANSACTION_DATA,
+    BCSSerializer,
+    base58_decode,
+    hex_address_to_bytes32,
+    serialize_merge_coins_transaction,
+)
+
+VAULT = "0x4f452732b2f1be3fda125eaba2d7fc82e7ed1c6deabefe728386c51e9c5c8469"
+TAKER = "0x3cf09d732b53b4270cab290e1c2a6fbd2f7ac8c1f205be90a302d7da23646801"
+QUOTE = (VAULT, "quote_id", TAKER, 1000000, 1000000000, "0x2::sui::SUI", "usdc_Address::usdc::USDC", 1739649109673, 1739649099673)
+SENDER = "0x" + "ab" * 32
+
+
+def digest(number):
+    value = int.from_bytes(b"\xaa" + number.to_bytes(31, "big"), "big")
+    text = ""
+    while value:
+        value, index = divmod(value, 58)
+        text = BASE58_ALPHABET[index] + text
+    return text
+
+
+REFS = [("0x{:064x}".format(i), i, digest(i)) for i in range(1, 501)]
+
+
+def serializer_quote(quote):
+    """
+    Quote.get_bcs_serialized_quote before the schema
+    """
+    vault, quote_id, taker, token_in_amount, token_out_amount, token_in_type, token_out_type, expires_at, created_at = quote
+    serializer = BCSSerializer()
+    serializer.serialize_address(vault)
+    serializer.serialize_str(quote_id)
+    serializer.serialize_address(taker)
+    serializer.serialize_u64(token_in_amount)
+    serializer.serialize_u64(token_out_amount)
+    serializer.serialize_str(token_in_type)
+    serializer.serialize_str(token_out_type)
+    serializer.serialize_u64(expires_at)
+    serializer.serialize_u64(created_at)
+    return serializer.get_bytes()
+
+
+def serializer_refs(refs):
+    """
+    _serialize_object_ref of the transaction builder before the schema
+    """
+    serializer = BCSSerializer()
+    for object_id, version, object_digest in refs:
+        serializer.serialize_raw_bytes(hex_address_to_bytes32(object_id))
+        serializer.serialize_u64(version)
+        serializer.serialize_uleb128_bytes(base58_decode(object_digest))
+    return serializer.get_bytes()
+
+
+def schema_refs(refs):
+    buffer = bytearray()
+    for object_ref in refs:
+        OBJECT_REF.write(buffer, object_ref)
+    return bytes(buffer)
+
+
+def schema_refs_uncached(refs):
+    # every digest decoded from base58, as for coins never seen before
+    _digest_to_wire.cache_clear()
+    return schema_refs(refs)
+
+
+def rate(function, argument, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations=20000):
+    assert serializer_quote(QUOTE) == QUOTE_BCS.encode(QUOTE)
+    assert serializer_refs(REFS) == schema_refs(REFS)
+    merge = serialize_merge_coins_transaction(
+        SENDER, [("owned",) + ref for ref in REFS], 0, list(range(1, 500)), REFS[:1], 750, 100000000
+    )
+    assert TRANSACTION_DATA.encode(TRANSACTION_DATA.decode(merge)) == merge
+
+    ref_iterations = max(1, iterations // 100)
+    rows = [
+        ("Quote encode", "quotes/s", rate(serializer_quote, QUOTE, iterations), rate(QUOTE_BCS.encode, QUOTE, iterations)),
+        ("500 object refs", "batches/s", rate(serializer_refs, REFS, ref_iterations), rate(schema_refs, REFS, ref_iterations)),
+        ("  digests uncached", "batches/s", rate(serializer_refs, REFS, ref_iterations), rate(schema_refs_uncached, REFS, ref_iterations)),
+    ]
+    print("{:<18} {:>12} {:>14} {:>14} {:>8}".format("", "unit", "serializer", "schema", "speedup"))
+    for name, unit, before, after in rows:
+        print("{:<18} {:>12} {:>14.0f} {:>14.0f} {:>7.1f}x".format(name, unit, before, after, after / before))
+
+    decodes = rate(TRANSACTION_DATA.decode, merge, ref_iterations)
+    print(
+        "TransactionData decode, 500 coins merge ({} bytes): {:.0f} txs/s, {:.1f} MB/s".format(
+            len(merge), decodes, decodes * len(merge) / 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,99 @@
+"""
+Coin selection of CoinUtils.create_coin_with_balance on wallets of 10k coins:
+the previous selection (coins sorted ascending, the first coin covering the
+amount, otherwise every coin merged) against select_coins. Reports the time
+taken to select and the merge and split transactions the selection costs,
+merges counted the way CoinUtils.merge_coins chunks them.
+
+Usage:
+    python benchmarks/coin_selection_bench.py [coins] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sui_utils import MAX_MERGE_COINS_PER_TRANSACTION, Coin, CoinUtils, select_coins
+
+DECIMALS = 10**6
+
+
+def wallet(balances):
+    return [
+        Coin({"coinType": "0x2::sui::SUI", "coinObjectId": "0x{:064x}".format(i), "version": "1", "digest": "d", "balance": str(balance)})
+        for i, balance in enumerate(balances, 1)
+    ]
+
+
+def merge_transactions(sources):
+    """
+    Transactions CoinUtils.merge_coins sends to merge the number of sources into a coin
+    """
+    size = MAX_MERGE_COINS_PER_TRANSACTION - 1
+    transactions = 0
+    while sources:
+        chunks = [min(size, sources - i) for i in range(0, sources, size)]
+        transactions += 1 + sum(1 for chunk in chunks[1:] if chunk > 1)
+        sources = len(chunks) - 1
+    return transactions
+
+
+def previous_selection(coins, amount):
+    coins = CoinUtils.sort_ascending(coins)
+    for coin in coins:
+        if int(coin.balance) >= amount:
+            return [coin], int(coin.balance)
+    return coins, CoinUtils.sum_coins(coins)
+
+
+def cost(selected, total, amount):
+    merges = merge_transactions(len(selected) - 1)
+    splits = 1 if total > amount else 0
+    return merges + splits, len(selected) - 1
+
+
+def measure(select, coins, amounts):
+    start = time.perf_counter()
+    selections = [select(coins, amount) for amount in amounts]
+    elapsed = time.perf_counter() - start
+    transactions = merged = 0
+    for (selected, total), amount in zip(selections, amounts):
+        assert total >= amount
+        tx, coins_merged = cost(selected, total, amount)
+        transactions += tx
+        merged += coins_merged
+    return elapsed / len(amounts), transactions, merged
+
+
+def scenarios(count, rng):
+    dust = [rng.randint(1, DECIMALS) for _ in range(count - 20)] + [rng.randint(50, 500) * DECIMALS for _ in range(20)]
+    uniform = [rng.randint(1, 100 * DECIMALS) for _ in range(count)]
+    # whole amounts, coins left by deposits of round sums
+    round_sums = [rng.choice([1, 2, 5, 10, 20, 50]) * DECIMALS for _ in range(count)]
+    return [
+        ("dust heavy, 20 large coins", dust, lambda: rng.randint(100, 900) * DECIMALS),
+        ("uniform balances", uniform, lambda: rng.randint(150, 400) * DECIMALS),
+        ("round balances", round_sums, lambda: rng.randint(60, 300) * DECIMALS),
+        ("covered by one coin", uniform, lambda: rng.randint(1, 99) * DECIMALS),
+    ]
+
+
+def main(count=10000, seed=1):
+    rng = random.Random(seed)
+    print("{} coins per wallet, 20 amounts per scenario".format(count))
+    print("{:<28} {:<10} {:>10} {:>13} {:>13}".format("scenario", "selection", "ms/amount", "transactions", "coins merged"))
+    for name, balances, amount in scenarios(count, rng):
+        coins = wallet(balances)
+        amounts = [amount() for _ in range(20)]
+        for label, select in (("previous", previous_selection), ("optimal", select_coins)):
+            elapsed, transactions, merged = measure(select, coins, amounts)
+            print("{:<28} {:<10} {:>10.2f} {:>13} {:>13}".format(name, label, elapsed * 1000, transactions, merged))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+    )
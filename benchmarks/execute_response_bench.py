@@ -0,0 +1,186 @@
+"""
+Response size and round trip latency of sui_executeTransactionBlock with the
+full response fields (the previous behaviour) against STATUS_RESPONSE_OPTIONS,
+which the margin methods now request by default. A local node answers with a
+deposit_to_bank shaped response trimmed to the requested fields, so the
+numbers cover serialization, transfer and decoding but not validator time.
+The finality mode does not change the response and is not measured here.
+
+Usage:
+    python benchmarks/execute_response_bench.py [iterations]
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sui_utils import (
+    EXECUTION_FINALITY,
+    FULL_RESPONSE_OPTIONS,
+    STATUS_RESPONSE_OPTIONS,
+    AsyncSuiRpcClient,
+)
+
+SENDER = "0x" + "ab" * 32
+
+
+def object_id(index):
+    return "0x{:064x}".format(index)
+
+
+def reference(index):
+    return {"objectId": object_id(index), "version": 8123456 + index, "digest": "9xF3kLmPq2Rs8TuVw4XyZa7Bc1De5Fg6Hj{:02d}".format(index)}
+
+
+def owned(index):
+    return {"owner": {"AddressOwner": SENDER}, "reference": reference(index)}
+
+
+def shared(index):
+    return {"owner": {"Shared": {"initial_shared_version": 1200 + index}}, "reference": reference(index)}
+
+
+def full_response():
+    """
+    Response of a deposit_to_bank call with every response field shown
+    """
+    inputs = [{"type": "object", "objectType": "sharedObject", "objectId": object_id(i), "initialSharedVersion": "1200", "mutable": True} for i in range(1, 4)]
+    inputs += [{"type": "pure", "valueType": "address", "value": SENDER}, {"type": "pure", "valueType": "u64", "value": "1000000"}]
+    effects = {
+        "messageVersion": "v1",
+        "status": {"status": "success"},
+        "executedEpoch": "512",
+        "gasUsed": {"computationCost": "750000", "storageCost": "10000000", "storageRebate": "9800000", "nonRefundableStorageFee": "98000"},
+        "modifiedAtVersions": [{"objectId": object_id(i), "sequenceNumber": str(8123400 + i)} for i in range(1, 6)],
+        "sharedObjects": [reference(i) for i in range(1, 4)],
+        "transactionDigest": "4vJ9JU1bJJE96FWSJKvHsmmFADCg4gpZQff4P3bkLKi",
+        "mutated": [shared(i) for i in range(1, 4)] + [owned(4), owned(5)],
+        "deleted": [reference(6)],
+        "gasObject": owned(5),
+        "eventsDigest": "6kerMphN4S5QTfd9TAhwMnFYMiE6oPqvGdmcYwCQP3nk",
+        "dependencies": ["3Gqv9hSZJ1fxLMdJzNbnzPsc4gTGK7bXYiGpGUzb9LMM", "8ZHqABzeGeKiFtmvAmx1uZKPNPHQfxdw9qMCdmj3NeWh"],
+    }
+    return {
+        "digest": effects["transactionDigest"],
+        "transaction": {
+            "data": {
+                "messageVersion": "v1",
+                "transaction": {
+                    "kind": "ProgrammableTransaction",
+                    "inputs": inputs,
+                    "transactions": [{"MoveCall": {"package": object_id(99), "module": "margin_bank", "function": "deposit_to_bank", "type_arguments": [object_id(98) + "::coin::COIN"], "arguments": [{"Input": i} for i in range(len(inputs))]}}],
+                },
+                "sender": SENDER,
+                "gasData": {"payment": [reference(5)], "owner": SENDER, "price": "750", "budget": "100000000"},
+            },
+            "txSignatures": ["AEmMi3RqYqkyKW0/5v1zCjlG0PMC6Hd3A0ngV/2ljVUfKOyUHk7Ct+lt0qvZTeaBTEuIJEYvXT2HLnkRbsf7KAN8sbHn0HCZCpcnbnDUohhwBiRp5Vcn2+tBn3BCvlHa1g=="],
+        },
+        "effects": effects,
+        "events": [
+            {
+                "id": {"txDigest": effects["transactionDigest"], "eventSeq": "0"},
+                "packageId": object_id(99),
+                "transactionModule": "margin_bank",
+                "sender": SENDER,
+                "type": object_id(99) + "::margin_bank::BankBalanceUpdate",
+                "parsedJson": {"action": "0", "srcAddress": SENDER, "destAddress": SENDER, "amount": "1000000000000000000", "srcBalance": "0", "destBalance": "25000000000000000000"},
+                "bcs": "2ZBXMq6S8uXSfWqfDWDzcxLmjyHKZNcAXsXhG4PKVvyqKKkdDKcE2fSjUDaSC4zWvrcpUxZvgR",
+            }
+        ],
+        "objectChanges": [
+            {"type": "mutated", "sender": SENDER, "owner": change["owner"], "objectType": object_id(99) + "::margin_bank::Bank", "objectId": change["reference"]["objectId"], "version": str(change["reference"]["version"]), "previousVersion": str(change["reference"]["version"] - 7), "digest": change["reference"]["digest"]}
+            for change in effects["mutated"]
+        ],
+        "confirmedLocalExecution": True,
+    }
+
+
+# response field of each option, digest is always returned
+OPTION_FIELDS = {
+    "showInput": "transaction",
+    "showEffects": "effects",
+    "showEvents": "events",
+    "showObjectChanges": "objectChanges",
+}
+
+
+class Node:
+    """
+    Answers sui_executeTransactionBlock on its own thread with the fields requested
+    """
+
+    def __init__(self):
+        self.response = full_response()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.url = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(5)
+
+    async def _handler(self, request):
+        body = json.loads(await request.read())
+        options = body["params"][2]
+        result = {"digest": self.response["digest"]}
+        for option, field in OPTION_FIELDS.items():
+            if options.get(option):
+                result[field] = self.response[field]
+        if body["params"][3] == EXECUTION_FINALITY.WAIT_FOR_LOCAL_EXECUTION.value:
+            result["confirmedLocalExecution"] = True
+        return web.Response(
+            text=json.dumps({"jsonrpc": "2.0", "id": body["id"], "result": result}),
+            content_type="application/json",
+        )
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post("/", self._handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return "http://127.0.0.1:{}/".format(site._server.sockets[0].getsockname()[1])
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+async def measure(client, options, iterations):
+    response = await client.execute_transaction_block("dHg=", "c2ln", response_options=options)
+    size = len(json.dumps(response))
+    assert response["result"]["effects"]["status"]["status"] == "success"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await client.execute_transaction_block("dHg=", "c2ln", response_options=options)
+    return size, (time.perf_counter() - start) / iterations
+
+
+async def run(iterations):
+    node = Node()
+    client = AsyncSuiRpcClient(node.url)
+    try:
+        full_size, full_latency = await measure(client, FULL_RESPONSE_OPTIONS, iterations)
+        status_size, status_latency = await measure(client, STATUS_RESPONSE_OPTIONS, iterations)
+    finally:
+        await client.close()
+        node.stop()
+
+    print("{} executions per option set".format(iterations))
+    print("full response:   {:>6} bytes {:>8.1f} us".format(full_size, full_latency * 1e6))
+    print(
+        "status response: {:>6} bytes {:>8.1f} us ({:.0%} of the bytes, {:.2f}x faster)".format(
+            status_size, status_latency * 1e6, status_size / full_size, full_latency / status_latency
+        )
+    )
+
+
+def main(iterations=2000):
+    asyncio.run(run(iterations))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,49 @@
+"""
+Unit conversion latency of eth_utils.to_wei/from_wei versus the integer
+fixed point helpers used by to_base18, toUsdcBase and toSuiBase.
+
+Usage:
+    python benchmarks/fixed_point_bench.py [iterations]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eth_utils import from_wei, to_wei
+from sui_utils.fixed_point import from_fixed, to_fixed, to_fixed_batch
+
+VALUES = [0.05123234, 1770.2, 3, "0.23423001", 0.1 + 0.2]
+
+
+def main(iterations=20000):
+    for value in VALUES:
+        assert to_fixed(value, 18) == to_wei(value, "ether")
+
+    print("iterations: {}".format(iterations))
+    for value in VALUES:
+        eth = timeit.timeit(lambda: to_wei(value, "ether"), number=iterations)
+        fixed = timeit.timeit(lambda: to_fixed(value, 18), number=iterations)
+        print(
+            "to 1e18 {!r:>22}: eth_utils {:6.2f} us, fixed_point {:6.2f} us ({:.1f}x)".format(
+                value, eth / iterations * 1e6, fixed / iterations * 1e6, eth / fixed
+            )
+        )
+
+    number = 51232340000000000
+    eth = timeit.timeit(lambda: float(from_wei(number, "ether")), number=iterations)
+    fixed = timeit.timeit(lambda: from_fixed(number, 18), number=iterations)
+    print(
+        "from 1e18 {:>20}: eth_utils {:6.2f} us, fixed_point {:6.2f} us ({:.1f}x)".format(
+            number, eth / iterations * 1e6, fixed / iterations * 1e6, eth / fixed
+        )
+    )
+
+    prices = [1770.2 + i * 0.05 for i in range(1000)]
+    batch = timeit.timeit(lambda: to_fixed_batch(prices, 18), number=20)
+    print("to_fixed_batch, 1000 prices: {:.2f} ms".format(batch / 20 * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
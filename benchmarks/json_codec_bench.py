@@ -0,0 +1,67 @@
+"""
+Decode and encode latency of the available JSON codecs on OrderbookDepthUpdate
+and AccountDataUpdate websocket payloads (benchmarks/payloads). The baseline
+is the previous path: utf-8 decode of the frame followed by json.loads.
+
+Usage:
+    python benchmarks/json_codec_bench.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bluefin_v2_client.json_codec import CODECS
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), "payloads")
+
+
+def load_payloads():
+    payloads = {}
+    for name in sorted(os.listdir(PAYLOADS)):
+        with open(os.path.join(PAYLOADS, name), "rb") as f:
+            payloads[name] = f.read()
+    return payloads
+
+
+def available_codecs():
+    codecs = []
+    for codec_class in CODECS.values():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            print("{}: not installed".format(codec_class.name))
+    return codecs
+
+
+def main(iterations=20000):
+    codecs = available_codecs()
+    for name, frame in load_payloads().items():
+        message = json.loads(frame)
+        print("{} ({} bytes), {} iterations".format(name, len(frame), iterations))
+
+        baseline = timeit.timeit(lambda: json.loads(frame.decode("utf-8")), number=iterations)
+        print("  decode {:>8} (str):   {:7.2f} us".format("json", baseline / iterations * 1e6))
+        for codec in codecs:
+            assert codec.loads(frame) == message
+            took = timeit.timeit(lambda: codec.loads(frame), number=iterations)
+            print(
+                "  decode {:>8} (bytes): {:7.2f} us ({:.1f}x)".format(
+                    codec.name, took / iterations * 1e6, baseline / took
+                )
+            )
+
+        baseline = timeit.timeit(lambda: json.dumps(message), number=iterations)
+        for codec in codecs:
+            took = timeit.timeit(lambda: codec.dumps(message), number=iterations)
+            print(
+                "  encode {:>8}:         {:7.2f} us ({:.1f}x)".format(
+                    codec.name, took / iterations * 1e6, baseline / took
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
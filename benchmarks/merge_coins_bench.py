@@ -0,0 +1,213 @@
+"""
+Merging dust coins with the previous CoinUtils.merge_coins loop (one
+unsafe_mergeCoins transaction built by the node, signed and executed per coin)
+against the programmable transactions it now sends (up to 500 coins each,
+chunks executed in parallel). A local node answers every request after a
+fixed latency standing in for the network and validators.
+
+Gas comes from a simple cost model in the node, not from a validator: a
+computation bucket of 1000 units per transaction at the reference gas price,
+the storage of the rewritten objects, less a 99% rebate of the storage of the
+objects rewritten or deleted.
+
+Usage:
+    python benchmarks/merge_coins_bench.py [coins] [latency_ms]
+"""
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sui_utils import (
+    BASE58_ALPHABET,
+    STATUS_RESPONSE_OPTIONS,
+    Coin,
+    CoinUtils,
+    Signer,
+    SuiWallet,
+    rpc_sui_createMergeCoinsTransaction,
+)
+
+SEED = "negative repeat fold noodle symptom spirit spend trophy merge ethics math erupt"
+USDC = "0x" + "0d" * 32 + "::coin::COIN"
+SUI = "0x2::sui::SUI"
+GAS_PRICE = 750
+COMPUTATION_UNITS = 1000
+OBJECT_STORAGE_COST = 1976000
+REBATE_RATE = 0.99
+
+
+def object_id(index):
+    return "0x{:064x}".format(index)
+
+
+def digest(number):
+    # base58 of 32 bytes, unique per number
+    value = int.from_bytes(b"\xaa" + number.to_bytes(31, "big"), "big")
+    text = ""
+    while value:
+        value, index = divmod(value, 58)
+        text = BASE58_ALPHABET[index] + text
+    return text
+
+
+class Node:
+    """
+    Answers the merge, execute and gas reads on its own thread, parallel requests overlap
+    """
+
+    def __init__(self, owner, gas_coins, latency):
+        self.owner = owner
+        self.gas_coins = gas_coins
+        self.latency = latency
+        self.version = 100
+        self.gas = 0
+        self.transactions = 0
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.url = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(5)
+
+    def _merged(self, tx_bytes):
+        # (destination, sources, gas coin) of a MergeCoins transaction, or of a node built merge
+        data = base64.b64decode(tx_bytes)
+        if data[:1] == b"{":
+            merge = json.loads(data)
+            return merge["primary"], [merge["coin"]], self.gas_coins[0]["coinObjectId"]
+        count = data[2]
+        if count & 0x80:
+            count = (count & 0x7F) | (data[3] << 7)
+            pos = 4
+        else:
+            pos = 3
+        inputs = []
+        for _ in range(count):
+            inputs.append("0x" + data[pos + 2 : pos + 34].hex())
+            pos += 75
+        # MergeCoins into Input(0), sources Input(1..)
+        gas_pos = len(data) - 1 - 8 - 8 - 32 - 73
+        return inputs[0], inputs[1:], "0x" + data[gas_pos : gas_pos + 32].hex()
+
+    def _execute(self, params):
+        destination, sources, gas = self._merged(params[0])
+        self.version += 1
+        self.transactions += 1
+        computation = COMPUTATION_UNITS * GAS_PRICE
+        storage = 2 * OBJECT_STORAGE_COST
+        rebate = int(REBATE_RATE * OBJECT_STORAGE_COST * (2 + len(sources)))
+        self.gas += computation + storage - rebate
+
+        def changed(object_id):
+            return {"owner": {"AddressOwner": self.owner}, "reference": {"objectId": object_id, "version": self.version, "digest": digest(self.version)}}
+
+        return {
+            "digest": digest(self.version),
+            "effects": {
+                "status": {"status": "success"},
+                "executedEpoch": "512",
+                "gasUsed": {"computationCost": str(computation), "storageCost": str(storage), "storageRebate": str(rebate)},
+                "mutated": [changed(destination), changed(gas)],
+                "deleted": [{"objectId": source, "version": self.version, "digest": digest(0)} for source in sources],
+                "gasObject": changed(gas),
+            },
+        }
+
+    def _answer(self, request):
+        method, params = request["method"], request["params"]
+        if method == "unsafe_mergeCoins":
+            tx = json.dumps({"primary": params[1], "coin": params[2]}).encode()
+            result = {"txBytes": base64.b64encode(tx).decode()}
+        elif method == "sui_executeTransactionBlock":
+            result = self._execute(params)
+        elif method == "suix_getCoins":
+            result = {"data": self.gas_coins, "hasNextPage": False}
+        else:
+            result = str(GAS_PRICE)
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    async def _handler(self, request):
+        body = json.loads(await request.read())
+        await asyncio.sleep(self.latency)
+        if isinstance(body, list):
+            response = [self._answer(item) for item in body]
+        else:
+            response = self._answer(body)
+        return web.Response(text=json.dumps(response), content_type="application/json")
+
+    async def _start(self):
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_post("/", self._handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return "http://127.0.0.1:{}/".format(site._server.sockets[0].getsockname()[1])
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def dust(count):
+    return [
+        Coin({"coinType": USDC, "coinObjectId": object_id(i), "version": "1", "digest": digest(i), "balance": "1000"})
+        for i in range(1, count + 1)
+    ]
+
+
+def gas_coins():
+    return [
+        {"coinType": SUI, "coinObjectId": object_id(10**6 + i), "version": "1", "digest": digest(10**6 + i), "balance": str(10**11)}
+        for i in range(4)
+    ]
+
+
+def loop_merge(coins, wallet, url):
+    """
+    CoinUtils.merge_coins before programmable transactions
+    """
+    primary_coin_id = coins[0].coin_object_id
+    signer = Signer()
+    for coin in coins[1:]:
+        tx_bytes = rpc_sui_createMergeCoinsTransaction(url, primary_coin_id, coin.coin_object_id, wallet.getUserAddress())
+        signer.sign_and_execute_tx(tx_bytes, wallet, url, response_options=STATUS_RESPONSE_OPTIONS)
+    return primary_coin_id
+
+
+def measure(merge, count, latency):
+    wallet = SuiWallet(seed=SEED)
+    node = Node(wallet.getUserAddress(), gas_coins(), latency)
+    try:
+        start = time.perf_counter()
+        merge(dust(count), wallet, node.url)
+        return time.perf_counter() - start, node.transactions, node.gas
+    finally:
+        node.stop()
+
+
+def main(coins=200, latency_ms=20):
+    latency = latency_ms / 1000
+    loop_time, loop_transactions, loop_gas = measure(loop_merge, coins, latency)
+    ptb_time, ptb_transactions, ptb_gas = measure(CoinUtils.merge_coins, coins, latency)
+
+    print("{} coins, {} ms per node request".format(coins, latency_ms))
+    print("unsafe_mergeCoins loop:  {:>8.3f} s {:>5} transactions {:>12} MIST net gas".format(loop_time, loop_transactions, loop_gas))
+    print("programmable merge:      {:>8.3f} s {:>5} transactions {:>12} MIST net gas".format(ptb_time, ptb_transactions, ptb_gas))
+    print(
+        "saved: {:.3f} s ({:.1f}x faster), {} MIST gas (rebates make the net gas negative)".format(
+            loop_time - ptb_time, loop_time / ptb_time, loop_gas - ptb_gas
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
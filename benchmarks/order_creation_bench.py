@@ -0,0 +1,70 @@
+"""
+Splits BluefinClient.create_signed_order time into ed25519 signing and the
+remaining (non crypto) order building overhead.
+
+Usage:
+    python benchmarks/order_creation_bench.py [iterations]
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bluefin_v2_client import (
+    BluefinClient,
+    Networks,
+    MARKET_SYMBOLS,
+    ORDER_SIDE,
+    ORDER_TYPE,
+    OrderSignatureRequest,
+)
+
+TEST_ACCT_KEY = (
+    "negative repeat fold noodle symptom spirit spend trophy merge ethics math erupt"
+)
+TEST_CONTRACTS = {
+    "auxiliaryContractsAddresses": {"objects": {}},
+    "ETH-PERP": {
+        "Perpetual": {
+            "id": "0x3ff3b4ac6de2d5a0c1d7e3e6d0a5c7d9ab2fb9bf1e2e0a99c6b0d61c33a8c8a0"
+        }
+    },
+}
+
+
+def request():
+    return OrderSignatureRequest(
+        symbol=MARKET_SYMBOLS.ETH,
+        price=1770.2,
+        quantity=0.02,
+        side=ORDER_SIDE.BUY,
+        orderType=ORDER_TYPE.LIMIT,
+        leverage=4,
+        postOnly=True,
+    )
+
+
+async def main(iterations=20000):
+    client = BluefinClient(True, Networks["SUI_STAGING"], TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(TEST_CONTRACTS)
+    private_key = client.account.privateKeyBytes
+    msg_hash = hashlib.sha256(b"order").digest()
+
+    total = timeit.timeit(lambda: client.create_signed_order(request()), number=iterations)
+    crypto = timeit.timeit(
+        lambda: client.order_signer.sign_hash(msg_hash, private_key), number=iterations
+    )
+
+    print("iterations:           {}".format(iterations))
+    print("create_signed_order:  {:.2f} us/order".format(total / iterations * 1e6))
+    print("ed25519 signing:      {:.2f} us/order".format(crypto / iterations * 1e6))
+    print("non crypto overhead:  {:.2f} us/order".format((total - crypto) / iterations * 1e6))
+
+    await client.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,62 @@
+"""
+Compares the struct based order serializer against the original hex based one.
+
+Usage:
+    python benchmarks/order_serializer_bench.py [iterations]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sui_utils import numberToHex, hexToByteArray
+from bluefin_v2_client.order_signer import OrderSigner
+
+ORDER = {
+    "market": "0x3ff3b4ac6de2d5a0c1d7e3e6d0a5c7d9ab2fb9bf1e2e0a99c6b0d61c33a8c8a0",
+    "isBuy": True,
+    "price": 1770200000000000000000,
+    "quantity": 20000000000000000,
+    "leverage": 4000000000000000000,
+    "maker": "0x1c2a0f8e3b5d4c6a79e8f0d1b2c3a4e5f60718293a4b5c6d7e8f90a1b2c3d4e5",
+    "reduceOnly": False,
+    "postOnly": False,
+    "cancelOnRevert": False,
+    "orderbookOnly": True,
+    "expiration": 1739649099673,
+    "salt": 1739653234,
+    "ioc": False,
+}
+
+
+def legacy_serialized_order(signer, order):
+    flags = hexToByteArray(numberToHex(signer.get_order_flags(order), 2))
+    return (
+        hexToByteArray(numberToHex(int(order["price"])))
+        + hexToByteArray(numberToHex(int(order["quantity"])))
+        + hexToByteArray(numberToHex(int(order["leverage"])))
+        + hexToByteArray(numberToHex(int(order["salt"])))
+        + hexToByteArray(numberToHex(int(order["expiration"]), 16))
+        + hexToByteArray(numberToHex(int(order["maker"], 16), 64))
+        + hexToByteArray(numberToHex(int(order["market"], 16), 64))
+        + flags
+        + bytearray("Bluefin", encoding="utf-8")
+    )
+
+
+def main(iterations=100000):
+    signer = OrderSigner()
+    assert signer.get_serialized_order(ORDER) == legacy_serialized_order(signer, ORDER)
+
+    legacy = timeit.timeit(lambda: legacy_serialized_order(signer, ORDER), number=iterations)
+    compiled = timeit.timeit(lambda: signer.get_serialized_order(ORDER), number=iterations)
+
+    print("iterations:        {}".format(iterations))
+    print("legacy serializer: {:.3f} us/order".format(legacy / iterations * 1e6))
+    print("struct serializer: {:.3f} us/order".format(compiled / iterations * 1e6))
+    print("speedup:           {:.2f}x".format(legacy / compiled))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
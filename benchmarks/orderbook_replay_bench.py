@@ -0,0 +1,114 @@
+"""
+Replays a deterministic stream of OrderbookDepthUpdate events into a
+LocalOrderBook and reports updates applied per second, along with the cost of
+the top of book and VWAP queries. The baseline rebuilds a dict book and sorts
+it after every update, the way callers had to before LocalOrderBook.
+
+Usage:
+    python benchmarks/orderbook_replay_bench.py [updates]
+"""
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bluefin_v2_client import LocalOrderBook, MARKET_SYMBOLS, ORDER_SIDE
+
+TICK = 10**17  # 0.1 in base 1e18
+MID = 3500 * 10**18
+LEVELS = 50
+
+
+def make_snapshot():
+    return {
+        "symbol": "ETH-PERP",
+        "orderbookUpdateId": 0,
+        "bids": [[str(MID - i * TICK), str(10**18)] for i in range(1, LEVELS + 1)],
+        "asks": [[str(MID + i * TICK), str(10**18)] for i in range(1, LEVELS + 1)],
+    }
+
+
+def make_updates(count, seed=7):
+    """
+    Updates of 1 to 4 levels each within 60 ticks of the mid, a quarter of
+    them remove their level
+    """
+    rng = random.Random(seed)
+    updates = []
+    for sequence in range(1, count + 1):
+        update = {"symbol": "ETH-PERP", "orderbookUpdateId": sequence, "bids": [], "asks": []}
+        for _ in range(rng.randint(1, 4)):
+            side = rng.choice(("bids", "asks"))
+            offset = rng.randint(1, 60) * TICK
+            price = MID - offset if side == "bids" else MID + offset
+            size = 0 if rng.random() < 0.25 else rng.randint(1, 50) * 10**17
+            update[side].append([str(price), str(size)])
+        updates.append(update)
+    return updates
+
+
+def replay_dict_baseline(snapshot, updates):
+    book = {"bids": {}, "asks": {}}
+    for side in ("bids", "asks"):
+        for price, size in snapshot[side]:
+            book[side][int(price) / 1e18] = int(size) / 1e18
+    for update in updates:
+        for side in ("bids", "asks"):
+            for price, size in update[side]:
+                price = int(price) / 1e18
+                size = int(size) / 1e18
+                if size:
+                    book[side][price] = size
+                else:
+                    book[side].pop(price, None)
+        bids = sorted(book["bids"].items(), reverse=True)
+        asks = sorted(book["asks"].items())
+    return bids[0], asks[0]
+
+
+def replay_local_book(snapshot, updates):
+    book = LocalOrderBook(MARKET_SYMBOLS.ETH)
+    book.load_snapshot(snapshot)
+    apply = book.apply
+    for update in updates:
+        apply(update)
+    return book
+
+
+def main(count=100000):
+    snapshot = make_snapshot()
+    updates = make_updates(count)
+
+    start = time.perf_counter()
+    replay_dict_baseline(snapshot, updates)
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    book = replay_local_book(snapshot, updates)
+    local = time.perf_counter() - start
+
+    print("{} updates, {} bid and {} ask levels after replay".format(
+        count, len(book.bids), len(book.asks)
+    ))
+    print("dict + sort baseline: {:>12,.0f} updates/s".format(count / baseline))
+    print("LocalOrderBook:       {:>12,.0f} updates/s ({:.1f}x)".format(
+        count / local, baseline / local
+    ))
+
+    queries = {
+        "best_bid": lambda: book.best_bid(),
+        "mid": lambda: book.mid(),
+        "depth(10)": lambda: book.depth(ORDER_SIDE.BUY, 10),
+        "vwap(5)": lambda: book.vwap(ORDER_SIDE.SELL, 5),
+    }
+    for name, query in queries.items():
+        runs = 100000
+        seconds = timeit.timeit(query, number=runs)
+        print("{:<10} {:>8.3f} us".format(name, seconds / runs * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,49 @@
+"""
+Per signature latency with a freshly expanded ed25519 key versus the shared,
+cached signing key used by Signer and SuiWallet.
+
+Usage:
+    python benchmarks/signing_key_bench.py [iterations]
+"""
+import hashlib
+import os
+import sys
+import timeit
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from nacl.signing import SigningKey
+from sui_utils import SuiWallet, Signer
+
+TEST_ACCT_SEED = "lawsuit pony abuse faint call ship attract slender arrange expire despair orbit"
+
+
+def main(iterations=20000):
+    wallet = SuiWallet(seed=TEST_ACCT_SEED)
+    signer = Signer()
+    private_key = wallet.privateKeyBytes
+    msg_hash = hashlib.sha256(b"bluefin").digest()
+
+    assert SigningKey(private_key).sign(msg_hash)[:64].hex() + "1" == signer.sign_hash(
+        msg_hash, private_key
+    )
+
+    rebuilt = timeit.timeit(
+        lambda: SigningKey(private_key).sign(msg_hash), number=iterations
+    )
+    cached = timeit.timeit(
+        lambda: wallet.getSigningKey().sign(msg_hash), number=iterations
+    )
+    sign_hash = timeit.timeit(
+        lambda: signer.sign_hash(msg_hash, private_key), number=iterations
+    )
+
+    print("iterations:                 {}".format(iterations))
+    print("SigningKey per signature:   {:.2f} us".format(rebuilt / iterations * 1e6))
+    print("cached wallet signing key:  {:.2f} us".format(cached / iterations * 1e6))
+    print("Signer.sign_hash (cached):  {:.2f} us".format(sign_hash / iterations * 1e6))
+    print("speedup:                    {:.2f}x".format(rebuilt / cached))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,104 @@
+"""
+Round trip latency of the threaded WebsocketClient (websocket-client on a
+SocketManager thread) versus AsyncWebsocketClient (aiohttp on the caller's
+event loop) against a local websocket echo server.
+
+Usage:
+    python benchmarks/websocket_latency_bench.py [messages]
+"""
+import asyncio
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aiohttp import web
+from bluefin_v2_client import AsyncWebsocketClient, WebsocketClient
+
+
+def start_echo_server():
+    """
+    Runs an aiohttp echo server on its own loop and thread, returns its url
+    """
+    started = queue.Queue()
+
+    async def echo(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            await ws.send_str(message.data)
+        return ws
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/", echo)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        started.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    return "ws://127.0.0.1:{}/".format(started.get())
+
+
+def message(i):
+    return {"eventName": "Echo", "data": {"i": i, "bids": [["3500", "1"]] * 20}}
+
+
+def bench_threaded(url, count):
+    received = queue.Queue()
+    client = WebsocketClient(url)
+    client.listen("Echo", lambda data: received.put(time.perf_counter()))
+    client.initialize_socket(on_open=None)
+
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        client.send(message(i))
+        latencies.append(received.get() - start)
+    client.stop()
+    return latencies
+
+
+async def bench_async(url, count):
+    client = AsyncWebsocketClient(url)
+    received = asyncio.Queue()
+    client.listen("Echo", lambda data: received.put_nowait(time.perf_counter()))
+    await client.open()
+
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        await client.send(message(i))
+        latencies.append(await received.get() - start)
+    await client.close()
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print(
+        "{:<22} p50 {:7.1f} us  p99 {:7.1f} us  mean {:7.1f} us".format(
+            name,
+            latencies[len(latencies) // 2] * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6,
+            statistics.mean(latencies) * 1e6,
+        )
+    )
+
+
+def main(count=2000):
+    url = start_echo_server()
+    print("{} round trips against {}".format(count, url))
+    report("threaded SocketManager", bench_threaded(url, count))
+    report("AsyncWebsocketClient", asyncio.run(bench_async(url, count)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -1,6 +1,22 @@
 
 from sui_utils import *
 
+# fields of the Quote struct signed by the quote initiator, in order
+QUOTE_BCS = BCSStruct(
+    "Quote",
+    [
+        ("vault", BCS_ADDRESS),
+        ("id", BCS_STRING),
+        ("taker", BCS_ADDRESS),
+        ("token_in_amount", BCS_U64),
+        ("token_out_amount", BCS_U64),
+        ("token_in_type", BCS_STRING),
+        ("token_out_type", BCS_STRING),
+        ("expires_at", BCS_U64),
+        ("created_at", BCS_U64),
+    ],
+)
+
 
 # Defines the Quote class
 class Quote:
@@ -53,20 +69,20 @@ class Quote:
         Returns:
         bytes
         """
-        serializer = BCSSerializer()
-
         # Apply BCS serialization to the Quote in correct order
-        serializer.serialize_address(self.vault)  
-        serializer.serialize_str(self.id) 
-        serializer.serialize_address(self.taker)  
-        serializer.serialize_u64(self.token_in_amount) 
-        serializer.serialize_u64(self.token_out_amount)  
-        serializer.serialize_str(self.token_in_type) 
-        serializer.serialize_str(self.token_out_type)  
-        serializer.serialize_u64(self.expires_at)  
-        serializer.serialize_u64(self.created_at)  
-
-        return serializer.get_bytes()
+        return QUOTE_BCS.encode(
+            (
+                self.vault,
+                self.id,
+                self.taker,
+                self.token_in_amount,
+                self.token_out_amount,
+                self.token_in_type,
+                self.token_out_type,
+                self.expires_at,
+                self.created_at,
+            )
+        )
     
     def sign(self, wallet: SuiWallet) -> bytes:
         serializedBytes = self.get_bcs_serialized_quote()
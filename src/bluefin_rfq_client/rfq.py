@@ -30,6 +30,11 @@ class RFQClient:
         self.url = url
         self.rfq_contracts = rfq_contracts
         self.signer = Signer()
+        # builds transaction bytes without an unsafe_moveCall round trip
+        self.tx_builder = TransactionBuilder(
+            get_rpc_client(url),
+            wallet.getUserAddress(),
+            objects=get_object_cache(url, wallet.getUserAddress()))
 
     ###########################################################
     ############## Quote Management Methods ###################
@@ -138,7 +143,9 @@ class RFQClient:
     
     def create_vault(self, 
         manager: str,
-        gasbudget: str | None = 100000000
+        gasbudget: str | None = 100000000,
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
         ) -> tuple[bool, TransactionResult] :
         """
         Creates new vault on bluefin RFQ protocol with provided vault manager.
@@ -146,6 +153,8 @@ class RFQClient:
         Inputs:
           manager (str): address of the account that needs to be manager of vault.
           gasbudget (str, optional): Gas budget for transaction (default: "100000000", 0.1 Sui).
+          response_options (dict, optional): response fields of the transaction (default: FULL_RESPONSE_OPTIONS), STATUS_RESPONSE_OPTIONS is enough to check the status.
+          finality (EXECUTION_FINALITY, optional): finality to wait for (default: WAIT_FOR_LOCAL_EXECUTION).
 
         Output:
           Tuple of bool (indicating status of execution) and TransactionResult.
@@ -156,18 +165,13 @@ class RFQClient:
                     manager
                 ]
         
-        tx_bytes = rpc_unsafe_moveCall(
-            url=self.url,
-            params=move_function_params,
-            function_name='create_rfq_vault',
-            function_library='gateway',
-            userAddress=self.wallet.getUserAddress(),
-            packageId=self.rfq_contracts.get_package(),
-            gasBudget=gasbudget
+        res = self._execute_move_call(
+            move_function_params,
+            'create_rfq_vault',
+            gasbudget,
+            response_options=response_options,
+            finality=finality
         )
-
-        signature = self.signer.sign_tx(tx_bytes, self.wallet)
-        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature)
         tx_response = TransactionResult(res)
         try:
             success = tx_response.effects.status == "success"
@@ -179,7 +183,9 @@ class RFQClient:
         vault: str,
         amount: str,
         coin_type: str,
-        gasbudget: str | None = 100000000
+        gasbudget: str | None = 100000000,
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
         ) -> tuple[bool, TransactionResult] :
         """
         Deposits coin amount in the vault.
@@ -189,6 +195,8 @@ class RFQClient:
           amount (str): amount of the coin that is to be deposited (scaled to supported coin decimals, eg. 1000000000 for 1 Sui).
           coin_type (str): on chain token type of input coin (i.e for USDC , usdc_Address::usdc::USDC).
           gasbudget (str, optional): Gas budget for transaction (default: "100000000", 0.1 Sui).
+          response_options (dict, optional): response fields of the transaction (default: FULL_RESPONSE_OPTIONS), STATUS_RESPONSE_OPTIONS is enough to check the status.
+          finality (EXECUTION_FINALITY, optional): finality to wait for (default: WAIT_FOR_LOCAL_EXECUTION).
 
         Output:
           Tuple of bool (indicating status of execution) and TransactionResult.
@@ -209,19 +217,14 @@ class RFQClient:
                     coin_type
                 ]
         
-        tx_bytes = rpc_unsafe_moveCall(
-            url=self.url,
-            params=move_function_params,
-            function_name='deposit',
-            function_library='gateway',
-            userAddress=self.wallet.getUserAddress(),
-            packageId=self.rfq_contracts.get_package(),
-            gasBudget=gasbudget,
-            typeArguments=move_function_type_arguments
+        res = self._execute_move_call(
+            move_function_params,
+            'deposit',
+            gasbudget,
+            type_arguments=move_function_type_arguments,
+            response_options=response_options,
+            finality=finality
         )
-
-        signature = self.signer.sign_tx(tx_bytes, self.wallet)
-        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature)
         tx_response = TransactionResult(res)
         try:
             success = tx_response.effects.status == "success"
@@ -233,7 +236,9 @@ class RFQClient:
         vault: str,
         amount: str,
         coin_type: str,
-        gasbudget: str | None = 100000000
+        gasbudget: str | None = 100000000,
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
         ) -> tuple[bool, TransactionResult] :
         """
         Withdraws coin amount from the vault (Note: Only vault manager can withdraw from vault).
@@ -243,6 +248,8 @@ class RFQClient:
           amount (str): amount of the coin that is to be withdrawn (scaled to supported coin decimals, eg. 1000000000 for 1 Sui).
           coin_type (str): on chain token type of the coin (i.e for USDC , usdc_Address::usdc::USDC).
           gasbudget (str, optional): Gas budget for transaction (default: "100000000", 0.1 Sui).
+          response_options (dict, optional): response fields of the transaction (default: FULL_RESPONSE_OPTIONS), STATUS_RESPONSE_OPTIONS is enough to check the status.
+          finality (EXECUTION_FINALITY, optional): finality to wait for (default: WAIT_FOR_LOCAL_EXECUTION).
 
         Output:
           Tuple of bool (indicating status of execution) and TransactionResult.
@@ -256,19 +263,14 @@ class RFQClient:
                     coin_type
                 ]
         
-        tx_bytes = rpc_unsafe_moveCall(
-            url=self.url,
-            params=move_function_params,
-            function_name='withdraw',
-            function_library='gateway',
-            userAddress=self.wallet.getUserAddress(),
-            packageId=self.rfq_contracts.get_package(),
-            gasBudget=gasbudget,
-            typeArguments=move_function_type_arguments
+        res = self._execute_move_call(
+            move_function_params,
+            'withdraw',
+            gasbudget,
+            type_arguments=move_function_type_arguments,
+            response_options=response_options,
+            finality=finality
         )
-
-        signature = self.signer.sign_tx(tx_bytes, self.wallet)
-        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature)
         tx_response = TransactionResult(res)
         try:
             success = tx_response.effects.status == "success"
@@ -279,7 +281,9 @@ class RFQClient:
     def update_vault_manager(self, 
         vault: str,
         new_manager: str,
-        gasbudget: str | None = 100000000
+        gasbudget: str | None = 100000000,
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
         ) -> tuple[bool, TransactionResult] :
         """
         Updates the vault manager (Note: Only current manager can update vault manager).
@@ -288,6 +292,8 @@ class RFQClient:
           vault (str): on chain vault object ID.
           new_manager (str): address of the new manager.
           gasbudget (str, optional): Gas budget for transaction (default: "100000000", 0.1 Sui).
+          response_options (dict, optional): response fields of the transaction (default: FULL_RESPONSE_OPTIONS), STATUS_RESPONSE_OPTIONS is enough to check the status.
+          finality (EXECUTION_FINALITY, optional): finality to wait for (default: WAIT_FOR_LOCAL_EXECUTION).
 
         Output:
           Tuple of bool (indicating status of execution) and TransactionResult.
@@ -299,18 +305,13 @@ class RFQClient:
                     new_manager
                 ]
         
-        tx_bytes = rpc_unsafe_moveCall(
-            url=self.url,
-            params=move_function_params,
-            function_name='set_manager',
-            function_library='gateway',
-            userAddress=self.wallet.getUserAddress(),
-            packageId=self.rfq_contracts.get_package(),
-            gasBudget=gasbudget
+        res = self._execute_move_call(
+            move_function_params,
+            'set_manager',
+            gasbudget,
+            response_options=response_options,
+            finality=finality
         )
-
-        signature = self.signer.sign_tx(tx_bytes, self.wallet)
-        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature)
         tx_response = TransactionResult(res)
         try:
             success = tx_response.effects.status == "success"
@@ -322,7 +323,9 @@ class RFQClient:
         vault: str,
         coin_type: str,
         min_amount: str,
-        gasbudget: str | None = 100000000
+        gasbudget: str | None = 100000000,
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
         ) -> tuple[bool, TransactionResult] :
         """
         Updates minimum deposit amount for a coin (Note: Only vault manager can update min deposit).
@@ -332,6 +335,8 @@ class RFQClient:
           coin_type (str): on chain token type of the coin (i.e for USDC , usdc_Address::usdc::USDC).
           min_amount (str): new minimum amount of the coin that can be deposited (scaled to supported coin decimals, eg. 1000000000 for 1 Sui).
           gasbudget (str, optional): Gas budget for transaction (default: "100000000", 0.1 Sui).
+          response_options (dict, optional): response fields of the transaction (default: FULL_RESPONSE_OPTIONS), STATUS_RESPONSE_OPTIONS is enough to check the status.
+          finality (EXECUTION_FINALITY, optional): finality to wait for (default: WAIT_FOR_LOCAL_EXECUTION).
 
         Output:
           Tuple of bool (indicating status of execution) and TransactionResult.
@@ -346,19 +351,14 @@ class RFQClient:
                     coin_type
                 ]
         
-        tx_bytes = rpc_unsafe_moveCall(
-            url=self.url,
-            params=move_function_params,
-            function_name='update_min_deposit',
-            function_library='gateway',
-            userAddress=self.wallet.getUserAddress(),
-            packageId=self.rfq_contracts.get_package(),
-            gasBudget=gasbudget,
-            typeArguments=move_function_type_arguments
+        res = self._execute_move_call(
+            move_function_params,
+            'update_min_deposit',
+            gasbudget,
+            type_arguments=move_function_type_arguments,
+            response_options=response_options,
+            finality=finality
         )
-
-        signature = self.signer.sign_tx(tx_bytes, self.wallet)
-        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature)
         tx_response = TransactionResult(res)
         try:
             success = tx_response.effects.status == "success"
@@ -370,7 +370,9 @@ class RFQClient:
         vault: str,
         coin_type: str,
         min_amount: str,
-        gasbudget: str | None = 100000000
+        gasbudget: str | None = 100000000,
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
         ) -> tuple[bool, TransactionResult] :
         """
         Adds support for a coin in the vault (Note: Only vault manager can add coin support).
@@ -380,6 +382,8 @@ class RFQClient:
           coin_type (str): on chain token type of the coin (i.e for USDC , usdc_Address::usdc::USDC).
           min_amount (str): minimum amount of the coin that can be deposited (scaled to supported coin decimals, eg. 1000000000 for 1 Sui).
           gasbudget (str, optional): Gas budget for transaction (default: "100000000", 0.1 Sui).
+          response_options (dict, optional): response fields of the transaction (default: FULL_RESPONSE_OPTIONS), STATUS_RESPONSE_OPTIONS is enough to check the status.
+          finality (EXECUTION_FINALITY, optional): finality to wait for (default: WAIT_FOR_LOCAL_EXECUTION).
 
         Output:
           Tuple of bool (indicating status of execution) and TransactionResult.
@@ -394,19 +398,14 @@ class RFQClient:
                     coin_type
                 ]
         
-        tx_bytes = rpc_unsafe_moveCall(
-            url=self.url,
-            params=move_function_params,
-            function_name='support_coin',
-            function_library='gateway',
-            userAddress=self.wallet.getUserAddress(),
-            packageId=self.rfq_contracts.get_package(),
-            gasBudget=gasbudget,
-            typeArguments=move_function_type_arguments
+        res = self._execute_move_call(
+            move_function_params,
+            'support_coin',
+            gasbudget,
+            type_arguments=move_function_type_arguments,
+            response_options=response_options,
+            finality=finality
         )
-
-        signature = self.signer.sign_tx(tx_bytes, self.wallet)
-        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature)
         tx_response = TransactionResult(res)
         try:
             success = tx_response.effects.status == "success"
@@ -440,4 +439,58 @@ class RFQClient:
         except Exception as e:
             raise Exception(f"Failed to get vault coin balance, Exception: {e}")
         
-        
\ No newline at end of file
+        
+
+    def _execute_move_call(self,
+        move_function_params: list,
+        function_name: str,
+        gasbudget,
+        type_arguments: list = [],
+        response_options: dict | None = None,
+        finality: EXECUTION_FINALITY | None = None
+        ) -> dict:
+        """
+        Builds, signs and executes a call to the gateway module. Transaction bytes are built
+        locally by tx_builder, the node builds them with unsafe_moveCall when the builder
+        can't or when the locally built transaction used stale object references.
+        """
+        try:
+            tx_bytes = self.tx_builder.move_call(
+                move_function_params,
+                function_name,
+                'gateway',
+                self.rfq_contracts.get_package(),
+                gasBudget=gasbudget,
+                typeArguments=type_arguments
+            )
+        except Exception:
+            # the node builds it, its effects refresh what is cached
+            tx_bytes = None
+
+        if tx_bytes is not None:
+            res = self._execute(tx_bytes, response_options, finality)
+            if not is_stale_object_error(res):
+                # other errors are returned, the transaction may still execute
+                return res
+
+        tx_bytes = rpc_unsafe_moveCall(
+            url=self.url,
+            params=move_function_params,
+            function_name=function_name,
+            function_library='gateway',
+            userAddress=self.wallet.getUserAddress(),
+            packageId=self.rfq_contracts.get_package(),
+            gasBudget=gasbudget,
+            typeArguments=type_arguments
+        )
+        return self._execute(tx_bytes, response_options, finality)
+
+    def _execute(self, tx_bytes: str, response_options: dict | None, finality: EXECUTION_FINALITY | None) -> dict:
+        signature = self.signer.sign_tx(tx_bytes, self.wallet)
+        res = rpc_sui_executeTransactionBlock(self.url, tx_bytes, signature, response_options=response_options, finality=finality)
+        effects = (res.get("result") or {}).get("effects")
+        if effects:
+            self.tx_builder.update_from_effects(effects)
+        else:
+            self.tx_builder.invalidate()
+        return res
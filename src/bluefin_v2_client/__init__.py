@@ -1,6 +1,12 @@
 from .api_service import *
+from .arrays import *
 from .client import *
 from .constants import *
 from .enumerations import *
+from .event_dispatcher import *
 from .interfaces import *
+from .json_codec import *
+from .orderbook import *
+from .reconnect import *
+from .sockets_lib import *
 from sui_utils import *
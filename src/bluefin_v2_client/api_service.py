@@ -1,19 +1,93 @@
-import aiohttp
+import asyncio
+import inspect
+from functools import lru_cache
 from .interfaces import *
+from .json_codec import get_codec
+
+# connection pool settings for the aiohttp sessions created by APIService,
+# any TCPConnector argument can be overridden through connector_settings.
+# aiohttp sets TCP_NODELAY on every connection it opens.
+DEFAULT_CONNECTOR_SETTINGS = {
+    "limit": 100,  # total open connections
+    "limit_per_host": 32,  # open connections per host
+    "keepalive_timeout": 60,  # seconds idle connections are kept in the pool
+    "ttl_dns_cache": 300,  # seconds resolved hosts are cached
+    "happy_eyeballs_delay": 0.25,  # seconds before racing the next address (RFC 8305), aiohttp 3.10+
+}
+
+
+@lru_cache(maxsize=None)
+def _connector_arguments(connector_class) -> frozenset:
+    return frozenset(inspect.signature(connector_class).parameters)
+
+
+def create_client_session(connector_settings: dict = None, **session_kwargs):
+    """
+        Creates an aiohttp session on a tuned TCPConnector.
+        Must be called from a running event loop.
+        Inputs:
+            - connector_settings(dict): overrides for DEFAULT_CONNECTOR_SETTINGS
+            - session_kwargs: passed on to aiohttp.ClientSession
+    """
+    import aiohttp
+
+    # defaults the installed aiohttp doesn't know are left out, overrides are passed as given
+    supported = _connector_arguments(aiohttp.TCPConnector)
+    settings = {name: value for name, value in DEFAULT_CONNECTOR_SETTINGS.items() if name in supported}
+    if connector_settings:
+        settings.update(connector_settings)
+    session_kwargs.setdefault("json_serialize", get_codec().dumps)
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(**settings), **session_kwargs
+    )
 
 
 class APIService:
-    def __init__(self, url, UUID=""):
+    def __init__(self, url, UUID="", session=None, connector_settings=None):
+        """
+            Inputs:
+                - url(str): server url every request path is appended to
+                - UUID(str): market maker id sent as x-mm-id
+                - session(aiohttp.ClientSession): session shared with other services,
+                  it is not closed by close_session
+                - connector_settings(dict): connection pool overrides used when
+                  a new session is created
+        """
         self.server_url = url
         self.auth_token = None
         self.api_token = None
         self.uuid = UUID
-        self.client = aiohttp.ClientSession()
+        self.owns_session = session is None
+        if session is None:
+            session = create_client_session(connector_settings)
+        self.client = session
 
     async def close_session(self):
-        if self.client is not None:
+        if self.client is not None and self.owns_session:
             return await self.client.close()
 
+    async def warmup(self, connections=4, path="/"):
+        """
+            Opens `connections` connections to the server in parallel and returns
+            them to the pool, so the first requests reuse established TLS sessions.
+            Connections stay open for the connector keepalive_timeout.
+            Inputs:
+                - connections(int): number of connections to open, capped by limit_per_host
+                - path(str): path requested on each connection, should be cheap and public
+            Returns:
+                - int: number of connections that completed the request
+        """
+        url = self._create_url(path)
+
+        async def _open():
+            async with self.client.get(url) as response:
+                await response.read()
+
+        results = await asyncio.gather(
+            *[_open() for _ in range(connections)], return_exceptions=True
+        )
+        return sum(1 for result in results if not isinstance(result, BaseException))
+
     async def get(self, service_url, query={}, auth_required=False):
         """
             Makes a GET request and returns the results
@@ -44,7 +118,7 @@ class APIService:
 
         try:
             if response.status != 503:  # checking for service unavailitbility
-                return await response.json()
+                return await self._read_json(response)
             else:
                 return response
         except:
@@ -76,7 +150,7 @@ class APIService:
 
         try:
             if response.status != 503:  # checking for service unavailitbility
-                return await response.json()
+                return await self._read_json(response)
             else:
                 return response
         except:
@@ -109,7 +183,7 @@ class APIService:
             response = await self.client.delete(url=url, data=data)
 
         try:
-            return await response.json()
+            return await self._read_json(response)
         except:
             raise Exception(
                 "Error while posting to {}: {}".format(url, response))
@@ -118,6 +192,15 @@ class APIService:
         Private methods
     """
 
+    async def _read_json(self, response):
+        """
+        Decodes the response body with the configured codec straight from bytes
+        """
+        body = await response.read()
+        if not body.strip():
+            return None
+        return get_codec().loads(body)
+
     def _create_url(self, path):
         """
         Appends namespace to server url
@@ -0,0 +1,212 @@
+"""
+NumPy views of order book snapshots and recent trades. Base 1e18 strings are
+parsed and scaled with vectorized NumPy operations into arrays allocated once
+and refreshed in place. NumPy is only imported when a view is created.
+"""
+from .enumerations import ORDER_SIDE
+
+# fields of a TradeArrays record, price and quantity use the view's dtype
+TRADE_FIELDS = ("id", "time", "price", "quantity", "side")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required for array views, pip install numpy")
+    return numpy
+
+
+def parse_fixed_array(values, decimals=18, precision=9, out=None):
+    """
+    Converts base 10**decimals integers (or their string form) to int64 values
+    in base 10**precision (below 10**18), truncating the dropped digits.
+    The digit strings are right aligned and multiplied by the powers of ten of
+    their columns, so values wider than 64 bits are parsed exactly.
+    Inputs:
+        - values: sequence of non negative integers or digit strings
+        - decimals(int): decimals of the values
+        - precision(int): decimals kept in the result
+        - out(numpy.ndarray): int64 array of len(values) to write to
+    Returns:
+        numpy.ndarray: int64 values
+    """
+    numpy = _numpy()
+    text = numpy.asarray(values, dtype="S").reshape(-1)
+    if out is None:
+        out = numpy.empty(len(text), dtype=numpy.int64)
+    if len(text) == 0:
+        return out
+
+    width = text.dtype.itemsize
+    text = numpy.char.rjust(text, width, b"0")
+    digits = text.view(numpy.uint8).reshape(len(text), width) - 48
+    if (digits > 9).any():
+        raise ValueError("Values must be non negative integers")
+
+    # columns left once the dropped decimals are cut
+    keep = min(width, width - (decimals - precision))
+    if keep <= 0:
+        out[:] = 0
+        return out
+    if keep > 18 and digits[:, : keep - 18].any():
+        raise ValueError("Values do not fit in int64 with {} decimals".format(precision))
+    keep_from = max(0, keep - 18)
+    weights = numpy.power(10, numpy.arange(keep - keep_from - 1, -1, -1, dtype=numpy.int64))
+    numpy.matmul(digits[:, keep_from:keep].astype(numpy.int64), weights, out=out)
+    if precision > decimals:
+        out *= 10 ** (precision - decimals)
+    return out
+
+
+class _FixedPointParser:
+    def __init__(self, dtype, decimals, precision):
+        numpy = _numpy()
+        self.numpy = numpy
+        self.dtype = numpy.dtype(dtype)
+        if self.dtype not in (numpy.dtype(numpy.float64), numpy.dtype(numpy.int64)):
+            raise ValueError("dtype must be float64 or int64")
+        self.decimals = decimals
+        self.precision = precision
+        self.scale = 10.0**decimals
+
+    def parse(self, values, out):
+        """
+        Writes values parsed and scaled to out, a 1d view with len(values) items
+        """
+        if self.dtype.kind == "f":
+            self.numpy.divide(
+                self.numpy.asarray(values, dtype=self.numpy.float64).reshape(-1),
+                self.scale,
+                out=out,
+            )
+        else:
+            parse_fixed_array(values, self.decimals, self.precision, out)
+
+
+class OrderbookArrays:
+    """
+    Bids and asks of an order book snapshot as contiguous (price, size) arrays,
+    best level first. The arrays are allocated once for `capacity` levels and
+    overwritten by each update, bids and asks are views of their filled rows.
+    e.g.
+        book = OrderbookArrays(capacity=50)
+        book.update(await client.get_orderbook({"symbol": MARKET_SYMBOLS.ETH, "limit": 50}))
+        book.bids[:, 0]  # bid prices
+    """
+
+    def __init__(self, capacity=50, dtype="float64", decimals=18, precision=9):
+        """
+        Inputs:
+            - capacity(int): levels kept per side, deeper levels are ignored
+            - dtype: float64 for human readable values, int64 for fixed point
+              values with `precision` decimals
+            - decimals(int): decimals of the values received
+            - precision(int): decimals of int64 values
+        """
+        self._parser = _FixedPointParser(dtype, decimals, precision)
+        numpy = self._parser.numpy
+        self.capacity = capacity
+        self.dtype = self._parser.dtype
+        self._bids = numpy.zeros((capacity, 2), dtype=self.dtype)
+        self._asks = numpy.zeros((capacity, 2), dtype=self.dtype)
+        self.bid_count = 0
+        self.ask_count = 0
+        self.sequence = None
+
+    @property
+    def bids(self):
+        return self._bids[: self.bid_count]
+
+    @property
+    def asks(self):
+        return self._asks[: self.ask_count]
+
+    def _load(self, buffer, levels) -> int:
+        count = min(len(levels), self.capacity)
+        if count:
+            self._parser.parse(levels[:count], buffer[:count].reshape(-1))
+        return count
+
+    def update(self, snapshot: dict):
+        """
+        Loads a get_orderbook snapshot into the arrays
+        """
+        self.bid_count = self._load(self._bids, snapshot.get("bids") or [])
+        self.ask_count = self._load(self._asks, snapshot.get("asks") or [])
+        self.sequence = snapshot.get("orderbookUpdateId")
+        return self
+
+    def best_bid(self):
+        return self._bids[0] if self.bid_count else None
+
+    def best_ask(self):
+        return self._asks[0] if self.ask_count else None
+
+
+class TradeArrays:
+    """
+    Recent trades as a structured array with TRADE_FIELDS, side is 1 for
+    BUY and -1 for SELL. Allocated once for `capacity` trades and overwritten
+    by each update, trades is a view of the filled records.
+    """
+
+    def __init__(self, capacity=100, dtype="float64", decimals=18, precision=9):
+        """
+        Inputs:
+            - capacity(int): trades kept, later trades in a response are ignored
+            - dtype: float64 or int64 for the price and quantity fields
+            - decimals(int): decimals of the values received
+            - precision(int): decimals of int64 values
+        """
+        self._parser = _FixedPointParser(dtype, decimals, precision)
+        numpy = self._parser.numpy
+        self.capacity = capacity
+        self.dtype = numpy.dtype(
+            [
+                ("id", numpy.int64),
+                ("time", numpy.int64),
+                ("price", self._parser.dtype),
+                ("quantity", self._parser.dtype),
+                ("side", numpy.int8),
+            ]
+        )
+        self._trades = numpy.zeros(capacity, dtype=self.dtype)
+        # contiguous staging columns, structured fields are strided
+        self._values = numpy.zeros(capacity, dtype=self._parser.dtype)
+        self.count = 0
+
+    @property
+    def trades(self):
+        return self._trades[: self.count]
+
+    def update(self, trades):
+        """
+        Loads a get_market_recent_trades response (a list of trades or a page
+        with them in data) into the array
+        """
+        numpy = self._parser.numpy
+        if isinstance(trades, dict):
+            trades = trades.get("data") or []
+        trades = trades[: self.capacity]
+        count = len(trades)
+        records = self._trades[:count]
+        values = self._values[:count]
+
+        records["id"] = numpy.fromiter(
+            (trade.get("id", 0) for trade in trades), numpy.int64, count
+        )
+        records["time"] = numpy.fromiter(
+            (trade.get("time", 0) for trade in trades), numpy.int64, count
+        )
+        for field in ("price", "quantity"):
+            self._parser.parse([trade[field] for trade in trades], values)
+            records[field] = values
+        buy = ORDER_SIDE.BUY.value
+        records["side"] = numpy.fromiter(
+            (1 if trade.get("side") == buy else -1 for trade in trades),
+            numpy.int8,
+            count,
+        )
+        self.count = count
+        return self
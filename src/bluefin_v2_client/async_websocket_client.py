@@ -0,0 +1,416 @@
+import asyncio
+import inspect
+import logging
+import time
+from .api_service import create_client_session
+from .enumerations import MARKET_SYMBOLS
+from .event_dispatcher import AsyncEventDispatcher
+from .json_codec import get_codec
+from .reconnect import GAP_EVENT, RECONNECT_EVENT, Backoff, SubscriptionRegistry
+from .websocket_client import (
+    global_updates_room,
+    orderbook_depth_room,
+    user_updates_room,
+)
+
+# put on event queues once the connection is closed
+_CLOSED = object()
+
+
+class AsyncWebsocketClient:
+    """
+    asyncio counterpart of WebsocketClient built on aiohttp websockets.
+    Events are read by a task on the loop the client was opened on and are
+    delivered to callbacks registered with listen (functions or coroutine
+    functions) and to every running events() iterator.
+    """
+
+    def __init__(
+        self,
+        stream_url,
+        token=None,
+        api_token=None,
+        session=None,
+        heartbeat=None,
+        logger=None,
+        dispatcher: AsyncEventDispatcher = None,
+    ):
+        """
+        Inputs:
+            - stream_url(str): websocket url
+            - session(aiohttp.ClientSession): session to open the connection on,
+              e.g. the APIService session. A new one is created when not provided.
+            - heartbeat(float): seconds between pings sent to the server, off by default
+            - dispatcher(AsyncEventDispatcher): delivers events to the callbacks
+              through bounded queues so slow callbacks don't hold up reading,
+              events() iterators are fed directly
+        """
+        if not logger:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+        self.token = token
+        self.api_token = api_token
+        self.stream_url = stream_url
+        self.session = session
+        self.owns_session = session is None
+        self.heartbeat = heartbeat
+        self.callbacks = {}
+        self.dispatcher = dispatcher
+        self.ws = None
+        self.on_close = None
+        self.on_error = None
+        self.reconnect = True
+        self.backoff = Backoff()
+        # rooms re-subscribed after a reconnect
+        self.subscriptions = SubscriptionRegistry()
+        self._reader = None
+        self._queues = []
+        self._closing = None
+        # outage details kept until the first message after a reconnect
+        self._gap = None
+
+    @property
+    def connected(self) -> bool:
+        return self.ws is not None and not self.ws.closed
+
+    async def open(
+        self,
+        on_open=None,
+        on_close=None,
+        on_error=None,
+        reconnect=True,
+        backoff: Backoff = None,
+    ):
+        """
+        Connects to the server and starts reading events on the running loop.
+        Inputs:
+            - on_open: called with the client once connected
+            - on_close: called with the client once the connection is closed
+              for good (closed by the client or reconnecting gave up)
+            - on_error: called with the client and the exception raised while
+              reading or by a callback
+            - reconnect(bool): re-establish dropped connections and re-subscribe
+              to the active rooms. Emits RECONNECT_EVENT once reconnected and
+              GAP_EVENT with the outage to first message time on the first
+              message after it.
+            - backoff(Backoff): delays between reconnect attempts
+        """
+        if self.session is None:
+            self.session = create_client_session()
+        self.on_close = on_close
+        self.on_error = on_error
+        self.reconnect = reconnect
+        self.backoff = backoff or Backoff()
+        self._closing = asyncio.Event()
+
+        self.logger.debug(
+            "Creating connection with WebSocket Server: %s", self.stream_url
+        )
+        self.ws = await self.session.ws_connect(
+            self.stream_url, heartbeat=self.heartbeat
+        )
+        self.logger.debug(
+            "WebSocket connection has been established: %s", self.stream_url
+        )
+        if self.dispatcher is not None:
+            self.dispatcher.start(self._deliver)
+        self._reader = asyncio.get_running_loop().create_task(self._run())
+        await self._callback(on_open, self)
+
+    async def close(self):
+        """
+        Closes the connection and waits for pending events to be delivered
+        """
+        if self._closing is not None:
+            self._closing.set()
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader is not None and self._reader is not asyncio.current_task():
+            await self._reader
+        if self.dispatcher is not None:
+            await self.dispatcher.stop()
+        if self.owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def set_token(self, token):
+        """
+        Sets default user token
+        Inputs:
+            - token (user auth token): Bluefin onboarding token.
+        """
+        self.token = token
+
+    def set_api_token(self, token):
+        """
+        Sets default user token
+        Inputs:
+            - token (user auth token): Bluefin onboarding token.
+        """
+        self.api_token = token
+
+    def listen(self, event, callback):
+        """
+        Assigns callbacks to desired events, callbacks can be coroutine functions
+        """
+        self.callbacks[event] = callback
+        return
+
+    async def events(self):
+        """
+        Async iterator over (event name, data) of the events received while it
+        runs, ends when the connection closes.
+        e.g. async for event, data in client.events(): ...
+        """
+        queue = asyncio.Queue()
+        self._queues.append(queue)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _CLOSED:
+                    return
+                yield item
+        finally:
+            self._queues.remove(queue)
+
+    async def send(self, message):
+        self.logger.debug("Sending message to WebSocket Server: %s", message)
+        await self.ws.send_str(get_codec().dumps(message))
+
+    async def ping(self):
+        self.logger.debug("Sending ping to WebSocket Server")
+        await self.ws.ping()
+
+    async def subscribe_global_updates_by_symbol(self, symbol: MARKET_SYMBOLS):
+        """
+        Allows user to subscribe to global updates for the desired symbol.
+        Inputs:
+            - symbol: market symbol of market user wants global updates for. (e.g. ETH-PERP)
+        """
+        return await self._send_subscription(
+            "SUBSCRIBE", global_updates_room(symbol)
+        )
+
+    async def unsubscribe_global_updates_by_symbol(self, symbol: MARKET_SYMBOLS):
+        """
+        Allows user to unsubscribe to global updates for the desired symbol.
+            Inputs:
+                - symbol: market symbol of market user wants to remove global updates for. (e.g. ETH-PERP)
+        """
+        return await self._send_subscription(
+            "UNSUBSCRIBE", global_updates_room(symbol)
+        )
+
+    async def subscribe_orderbook_depth_streams_by_symbol(
+        self, symbol: MARKET_SYMBOLS, depth=""
+    ):
+        """
+        Allows user to subscribe to orderbook depth stream for the desired symbol.
+        Inputs:
+            - symbol: market symbol of market user wants orderbook depth stream for. (e.g. ETH-PERP)
+            - depth: depth of orderbook depth stream (optional)
+        """
+        return await self._send_subscription(
+            "SUBSCRIBE", orderbook_depth_room(symbol, depth)
+        )
+
+    async def unsubscribe_orderbook_depth_streams_by_symbol(
+        self, symbol: MARKET_SYMBOLS, depth=""
+    ):
+        """
+        Allows user to unsubscribe to orderbook depth stream for the desired symbol.
+        Inputs:
+            - symbol: market symbol of market user wants orderbook depth stream for. (e.g. ETH-PERP)
+            - depth: depth of orderbook depth stream (optional)
+        """
+        return await self._send_subscription(
+            "UNSUBSCRIBE", orderbook_depth_room(symbol, depth)
+        )
+
+    async def subscribe_user_update_by_token(self, user_token: str = None):
+        """
+        Allows user to subscribe to their account updates.
+        Inputs:
+            - token(str): auth token generated when onboarding on Bluefin
+        """
+        token = self.token if user_token == None else user_token
+        return await self._send_subscription(
+            "SUBSCRIBE", user_updates_room(token, self.api_token)
+        )
+
+    async def unsubscribe_user_update_by_token(self, user_token: str = None):
+        """
+        Allows user to unsubscribe to their account updates.
+        Inputs:
+            - token: auth token generated when onboarding on Bluefin
+        """
+        token = self.token if user_token == None else user_token
+        return await self._send_subscription(
+            "UNSUBSCRIBE", user_updates_room(token, self.api_token)
+        )
+
+    async def _send_subscription(self, action, room) -> bool:
+        if not self.connected:
+            return False
+        try:
+            await self.send([action, [room]])
+            self.subscriptions.update(action, room)
+            return True
+        except Exception as e:
+            self.logger.error("Failed to {} {}: {}".format(action, room, e))
+            return False
+
+    async def _run(self):
+        """
+        Reads until the connection is closed by the client, reconnecting on drops
+        """
+        try:
+            while True:
+                try:
+                    await self._read()
+                except Exception as e:
+                    self.logger.error("Lost websocket connection: {}".format(e))
+                if not self.reconnect or self._closing.is_set():
+                    return
+                if not await self._reconnect():
+                    return
+        finally:
+            for queue in self._queues:
+                queue.put_nowait(_CLOSED)
+            self.logger.debug("WebSocket connection closed: %s", self.stream_url)
+            await self._callback(self.on_close, self)
+
+    async def _read(self):
+        import aiohttp
+
+        async for message in self.ws:
+            if message.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                if self._gap is not None:
+                    await self._emit_gap()
+                try:
+                    await self._dispatch(get_codec().loads(message.data))
+                except Exception as e:
+                    self.logger.error("Failed to handle message: {}".format(e))
+                    await self._callback(self.on_error, self, e)
+            elif message.type == aiohttp.WSMsgType.ERROR:
+                self.logger.error(
+                    "Websocket exception: {}".format(self.ws.exception())
+                )
+                await self._callback(self.on_error, self, self.ws.exception())
+
+    async def _reconnect(self) -> bool:
+        """
+        Reconnects with backoff until it succeeds, the client is closed or the
+        backoff is exhausted. Re-subscribes and emits RECONNECT_EVENT on success.
+        """
+        disconnected_at = time.time()
+        lost = time.monotonic()
+        attempt = 0
+        while not self.backoff.exhausted(attempt):
+            try:
+                await asyncio.wait_for(
+                    self._closing.wait(), self.backoff.delay(attempt)
+                )
+                return False
+            except asyncio.TimeoutError:
+                pass
+            attempt += 1
+            rooms = self.subscriptions.rooms()
+            ws = None
+            try:
+                ws = self.ws = await self.session.ws_connect(
+                    self.stream_url, heartbeat=self.heartbeat
+                )
+                for room in rooms:
+                    await self.send(["SUBSCRIBE", [room]])
+            except Exception as e:
+                self.logger.warning(
+                    "Reconnect attempt {} to {} failed: {}".format(
+                        attempt, self.stream_url, e
+                    )
+                )
+                if ws is not None:
+                    # opened but not subscribed, the next attempt opens another one
+                    try:
+                        await ws.close()
+                    except Exception:
+                        pass
+                continue
+
+            self.logger.info(
+                "WebSocket connection re-established after %d attempt(s): %s",
+                attempt,
+                self.stream_url,
+            )
+            outage = {
+                "attempts": attempt,
+                "disconnectedAt": disconnected_at,
+                "reconnectedAt": time.time(),
+                "downtime": time.monotonic() - lost,
+                "subscriptions": rooms,
+            }
+            self._gap = (outage, time.monotonic())
+            await self._emit(RECONNECT_EVENT, outage)
+            return True
+
+        self.logger.error(
+            "Giving up reconnecting to {} after {} attempts".format(
+                self.stream_url, attempt
+            )
+        )
+        return False
+
+    async def _emit_gap(self):
+        outage, reconnected = self._gap
+        self._gap = None
+        await self._emit(
+            GAP_EVENT,
+            {
+                "disconnectedAt": outage["disconnectedAt"],
+                "reconnectedAt": outage["reconnectedAt"],
+                "firstMessageAt": time.time(),
+                "outageToFirstMessage": outage["downtime"]
+                + time.monotonic()
+                - reconnected,
+            },
+        )
+
+    async def _emit(self, event, data):
+        """
+        Delivers client side events to their listener, the default listener is not used
+        """
+        if event in self.callbacks:
+            await self._callback(self.callbacks[event], data)
+
+    async def _dispatch(self, data):
+        """
+        Delivers an event to its callback (or the default one) and to the event iterators
+        """
+        event_name = data["eventName"]
+        for queue in self._queues:
+            queue.put_nowait((event_name, data["data"]))
+
+        if self.dispatcher is not None:
+            await self.dispatcher.put(event_name, data["data"])
+        else:
+            await self._deliver(event_name, data["data"])
+
+    async def _deliver(self, event_name, data):
+        if event_name in self.callbacks:
+            await self._callback(self.callbacks[event_name], data)
+        elif "default" in self.callbacks:
+            await self._callback(
+                self.callbacks["default"], {"event": event_name, "data": data}
+            )
+
+    async def _callback(self, callback, *args):
+        if not callback:
+            return
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            self.logger.error("Error from callback {}: {}".format(callback, e))
+            if self.on_error and callback is not self.on_error:
+                await self._callback(self.on_error, self, e)
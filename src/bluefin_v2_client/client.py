@@ -1,13 +1,15 @@
 import json
-from copy import deepcopy
 
 from .api_service import APIService
+from .arrays import OrderbookArrays, TradeArrays
 from .contracts import Contracts
 from .order_signer import OrderSigner
 from .onboarding_signer import OnboardingSigner
+from .order_record import OrderRecord
 from .constants import SUI_CLOCK_OBJECT_ID, TIME, SERVICE_URLS
 from .sockets_lib import Sockets
 from .websocket_client import WebsocketClient
+from .async_websocket_client import AsyncWebsocketClient
 from sui_utils import *
 from .interfaces import *
 from .enumerations import *
@@ -20,7 +22,25 @@ class BluefinClient:
     A class to represent a client for interacting with bluefin offchain and onchain APIs.
     """
 
-    def __init__(self, are_terms_accepted, network, private_key=""):
+    def __init__(
+        self,
+        are_terms_accepted,
+        network,
+        private_key="",
+        session=None,
+        connector_settings=None,
+        retry_policy=None,
+    ):
+        """
+        Inputs:
+            are_terms_accepted (bool): acceptance of bluefin terms of use
+            network (dict): one of Networks
+            private_key (str): seed phrase or 0x prefixed private key
+            session (aiohttp.ClientSession, optional): http session to share with other clients,
+                it is not closed by close_connections
+            connector_settings (dict, optional): connection pool overrides, see DEFAULT_CONNECTOR_SETTINGS
+            retry_policy (RetryPolicy, optional): retries of on-chain transactions, see sui_utils.RetryPolicy
+        """
         self.are_terms_accepted = are_terms_accepted
         self.network = network
         if private_key != "":
@@ -30,17 +50,42 @@ class BluefinClient:
             else:
                 self.account = SuiWallet(seed=private_key)
             # self.account = Account.from_key(private_key)
+            # pre-encode maker address used while hashing orders
+            hex_address_to_bytes32(self.account.address.lower())
         self.apis = APIService(
-            self.network["apiGateway"], default_value(self.network, "UUID", "")
+            self.network["apiGateway"],
+            default_value(self.network, "UUID", ""),
+            session=session,
+            connector_settings=connector_settings,
         )
-        self.dms_api = APIService(self.network["dmsURL"])
+        # dms shares the connection pool, it is closed along with apis
+        self.dms_api = APIService(self.network["dmsURL"], session=self.apis.client)
         self.socket = Sockets(self.network["socketURL"])
         self.ws_client = WebsocketClient(self.network["webSocketURL"])
+        # asyncio websocket client, delivers events on the same loop as apis
+        self.async_ws_client = AsyncWebsocketClient(
+            self.network["webSocketURL"], session=self.apis.client
+        )
         self.contracts = Contracts()
         self.order_signer = OrderSigner()
         self.onboarding_signer = OnboardingSigner()
         self.contract_signer = Signer()
+        self.signing_pool = None
+        self.signing_pool_workers = 0
         self.url = self.network["url"]
+        # sui node calls share the apis connection pool
+        self.rpc = AsyncSuiRpcClient(
+            self.url, session=self.apis.client, retry_policy=retry_policy
+        )
+        # builds transaction bytes without an unsafe_moveCall round trip
+        self.tx_builder = None
+        self.objects = None
+        if private_key != "":
+            # owned object references and coin balances, kept from the effects of executions
+            self.objects = get_object_cache(self.url, self.account.getUserAddress())
+            self.tx_builder = AsyncTransactionBuilder(
+                self.rpc, self.account.getUserAddress(), objects=self.objects
+            )
 
     async def init(self, user_onboarding=True, api_token="", auth_token=""):
         """
@@ -59,17 +104,21 @@ class BluefinClient:
             # for socket
             self.socket.set_api_token(api_token)
             self.ws_client.set_api_token(api_token)
+            self.async_ws_client.set_api_token(api_token)
         # 2. priority to perform onboarding if `true` over auth_token
         elif user_onboarding:
             self.apis.auth_token = await self.onboard_user()
             self.dms_api.auth_token = self.apis.auth_token
             self.socket.set_token(self.apis.auth_token)
             self.ws_client.set_token(self.apis.auth_token)
+            self.async_ws_client.set_token(self.apis.auth_token)
         # 3. if user has provided auth token avoid onboarding again and use provided token
         elif auth_token:
-            self.dmsApi.auth_token = auth_token
+            self.apis.auth_token = auth_token
+            self.dms_api.auth_token = auth_token
             self.socket.set_token(auth_token)
-            self.webSocketClient.set_token(auth_token)
+            self.ws_client.set_token(auth_token)
+            self.async_ws_client.set_token(auth_token)
 
     async def onboard_user(self, token: str = None):
         """
@@ -169,46 +218,118 @@ class BluefinClient:
         Returns:
             OrderSignatureResponse: order raw info and generated signature
         """
-        if "ioc" in req and req["ioc"]:
-            req["timeInForce"] = TIME_IN_FORCE.IMMEDIATE_OR_CANCEL
-        if (
-            "timeInForce" in req
-            and req["timeInForce"] == TIME_IN_FORCE.IMMEDIATE_OR_CANCEL
-        ):
-            req["ioc"] = True
-        sui_params = deepcopy(req)
-        sui_params["price"] = to_base18(req["price"])
-        sui_params["quantity"] = to_base18(req["quantity"])
-        sui_params["leverage"] = to_base18(req["leverage"])
-
-        if "triggerPrice" in sui_params:
-            sui_params["triggerPrice"] = to_base18(sui_params["triggerPrice"])
-
-        order = self.create_order_to_sign(sui_params)
-        symbol = sui_params["symbol"].value
-        order_signature = self.order_signer.sign_order(
-            order, self.account.privateKeyBytes
+        return self.create_signed_order_record(req).to_signature_response()
+
+    def create_signed_order_record(self, req: OrderSignatureRequest) -> OrderRecord:
+        """
+        Same as create_signed_order but returns an OrderRecord, which avoids building
+        intermediate dicts. The record can be passed directly to post_signed_order.
+        Inputs:
+            params (OrderSignatureRequest): parameters to create order with
+        Returns:
+            OrderRecord: order raw info and generated signature
+        """
+        record = self._create_order_record(req)
+        record.orderSignature = (
+            self.order_signer.sign_order(record, self.account.privateKeyBytes)
+            + self.account.publicKeyBase64.decode()
         )
-        order_signature = order_signature + self.account.publicKeyBase64.decode()
-        return OrderSignatureResponse(
-            symbol=symbol,
-            price=sui_params["price"],
-            quantity=sui_params["quantity"],
-            side=sui_params["side"],
-            leverage=sui_params["leverage"],
-            reduceOnly=default_value(sui_params, "reduceOnly", False),
-            postOnly=default_value(sui_params, "postOnly", False),
-            cancelOnRevert=default_value(sui_params, "cancelOnRevert", False),
-            salt=order["salt"],
-            expiration=order["expiration"],
-            orderSignature=order_signature,
-            orderType=sui_params["orderType"],
-            maker=order["maker"],
-            orderbookOnly=default_value(sui_params, "orderbookOnly", True),
-            timeInForce=default_value(
-                sui_params, "timeInForce", TIME_IN_FORCE.GOOD_TILL_TIME
-            ),
-            triggerPrice=default_value(sui_params, "triggerPrice", None),
+        return record
+
+    def create_signed_orders(
+        self, requests: List[OrderSignatureRequest], as_records: bool = False
+    ) -> List[Union[OrderSignatureResponse, OrderRecord]]:
+        """
+        Creates orders from provided params and signs them using the private key of the account.
+        Orders are serialized and hashed in a single pass, signatures are generated on the
+        signing pool if one is configured (see set_signing_pool).
+        Inputs:
+            requests (List[OrderSignatureRequest]): parameters to create orders with
+            as_records (bool): return OrderRecord objects instead of OrderSignatureResponse dicts
+        Returns:
+            List[OrderSignatureResponse]: order raw info and generated signature, in input order
+        """
+        records = [self._create_order_record(req) for req in requests]
+        signatures = self.order_signer.sign_orders(
+            records,
+            self.account.privateKeyBytes,
+            self.signing_pool,
+            self.signing_pool_workers,
+        )
+        public_key = self.account.publicKeyBase64.decode()
+        for record, signature in zip(records, signatures):
+            record.orderSignature = signature + public_key
+
+        if as_records:
+            return records
+        return [record.to_signature_response() for record in records]
+
+    def set_signing_pool(self, workers: int, use_processes: bool = False):
+        """
+        Configures the pool used by create_signed_orders to sign orders in parallel.
+        PyNaCl releases the GIL while signing so a thread pool scales with cores,
+        a process pool avoids the remaining per order python overhead.
+        Inputs:
+            workers (int): number of workers, 0 or 1 signs on the calling thread
+            use_processes (bool): use a process pool instead of a thread pool
+        """
+        if self.signing_pool is not None:
+            self.signing_pool.shutdown(wait=False)
+            self.signing_pool = None
+        self.signing_pool_workers = workers
+
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            self.signing_pool = pool(max_workers=workers)
+
+    def _create_order_record(self, req: OrderSignatureRequest) -> OrderRecord:
+        """
+        Builds an OrderRecord in base 1e18 from the order request,
+        follows the same defaults as create_order_to_sign.
+        """
+        get = req.get
+        order_type = req["orderType"]
+
+        time_in_force = get("timeInForce", TIME_IN_FORCE.GOOD_TILL_TIME)
+        ioc = get("ioc", False)
+        if ioc:
+            time_in_force = TIME_IN_FORCE.IMMEDIATE_OR_CANCEL
+        elif time_in_force == TIME_IN_FORCE.IMMEDIATE_OR_CANCEL:
+            ioc = True
+
+        expiration = req["expiration"] if "expiration" in req else None
+        if expiration is None:
+            expiration = current_unix_timestamp()
+            # MARKET ORDER set expiration of 1 minute, LIMIT ORDER of 30 days
+            if order_type == ORDER_TYPE.MARKET:
+                expiration += TIME["SECONDS_IN_A_MINUTE"]
+            else:
+                expiration += TIME["SECONDS_IN_A_MONTH"]
+            expiration *= 1000
+
+        trigger_price = get("triggerPrice")
+        maker = get("maker")
+
+        return OrderRecord(
+            symbol=req["symbol"],
+            market=get("market") or self.contracts.get_perpetual_id(req["symbol"]),
+            side=req["side"],
+            orderType=order_type,
+            price=to_base18(req["price"]),
+            quantity=to_base18(req["quantity"]),
+            leverage=to_base18(req["leverage"]),
+            maker=maker.lower() if maker else self.account.address.lower(),
+            reduceOnly=get("reduceOnly", False),
+            postOnly=get("postOnly", False),
+            cancelOnRevert=get("cancelOnRevert", False),
+            orderbookOnly=get("orderbookOnly", True),
+            expiration=expiration,
+            salt=req["salt"] if "salt" in req else random_number(1000000),
+            ioc=ioc,
+            timeInForce=time_in_force,
+            triggerPrice=None if trigger_price is None else to_base18(trigger_price),
         )
 
     def create_signed_cancel_order(
@@ -225,22 +346,7 @@ class BluefinClient:
         Returns:
             OrderSignatureResponse: generated cancel signature
         """
-        if "ioc" in params and params["ioc"]:
-            params["timeInForce"] = TIME_IN_FORCE.IMMEDIATE_OR_CANCEL
-        if (
-            "timeInForce" in params
-            and params["timeInForce"] == TIME_IN_FORCE.IMMEDIATE_OR_CANCEL
-        ):
-            params["ioc"] = True
-        sui_params = deepcopy(params)
-        sui_params["price"] = to_base18(params["price"])
-        sui_params["quantity"] = to_base18(params["quantity"])
-        sui_params["leverage"] = to_base18(params["leverage"])
-
-        if "triggerPrice" in sui_params:
-            sui_params["triggerPrice"] = to_base18(sui_params["triggerPrice"])
-
-        order_to_sign = self.create_order_to_sign(sui_params)
+        order_to_sign = self._create_order_record(params)
         hash_val = self.order_signer.get_order_hash(order_to_sign)
         return self.create_signed_cancel_orders(
             params["symbol"], hash_val.hex(), parentAddress
@@ -342,6 +448,11 @@ class BluefinClient:
         if params["reduceOnly"]:
             print("Warning: Reduce Only feature is deprecated until further notice. Reduce Only orders will be rejected from the API.")
 
+        if isinstance(params, OrderRecord):
+            return await self.apis.post(
+                SERVICE_URLS["ORDERS"]["ORDERS"], params.to_wire(), auth_required=True
+            )
+
         return await self.apis.post(
             SERVICE_URLS["ORDERS"]["ORDERS"],
             {
@@ -371,23 +482,29 @@ class BluefinClient:
         )
 
     # Contract calls
-    async def deposit_margin_to_bank(self, amount: int, coin_id: str = "") -> bool:
+    async def deposit_margin_to_bank(
+        self,
+        amount: int,
+        coin_id: str = "",
+        response_options: dict = None,
+        finality: EXECUTION_FINALITY = None,
+    ) -> bool:
         """
         Deposits given amount of USDC from user's account to margin bank
 
         Inputs:
             amount (number): quantity of usdc to be deposited to bank in base decimals (1,2 etc)
             coin_id (string) (optional): the id of the coin you want the amount to be deposited from
+            response_options (dict): optional sui_executeTransactionBlock response fields,
+                defaults to STATUS_RESPONSE_OPTIONS
+            finality (EXECUTION_FINALITY): optional finality to wait for, defaults to WAIT_FOR_LOCAL_EXECUTION
 
         Returns:
             Boolean: true if amount is successfully deposited, false otherwise
         """
-        usdc_coins = self.get_usdc_coins()
         if coin_id == "":
-            coin_id = self._get_coin_having_balance(usdc_coins["data"], amount)
+            coin_id = await self._get_usdc_coin_having_balance(amount)
 
-        package_id = self.contracts.get_package_id()
-        user_address = self.account.getUserAddress()
         callArgs = []
         callArgs.append(self.contracts.get_bank_id())
 
@@ -400,17 +517,15 @@ class BluefinClient:
 
         callArgs[2] = getsha256Hash(callArgs)
 
-        txBytes = rpc_unsafe_moveCall(
-            self.url,
+        res = await self._execute_move_call(
             callArgs,
             "deposit_to_bank",
             "margin_bank",
-            user_address,
-            package_id,
-            typeArguments=[self.contracts.get_currency_type()],
+            [self.contracts.get_currency_type()],
+            response_options,
+            finality,
+            balance_changes={coin_id: -toUsdcBase(amount)},
         )
-        signature = self.contract_signer.sign_tx(txBytes, self.account)
-        res = rpc_sui_executeTransactionBlock(self.url, txBytes, signature)
         try:
             if res["result"]["effects"]["status"]["status"] == "success":
                 return True
@@ -419,12 +534,20 @@ class BluefinClient:
         except Exception as e:
             return res
 
-    async def withdraw_margin_from_bank(self, amount: Union[float, int]) -> bool:
+    async def withdraw_margin_from_bank(
+        self,
+        amount: Union[float, int],
+        response_options: dict = None,
+        finality: EXECUTION_FINALITY = None,
+    ) -> bool:
         """
         Withdraws given amount of usdc from margin bank if possible
 
         Inputs:
             amount (number): quantity of usdc to be withdrawn from bank in base decimals (1,2 etc)
+            response_options (dict): optional sui_executeTransactionBlock response fields,
+                defaults to STATUS_RESPONSE_OPTIONS
+            finality (EXECUTION_FINALITY): optional finality to wait for, defaults to WAIT_FOR_LOCAL_EXECUTION
 
         Returns:
             Boolean: true if amount is successfully withdrawn, false otherwise
@@ -442,17 +565,14 @@ class BluefinClient:
         ]
 
         callArgs[2] = getsha256Hash(callArgs)
-        txBytes = rpc_unsafe_moveCall(
-            self.url,
+        res = await self._execute_move_call(
             callArgs,
             "withdraw_from_bank",
             "margin_bank",
-            self.account.getUserAddress(),
-            self.contracts.get_package_id(),
-            typeArguments=[self.contracts.get_currency_type()],
+            [self.contracts.get_currency_type()],
+            response_options,
+            finality,
         )
-        signature = self.contract_signer.sign_tx(txBytes, self.account)
-        res = rpc_sui_executeTransactionBlock(self.url, txBytes, signature)
         try:
             if res["result"]["effects"]["status"]["status"] == "success":
                 return True
@@ -461,12 +581,16 @@ class BluefinClient:
         except Exception as e:
             return res
 
-    async def withdraw_all_margin_from_bank(self):
+    async def withdraw_all_margin_from_bank(
+        self, response_options: dict = None, finality: EXECUTION_FINALITY = None
+    ):
         """
         Withdraws everything of usdc from margin bank
 
         Inputs:
-            No input Required
+            response_options (dict): optional sui_executeTransactionBlock response fields,
+                defaults to STATUS_RESPONSE_OPTIONS
+            finality (EXECUTION_FINALITY): optional finality to wait for, defaults to WAIT_FOR_LOCAL_EXECUTION
         Returns:
             Boolean: true if amount is successfully withdrawn, false otherwise
         """
@@ -481,17 +605,14 @@ class BluefinClient:
         ]
 
         callArgs[2] = getsha256Hash(callArgs)
-        txBytes = rpc_unsafe_moveCall(
-            self.url,
+        res = await self._execute_move_call(
             callArgs,
             "withdraw_all_margin_from_bank",
             "margin_bank",
-            self.account.getUserAddress(),
-            self.contracts.get_package_id(),
-            typeArguments=[self.contracts.get_currency_type()],
+            [self.contracts.get_currency_type()],
+            response_options,
+            finality,
         )
-        signature = self.contract_signer.sign_tx(txBytes, self.account)
-        res = rpc_sui_executeTransactionBlock(self.url, txBytes, signature)
 
         if res["result"]["effects"]["status"]["status"] == "success":
             return True
@@ -531,14 +652,11 @@ class BluefinClient:
             callArgs.append(str(to_base18(leverage)))
 
             callArgs.append(getsha256Hash(callArgs + [getSalt()]))
-            txBytes = rpc_unsafe_moveCall(
-                self.url,
+            txBytes, _ = await self._move_call(
                 callArgs,
                 "adjust_leverage",
                 "exchange",
-                self.account.getUserAddress(),
-                self.contracts.get_package_id(),
-                typeArguments=[self.contracts.get_currency_type()],
+                [self.contracts.get_currency_type()],
             )
             signature = self.contract_signer.sign_tx(txBytes, self.account)
             separator = "||||"  # Choose a separator that won't appear in txBytes or signature
@@ -557,13 +675,15 @@ class BluefinClient:
             )
             # If API is unsuccessful make direct contract call to update the leverage
             if 'error' in res:
-                result = rpc_sui_executeTransactionBlock(
-                    self.url, txBytes, signature)
+                result = await self._execute_transaction_block(txBytes, signature)
                 if result["result"]["effects"]["status"]["status"] == "success":
                     return True
                 else:
                     return False
 
+            # executed by the exchange, the objects it used changed without us seeing the effects
+            if self.tx_builder is not None:
+                self.tx_builder.invalidate()
             return res
 
         res = await self.apis.post(
@@ -584,6 +704,8 @@ class BluefinClient:
         operation: ADJUST_MARGIN,
         amount: str,
         parentAddress: str = "",
+        response_options: dict = None,
+        finality: EXECUTION_FINALITY = None,
     ):
         """
         Adjusts user's on-chain position by adding or removing the specified amount of margin.
@@ -594,6 +716,9 @@ class BluefinClient:
             amount (number): amount of margin to be adjusted
             parentAddress (str): optional, if provided, the margin of parent is
                                 being adjusted (for sub accounts only)
+            response_options (dict): optional sui_executeTransactionBlock response fields,
+                defaults to STATUS_RESPONSE_OPTIONS
+            finality (EXECUTION_FINALITY): optional finality to wait for, defaults to WAIT_FOR_LOCAL_EXECUTION
         Returns:
             Boolean: true if the margin is adjusted
         """
@@ -620,30 +745,14 @@ class BluefinClient:
 
         callArgs.append(getsha256Hash(callArgs + [getSalt()]))
 
-        if operation == ADJUST_MARGIN.ADD:
-            txBytes = rpc_unsafe_moveCall(
-                self.url,
-                callArgs,
-                "add_margin",
-                "exchange",
-                self.account.getUserAddress(),
-                self.contracts.get_package_id(),
-                typeArguments=[self.contracts.get_currency_type()],
-            )
-
-        else:
-            txBytes = rpc_unsafe_moveCall(
-                self.url,
-                callArgs,
-                "remove_margin",
-                "exchange",
-                self.account.getUserAddress(),
-                self.contracts.get_package_id(),
-                typeArguments=[self.contracts.get_currency_type()],
-            )
-
-        signature = self.contract_signer.sign_tx(txBytes, self.account)
-        result = rpc_sui_executeTransactionBlock(self.url, txBytes, signature)
+        result = await self._execute_move_call(
+            callArgs,
+            "add_margin" if operation == ADJUST_MARGIN.ADD else "remove_margin",
+            "exchange",
+            [self.contracts.get_currency_type()],
+            response_options,
+            finality,
+        )
         if result["result"]["effects"]["status"]["status"] == "success":
             return True
         else:
@@ -663,17 +772,7 @@ class BluefinClient:
         callArgs.append(self.contracts.get_sub_account_id())
         callArgs.append(sub_account_address)
         callArgs.append(status)
-        txBytes = rpc_unsafe_moveCall(
-            self.url,
-            callArgs,
-            "set_sub_account",
-            "roles",
-            self.account.getUserAddress(),
-            self.contracts.get_package_id(),
-        )
-
-        signature = self.contract_signer.sign_tx(txBytes, self.account)
-        result = rpc_sui_executeTransactionBlock(self.url, txBytes, signature)
+        result = await self._execute_move_call(callArgs, "set_sub_account", "roles")
         if result["result"]["effects"]["status"]["status"] == "success":
             return True
         else:
@@ -688,8 +787,8 @@ class BluefinClient:
             callArgs.append(userAddress or self.account.getUserAddress())
             callArgs.append("0x2::sui::SUI")
 
-            result = rpc_call_sui_function(
-                self.url, callArgs, method="suix_getBalance"
+            result = await self.rpc.call_sui_function(
+                callArgs, method="suix_getBalance"
             )
             return fromSuiBase(result.raw_response["totalBalance"])
         except Exception as e:
@@ -717,8 +816,8 @@ class BluefinClient:
             callArgs = []
             callArgs.append(userAddress or self.account.getUserAddress())
             callArgs.append(self.contracts.get_currency_type())
-            result = rpc_call_sui_function(
-                self.url, callArgs, method="suix_getBalance"
+            result = await self.rpc.call_sui_function(
+                callArgs, method="suix_getBalance"
             )
             return fromUsdcBase(result.raw_response["totalBalance"])
 
@@ -735,8 +834,8 @@ class BluefinClient:
             call_args.append(
                 {"type": "address", "value": userAddress or self.account.getUserAddress()}
             )
-            result = rpc_call_sui_function(
-                self.url, call_args, method="suix_getDynamicFieldObject"
+            result = await self.rpc.call_sui_function(
+                call_args, method="suix_getDynamicFieldObject"
             )
             if "error" in result.raw_response:
                 if result.raw_response["error"]["code"] == "dynamicFieldNotFound":
@@ -756,8 +855,10 @@ class BluefinClient:
             call_args.append(
                 {"type": "address", "value": userAddress or self.account.getUserAddress()}
             )
-            result = rpc_call_sui_function(
-                self.url, call_args, method="suix_getDynamicFieldObject"
+            result = (
+                await self.rpc.call_sui_function(
+                    call_args, method="suix_getDynamicFieldObject"
+                )
             ).raw_response
 
             balance = fromSuiBase(
@@ -767,6 +868,60 @@ class BluefinClient:
         except Exception as e:
             raise (Exception("Failed to get balance, Exception: {}".format(e)))
 
+    async def get_chain_snapshot(self, markets: list, addresses: list = None) -> dict:
+        """
+        Returns the on-chain balances and positions of addresses, read from the
+        node with a single JSON-RPC batch request.
+        Inputs:
+            markets (list[MARKET_SYMBOLS]): markets to read positions of
+            addresses (list[str]): addresses to read, defaults to the client account
+        Returns:
+            dict: address -> {
+                "suiBalance": float,
+                "usdcBalance": float,
+                "marginBankBalance": float,
+                "positions": {symbol: on-chain position fields, None without a position}
+            }
+        """
+        addresses = addresses or [self.account.getUserAddress()]
+        currency_type = self.contracts.get_currency_type()
+        bank_table_id = self.contracts.get_bank_table_id()
+        calls = []
+        for address in addresses:
+            key = {"type": "address", "value": address}
+            calls.append(("suix_getBalance", [address, "0x2::sui::SUI"]))
+            calls.append(("suix_getBalance", [address, currency_type]))
+            calls.append(("suix_getDynamicFieldObject", [bank_table_id, key]))
+            for market in markets:
+                calls.append(
+                    (
+                        "suix_getDynamicFieldObject",
+                        [self.contracts.get_position_table_id(market), key],
+                    )
+                )
+
+        try:
+            responses = iter(await self.rpc.batch(calls))
+            snapshot = {}
+            for address in addresses:
+                sui_balance = self._batch_result(next(responses))
+                usdc_balance = self._batch_result(next(responses))
+                bank_account = self._dynamic_field_fields(next(responses))
+                snapshot[address] = {
+                    "suiBalance": fromSuiBase(sui_balance["totalBalance"]),
+                    "usdcBalance": fromUsdcBase(usdc_balance["totalBalance"]),
+                    "marginBankBalance": fromSuiBase(bank_account["balance"])
+                    if bank_account
+                    else 0,
+                    "positions": {
+                        market.value: self._dynamic_field_fields(next(responses))
+                        for market in markets
+                    },
+                }
+            return snapshot
+        except Exception as e:
+            raise (Exception("Failed to get chain snapshot, Exception: {}".format(e)))
+
     # Market endpoints
     async def get_orderbook(self, params: GetOrderbookRequest):
         """
@@ -779,6 +934,21 @@ class BluefinClient:
         params = extract_enums(params, ["symbol"])
         return await self.apis.get(SERVICE_URLS["MARKET"]["ORDER_BOOK"], params)
 
+    async def get_orderbook_arrays(
+        self, params: GetOrderbookRequest, out: OrderbookArrays = None
+    ):
+        """
+        Returns the orderbook snapshot as NumPy (price, size) arrays, requires numpy.
+        Inputs:
+            params(GetOrderbookRequest): the order symbol and limit(orderbook depth)
+            out(OrderbookArrays): arrays to refresh in place, created when not provided
+        Returns:
+            OrderbookArrays: bids and asks arrays
+        """
+        if out is None:
+            out = OrderbookArrays(capacity=default_value(params, "limit", 50))
+        return out.update(await self.get_orderbook(params))
+
     async def get_exchange_status(self):
         """
         Returns a dictionary containing the exchange status.
@@ -944,6 +1114,21 @@ class BluefinClient:
 
         return await self.apis.get(SERVICE_URLS["MARKET"]["RECENT_TRADE"], params)
 
+    async def get_market_recent_trades_array(
+        self, params: GetMarketRecentTradesRequest, out: TradeArrays = None
+    ):
+        """
+        Returns the recent trades as a NumPy structured array, requires numpy.
+        Inputs:
+            params(GetMarketRecentTradesRequest): params required to fetch recent trades
+            out(TradeArrays): array to refresh in place, created when not provided
+        Returns:
+            TradeArrays: recent trades array
+        """
+        if out is None:
+            out = TradeArrays(capacity=default_value(params, "pageSize", 100))
+        return out.update(await self.get_market_recent_trades(params))
+
     async def get_contract_addresses(self):
         """
         Returns:
@@ -1170,16 +1355,53 @@ class BluefinClient:
             )
         return response
 
+    async def warmup_connections(self, connections=4):
+        """
+        Opens and pools connections to the api gateway before trading starts,
+        so the first orders don't pay for TCP and TLS handshakes.
+        Inputs:
+            connections (int): number of connections to open
+        Returns:
+            int: number of connections established
+        """
+        return await self.apis.warmup(connections, SERVICE_URLS["MARKET"]["STATUS"])
+
     async def close_connections(self):
+        await self.async_ws_client.close()
         # close aio http connection
         await self.apis.close_session()
         await self.dms_api.close_session()
+        await self.rpc.close()
+        # release signing workers
+        self.set_signing_pool(0)
+
+    async def _get_usdc_coin_having_balance(self, balance: int) -> str:
+        """
+        Returns the id of a usdc coin having the balance, from the cached coins
+        when they are known, the coin list is read otherwise
+        """
+        currency = self.contracts.get_currency_type()
+        coins = self.objects.get_coins(currency) if self.objects is not None else None
+        if coins is not None:
+            try:
+                return self._get_coin_having_balance(coins, balance)
+            except Exception:
+                # coins received since they were listed are not cached
+                pass
+
+        # every page, a coin having the balance may not be on the first one
+        coins = await self.rpc.get_coins_with_type(
+            self.account.getUserAddress(), currency
+        )
+        if self.objects is not None:
+            self.objects.load_coins(currency, coins)
+        return self._get_coin_having_balance(coins, balance)
 
     def _get_coin_having_balance(self, usdc_coin_list: list, balance: int) -> str:
-        balance = toUsdcBase(balance)
-        for coin in usdc_coin_list:
-            if int(coin["balance"]) >= balance:
-                return coin["coinObjectId"]
+        # the smallest coin covering the balance, larger coins are kept whole
+        coin = CoinIndex(usdc_coin_list).smallest_sufficient(toUsdcBase(balance))
+        if coin is not None:
+            return coin.coin_object_id
         raise Exception(
             "Not enough balance available, please merge your coins for get usdc"
         )
@@ -1454,3 +1676,103 @@ class BluefinClient:
     def set_uuid(self, uuid):
         self.apis.set_uuid(uuid)
         self.dms_api.set_uuid(uuid)
+
+    async def _move_call(
+        self, callArgs, function_name, function_library, typeArguments=[], local=True
+    ):
+        """
+        Returns (txBytes, built locally) of a call to the exchange package. The
+        bytes are built with tx_builder, or by the node with unsafe_moveCall
+        when local is False or the builder can't build them.
+        """
+        package_id = self.contracts.get_package_id()
+        if local and self.tx_builder is not None:
+            try:
+                txBytes = await self.tx_builder.move_call(
+                    callArgs,
+                    function_name,
+                    function_library,
+                    package_id,
+                    typeArguments=typeArguments,
+                )
+                return txBytes, True
+            except Exception:
+                # the node builds it, its effects refresh what is cached
+                pass
+        txBytes = await self.rpc.unsafe_moveCall(
+            callArgs,
+            function_name,
+            function_library,
+            self.account.getUserAddress(),
+            package_id,
+            typeArguments=typeArguments,
+        )
+        return txBytes, False
+
+    async def _execute_move_call(
+        self,
+        callArgs,
+        function_name,
+        function_library,
+        typeArguments=[],
+        response_options=None,
+        finality=None,
+        balance_changes=None,
+    ) -> dict:
+        """
+        Builds, signs and executes a call to the exchange package. balance_changes
+        (coin id -> change) of the coins used keeps their cached balance current.
+        """
+        txBytes, local = await self._move_call(
+            callArgs, function_name, function_library, typeArguments
+        )
+        signature = self.contract_signer.sign_tx(txBytes, self.account)
+        result = await self._execute_transaction_block(
+            txBytes, signature, response_options, finality, balance_changes
+        )
+        if local and is_stale_object_error(result):
+            # cached object references can be stale when objects were used by
+            # transactions sent from elsewhere, have the node build it instead.
+            # Other errors are returned, the transaction may still execute.
+            txBytes, _ = await self._move_call(
+                callArgs, function_name, function_library, typeArguments, local=False
+            )
+            signature = self.contract_signer.sign_tx(txBytes, self.account)
+            result = await self._execute_transaction_block(
+                txBytes, signature, response_options, finality, balance_changes
+            )
+        return result
+
+    async def _execute_transaction_block(
+        self, txBytes, signature, response_options=None, finality=None, balance_changes=None
+    ) -> dict:
+        # the callers only check effects.status, skip the other response fields by default
+        result = await self.rpc.execute_transaction_block(
+            txBytes,
+            signature,
+            response_options=response_options or STATUS_RESPONSE_OPTIONS,
+            finality=finality,
+        )
+        if self.tx_builder is not None:
+            effects = (result.get("result") or {}).get("effects")
+            if effects:
+                self.tx_builder.update_from_effects(effects, balance_changes)
+            else:
+                self.tx_builder.invalidate()
+        return result
+
+    def _batch_result(self, response: dict):
+        if "error" in response:
+            raise Exception(response["error"])
+        return response["result"]
+
+    def _dynamic_field_fields(self, response: dict):
+        """
+        Returns the fields of a dynamic field object, None when it does not exist
+        """
+        result = self._batch_result(response)
+        if "error" in result:
+            if result["error"]["code"] == "dynamicFieldNotFound":
+                return None
+            raise Exception(result["error"])
+        return result["data"]["content"]["fields"]["value"]["fields"]
@@ -1,3 +1,4 @@
+from sui_utils import hex_address_to_bytes32
 from .enumerations import MARKET_SYMBOLS
 
 
@@ -14,6 +15,10 @@ class Contracts:
         self.contracts_global_info = contracts_info["auxiliaryContractsAddresses"][
             "objects"
         ]
+        # pre-encode perpetual ids so order hashing only encodes per order fields
+        for market_info in contracts_info.values():
+            if isinstance(market_info, dict) and "Perpetual" in market_info:
+                hex_address_to_bytes32(market_info["Perpetual"]["id"])
 
     def get_sub_account_id(self):
         return self.contracts_global_info["SubAccounts"]["id"]
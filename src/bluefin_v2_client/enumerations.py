@@ -125,3 +125,12 @@ class ADJUST_MARGIN(Enum):
 class TRADE_TYPE(Enum):
     ISOLATED = "IsolatedTrader"
     LIQUIDATION = "IsolatedLiquidation"
+
+
+class OVERFLOW_POLICY(Enum):
+    # producer waits until the consumer frees a slot
+    BLOCK = "BLOCK"
+    # oldest pending event is dropped
+    DROP_OLDEST = "DROP_OLDEST"
+    # pending event of the same symbol is replaced by the latest one
+    COALESCE = "COALESCE"
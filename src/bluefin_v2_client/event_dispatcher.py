@@ -0,0 +1,302 @@
+"""
+Optional stage between a socket reader and the user callbacks. Events are put
+on a bounded queue per event type and delivered by a worker, so slow
+callbacks don't stall the socket. Full queues apply their OVERFLOW_POLICY.
+"""
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from .enumerations import OVERFLOW_POLICY, SOCKET_EVENTS
+
+DEFAULT_QUEUE_SIZE = 1024
+
+# snapshot events where only the latest update of a symbol is worth delivering.
+# Order book depth updates are deltas, each one is needed to keep a book (and
+# its orderbookUpdateId sequence) whole, they use the default policy.
+DEFAULT_POLICIES = {
+    SOCKET_EVENTS.MARKET_DATA_UPDATE.value: OVERFLOW_POLICY.COALESCE,
+}
+
+_logger = logging.getLogger(__name__)
+
+
+def event_symbol(data):
+    """
+    Returns the market symbol of an event payload (data.symbol or the symbol
+    of a nested object), None when it has none
+    """
+    if not isinstance(data, dict):
+        return None
+    symbol = data.get("symbol")
+    if symbol is not None:
+        return symbol
+    for nested in data.values():
+        if isinstance(nested, dict) and "symbol" in nested:
+            return nested["symbol"]
+    return None
+
+
+class EventQueue:
+    """
+    Bounded queue of the pending events of one type
+    """
+
+    def __init__(
+        self,
+        maxsize=DEFAULT_QUEUE_SIZE,
+        policy=OVERFLOW_POLICY.BLOCK,
+        key=event_symbol,
+    ):
+        """
+        Inputs:
+            - maxsize(int): pending events kept, distinct symbols for COALESCE
+            - policy(OVERFLOW_POLICY): behaviour once the queue is full
+            - key: returns the coalescing key (symbol) of an event payload
+        """
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self.items = OrderedDict() if policy == OVERFLOW_POLICY.COALESCE else deque()
+        self.dropped = 0
+        self.coalesced = 0
+        self.delivered = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def full(self) -> bool:
+        return len(self.items) >= self.maxsize
+
+    def push(self, data) -> bool:
+        """
+        Adds an event, dropping the oldest one when full.
+        Returns False when it replaced a pending event of the same symbol.
+        """
+        if self.policy == OVERFLOW_POLICY.COALESCE:
+            key = self.key(data)
+            if key is None:
+                key = object()
+            elif key in self.items:
+                # the least recently updated symbol is the one evicted when full
+                self.items[key] = data
+                self.items.move_to_end(key)
+                self.coalesced += 1
+                return False
+            if self.full():
+                self.items.popitem(last=False)
+                self.dropped += 1
+            self.items[key] = data
+            return True
+
+        if self.full():
+            self.items.popleft()
+            self.dropped += 1
+        self.items.append(data)
+        return True
+
+    def pop(self):
+        self.delivered += 1
+        if self.policy == OVERFLOW_POLICY.COALESCE:
+            return self.items.popitem(last=False)[1]
+        return self.items.popleft()
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy.value,
+            "depth": len(self.items),
+            "maxsize": self.maxsize,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+        }
+
+
+class _BaseDispatcher:
+    def __init__(
+        self,
+        maxsize=DEFAULT_QUEUE_SIZE,
+        policy=OVERFLOW_POLICY.BLOCK,
+        policies: dict = None,
+    ):
+        """
+        Inputs:
+            - maxsize(int): default queue size
+            - policy(OVERFLOW_POLICY): default overflow policy
+            - policies(dict): event name -> OVERFLOW_POLICY, added to DEFAULT_POLICIES
+        """
+        self.maxsize = maxsize
+        self.policy = policy
+        self.policies = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self.queues = {}
+        # event names in arrival order, one per queued event
+        self._ready = deque()
+        self._running = False
+
+    def configure(self, event, policy=None, maxsize=None, key=event_symbol):
+        """
+        Sets the queue used for an event, call before its first event is put
+        """
+        self.queues[event] = EventQueue(
+            maxsize or self.maxsize,
+            policy or self.policies.get(event, self.policy),
+            key,
+        )
+        return self.queues[event]
+
+    def stats(self) -> dict:
+        """
+        Returns depth, drop and coalesce counters per event
+        """
+        return {event: queue.stats() for event, queue in self.queues.items()}
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    @property
+    def dropped(self) -> int:
+        return sum(queue.dropped for queue in self.queues.values())
+
+    def _queue(self, event) -> EventQueue:
+        queue = self.queues.get(event)
+        if queue is None:
+            queue = self.configure(event)
+        return queue
+
+    def _push(self, queue: EventQueue, event, data):
+        if queue.push(data):
+            self._ready.append(event)
+
+    def _pop(self):
+        """
+        Returns the next (event, data) or None, skips events dropped since they were queued
+        """
+        while self._ready:
+            event = self._ready.popleft()
+            queue = self.queues[event]
+            if len(queue):
+                return event, queue.pop()
+        return None
+
+
+class EventDispatcher(_BaseDispatcher):
+    """
+    Delivers events to a handler on a worker thread, used by WebsocketClient
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def start(self, handler):
+        """
+        Starts the worker thread calling handler(event, data) for each event
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(handler,), daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the worker once pending events are delivered
+        Inputs:
+            - timeout(float): seconds to wait for the worker, 0 to not wait
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None and timeout != 0:
+            self._thread.join(timeout)
+
+    def put(self, event, data):
+        """
+        Queues an event, waits for a free slot when its queue is full and BLOCK
+        """
+        with self._condition:
+            queue = self._queue(event)
+            if queue.policy == OVERFLOW_POLICY.BLOCK:
+                while queue.full() and self._running:
+                    self._condition.wait()
+            self._push(queue, event, data)
+            self._condition.notify_all()
+
+    def _run(self, handler):
+        while True:
+            with self._condition:
+                item = self._pop()
+                while item is None:
+                    if not self._running:
+                        return
+                    self._condition.wait()
+                    item = self._pop()
+                # wake producers waiting for a free slot
+                self._condition.notify_all()
+            try:
+                handler(*item)
+            except Exception as e:
+                _logger.error("Error from event handler: {}".format(e))
+
+
+class AsyncEventDispatcher(_BaseDispatcher):
+    """
+    Delivers events to a coroutine handler on a task, used by Sockets and AsyncWebsocketClient
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = asyncio.Condition()
+        self._task = None
+
+    def start(self, handler):
+        """
+        Starts a task on the running loop awaiting handler(event, data) for each event
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._running = True
+        self._task = asyncio.get_running_loop().create_task(self._run(handler))
+
+    async def stop(self):
+        """
+        Stops the worker once pending events are delivered
+        """
+        if self._task is None:
+            return
+        async with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._task is not asyncio.current_task():
+            await self._task
+
+    async def put(self, event, data):
+        """
+        Queues an event, waits for a free slot when its queue is full and BLOCK
+        """
+        async with self._condition:
+            queue = self._queue(event)
+            if queue.policy == OVERFLOW_POLICY.BLOCK:
+                while queue.full() and self._running:
+                    await self._condition.wait()
+            self._push(queue, event, data)
+            self._condition.notify_all()
+
+    async def _run(self, handler):
+        while True:
+            async with self._condition:
+                item = self._pop()
+                while item is None:
+                    if not self._running:
+                        return
+                    await self._condition.wait()
+                    item = self._pop()
+                self._condition.notify_all()
+            try:
+                await handler(*item)
+            except Exception as e:
+                _logger.error("Error from event handler: {}".format(e))
@@ -0,0 +1,160 @@
+"""
+JSON codecs used by APIService, Sockets and WebsocketClient to encode and
+decode payloads. The stdlib json module is always available, orjson or
+msgspec are picked up automatically when installed.
+"""
+import json
+import re
+
+# a number token of 20 digits or more, possibly wider than the 64 bit integers
+# orjson and msgspec decode exactly (numbers inside strings can match too,
+# these are decoded by json, only slower)
+_WIDE_INTEGER = re.compile(r"[\[:,]\s*-?\d{20}")
+_WIDE_INTEGER_BYTES = re.compile(_WIDE_INTEGER.pattern.encode())
+
+
+def _has_wide_integer(data) -> bool:
+    """
+    Returns True when the JSON text may hold an integer wider than 64 bits.
+    Input:
+        data: str or bytes
+    """
+    if isinstance(data, str):
+        return _WIDE_INTEGER.search(data) is not None
+    return _WIDE_INTEGER_BYTES.search(data) is not None
+
+
+class JSONCodec:
+    """
+    Codec backed by the stdlib json module.
+    loads accepts str or bytes, dumps returns str and dumps_bytes returns bytes.
+    """
+
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj, **kwargs) -> str:
+        # socketio passes json.dumps keyword arguments (separators)
+        return json.dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec backed by orjson, decodes straight from bytes.
+    orjson decodes integers wider than 64 bits as floats, payloads that may
+    hold one (base 1e18 values) are decoded by json instead.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def loads(self, data):
+        if _has_wide_integer(data):
+            return json.loads(data)
+        return self._loads(data)
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def dumps_bytes(self, obj) -> bytes:
+        try:
+            return self._dumps(obj)
+        except TypeError:
+            # integers wider than 64 bits or non str keys
+            return json.dumps(obj).encode("utf-8")
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    Codec backed by msgspec.json, decodes straight from bytes.
+    Like orjson, payloads that may hold integers wider than 64 bits are
+    decoded by json.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encode = msgspec.json.encode
+        self._encode_error = msgspec.EncodeError
+        self._decode = msgspec.json.decode
+        self._decode_error = msgspec.DecodeError
+
+    def loads(self, data):
+        if _has_wide_integer(data):
+            return json.loads(data)
+        try:
+            return self._decode(data)
+        except self._decode_error as e:
+            # callers (socketio included) expect json.JSONDecodeError's ValueError
+            raise ValueError(str(e)) from e
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def dumps_bytes(self, obj) -> bytes:
+        try:
+            return self._encode(obj)
+        except (TypeError, OverflowError, self._encode_error):
+            return json.dumps(obj).encode("utf-8")
+
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+}
+
+# preference order for "auto"
+AUTO_CODECS = (OrjsonCodec.name, MsgspecCodec.name, JSONCodec.name)
+
+_codec = None
+
+
+def set_codec(codec="auto") -> JSONCodec:
+    """
+    Sets the codec used by all transports.
+    Inputs:
+        codec: "auto", a name from CODECS or a JSONCodec instance.
+               "auto" picks the first installed of orjson, msgspec and json.
+    Returns:
+        JSONCodec: the codec in use
+    Note: socket.io clients keep the codec that was set when they were created.
+    """
+    global _codec
+    if isinstance(codec, str):
+        if codec == "auto":
+            for name in AUTO_CODECS:
+                try:
+                    codec = CODECS[name]()
+                    break
+                except ImportError:
+                    continue
+        elif codec in CODECS:
+            codec = CODECS[codec]()
+        else:
+            raise ValueError(
+                "Unknown codec {}, expected one of {}".format(codec, list(CODECS))
+            )
+    _codec = codec
+    return _codec
+
+
+def get_codec() -> JSONCodec:
+    """
+    Returns the codec used by all transports, selects one on first use.
+    """
+    if _codec is None:
+        return set_codec()
+    return _codec
@@ -0,0 +1,152 @@
+from .enumerations import ORDER_SIDE, ORDER_TYPE, MARKET_SYMBOLS, TIME_IN_FORCE
+from .interfaces import Order, OrderSignatureResponse
+
+
+class OrderRecord:
+    """
+    Lightweight order representation used on the order signing hot path.
+    Holds the order fields in base 1e18 along with the request enums and is
+    converted to a dict only when a dict is actually required (signature
+    response or the POST body).
+    """
+
+    __slots__ = (
+        "symbol",
+        "market",
+        "side",
+        "orderType",
+        "price",
+        "quantity",
+        "leverage",
+        "maker",
+        "reduceOnly",
+        "postOnly",
+        "cancelOnRevert",
+        "orderbookOnly",
+        "expiration",
+        "salt",
+        "ioc",
+        "timeInForce",
+        "triggerPrice",
+        "orderSignature",
+        "clientId",
+    )
+
+    # allows OrderSigner to read the record the same way it reads an Order dict,
+    # object.__getattribute__ keeps the lookup in C
+    __getitem__ = object.__getattribute__
+
+    def __init__(
+        self,
+        symbol: MARKET_SYMBOLS,
+        market: str,
+        side: ORDER_SIDE,
+        orderType: ORDER_TYPE,
+        price: int,
+        quantity: int,
+        leverage: int,
+        maker: str,
+        reduceOnly: bool,
+        postOnly: bool,
+        cancelOnRevert: bool,
+        orderbookOnly: bool,
+        expiration: int,
+        salt: int,
+        ioc: bool,
+        timeInForce: TIME_IN_FORCE,
+        triggerPrice: int = None,
+        orderSignature: str = None,
+        clientId: str = None,
+    ):
+        self.symbol = symbol
+        self.market = market
+        self.side = side
+        self.orderType = orderType
+        self.price = price
+        self.quantity = quantity
+        self.leverage = leverage
+        self.maker = maker
+        self.reduceOnly = reduceOnly
+        self.postOnly = postOnly
+        self.cancelOnRevert = cancelOnRevert
+        self.orderbookOnly = orderbookOnly
+        self.expiration = expiration
+        self.salt = salt
+        self.ioc = ioc
+        self.timeInForce = timeInForce
+        self.triggerPrice = triggerPrice
+        self.orderSignature = orderSignature
+        self.clientId = clientId
+
+    @property
+    def isBuy(self) -> bool:
+        return self.side == ORDER_SIDE.BUY
+
+    def to_order(self) -> Order:
+        """
+        Returns the order fields that get signed
+        """
+        return Order(
+            market=self.market,
+            isBuy=self.isBuy,
+            price=self.price,
+            quantity=self.quantity,
+            leverage=self.leverage,
+            maker=self.maker,
+            reduceOnly=self.reduceOnly,
+            postOnly=self.postOnly,
+            cancelOnRevert=self.cancelOnRevert,
+            orderbookOnly=self.orderbookOnly,
+            expiration=self.expiration,
+            salt=self.salt,
+            ioc=self.ioc,
+        )
+
+    def to_signature_response(self) -> OrderSignatureResponse:
+        """
+        Returns the signed order in OrderSignatureResponse format
+        """
+        return OrderSignatureResponse(
+            symbol=self.symbol.value,
+            price=self.price,
+            quantity=self.quantity,
+            side=self.side,
+            leverage=self.leverage,
+            reduceOnly=self.reduceOnly,
+            postOnly=self.postOnly,
+            cancelOnRevert=self.cancelOnRevert,
+            salt=self.salt,
+            expiration=self.expiration,
+            orderSignature=self.orderSignature,
+            orderType=self.orderType,
+            maker=self.maker,
+            orderbookOnly=self.orderbookOnly,
+            timeInForce=self.timeInForce,
+            triggerPrice=self.triggerPrice,
+        )
+
+    def to_wire(self) -> dict:
+        """
+        Returns the body posted to the orders API
+        """
+        return {
+            "orderbookOnly": self.orderbookOnly,
+            "symbol": self.symbol.value,
+            "price": self.price,
+            "quantity": self.quantity,
+            "leverage": self.leverage,
+            "userAddress": self.maker,
+            "orderType": self.orderType.value,
+            "side": self.side.value,
+            "reduceOnly": self.reduceOnly,
+            "salt": self.salt,
+            "expiration": self.expiration,
+            "orderSignature": self.orderSignature,
+            "timeInForce": self.timeInForce.value,
+            "postOnly": self.postOnly,
+            "cancelOnRevert": self.cancelOnRevert,
+            "clientId": "bluefin-v2-client-python: {}".format(
+                self.clientId or "bluefin-python-client"
+            ),
+            "triggerPrice": self.triggerPrice,
+        }
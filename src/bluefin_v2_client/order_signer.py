@@ -1,6 +1,27 @@
-from sui_utils import numberToHex, hexToByteArray, Signer
+from typing import TYPE_CHECKING, List
+from sui_utils import Signer, get_signing_key, hex_address_to_bytes32
 from .interfaces import Order
 import hashlib
+import struct
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# price, quantity, leverage and salt are u128 values; each is packed as two
+# big-endian u64 halves. Followed by expiration (u64), maker and market
+# (32 byte addresses), the flags byte and the "Bluefin" suffix.
+ORDER_SERIALIZER = struct.Struct(">QQQQQQQQQ32s32sB7s")
+ORDER_HASH_SUFFIX = b"Bluefin"
+_U64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def sign_order_hashes(msg_hashes: List[bytes], private_key: bytes) -> List[str]:
+    """
+    Signs a list of order message hashes with the provided key.
+    Defined at module level so it can be shipped to process pool workers.
+    """
+    signing_key = get_signing_key(private_key)
+    return [signing_key.sign(msg_hash)[:64].hex() + "1" for msg_hash in msg_hashes]
 
 
 class OrderSigner(Signer):
@@ -33,35 +54,34 @@ class OrderSigner(Signer):
 
     def get_serialized_order(self, order: Order):
         """
-        Returns order hash.
+        Returns the serialized order bytes that are hashed for signing.
         Inputs:
             - order: the order to be signed
         Returns:
-            - str: order hash
+            - bytearray: serialized order
         """
-        flags = self.get_order_flags(order)
-        flags = hexToByteArray(numberToHex(flags, 2))
-
-        buffer = bytearray()
-        orderPriceHex = hexToByteArray(numberToHex(int(order["price"])))
-        orderQuantityHex = hexToByteArray(numberToHex(int(order["quantity"])))
-        orderLeverageHex = hexToByteArray(numberToHex(int(order["leverage"])))
-        orderSalt = hexToByteArray(numberToHex(int(order["salt"])))
-        orderExpiration = hexToByteArray(numberToHex(int(order["expiration"]), 16))
-        orderMaker = hexToByteArray(numberToHex(int(order["maker"], 16), 64))
-        orderMarket = hexToByteArray(numberToHex(int(order["market"], 16), 64))
-        bluefin = bytearray("Bluefin", encoding="utf-8")
-
-        buffer = (
-            orderPriceHex
-            + orderQuantityHex
-            + orderLeverageHex
-            + orderSalt
-            + orderExpiration
-            + orderMaker
-            + orderMarket
-            + flags
-            + bluefin
+        price = int(order["price"])
+        quantity = int(order["quantity"])
+        leverage = int(order["leverage"])
+        salt = int(order["salt"])
+
+        buffer = bytearray(ORDER_SERIALIZER.size)
+        ORDER_SERIALIZER.pack_into(
+            buffer,
+            0,
+            price >> 64,
+            price & _U64_MASK,
+            quantity >> 64,
+            quantity & _U64_MASK,
+            leverage >> 64,
+            leverage & _U64_MASK,
+            salt >> 64,
+            salt & _U64_MASK,
+            int(order["expiration"]),
+            hex_address_to_bytes32(order["maker"]),
+            hex_address_to_bytes32(order["market"]),
+            self.get_order_flags(order),
+            ORDER_HASH_SUFFIX,
         )
         return buffer
 
@@ -81,7 +101,51 @@ class OrderSigner(Signer):
         Returns:
             str: generated signature
         """
-        msg_hash = hashlib.sha256(
+        return self.sign_hash(self.get_order_message_hash(order), private_key, "")
+
+    def get_order_message_hash(self, order: Order) -> bytes:
+        """
+        Returns the digest that gets signed for an order, the sha256 of
+        the hex encoded serialized order.
+        """
+        return hashlib.sha256(
             self.get_serialized_order(order).hex().encode("utf-8")
         ).digest()
-        return self.sign_hash(msg_hash, private_key, "")
+
+    def sign_orders(
+        self,
+        orders: List[Order],
+        private_key,
+        executor: "Executor" = None,
+        workers: int = 1,
+    ) -> List[str]:
+        """
+        Signs a batch of orders. All orders are serialized and hashed in a single
+        pass, signing is then split in `workers` chunks and spread over the executor.
+
+        Args:
+            orders (List[Order]): orders to be signed
+            private_key (bytes): private key of the account to be used for signing
+            executor (Executor): optional thread/process pool used for signing
+            workers (int): number of chunks to split the batch in
+
+        Returns:
+            List[str]: generated signatures, in the same order as the input
+        """
+        msg_hashes = [self.get_order_message_hash(order) for order in orders]
+
+        if executor is None or workers <= 1 or len(msg_hashes) < 2:
+            return sign_order_hashes(msg_hashes, private_key)
+
+        chunk_size = -(-len(msg_hashes) // workers)
+        chunks = [
+            msg_hashes[i : i + chunk_size]
+            for i in range(0, len(msg_hashes), chunk_size)
+        ]
+        private_key = bytes(private_key)
+        signatures = []
+        for chunk in executor.map(
+            sign_order_hashes, chunks, [private_key] * len(chunks)
+        ):
+            signatures.extend(chunk)
+        return signatures
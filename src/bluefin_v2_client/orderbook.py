@@ -0,0 +1,334 @@
+"""
+Local L2 order book kept in sync with OrderbookDepthUpdate events.
+The book is seeded from BluefinClient.get_orderbook, depth updates are applied
+incrementally and a sequence gap triggers a resync from a fresh snapshot.
+"""
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import islice
+from sui_utils import from_fixed
+from .enumerations import MARKET_SYMBOLS, ORDER_SIDE
+
+# updates kept while a snapshot is being fetched
+DEFAULT_BUFFER_SIZE = 1000
+# snapshots fetched in a row before giving up on a resync
+RESYNC_ATTEMPTS = 3
+
+
+class BookSide:
+    """
+    Price levels of one side of the book in two parallel lists sorted from the
+    best price: keys (the price, negated for bids) and sizes.
+    Levels are found by bisection, a price is removed when its size is 0.
+    """
+
+    __slots__ = ("sign", "keys", "sizes")
+
+    def __init__(self, descending: bool):
+        self.sign = -1 if descending else 1
+        self.keys = []
+        self.sizes = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+
+    def update(self, price: float, size: float):
+        key = price * self.sign
+        keys = self.keys
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            if size:
+                self.sizes[index] = size
+            else:
+                del keys[index]
+                del self.sizes[index]
+        elif size:
+            keys.insert(index, key)
+            self.sizes.insert(index, size)
+
+    def price(self, index: int) -> float:
+        return self.keys[index] * self.sign
+
+    def level(self, index: int):
+        """
+        Returns (price, size) of the level at index, 0 being the best, None past the last level
+        """
+        if index >= len(self.keys):
+            return None
+        return self.keys[index] * self.sign, self.sizes[index]
+
+    def levels(self, count: int = None):
+        """
+        Yields (price, size) of the best levels without copying the side
+        """
+        sign = self.sign
+        for key, size in islice(zip(self.keys, self.sizes), count):
+            yield key * sign, size
+
+    def size(self, count: int) -> float:
+        """
+        Returns the size of the best `count` levels
+        """
+        return sum(islice(self.sizes, count))
+
+    def size_to_price(self, price: float) -> float:
+        """
+        Returns the size of the levels priced at or better than price
+        """
+        return sum(islice(self.sizes, bisect_right(self.keys, price * self.sign)))
+
+    def vwap(self, quantity: float):
+        """
+        Returns the average price of taking quantity from the best levels,
+        None when the side holds less than quantity
+        """
+        remaining = quantity
+        notional = 0.0
+        sign = self.sign
+        for key, size in zip(self.keys, self.sizes):
+            if size >= remaining:
+                return (notional + key * sign * remaining) / quantity
+            notional += key * sign * size
+            remaining -= size
+        return None
+
+
+class LocalOrderBook:
+    """
+    L2 order book of a market built from a get_orderbook snapshot and
+    OrderbookDepthUpdate events.
+    Prices and sizes are converted from their base 1e18 form on arrival, the
+    queries read the sorted levels in place.
+    e.g.
+        book = LocalOrderBook(MARKET_SYMBOLS.ETH, client)
+        await book.sync()
+        await client.socket.listen(SOCKET_EVENTS.ORDERBOOK_DEPTH_UPDATES.value, book.on_update)
+    """
+
+    def __init__(
+        self,
+        symbol: MARKET_SYMBOLS,
+        client=None,
+        limit=50,
+        decimals=18,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        on_resync=None,
+        logger=None,
+    ):
+        """
+        Inputs:
+            - symbol(MARKET_SYMBOLS): market of the book
+            - client(BluefinClient): used to fetch snapshots, the book has to be
+              seeded with load_snapshot when not provided
+            - limit(int): levels requested per side in snapshots
+            - decimals(int): decimals of the prices and sizes received, 0 when
+              they are already human readable
+            - buffer_size(int): updates kept while a snapshot is fetched
+            - on_resync: called with the book after each snapshot is loaded
+        """
+        if not logger:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+        self.market = MARKET_SYMBOLS(symbol)
+        self.symbol = self.market.value
+        self.client = client
+        self.limit = limit
+        self.decimals = decimals
+        self.on_resync = on_resync
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        # orderbookUpdateId of the last snapshot or update applied
+        self.sequence = None
+        self.synced = False
+        self.gaps = 0
+        self.updated_at = None
+        self._buffer = deque(maxlen=buffer_size)
+        self._resync_task = None
+
+    def _number(self, value) -> float:
+        if type(value) is float or not self.decimals:
+            return float(value)
+        return from_fixed(value, self.decimals)
+
+    def _side(self, side: ORDER_SIDE) -> BookSide:
+        return self.bids if side == ORDER_SIDE.BUY else self.asks
+
+    def _apply_levels(self, book_side: BookSide, levels):
+        number = self._number
+        for price, size in levels:
+            book_side.update(number(price), number(size))
+
+    def load_snapshot(self, snapshot: dict):
+        """
+        Replaces the book with a get_orderbook snapshot, then applies the
+        buffered updates that are newer than it
+        """
+        self.bids.clear()
+        self.asks.clear()
+        self._apply_levels(self.bids, snapshot.get("bids") or [])
+        self._apply_levels(self.asks, snapshot.get("asks") or [])
+        self.sequence = snapshot.get("orderbookUpdateId")
+        self.updated_at = snapshot.get("lastUpdatedAt")
+        self.synced = True
+
+        buffered = list(self._buffer)
+        self._buffer.clear()
+        for update in buffered:
+            if not self.synced:
+                self._buffer.append(update)
+            else:
+                self.apply(update)
+
+    async def sync(self):
+        """
+        Fetches a snapshot with the client and loads it
+        """
+        if self.client is None:
+            raise Exception("LocalOrderBook needs a client to fetch snapshots")
+        snapshot = await self.client.get_orderbook(
+            {"symbol": self.market, "limit": self.limit}
+        )
+        self.load_snapshot(snapshot)
+        self.logger.debug(
+            "Order book %s synced at update %s", self.symbol, self.sequence
+        )
+        if self.on_resync:
+            self.on_resync(self)
+
+    def apply(self, update: dict) -> bool:
+        """
+        Applies an OrderbookDepthUpdate, sizes of 0 remove their price level.
+        Updates of other markets and updates older than the book are ignored.
+        A gap in orderbookUpdateId stops applying updates until a new snapshot
+        is loaded, which is fetched automatically when the book has a client
+        and an event loop is running.
+        Returns:
+            bool: True when the update was applied to the book
+        """
+        if update.get("symbol", self.symbol) != self.symbol:
+            return False
+        if not self.synced:
+            self._buffer.append(update)
+            return False
+
+        sequence = update.get("orderbookUpdateId")
+        if sequence is not None and self.sequence is not None:
+            if sequence <= self.sequence:
+                return False
+            if sequence != self.sequence + 1:
+                self.logger.warning(
+                    "Order book {} gap: expected update {} got {}, resyncing".format(
+                        self.symbol, self.sequence + 1, sequence
+                    )
+                )
+                self.gaps += 1
+                self.synced = False
+                self._buffer.append(update)
+                self._schedule_resync()
+                return False
+
+        self._apply_levels(self.bids, update.get("bids") or [])
+        self._apply_levels(self.asks, update.get("asks") or [])
+        if sequence is not None:
+            self.sequence = sequence
+        self.updated_at = update.get("lastUpdatedAt", self.updated_at)
+        return True
+
+    async def on_update(self, data: dict):
+        """
+        Callback for SOCKET_EVENTS.ORDERBOOK_DEPTH_UPDATES
+        """
+        self.apply(data)
+
+    def _schedule_resync(self):
+        if self.client is None:
+            return
+        if self._resync_task is not None and not self._resync_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._resync_task = loop.create_task(self._resync())
+
+    async def _resync(self):
+        # buffered updates can show another gap once the snapshot is loaded
+        for _ in range(RESYNC_ATTEMPTS):
+            try:
+                await self.sync()
+            except Exception as e:
+                self.logger.error(
+                    "Failed to resync order book {}: {}".format(self.symbol, e)
+                )
+                return
+            if self.synced:
+                return
+
+    def best_bid(self):
+        """
+        Returns (price, size) of the best bid, None when there are no bids
+        """
+        return self.bids.level(0)
+
+    def best_ask(self):
+        """
+        Returns (price, size) of the best ask, None when there are no asks
+        """
+        return self.asks.level(0)
+
+    def mid(self):
+        """
+        Returns the price between the best bid and ask, None when a side is empty
+        """
+        if not self.bids or not self.asks:
+            return None
+        return (self.bids.price(0) + self.asks.price(0)) / 2
+
+    def spread(self):
+        """
+        Returns best ask - best bid, None when a side is empty
+        """
+        if not self.bids or not self.asks:
+            return None
+        return self.asks.price(0) - self.bids.price(0)
+
+    def level(self, side: ORDER_SIDE, index: int):
+        """
+        Returns (price, size) of a level, 0 being the best
+        Inputs:
+            - side(ORDER_SIDE): BUY for bids, SELL for asks
+            - index(int): level from the top of the book
+        """
+        return self._side(side).level(index)
+
+    def levels(self, side: ORDER_SIDE, count: int = None):
+        """
+        Yields (price, size) of the best `count` levels of a side, all when count is None
+        """
+        return self._side(side).levels(count)
+
+    def depth(self, side: ORDER_SIDE, count: int) -> float:
+        """
+        Returns the total size of the best `count` levels of a side
+        """
+        return self._side(side).size(count)
+
+    def cumulative_size(self, side: ORDER_SIDE, price: float) -> float:
+        """
+        Returns the total size of a side priced at or better than price
+        """
+        return self._side(side).size_to_price(price)
+
+    def vwap(self, side: ORDER_SIDE, quantity: float):
+        """
+        Returns the volume weighted average price of taking quantity from a
+        side, e.g. vwap(ORDER_SIDE.SELL, 2) is the average price of a 2 unit
+        market buy. None when the side holds less than quantity.
+        """
+        return self._side(side).vwap(quantity)
@@ -0,0 +1,33 @@
+import threading
+
+from sui_utils import MAX_BACKOFF_EXPONENT, Backoff
+
+# events emitted by the websocket clients, listen to them like server events
+RECONNECT_EVENT = "Reconnect"
+GAP_EVENT = "Gap"
+
+
+class SubscriptionRegistry:
+    """
+    Rooms currently subscribed to, replayed after a reconnect.
+    Safe to update from the caller's thread while the socket thread replays.
+    """
+
+    def __init__(self):
+        self._rooms = {}
+        self._lock = threading.Lock()
+
+    def update(self, action: str, room: dict):
+        key = tuple(sorted(room.items()))
+        with self._lock:
+            if action == "SUBSCRIBE":
+                self._rooms[key] = room
+            else:
+                self._rooms.pop(key, None)
+
+    def rooms(self) -> list:
+        with self._lock:
+            return list(self._rooms.values())
+
+    def __len__(self):
+        return len(self._rooms)
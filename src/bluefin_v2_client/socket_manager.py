@@ -1,11 +1,7 @@
 import logging
 import threading
-from websocket import (
-    ABNF,
-    create_connection,
-    WebSocketException,
-    WebSocketConnectionClosedException,
-)
+import time
+from .reconnect import Backoff
 
 
 class SocketManager(threading.Thread):
@@ -19,6 +15,10 @@ class SocketManager(threading.Thread):
         on_ping=None,
         on_pong=None,
         logger=None,
+        decode_text=True,
+        reconnect=False,
+        backoff=None,
+        on_reconnect=None,
     ):
         threading.Thread.__init__(self)
         if not logger:
@@ -31,11 +31,20 @@ class SocketManager(threading.Thread):
         self.on_ping = on_ping
         self.on_pong = on_pong
         self.on_error = on_error
+        # when False text frames are passed to on_message as utf-8 bytes
+        self.decode_text = decode_text
+        # re-establish dropped connections, on_reconnect is called with the outage details
+        self.reconnect = reconnect
+        self.backoff = backoff or Backoff()
+        self.on_reconnect = on_reconnect
+        self._closing = threading.Event()
 
     def create_ws_connection(self):
         self.logger.debug(
             "Creating connection with WebSocket Server: %s", self.stream_url
         )
+        from websocket import create_connection
+
         self.ws = create_connection(self.stream_url)
         self.logger.debug(
             "WebSocket connection has been established: %s", self.stream_url
@@ -43,7 +52,63 @@ class SocketManager(threading.Thread):
         self._callback(self.on_open)
 
     def run(self):
-        self.read_data()
+        while True:
+            try:
+                self.read_data()
+            except Exception as e:
+                if not self.reconnect or self._closing.is_set():
+                    raise e
+            if not self.reconnect or self._closing.is_set():
+                return
+            if not self._reconnect():
+                return
+
+    def _reconnect(self) -> bool:
+        """
+        Reconnects with backoff until it succeeds, the manager is closed or
+        the backoff is exhausted. Returns True once reconnected.
+        """
+        from websocket import create_connection
+
+        disconnected_at = time.time()
+        lost = time.monotonic()
+        attempt = 0
+        while not self.backoff.exhausted(attempt):
+            if self._closing.wait(self.backoff.delay(attempt)):
+                return False
+            attempt += 1
+            try:
+                self.ws = create_connection(self.stream_url)
+            except Exception as e:
+                self.logger.warning(
+                    "Reconnect attempt {} to {} failed: {}".format(
+                        attempt, self.stream_url, e
+                    )
+                )
+                continue
+
+            self.logger.info(
+                "WebSocket connection re-established after %d attempt(s): %s",
+                attempt,
+                self.stream_url,
+            )
+            self._callback(
+                self.on_reconnect,
+                {
+                    "attempts": attempt,
+                    "disconnectedAt": disconnected_at,
+                    "reconnectedAt": time.time(),
+                    "downtime": time.monotonic() - lost,
+                },
+            )
+            return True
+
+        self.logger.error(
+            "Giving up reconnecting to {} after {} attempts".format(
+                self.stream_url, attempt
+            )
+        )
+        return False
 
     def send_message(self, message):
         self.logger.debug("Sending message to WebSocket Server: %s", message)
@@ -53,6 +118,12 @@ class SocketManager(threading.Thread):
         self.ws.ping()
 
     def read_data(self):
+        from websocket import (
+            ABNF,
+            WebSocketException,
+            WebSocketConnectionClosedException,
+        )
+
         data = ""
         while True:
             try:
@@ -82,11 +153,12 @@ class SocketManager(threading.Thread):
                 self._callback(self.on_pong)
             else:
                 data = frame.data
-                if op_code == ABNF.OPCODE_TEXT:
+                if op_code == ABNF.OPCODE_TEXT and self.decode_text:
                     data = data.decode("utf-8")
                 self._callback(self.on_message, data)
 
     def close(self):
+        self._closing.set()
         if not self.ws.connected:
             self.logger.warn("Websocket already closed")
         else:
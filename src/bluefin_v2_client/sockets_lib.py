@@ -1,24 +1,47 @@
-import socketio
 from .enumerations import MARKET_SYMBOLS, SOCKET_EVENTS
-sio = socketio.AsyncClient()
+from .event_dispatcher import AsyncEventDispatcher
+from .json_codec import get_codec
 
 
 class Sockets:
-    callbacks = {}
-
-    def __init__(self, url, timeout=10, token=None) -> None:
+    def __init__(self, url, timeout=10, token=None, dispatcher: AsyncEventDispatcher = None) -> None:
+        """
+            Inputs:
+                - dispatcher(AsyncEventDispatcher): delivers events to the callbacks
+                  through bounded queues so slow callbacks don't hold up reading,
+                  by default each callback is awaited before the next event is read
+        """
         self.url = url
         self.timeout = timeout
         self.token = token
         self.api_token = ""
+        # each instance has its own connection and callbacks
+        self.callbacks = {}
+        self.dispatcher = dispatcher
+        self._sio = None
         return
 
+    @property
+    def sio(self):
+        """
+            socketio client of this instance, socketio is imported and the
+            client created on first use instead of at import time
+        """
+        if self._sio is None:
+            import socketio
+
+            self._sio = socketio.AsyncClient(json=get_codec())
+            self._sio.on("*", self.listener)
+            self._sio.on("connect", self.connect)
+            self._sio.on("disconnect", self.disconnect)
+        return self._sio
+
     async def _establish_connection(self):
         """
             Connects to the desired url
         """
         try:
-            await sio.connect(self.url, wait_timeout=self.timeout,
+            await self.sio.connect(self.url, wait_timeout=self.timeout,
                               transports=["websocket"])
             return True
         except:
@@ -44,6 +67,8 @@ class Sockets:
         """
             opens socket instance connection
         """
+        if self.dispatcher is not None:
+            self.dispatcher.start(self._deliver)
         self.connection_established = await self._establish_connection()
         if not self.connection_established:
             await self.close()
@@ -54,44 +79,50 @@ class Sockets:
         """
             closes the socket instance connection
         """
-        await sio.disconnect()
+        await self.sio.disconnect()
+        if self.dispatcher is not None:
+            await self.dispatcher.stop()
         return
 
-    @sio.on("*")
-    async def listener(event, data):
+    async def listener(self, event, data):
         """
             Listens to all events emitted by the server
         """
+        if self.dispatcher is not None:
+            await self.dispatcher.put(event, data)
+        else:
+            await self._deliver(event, data)
+        return
+
+    async def _deliver(self, event, data):
         try:
-            if event in Sockets.callbacks.keys():
-                await Sockets.callbacks[event](data)
-            elif "default" in Sockets.callbacks.keys():
-                await Sockets.callbacks["default"]({"event": event, "data": data})
+            if event in self.callbacks.keys():
+                await self.callbacks[event](data)
+            elif "default" in self.callbacks.keys():
+                await self.callbacks["default"]({"event": event, "data": data})
             else:
                 pass
         except:
             pass
         return
 
-    @sio.event
-    async def connect():
+    async def connect(self):
         print("Connected To Socket Server")
-        if 'connect' in Sockets.callbacks:
+        if 'connect' in self.callbacks:
             # Execute the callback using asyncio.run() if available
-            await Sockets.callbacks['connect']()
+            await self.callbacks['connect']()
 
-    @sio.event
-    async def disconnect():
+    async def disconnect(self):
         print('Disconnected From Socket Server')
-        if 'disconnect' in Sockets.callbacks:
+        if 'disconnect' in self.callbacks:
             # Execute the callback using asyncio.run() if available
-            await Sockets.callbacks['disconnect']()
+            await self.callbacks['disconnect']()
 
     async def listen(self, event, callback):
         """
             Assigns callbacks to desired events
         """
-        Sockets.callbacks[event] = callback
+        self.callbacks[event] = callback
         return
 
     async def subscribe_global_updates_by_symbol(self, symbol: MARKET_SYMBOLS):
@@ -101,7 +132,7 @@ class Sockets:
                 - symbol: market symbol of market user wants global updates for. (e.g. ETH-PERP)
         """
         try:
-            resp = await sio.call('SUBSCRIBE', [
+            resp = await self.sio.call('SUBSCRIBE', [
                 {
                     "e": SOCKET_EVENTS.GLOBAL_UPDATES_ROOM.value,
                     "p": symbol.value,
@@ -120,7 +151,7 @@ class Sockets:
                 - depth: depth of orderbook depth stream (optional)
         """
         try:
-            resp = await sio.call('SUBSCRIBE', [
+            resp = await self.sio.call('SUBSCRIBE', [
                 {
                     "e": SOCKET_EVENTS.ORDERBOOK_DEPTH_STREAM_ROOM.value,
                     "p": symbol.value,
@@ -141,7 +172,7 @@ class Sockets:
                 - depth: depth of orderbook depth stream (optional)
         """
         try:
-            resp = await sio.call('UNSUBSCRIBE', [
+            resp = await self.sio.call('UNSUBSCRIBE', [
                 {
                     "e": SOCKET_EVENTS.ORDERBOOK_DEPTH_STREAM_ROOM.value,
                     "p": symbol.value,
@@ -161,7 +192,7 @@ class Sockets:
                     - symbol: market symbol of market user wants to remove global updates for. (e.g. ETH-PERP)
         """
         try:
-            resp = await sio.call('UNSUBSCRIBE', [
+            resp = await self.sio.call('UNSUBSCRIBE', [
                 {
                     "e": SOCKET_EVENTS.GLOBAL_UPDATES_ROOM.value,
                     "p": symbol.value,
@@ -173,21 +204,22 @@ class Sockets:
             print(e)
             return False
 
-    async def subscribe_user_update_by_token(self, parent_account: str = None, user_token: str = None) -> bool:
+    async def subscribe_user_update_by_token(self, parent_account: str = None, user_token: str = None, api_token: str = None) -> bool:
         """
             Allows user to subscribe to their account updates.
             Inputs:
                 - parent_account(str): address of parent account. Only whitelisted 
                   sub-account can listen to its parent account position updates
                 - token(str): auth token generated when onboarding on Bluefin
+                - api_token(str): read only api token, defaults to the one set on the instance
         """
         try:
-            resp = await sio.call("SUBSCRIBE", [
+            resp = await self.sio.call("SUBSCRIBE", [
                 {
                     "e": SOCKET_EVENTS.USER_UPDATES_ROOM.value,
                     'pa': parent_account,
                     "t": self.token if user_token == None else user_token,
-                    "rt": self.api_token
+                    "rt": self.api_token if api_token == None else api_token
                 },
             ])
 
@@ -196,22 +228,189 @@ class Sockets:
             print(e)
             return False
 
-    async def unsubscribe_user_update_by_token(self, parent_account: str = None, user_token: str = None):
+    async def unsubscribe_user_update_by_token(self, parent_account: str = None, user_token: str = None, api_token: str = None):
         """
             Allows user to unsubscribe to their account updates.
             Inputs:
                 - parent_account(str): address of parent account. Only for sub-accounts
                 - token: auth token generated when onboarding on Bluefin
+                - api_token(str): read only api token, defaults to the one set on the instance
         """
         try:
-            resp = await sio.call("UNSUBSCRIBE", [
+            resp = await self.sio.call("UNSUBSCRIBE", [
                 {
                     "e": SOCKET_EVENTS.USER_UPDATES_ROOM.value,
                     'pa': parent_account,
                     "t": self.token if user_token == None else user_token,
-                    "rt": self.api_token
+                    "rt": self.api_token if api_token == None else api_token
                 },
             ])
             return resp["success"]
         except:
             return False
+
+
+# keys holding the account address in user update payloads, checked on the
+# payload and on its nested objects (e.g. order.userAddress, accountData.address)
+ACCOUNT_ADDRESS_KEYS = ("userAddress", "address", "account")
+
+
+def account_address(data):
+    """
+        Returns the lower case account address of a user update payload,
+        None when it can't be found
+    """
+    if not isinstance(data, dict):
+        return None
+    for key in ACCOUNT_ADDRESS_KEYS:
+        value = data.get(key)
+        if isinstance(value, str):
+            return value.lower()
+    for nested in data.values():
+        if isinstance(nested, dict):
+            for key in ACCOUNT_ADDRESS_KEYS:
+                value = nested.get(key)
+                if isinstance(value, str):
+                    return value.lower()
+    return None
+
+
+class SocketsPool:
+    """
+        Hosts the user update subscriptions of many accounts on a small set of
+        Sockets connections. Connections are opened on demand and carry up to
+        `accounts_per_connection` accounts each. Events are routed to the
+        callbacks of the account whose address they carry (see account_address).
+    """
+
+    def __init__(self, url, max_connections=4, accounts_per_connection=100, timeout=10, address_resolver=account_address) -> None:
+        """
+            Inputs:
+                - url(str): socket server url
+                - max_connections(int): maximum number of connections opened
+                - accounts_per_connection(int): accounts subscribed on each connection
+                - timeout(int): connection timeout in seconds
+                - address_resolver: returns the account address of an event payload
+        """
+        self.url = url
+        self.max_connections = max_connections
+        self.accounts_per_connection = accounts_per_connection
+        self.timeout = timeout
+        self.address_resolver = address_resolver
+        # pool wide callbacks, used for events no account callback handles
+        self.callbacks = {}
+        # address -> subscription details and callbacks of the account
+        self.accounts = {}
+        # connection -> addresses subscribed on it
+        self.connections = {}
+
+    async def listen(self, event, callback, address: str = None):
+        """
+            Assigns callbacks to desired events, for one account or for the whole pool
+            Inputs:
+                - event(str): event name, "default" receives unhandled events
+                - callback: coroutine function called with the event data
+                - address(str): account the callback is for, None for all accounts,
+                  added to the pool with add_account
+        """
+        if address is None:
+            self.callbacks[event] = callback
+            return
+        account = self.accounts.get(address.lower())
+        if account is None:
+            raise ValueError("Account {} is not in the sockets pool, add it with add_account first".format(address))
+        account["callbacks"][event] = callback
+
+    async def add_account(self, address: str, user_token: str, parent_account: str = None, api_token: str = "") -> bool:
+        """
+            Subscribes to the user updates of an account on the least loaded connection
+            Inputs:
+                - address(str): account address, used to route its events
+                - user_token(str): auth token of the account
+                - parent_account(str): address of parent account, only for sub-accounts
+                - api_token(str): read only api token of the account
+            Returns:
+                - bool: True if the subscription succeeded
+        """
+        address = address.lower()
+        if address in self.accounts:
+            return True
+
+        connection = await self._available_connection()
+        subscribed = await connection.subscribe_user_update_by_token(parent_account, user_token, api_token)
+        if subscribed:
+            self.accounts[address] = {
+                "connection": connection,
+                "user_token": user_token,
+                "parent_account": parent_account,
+                "api_token": api_token,
+                "callbacks": {},
+            }
+            self.connections[connection].add(address)
+        return subscribed
+
+    async def remove_account(self, address: str) -> bool:
+        """
+            Unsubscribes from the user updates of an account and frees its slot
+        """
+        account = self.accounts.pop(address.lower(), None)
+        if account is None:
+            return False
+        connection = account["connection"]
+        self.connections[connection].discard(address.lower())
+        return await connection.unsubscribe_user_update_by_token(account["parent_account"], account["user_token"], account["api_token"])
+
+    async def close(self):
+        """
+            Closes every connection of the pool
+        """
+        for connection in self.connections:
+            await connection.close()
+        self.connections = {}
+        self.accounts = {}
+
+    async def _available_connection(self) -> Sockets:
+        """
+            Returns the least loaded connection with a free slot, opening a new
+            connection when all are full
+        """
+        if self.connections:
+            connection = min(self.connections, key=lambda conn: len(self.connections[conn]))
+            if len(self.connections[connection]) < self.accounts_per_connection:
+                return connection
+        if len(self.connections) >= self.max_connections:
+            raise Exception("Sockets pool is full: {} connections with {} accounts each".format(self.max_connections, self.accounts_per_connection))
+
+        connection = Sockets(self.url, self.timeout)
+
+        async def route(payload):
+            await self._dispatch(payload["event"], payload["data"])
+
+        async def resubscribe():
+            # socketio reconnects on its own but the server forgets the rooms
+            for address in list(self.connections.get(connection, ())):
+                account = self.accounts[address]
+                await connection.subscribe_user_update_by_token(account["parent_account"], account["user_token"], account["api_token"])
+
+        connection.callbacks["default"] = route
+        connection.callbacks["connect"] = resubscribe
+        self.connections[connection] = set()
+        try:
+            await connection.open()
+        except Exception:
+            del self.connections[connection]
+            raise
+        return connection
+
+    async def _dispatch(self, event, data):
+        """
+            Delivers an event to the callbacks of its account, falling back to the pool callbacks
+        """
+        account = self.accounts.get(self.address_resolver(data))
+        chain = (account["callbacks"], self.callbacks) if account else (self.callbacks,)
+        for callbacks in chain:
+            if event in callbacks:
+                return await callbacks[event](data)
+        for callbacks in chain:
+            if "default" in callbacks:
+                return await callbacks["default"]({"event": event, "data": data})
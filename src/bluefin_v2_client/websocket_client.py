@@ -1,9 +1,28 @@
-import json
 import logging
+import time
+from .event_dispatcher import EventDispatcher
+from .json_codec import get_codec
+from .reconnect import GAP_EVENT, RECONNECT_EVENT, Backoff, SubscriptionRegistry
 from .socket_manager import SocketManager
 from .enumerations import MARKET_SYMBOLS, SOCKET_EVENTS
 
 
+def global_updates_room(symbol: MARKET_SYMBOLS) -> dict:
+    return {"e": SOCKET_EVENTS.GLOBAL_UPDATES_ROOM.value, "p": symbol.value}
+
+
+def orderbook_depth_room(symbol: MARKET_SYMBOLS, depth="") -> dict:
+    return {
+        "e": SOCKET_EVENTS.ORDERBOOK_DEPTH_STREAM_ROOM.value,
+        "p": symbol.value,
+        "d": depth,
+    }
+
+
+def user_updates_room(token: str, api_token: str) -> dict:
+    return {"e": SOCKET_EVENTS.USER_UPDATES_ROOM.value, "t": token, "rt": api_token}
+
+
 class WebsocketClient:
     def __init__(
         self,
@@ -11,7 +30,14 @@ class WebsocketClient:
         token=None,
         api_token=None,
         logger=None,
+        dispatcher: EventDispatcher = None,
     ):
+        """
+        Inputs:
+            - dispatcher(EventDispatcher): delivers events to the callbacks on its
+              own thread through bounded queues, by default callbacks run on the
+              socket thread
+        """
         if not logger:
             logger = logging.getLogger(__name__)
         self.logger = logger
@@ -19,6 +45,11 @@ class WebsocketClient:
         self.api_token = api_token
         self.stream_url = stream_url
         self.callbacks = {}
+        self.dispatcher = dispatcher
+        # rooms re-subscribed after a reconnect
+        self.subscriptions = SubscriptionRegistry()
+        # outage details kept until the first message after a reconnect
+        self._gap = None
 
     def initialize_socket(
         self,
@@ -28,7 +59,18 @@ class WebsocketClient:
         on_ping=None,
         on_pong=None,
         logger=None,
+        reconnect=True,
+        backoff: Backoff = None,
     ):
+        """
+        Connects to the websocket server and starts reading on a thread.
+        Inputs:
+            - reconnect(bool): re-establish dropped connections and re-subscribe
+              to the active rooms. Emits RECONNECT_EVENT once reconnected and
+              GAP_EVENT with the outage to first message time on the first
+              message after it.
+            - backoff(Backoff): delays between reconnect attempts
+        """
         self.socket_manager = SocketManager(
             self.stream_url,
             on_message=self.listener,
@@ -38,8 +80,15 @@ class WebsocketClient:
             on_ping=on_ping,
             on_pong=on_pong,
             logger=logger,
+            decode_text=False,
+            reconnect=reconnect,
+            backoff=backoff,
+            on_reconnect=self._on_reconnect,
         )
 
+        if self.dispatcher is not None:
+            self.dispatcher.start(self._deliver)
+
         # start the thread
         self.socket_manager.create_ws_connection()
         self.logger.debug("WebSocket Client started.")
@@ -68,8 +117,8 @@ class WebsocketClient:
         self.callbacks[event] = callback
         return
 
-    def send(self, message: dict):
-        self.socket_manager.send_message(json.dumps(message))
+    def send(self, message):
+        self.socket_manager.send_message(get_codec().dumps(message))
 
     def subscribe_global_updates_by_symbol(self, symbol: MARKET_SYMBOLS):
         """
@@ -83,19 +132,7 @@ class WebsocketClient:
                     "Socket connection is established, invoke socket.open()"
                 )
 
-            self.socket_manager.send_message(
-                json.dumps(
-                    [
-                        "SUBSCRIBE",
-                        [
-                            {
-                                "e": SOCKET_EVENTS.GLOBAL_UPDATES_ROOM.value,
-                                "p": symbol.value,
-                            },
-                        ],
-                    ]
-                )
-            )
+            self._send_subscription("SUBSCRIBE", global_updates_room(symbol))
             return True
         except Exception:
             return False
@@ -110,25 +147,11 @@ class WebsocketClient:
             if not self.socket_manager.ws.connected:
                 return False
 
-            self.socket_manager.send_message(
-                json.dumps(
-                    (
-                        [
-                            "UNSUBSCRIBE",
-                            [
-                                {
-                                    "e": SOCKET_EVENTS.GLOBAL_UPDATES_ROOM.value,
-                                    "p": symbol.value,
-                                },
-                            ],
-                        ]
-                    )
-                )
-            )
+            self._send_subscription("UNSUBSCRIBE", global_updates_room(symbol))
             return True
         except:
             return False
-    
+
     async def subscribe_orderbook_depth_streams_by_symbol(self, symbol: MARKET_SYMBOLS, depth=""):
         """
             Allows user to subscribe to orderbook depth stream for the desired symbol.
@@ -137,39 +160,24 @@ class WebsocketClient:
                 - depth: depth of orderbook depth stream (optional)
         """
         try:
-            self.socket_manager.send_message(json.dumps((['SUBSCRIBE', [
-                {
-                    "e": SOCKET_EVENTS.ORDERBOOK_DEPTH_STREAM_ROOM.value,
-                    "p": symbol.value,
-                    "d": depth
-                    
-                },
-            ]])))
+            self._send_subscription("SUBSCRIBE", orderbook_depth_room(symbol, depth))
             return True
         except:
             return False
 
-    async def subscribe_orderbook_depth_streams_by_symbol(self, symbol: MARKET_SYMBOLS, depth=""):
+    async def unsubscribe_orderbook_depth_streams_by_symbol(self, symbol: MARKET_SYMBOLS, depth=""):
         """
-            Allows user to subscribe to orderbook depth stream for the desired symbol.
+            Allows user to unsubscribe to orderbook depth stream for the desired symbol.
             Inputs:
                 - symbol: market symbol of market user wants orderbook depth stream for. (e.g. ETH-PERP)
                 - depth: depth of orderbook depth stream (optional)
         """
         try:
-            self.socket_manager.send_message(json.dumps((['UNSUBSCRIBE', [
-                {
-                    "e": SOCKET_EVENTS.ORDERBOOK_DEPTH_STREAM_ROOM.value,
-                    "p": symbol.value,
-                    "d": depth
-                    
-                },
-            ]])))
+            self._send_subscription("UNSUBSCRIBE", orderbook_depth_room(symbol, depth))
             return True
         except:
             return False
 
-
     def subscribe_user_update_by_token(self, user_token: str = None):
         """
         Allows user to subscribe to their account updates.
@@ -180,24 +188,8 @@ class WebsocketClient:
             if not self.socket_manager.ws.connected:
                 return False
 
-            self.socket_manager.send_message(
-                json.dumps(
-                    (
-                        [
-                            "SUBSCRIBE",
-                            [
-                                {
-                                    "e": SOCKET_EVENTS.USER_UPDATES_ROOM.value,
-                                    "t": self.token
-                                    if user_token == None
-                                    else user_token,
-                                    "rt": self.api_token,
-                                },
-                            ],
-                        ]
-                    )
-                )
-            )
+            token = self.token if user_token == None else user_token
+            self._send_subscription("SUBSCRIBE", user_updates_room(token, self.api_token))
             return True
         except:
             return False
@@ -212,50 +204,84 @@ class WebsocketClient:
             if not self.socket_manager.ws.connected:
                 return False
 
-            self.socket_manager.send_message(
-                json.dumps(
-                    (
-                        [
-                            "UNSUBSCRIBE",
-                            [
-                                {
-                                    "e": SOCKET_EVENTS.USER_UPDATES_ROOM.value,
-                                    "t": self.token
-                                    if user_token == None
-                                    else user_token,
-                                    "rt": self.api_token,
-                                },
-                            ],
-                        ]
-                    )
-                )
-            )
+            token = self.token if user_token == None else user_token
+            self._send_subscription("UNSUBSCRIBE", user_updates_room(token, self.api_token))
             return True
         except:
             return False
 
+    def _send_subscription(self, action, room):
+        self.send([action, [room]])
+        self.subscriptions.update(action, room)
+
+    def _on_reconnect(self, _, outage: dict):
+        """
+        Re-subscribes to the active rooms and emits RECONNECT_EVENT
+        """
+        rooms = self.subscriptions.rooms()
+        for room in rooms:
+            self.send(["SUBSCRIBE", [room]])
+        outage["subscriptions"] = rooms
+        self._gap = (outage, time.monotonic())
+        self._emit(RECONNECT_EVENT, outage)
+
+    def _emit_gap(self):
+        outage, reconnected = self._gap
+        self._gap = None
+        self._emit(
+            GAP_EVENT,
+            {
+                "disconnectedAt": outage["disconnectedAt"],
+                "reconnectedAt": outage["reconnectedAt"],
+                "firstMessageAt": time.time(),
+                "outageToFirstMessage": outage["downtime"]
+                + time.monotonic()
+                - reconnected,
+            },
+        )
+
+    def _emit(self, event, data):
+        """
+        Delivers client side events to their listener, the default listener is not used
+        """
+        if event in self.callbacks:
+            self.callbacks[event](data)
+
     def ping(self):
         self.logger.debug("Sending ping to WebSocket Server")
         self.socket_manager.ping()
 
     def stop(self, id=None):
         self.socket_manager.close()
+        if self.dispatcher is not None:
+            self.dispatcher.stop(timeout=0)
         # self.socket_manager.join()
 
     def listener(self, _, message):
         """
         Listens to all events emitted by the server
         """
-        data = json.loads(message)
-        event_name = data["eventName"]
+        if self._gap is not None:
+            try:
+                self._emit_gap()
+            except:
+                pass
+        # text frames arrive as bytes and are decoded by the codec directly
+        data = get_codec().loads(message)
+        if self.dispatcher is not None:
+            self.dispatcher.put(data["eventName"], data["data"])
+        else:
+            self._deliver(data["eventName"], data["data"])
+        return
+
+    def _deliver(self, event_name, data):
         try:
             if event_name in self.callbacks:
                 callback = self.callbacks[event_name]
-                callback(data["data"])
+                callback(data)
             elif "default" in self.callbacks.keys():
-                self.callbacks["default"]({"event": event_name, "data": data["data"]})
+                self.callbacks["default"]({"event": event_name, "data": data})
             else:
                 pass
         except:
             pass
-        return
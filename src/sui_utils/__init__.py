@@ -1,8 +1,13 @@
 from .account import *
 from .utilities import *
+from .fixed_point import *
+from .retry import *
 from .rpc import *
 from .signer import *
 from .bcs import *
+from .object_cache import *
+from .transaction_builder import *
 from .enumerations import *
+from .coin_selection import *
 from .coin_utils import *
 from .sui_interfaces import *
\ No newline at end of file
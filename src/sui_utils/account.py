@@ -1,11 +1,30 @@
 from .enumerations import WALLET_SCHEME
 from .utilities import *
 import base64
+from functools import lru_cache
+from nacl.signing import SigningKey
 from .bcs import *
 
+# max number of distinct private keys whose expanded signing keys are kept
+SIGNING_KEY_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=SIGNING_KEY_CACHE_SIZE)
+def _signing_key(private_key: bytes) -> SigningKey:
+    return SigningKey(private_key)
+
+
+def get_signing_key(private_key: bytes) -> SigningKey:
+    """
+    Returns a reusable ed25519 signing key for the given private key bytes.
+    Keys are expanded once and shared by every signer in the process.
+    """
+    return _signing_key(bytes(private_key))
+
 
 class SuiWallet:
     def __init__(self, seed="", privateKey="",scheme:WALLET_SCHEME = WALLET_SCHEME.ED25519):
+        self.signingKey = None
         if seed == "" and privateKey == "":
             return "Error"
         if seed != "":
@@ -46,6 +65,11 @@ class SuiWallet:
              return self.privateKey.ToHex()
 
 
+    def getSigningKey(self) -> SigningKey:
+        if self.signingKey is None:
+            self.signingKey = get_signing_key(self.privateKeyBytes)
+        return self.signingKey
+
     def getUserAddress(self):
         return self.address
     
@@ -1,4 +1,6 @@
+import operator
 import struct
+from functools import lru_cache
 from .utilities import *
 
 
@@ -40,9 +42,7 @@ class BCSSerializer:
     def serialize_str(self, value: str):
         if not isinstance(value, str):
             raise TypeError("Expected a string.")
-        encoded = value.encode("utf-8")
-        self.serialize_u8(len(encoded))  # Use u8 (1 byte) for the length
-        self.buffer.extend(encoded)
+        self.serialize_uleb128_bytes(value.encode("utf-8"))
 
     def serialize_list(self, values: list, element_serializer):
         self.serialize_u32(len(values))  # Length prefix
@@ -79,22 +79,50 @@ class BCSSerializer:
 
     def serialize_uint8_array(self, array: list):
         """
-        Serializes an array of uint8 values with a compact length prefix (u8).
+        Serializes an array of uint8 values with a ULEB128 length prefix.
 
         Args:
-            array (list): List of integers (0-255) representing uint8 values.
+            array (list): List of integers (0-255) representing uint8 values, or bytes.
         """
-        if not isinstance(array, list):
+        if not isinstance(array, (list, bytes, bytearray)):
             raise TypeError("Expected a list of uint8 values.")
-        if any(not (0 <= value < 256) for value in array):
+        try:
+            # range checked by bytes() in one pass
+            data = bytes(array)
+        except ValueError:
             raise ValueError(
                 "All elements in the array must be in the range 0-255.")
-        if len(array) > 255:
-            raise ValueError(
-                "Array length exceeds maximum allowed for u8 (255).")
+        self.serialize_uleb128_bytes(data)
+
+    def serialize_uleb128(self, value: int):
+        """
+        Serializes an unsigned integer as ULEB128, the length prefix of BCS sequences.
+        """
+        if value < 0:
+            raise ValueError("Value out of range for ULEB128.")
+        while value > 0x7F:
+            self.buffer.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buffer.append(value)
+
+    def serialize_raw_bytes(self, data: bytes):
+        """
+        Appends fixed size data (addresses, object ids) without a length prefix.
+        """
+        self.buffer.extend(data)
 
-        self.buffer.extend(decimal_to_bcs(len(array)))  # Serialize length as a single byte (u8)
-        self.buffer.extend(array)     # Append raw uint8 values
+    def serialize_uleb128_bytes(self, data: bytes):
+        """
+        Serializes a BCS vector<u8>: ULEB128 length followed by the bytes.
+        """
+        self.serialize_uleb128(len(data))
+        self.buffer.extend(data)
+
+    def serialize_uleb128_str(self, value: str):
+        """
+        Serializes a BCS string (Move identifiers, 0x1::string::String).
+        """
+        self.serialize_uleb128_bytes(value.encode("utf-8"))
 
     def _serialize_integer(self, value: int, byte_size: int, format_char: str):
         if not (0 <= value < 2**(byte_size * 8)):
@@ -133,3 +161,447 @@ def hex_to_byte_array(hex_address: str) -> bytearray:
     except ValueError as e:
         raise ValueError(f"Invalid hex string: {e}")
     
+
+
+# Schema driven codec: a layout is declared once with the types below and compiled
+# into an encoder and a decoder. Consecutive fixed size fields of a struct are packed
+# and unpacked by a single struct.Struct, decoding reads a memoryview of the data
+# without copying it.
+
+# longest sequence BCS allows, lengths are ULEB128 encoded u32
+MAX_SEQUENCE_LENGTH = 2**32 - 1
+
+_ULEB128_BYTES = [bytes((value,)) for value in range(0x80)]
+
+
+def uleb128_encode(value: int) -> bytes:
+    """
+    Returns the ULEB128 bytes of an unsigned integer, the length prefix of BCS sequences
+    """
+    if 0 <= value < 0x80:
+        return _ULEB128_BYTES[value]
+    if value < 0:
+        raise ValueError("Value out of range for ULEB128.")
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def uleb128_decode(view, offset: int = 0) -> tuple:
+    """
+    Reads a ULEB128 length at offset, returns it with the offset after it
+    """
+    value = shift = 0
+    end = len(view)
+    while offset < end:
+        byte = view[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            if byte == 0 and shift:
+                raise ValueError("Non canonical ULEB128 length.")
+            if value > MAX_SEQUENCE_LENGTH:
+                raise ValueError("ULEB128 length exceeds u32.")
+            return value, offset
+        shift += 7
+    raise ValueError("BCS data ends inside a ULEB128 length.")
+
+
+def _check_end(view, end: int):
+    if end > len(view):
+        raise ValueError(f"BCS data ends {end - len(view)} bytes early.")
+
+
+class BCSType:
+    """
+    A BCS layout compiled into an encoder and a decoder. Values are ints, bools,
+    str (addresses as hex, digests as base58), bytes, lists, None for an empty
+    option, dicts of struct fields and (variant, value) tuples of enums.
+    """
+
+    name = "bcs"
+
+    def encode(self, value) -> bytes:
+        """
+        Returns the BCS bytes of the value
+        """
+        buffer = bytearray()
+        try:
+            self.write(buffer, value)
+        except (struct.error, OverflowError) as e:
+            raise ValueError(f"Value out of range for {self.name}: {e}")
+        return bytes(buffer)
+
+    def decode(self, data):
+        """
+        Returns the value of BCS bytes (bytes, bytearray or memoryview), all of them
+        """
+        view = memoryview(data)
+        value, offset = self.decode_from(view)
+        if offset != len(view):
+            raise ValueError(f"{len(view) - offset} bytes left after {self.name}.")
+        return value
+
+    def decode_from(self, data, offset: int = 0) -> tuple:
+        """
+        Reads a value at offset of the data, returns it with the offset after it
+        """
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        try:
+            return self.read(view, offset)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"BCS data ends inside {self.name}: {e}")
+
+    def write(self, buffer: bytearray, value):
+        raise NotImplementedError
+
+    def read(self, view: memoryview, offset: int) -> tuple:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return self.name
+
+
+class BCSFixed(BCSType):
+    """
+    A fixed size type read and written with a struct format, to_wire and from_wire
+    convert values that are not what the format packs
+    """
+
+    def __init__(self, name: str, format: str, to_wire=None, from_wire=None):
+        self.name = name
+        self.format = format
+        self.to_wire = to_wire
+        self.from_wire = from_wire
+        self.struct = struct.Struct("<" + format)
+        self.size = self.struct.size
+
+    def write(self, buffer, value):
+        buffer += self.struct.pack(value if self.to_wire is None else self.to_wire(value))
+
+    def read(self, view, offset):
+        (value,) = self.struct.unpack_from(view, offset)
+        return (value if self.from_wire is None else self.from_wire(value)), offset + self.size
+
+
+def _bool_to_wire(value):
+    if not isinstance(value, bool):
+        raise TypeError("Expected a boolean value.")
+    return value
+
+
+def _bool_from_wire(value):
+    if value > 1:
+        raise ValueError(f"Invalid BCS boolean {value}.")
+    return value == 1
+
+
+def _address_to_wire(value):
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) != 32:
+            raise ValueError("Address must be 32 bytes in length.")
+        return value
+    return hex_address_to_bytes32(value)
+
+
+def _address_from_wire(value):
+    return "0x" + value.hex()
+
+
+@lru_cache(maxsize=ADDRESS_BYTES_CACHE_SIZE)
+def _digest_to_wire(value):
+    digest = base58_decode(value)
+    if len(digest) != 32:
+        raise ValueError("Digest must be 32 bytes in length.")
+    # a vector<u8> of 32 bytes
+    return b"\x20" + digest
+
+
+def _digest_from_wire(value):
+    if value[0] != 32:
+        raise ValueError(f"Digest must be 32 bytes in length, not {value[0]}.")
+    return base58_encode(value[1:])
+
+
+def _unsigned(bits: int):
+    size = bits // 8
+    return BCSFixed(
+        f"u{bits}",
+        f"{size}s",
+        lambda value: value.to_bytes(size, "little"),
+        lambda value: int.from_bytes(value, "little"),
+    )
+
+
+def bcs_fixed_bytes(size: int) -> BCSFixed:
+    """
+    Returns the type of a byte array of a fixed size, without a length prefix
+    """
+
+    def to_wire(value):
+        if len(value) != size:
+            raise ValueError(f"Expected {size} bytes, got {len(value)}.")
+        return value
+
+    return BCSFixed(f"bytes{size}", f"{size}s", to_wire)
+
+
+BCS_BOOL = BCSFixed("bool", "B", _bool_to_wire, _bool_from_wire)
+BCS_U8 = BCSFixed("u8", "B")
+BCS_U16 = BCSFixed("u16", "H")
+BCS_U32 = BCSFixed("u32", "I")
+BCS_U64 = BCSFixed("u64", "Q")
+BCS_U128 = _unsigned(128)
+BCS_U256 = _unsigned(256)
+# 0x hex, read back in the 64 characters form
+BCS_ADDRESS = BCSFixed("address", "32s", _address_to_wire, _address_from_wire)
+# base58 object and transaction digests, serialized as a vector<u8> of 32 bytes
+BCS_DIGEST = BCSFixed("digest", "33s", _digest_to_wire, _digest_from_wire)
+
+
+class _BCSBytes(BCSType):
+    name = "vector<u8>"
+
+    def write(self, buffer, value):
+        buffer += uleb128_encode(len(value))
+        buffer += value
+
+    def read(self, view, offset):
+        length, offset = uleb128_decode(view, offset)
+        end = offset + length
+        _check_end(view, end)
+        return view[offset:end].tobytes(), end
+
+
+class _BCSString(BCSType):
+    name = "string"
+
+    def write(self, buffer, value):
+        encoded = value.encode("utf-8")
+        buffer += uleb128_encode(len(encoded))
+        buffer += encoded
+
+    def read(self, view, offset):
+        length, offset = uleb128_decode(view, offset)
+        end = offset + length
+        _check_end(view, end)
+        return str(view[offset:end], "utf-8"), end
+
+
+BCS_BYTES = _BCSBytes()
+BCS_STRING = _BCSString()
+
+
+class BCSVector(BCSType):
+    """
+    vector<T>: a ULEB128 length and the elements
+    """
+
+    def __init__(self, element: BCSType):
+        self.element = element
+        self.name = f"vector<{element.name}>"
+
+    def write(self, buffer, value):
+        buffer += uleb128_encode(len(value))
+        write = self.element.write
+        for item in value:
+            write(buffer, item)
+
+    def read(self, view, offset):
+        length, offset = uleb128_decode(view, offset)
+        element = self.element
+        if isinstance(element, BCSFixed):
+            # all the elements by one iter_unpack
+            end = offset + length * element.size
+            _check_end(view, end)
+            values = [value for (value,) in element.struct.iter_unpack(view[offset:end])]
+            if element.from_wire is not None:
+                values = [element.from_wire(value) for value in values]
+            return values, end
+        values = []
+        read = element.read
+        for _ in range(length):
+            value, offset = read(view, offset)
+            values.append(value)
+        return values, offset
+
+
+class BCSOption(BCSType):
+    """
+    Option<T>: None or a value
+    """
+
+    def __init__(self, element: BCSType):
+        self.element = element
+        self.name = f"option<{element.name}>"
+
+    def write(self, buffer, value):
+        if value is None:
+            buffer.append(0)
+        else:
+            buffer.append(1)
+            self.element.write(buffer, value)
+
+    def read(self, view, offset):
+        tag = view[offset]
+        if tag == 0:
+            return None, offset + 1
+        if tag != 1:
+            raise ValueError(f"Invalid BCS option tag {tag}.")
+        return self.element.read(view, offset + 1)
+
+
+class BCSStruct(BCSType):
+    """
+    A struct of (name, type) fields in order. Values are written from a dict of the
+    fields or a tuple of them in order, and read as a dict.
+    """
+
+    def __init__(self, name: str, fields: list = None):
+        self.name = name
+        if fields is not None:
+            self.define(fields)
+
+    def define(self, fields: list):
+        """
+        Compiles the fields, separate from the constructor for layouts that refer to themselves
+        """
+        self.fields = list(fields)
+        names = tuple(name for name, _ in self.fields)
+        self._getter = operator.itemgetter(*names) if len(names) > 1 else (lambda value: (value[names[0]],))
+        self._writers = []
+        self._readers = []
+        run = []
+        for index, (name, field_type) in enumerate(self.fields):
+            if isinstance(field_type, BCSFixed):
+                run.append(index)
+                continue
+            self._compile_run(run)
+            run = []
+            self._writers.append(_field_writer(index, field_type))
+            self._readers.append(_field_reader(name, field_type))
+        self._compile_run(run)
+
+    def _compile_run(self, run: list):
+        # consecutive fixed size fields, a single struct.Struct
+        if not run:
+            return
+        types = [self.fields[index][1] for index in run]
+        packer = struct.Struct("<" + "".join(field_type.format for field_type in types))
+        to_wire = [(i, field_type.to_wire) for i, field_type in enumerate(types) if field_type.to_wire is not None]
+        from_wire = [(i, field_type.from_wire) for i, field_type in enumerate(types) if field_type.from_wire is not None]
+        names = [self.fields[index][0] for index in run]
+        self._writers.append(_run_writer(run[0], run[-1] + 1, packer, to_wire))
+        self._readers.append(_run_reader(names, packer, from_wire))
+
+    def write(self, buffer, value):
+        fields = value if isinstance(value, (tuple, list)) else self._getter(value)
+        if len(fields) != len(self.fields):
+            raise ValueError(f"{self.name} has {len(self.fields)} fields, got {len(fields)}.")
+        for write in self._writers:
+            write(buffer, fields)
+
+    def read(self, view, offset):
+        value = {}
+        for read in self._readers:
+            offset = read(view, offset, value)
+        return value, offset
+
+
+def _run_writer(start: int, stop: int, packer: struct.Struct, converters: list):
+    pack = packer.pack
+    if not converters:
+
+        def write(buffer, fields):
+            buffer += pack(*fields[start:stop])
+
+    else:
+
+        def write(buffer, fields):
+            values = list(fields[start:stop])
+            for index, convert in converters:
+                values[index] = convert(values[index])
+            buffer += pack(*values)
+
+    return write
+
+
+def _run_reader(names: list, packer: struct.Struct, converters: list):
+    unpack_from = packer.unpack_from
+    size = packer.size
+
+    def read(view, offset, value):
+        values = unpack_from(view, offset)
+        if converters:
+            values = list(values)
+            for index, convert in converters:
+                values[index] = convert(values[index])
+        value.update(zip(names, values))
+        return offset + size
+
+    return read
+
+
+def _field_writer(index: int, field_type: BCSType):
+    write_field = field_type.write
+
+    def write(buffer, fields):
+        write_field(buffer, fields[index])
+
+    return write
+
+
+def _field_reader(name: str, field_type: BCSType):
+    read_field = field_type.read
+
+    def read(view, offset, value):
+        value[name], offset = read_field(view, offset)
+        return offset
+
+    return read
+
+
+class BCSEnum(BCSType):
+    """
+    An enum of (name, type) variants in order, the type is None for variants without
+    a value. Values are (variant name, value) tuples, a variant without a value can be
+    written as its name alone and is read as (name, None).
+    """
+
+    def __init__(self, name: str, variants: list = None):
+        self.name = name
+        if variants is not None:
+            self.define(variants)
+
+    def define(self, variants: list):
+        """
+        Compiles the variants, separate from the constructor for layouts that refer to themselves
+        """
+        self.variants = list(variants)
+        self._variants = {
+            name: (uleb128_encode(index), variant_type) for index, (name, variant_type) in enumerate(self.variants)
+        }
+
+    def write(self, buffer, value):
+        if isinstance(value, str):
+            value = (value, None)
+        name, variant_value = value
+        if name not in self._variants:
+            raise ValueError(f"Unknown variant {name} of {self.name}.")
+        tag, variant_type = self._variants[name]
+        buffer += tag
+        if variant_type is not None:
+            variant_type.write(buffer, variant_value)
+
+    def read(self, view, offset):
+        index, offset = uleb128_decode(view, offset)
+        if index >= len(self.variants):
+            raise ValueError(f"Unknown variant {index} of {self.name}.")
+        name, variant_type = self.variants[index]
+        if variant_type is None:
+            return (name, None), offset
+        variant_value, offset = variant_type.read(view, offset)
+        return (name, variant_value), offset
@@ -0,0 +1,127 @@
+"""
+Selects the coins to use for an amount with as few merge and split transactions
+as possible. With coins merged by a single transaction, the cost of an amount is:
+  exact coin                          no transaction
+  smallest coin covering it           a split
+  coins adding up to it exactly       a merge
+  fewest coins covering it            a merge and a split
+"""
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+from .sui_interfaces import Coin
+
+# nodes visited looking for coins adding up to an amount
+DEFAULT_SEARCH_LIMIT = 20000
+
+
+class CoinIndex:
+    """
+    Coins sorted by balance with their prefix sums, built once for any number of selections
+    """
+
+    def __init__(self, coins: List[Coin]):
+        self.coins = sorted(coins, key=lambda coin: int(coin.balance))
+        self.balances = [int(coin.balance) for coin in self.coins]
+        self.prefix = [0]
+        for balance in self.balances:
+            self.prefix.append(self.prefix[-1] + balance)
+        self.total = self.prefix[-1]
+
+    def exact(self, amount: int) -> Coin | None:
+        """
+        Returns a coin having exactly the amount
+        """
+        index = bisect_left(self.balances, amount)
+        if index < len(self.balances) and self.balances[index] == amount:
+            return self.coins[index]
+        return None
+
+    def smallest_sufficient(self, amount: int) -> Coin | None:
+        """
+        Returns the coin with the smallest balance covering the amount
+        """
+        index = bisect_left(self.balances, amount)
+        return self.coins[index] if index < len(self.coins) else None
+
+    def minimal_subset(self, amount: int, search_limit: int = DEFAULT_SEARCH_LIMIT) -> List[Coin]:
+        """
+        Returns the fewest coins covering the amount, largest first. Coins adding
+        up to the amount exactly, with one coin more at most, are preferred as
+        they need no split, otherwise the smallest coin completing the largest ones.
+        """
+        if amount > self.total:
+            return []
+        # the largest coins are the fewest covering the amount
+        count = 1
+        while self.prefix[-1] - self.prefix[-1 - count] < amount:
+            count += 1
+
+        budget = [search_limit]
+        for size in (count, count + 1):
+            if size <= len(self.balances):
+                indexes = self._exact_subset(len(self.balances), amount, size, budget)
+                if indexes is not None:
+                    return [self.coins[i] for i in sorted(indexes, reverse=True)]
+
+        # the largest count - 1 coins, completed with the smallest coin covering what is left
+        largest = len(self.balances) - (count - 1)
+        remainder = amount - (self.prefix[-1] - self.prefix[largest])
+        index = bisect_left(self.balances, remainder, 0, largest)
+        return [self.coins[i] for i in range(len(self.coins) - 1, largest - 1, -1)] + [self.coins[index]]
+
+    def _exact_subset(self, end: int, amount: int, size: int, budget: list) -> list | None:
+        """
+        Returns indexes below end of size coins adding up to the amount, searching
+        larger balances first until the budget of visited nodes is spent
+        """
+        if size == 1:
+            index = bisect_left(self.balances, amount, 0, end)
+            return [index] if index < end and self.balances[index] == amount else None
+        # the size - 1 smallest coins, with the largest coin that still fits
+        smallest = self.prefix[size - 1]
+        index = min(end, bisect_right(self.balances, amount - smallest)) - 1
+        previous = None
+        while index >= size - 1 and budget[0] > 0:
+            budget[0] -= 1
+            balance = self.balances[index]
+            # the size - 1 largest coins below index can't make up the rest anymore
+            if balance + self.prefix[index] - self.prefix[index - size + 1] < amount:
+                return None
+            if balance != previous:
+                previous = balance
+                indexes = self._exact_subset(index, amount - balance, size - 1, budget)
+                if indexes is not None:
+                    return indexes + [index]
+            index -= 1
+        return None
+
+    def dust(self, threshold: int, max_coins: int = None) -> List[Coin]:
+        """
+        Returns the coins with a balance below threshold, smallest first
+        """
+        end = bisect_left(self.balances, threshold)
+        if max_coins is not None:
+            end = min(end, max_coins)
+        return self.coins[:end]
+
+
+def select_coins(coins: List[Coin], amount: int, search_limit: int = DEFAULT_SEARCH_LIMIT) -> Tuple[List[Coin], int]:
+    """
+    Selects the coins to make a coin of the amount, trying in order: a coin having
+    the amount, the smallest coin covering it, and the fewest coins covering it.
+
+    Input:
+        coins (List[Coin]): coins of a type in any order, or a CoinIndex of them
+        amount (int): balance required, scaled to the coin decimals
+        search_limit (int): nodes visited looking for coins adding up to the amount
+
+    Output:
+        Tuple[List[Coin], int]: the coins selected (merged into the first one when
+        there are more) and their total balance, ([], 0) when the coins are not enough
+    """
+    index = coins if isinstance(coins, CoinIndex) else CoinIndex(coins)
+    coin = index.exact(amount) or index.smallest_sufficient(amount)
+    if coin is not None:
+        return [coin], int(coin.balance)
+    selected = index.minimal_subset(amount, search_limit)
+    return selected, sum(int(coin.balance) for coin in selected)
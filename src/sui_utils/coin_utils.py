@@ -3,69 +3,118 @@ from .signer import Signer
 from .account import SuiWallet
 from .utilities import *
 from .sui_interfaces import Coin
+from .object_cache import get_object_cache
+from .coin_selection import CoinIndex, select_coins
+from .transaction_builder import DEFAULT_GAS_BUDGET, TransactionBuilder
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Union
 from decimal import Decimal
 
+# coins merged by a transaction, MergeCoins takes up to 511 sources (max_arguments of the protocol)
+MAX_MERGE_COINS_PER_TRANSACTION = 500
+
 class CoinUtils:
     """
     A Class to handle coin creation, merging, and finding on the SUI chain.
     """
     @staticmethod
-    def create_coin_with_balance(coin_type: str, balance: int, wallet: SuiWallet, url: str) -> str:
+    def create_coin_with_balance(coin_type: str, balance: int, wallet: SuiWallet, url: str, dust_threshold: int = 0) -> str:
         """
         Creates a new coin with the specified balance by splitting/merging coins if required.
-        Can take long time if the coin is not found and has to merge large number of coins.
+        Coins are picked with select_coins to need as few merge and split transactions as possible.
+        Coins cached from earlier transactions of the wallet are used without listing them again.
 
         Input:
             coin_type (str): The type of the coin.
             balance (int): The balance for the new coin scaled to coin decimals supported by the coin. Eg: 1000000000 for 1 SUI.
             wallet (SuiWallet): The wallet to sign the transaction.
+            dust_threshold (int): optional balance under which coins are merged along when coins are merged and split.
 
         Output:
             str: The ID of the new coin.
         """
+        if balance == 0:
+            raise Exception("Failed to create coin with balance, Exception: Currently sdk does not support creating zero coin")
+
+        # coins left by earlier transactions, the coin list is read when they are not known
+        cache = get_object_cache(url, wallet.getUserAddress())
+        cached_coins = cache.get_coins(coin_type)
+        if cached_coins is not None and CoinUtils.sum_coins(cached_coins) >= balance:
+            try:
+                return CoinUtils._create_coin_from(cached_coins, coin_type, balance, wallet, url, dust_threshold)
+            except Exception:
+                # the coins were used by a transaction sent from elsewhere
+                cache.invalidate(coin_type)
+
         try:
-            if balance == 0:
-                raise ValueError("Currently sdk does not support creating zero coin")
-
-            available_coins = CoinUtils.sort_ascending(get_coins_with_type(wallet.getUserAddress(), coin_type, url))
-            available_coins_balance = CoinUtils.sum_coins(available_coins)
-
-            if balance > available_coins_balance:
-                raise Exception(f"User: {wallet.getUserAddress()} does not have enough coins of type: {coin_type}")
-
-            coin, has_exact_balance = CoinUtils.find_coin_with_balance(available_coins, balance)
-
-            # if no coin is found, merge all available coins and create a new coin
-            if coin is None:
-                coin = available_coins[0]
-                coin_id = coin.coin_object_id
-                # merge all available coins into the first coin
-                CoinUtils.merge_coins(available_coins[1:], wallet, url, coin_id)
-                # if all coins had exact balance as required, then return the first coin id after merging
-                if available_coins_balance == balance:
-                    return coin_id
-            else:
-                coin_id = coin.coin_object_id
-
-            # if the coin is found and has exact balance, return the coin id
-            if has_exact_balance:
-                return coin_id
-
-            # if the coin has more balance, split the coin and create a new coin
-            split_amount = [str(balance)]
-            tx_result = CoinUtils.split_coin(coin_id, split_amount, wallet, url)
-            if tx_result.effects.status == "success":
-                return tx_result.effects.created[0].reference.object_id
-            raise Exception("Failed to create coin with balance")
+            available_coins = get_coins_with_type(wallet.getUserAddress(), coin_type, url)
+            cache.load_coins(coin_type, available_coins)
+            return CoinUtils._create_coin_from(available_coins, coin_type, balance, wallet, url, dust_threshold)
         except Exception as e:
+            cache.invalidate(coin_type)
             raise Exception(f"Failed to create coin with balance, Exception: {e}")
 
     @staticmethod
-    def merge_coins(coins: List[Coin], wallet: SuiWallet, url: str, primary_coin_id: str|None = None) -> str:
+    def _create_coin_from(available_coins: List[Coin], coin_type: str, balance: int, wallet: SuiWallet, url: str, dust_threshold: int = 0) -> str:
+        index = CoinIndex(available_coins)
+        if balance > index.total:
+            raise Exception(f"User: {wallet.getUserAddress()} does not have enough coins of type: {coin_type}")
+
+        selected, selected_balance = select_coins(index, balance)
+        coin_id = selected[0].coin_object_id
+        if len(selected) > 1:
+            sources = selected[1:]
+            if dust_threshold and selected_balance > balance:
+                # a split follows anyway, dust merged along costs no transaction
+                chosen = {coin.coin_object_id for coin in selected}
+                room = MAX_MERGE_COINS_PER_TRANSACTION - len(selected)
+                sources += [coin for coin in index.dust(dust_threshold) if coin.coin_object_id not in chosen][:room]
+            CoinUtils.merge_coins(sources, wallet, url, coin_id)
+
+        # the coin (or the coins merged) having the exact balance
+        if selected_balance == balance:
+            return coin_id
+
+        # if the coin has more balance, split the coin and create a new coin
+        split_amount = [str(balance)]
+        tx_result = CoinUtils.split_coin(coin_id, split_amount, wallet, url, coin_type)
+        if tx_result.effects.status == "success":
+            return tx_result.effects.created[0].reference.object_id
+        raise Exception("Failed to create coin with balance")
+
+    @staticmethod
+    def consolidate_dust(coin_type: str, threshold: int, wallet: SuiWallet, url: str) -> str | None:
+        """
+        Merges the coins with a balance below threshold into one coin, in a single
+        transaction for up to MAX_MERGE_COINS_PER_TRANSACTION coins.
+
+        Input:
+            coin_type (str): The type of the coins.
+            threshold (int): balance under which coins are merged, scaled to the coin decimals.
+            wallet (SuiWallet): The wallet to sign the transaction.
+            url (str): The URL of the SUI node.
+
+        Output:
+            str: The ID of the coin the dust was merged into, None when there was not enough dust to merge.
+        """
+        cache = get_object_cache(url, wallet.getUserAddress())
+        coins = cache.get_coins(coin_type)
+        if coins is None:
+            coins = get_coins_with_type(wallet.getUserAddress(), coin_type, url)
+            cache.load_coins(coin_type, coins)
+        dust = CoinIndex(coins).dust(threshold)
+        if len(dust) < 2:
+            return None
+        # the largest dust coin is kept
+        return CoinUtils.merge_coins(dust[:-1], wallet, url, dust[-1].coin_object_id)
+
+    @staticmethod
+    def merge_coins(coins: List[Coin], wallet: SuiWallet, url: str, primary_coin_id: str|None = None, gas_budget: int = DEFAULT_GAS_BUDGET, max_coins_per_transaction: int = MAX_MERGE_COINS_PER_TRANSACTION) -> str:
         """
         Merges provided coins into a primary coin.
-        Can take long time to merge large number of coins.
+        Coins are merged by programmable transactions of up to max_coins_per_transaction coins each.
+        Larger sets are merged in chunks executed in parallel (as many as there are SUI coins
+        to pay for their gas), the chunks are then merged into the primary coin.
         Recommended to combine with get_all_coins to provide a list of coins to merge.
 
         Input:
@@ -73,21 +122,86 @@ class CoinUtils:
             wallet (SuiWallet): The wallet to sign the transaction.
             url (str): The URL of the SUI node.
             primary_coin_id (str): optional ID of the primary coin to merge into. If not provided, the first coin in the list will be used as the primary coin.
+            gas_budget (int): optional gas budget of each transaction.
+            max_coins_per_transaction (int): optional number of coins merged by a transaction, at most the protocol limit.
 
         Output:
             str: The ID of the primary coin.
         """
         if primary_coin_id is None:
             primary_coin_id = coins[0].coin_object_id
-        
-        signer = Signer()
+        primary = normalize_address(primary_coin_id)
+
+        cache = get_object_cache(url, wallet.getUserAddress())
+        coin_type = next((coin.coin_type for coin in coins if coin.coin_type), None)
+        sources = []
+        seen = {primary}
         for coin in coins:
-            tx_bytes = rpc_sui_createMergeCoinsTransaction(url, primary_coin_id, coin.coin_object_id, wallet.getUserAddress())
-            signer.sign_and_execute_tx(tx_bytes, wallet, url)
+            object_id = normalize_address(coin.coin_object_id)
+            # references of listed coins spare reading them, unless cached from a later transaction
+            if cache.get(object_id) is None and coin.version is not None and coin.digest is not None:
+                cache.put(object_id, coin.version, coin.digest, coin.balance, coin_type)
+            if object_id not in seen:
+                seen.add(object_id)
+                sources.append(object_id)
+
+        builder = TransactionBuilder(get_rpc_client(url), wallet.getUserAddress(), gas_budget, objects=cache)
+        size = max_coins_per_transaction - 1
+        while sources:
+            chunks = [sources[i:i + size] for i in range(0, len(sources), size)]
+            # the first chunk is merged into the primary coin, the others into their first
+            # coin, which are merged into the primary coin by the next round
+            merges = [(primary, chunks[0])] + [(chunk[0], chunk[1:]) for chunk in chunks[1:] if len(chunk) > 1]
+            CoinUtils._execute_merges(merges, builder, coin_type, wallet, url)
+            sources = [chunk[0] for chunk in chunks[1:]]
         return primary_coin_id
-        
+
     @staticmethod
-    def split_coin(coin_id: str, amounts: List[int], wallet: SuiWallet, url: str) -> TransactionResult:
+    def _execute_merges(merges: list, builder: TransactionBuilder, coin_type: str, wallet: SuiWallet, url: str):
+        """
+        Executes the (destination, sources) merges, the ones paid by different gas coins in parallel
+        """
+        signer = Signer()
+        while merges:
+            wave = []
+            gas_coins = set()
+            for destination, sources in merges:
+                try:
+                    tx_bytes, gas = builder.merge_coins(destination, sources, coin_type=coin_type, exclude=gas_coins)
+                except Exception:
+                    if not wave:
+                        raise
+                    # no gas coin left for another transaction at the same time
+                    break
+                gas_coins.update(gas)
+                wave.append((destination, sources, tx_bytes))
+            merges = merges[len(wave):]
+
+            with ThreadPoolExecutor(max_workers=len(wave)) as pool:
+                futures = [
+                    pool.submit(signer.sign_and_execute_tx, tx_bytes, wallet, url, STATUS_RESPONSE_OPTIONS)
+                    for _, _, tx_bytes in wave
+                ]
+            errors = []
+            for (destination, sources, _), future in zip(wave, futures):
+                try:
+                    tx_result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                balances = [builder.objects.get(source) for source in sources]
+                balance_changes = {}
+                if all(known is not None and known[2] is not None for known in balances):
+                    balance_changes[destination] = sum(known[2] for known in balances)
+                builder.update_from_effects(tx_result.full_transaction_data["effects"], balance_changes)
+                if tx_result.effects.status != "success":
+                    errors.append(Exception(f"Failed to merge coins into {destination}: {tx_result.effects.status}"))
+            if errors:
+                builder.invalidate()
+                raise Exception(f"Failed to merge coins, Exception: {errors[0]}")
+
+    @staticmethod
+    def split_coin(coin_id: str, amounts: List[int], wallet: SuiWallet, url: str, coin_type: str|None = None) -> TransactionResult:
         """
         splits a coin into multiple coins of the specified amounts.
 
@@ -96,16 +210,25 @@ class CoinUtils:
             amounts (List[int]): The amounts of balance required for the new coins [combined must be equal or less than the balance of the provided coin and scaled to supported decimals of the coin. Eg: 1000000000 for 1 SUI]
             wallet (SuiWallet): The wallet to sign the transaction.
             url (str): The URL of the SUI node.
+            coin_type (str): optional type of the coin, a coin created by a single amount split is then cached for later transactions.
         """
         signer = Signer()
         tx_bytes = rpc_sui_createSplitCoinsTransaction(wallet.getUserAddress(), coin_id, [str(amount) for amount in amounts], url)
-        return signer.sign_and_execute_tx(tx_bytes, wallet, url)
+        tx_result = signer.sign_and_execute_tx(tx_bytes, wallet, url)
+        cache = get_object_cache(url, wallet.getUserAddress())
+        effects = tx_result.full_transaction_data["effects"]
+        cache.update_from_effects(effects, {coin_id: -sum(int(amount) for amount in amounts)})
+        created = effects.get("created", [])
+        if coin_type is not None and len(amounts) == 1 and len(created) == 1 and tx_result.effects.status == "success":
+            reference = created[0]["reference"]
+            cache.put(reference["objectId"], reference["version"], reference["digest"], int(amounts[0]), coin_type)
+        return tx_result
         
 
     @staticmethod
     def find_coin_with_balance(coins: List[Coin], amount: int) -> Tuple[Coin | None, bool]:
         """
-        Finds the coin having the provided balance or more.
+        Finds the coin with the smallest balance having the provided balance or more.
         Recommended to combine with get_all_coins to provide a list of coins to find the coin with the balance.
 
         Input:
@@ -115,11 +238,10 @@ class CoinUtils:
         Output:
             Tuple[Coin | None, bool]: The Coin object and a boolean indicating if the coin has exact balance or more.
         """
-        for coin in coins:
-            coin_balance = int(coin.balance)
-            if coin_balance >= amount:
-                return coin, coin_balance == amount
-        return None, False
+        coin = CoinIndex(coins).smallest_sufficient(amount)
+        if coin is None:
+            return None, False
+        return coin, int(coin.balance) == amount
 
     @staticmethod
     def sort_ascending(coins: List[Coin]) -> List[Coin]:
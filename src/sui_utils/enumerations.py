@@ -3,4 +3,11 @@ from enum import Enum
 
 class WALLET_SCHEME(Enum):
     ED25519 = "ED25519"
-    Secp256k1 = "Secp256k1" #not supportted currently
\ No newline at end of file
+    Secp256k1 = "Secp256k1" #not supportted currently
+
+class EXECUTION_FINALITY(Enum):
+    # returns once the effects are certified by a quorum of validators
+    WAIT_FOR_EFFECTS_CERT = "WaitForEffectsCert"
+    # also waits for the node to execute the transaction, so reads made on the
+    # same node right after see its effects
+    WAIT_FOR_LOCAL_EXECUTION = "WaitForLocalExecution"
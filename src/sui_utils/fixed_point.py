@@ -0,0 +1,207 @@
+"""
+Exact fixed point conversions between human readable numbers and their
+on-chain integer representation (e.g. 1e18 for prices, 1e6 for USDC, 1e9 for SUI).
+
+Numbers are split into integer digits and a base 10 exponent and scaled with
+integer arithmetic only, which gives the same results as eth_utils'
+to_wei/from_wei without creating a Decimal context on every call.
+"""
+import decimal
+import math
+import sys
+from typing import Iterable, List, Union
+
+MIN_VALUE = 0
+MAX_VALUE = 2**256 - 1
+
+# precomputed scale factors, 10**78 > MAX_VALUE
+POWERS_OF_TEN = tuple(10**i for i in range(79))
+
+Number = Union[int, float, str, decimal.Decimal]
+
+
+def _pow10(exponent: int) -> int:
+    if exponent < 0:
+        raise ValueError("Negative power of ten: {}".format(exponent))
+    if exponent < len(POWERS_OF_TEN):
+        return POWERS_OF_TEN[exponent]
+    return 10**exponent
+
+
+def _split_decimal(value: decimal.Decimal):
+    if not value.is_finite():
+        raise ValueError("Value must be a finite number: {}".format(value))
+    sign, digits, exponent = value.as_tuple()
+    coefficient = int("".join(map(str, digits))) if digits else 0
+    return -coefficient if sign else coefficient, exponent
+
+
+def _split_string(value: str):
+    """
+    Splits a plain decimal string ("12.5", "-1.2e-05") into its integer digits
+    and base 10 exponent. Anything else is parsed by Decimal.
+    """
+    mantissa, exponent = value, 0
+    if "e" in value or "E" in value:
+        mantissa, _, exp_part = value.replace("E", "e").partition("e")
+        exponent = int(exp_part)
+
+    int_part, _, frac_part = mantissa.partition(".")
+    if frac_part:
+        if not frac_part.isdigit():
+            raise ValueError
+        exponent -= len(frac_part)
+    return int(int_part + frac_part), exponent
+
+
+def _split_number(number: Number):
+    """
+    Returns (digits, exponent) such that number == digits * 10**exponent
+    """
+    number_type = type(number)
+    if number_type is int:
+        return number, 0
+    if number_type is float:
+        if not math.isfinite(number):
+            raise ValueError("Value must be a finite number: {}".format(number))
+        # repr gives the shortest string that round trips, same as str()
+        return _split_string(repr(number))
+    if isinstance(number, bool):
+        raise TypeError("Unsupported type. Must be one of integer, float, or string")
+    if isinstance(number, int):
+        return int(number), 0
+    if isinstance(number, str):
+        try:
+            return _split_string(number)
+        except ValueError:
+            try:
+                return _split_decimal(decimal.Decimal(number))
+            except decimal.InvalidOperation:
+                raise ValueError("Invalid number: {}".format(number))
+    if isinstance(number, decimal.Decimal):
+        return _split_decimal(number)
+    if isinstance(number, float):
+        return _split_number(float(number))
+    raise TypeError("Unsupported type. Must be one of integer, float, or string")
+
+
+def _scale_rounded(numerator: int, denominator: int, precision: int, decimals: int) -> int:
+    """
+    Scales numerator / denominator, a value below 1 written with `precision`
+    digits after the decimal point, the way eth_utils.to_wei does: the value
+    times 10**precision is rounded (half even) to `precision` significant
+    digits before being scaled to `decimals` and truncated.
+    """
+    numerator *= _pow10(precision)
+    integer = numerator // denominator
+    if integer:
+        leading = len(str(integer)) - 1
+    else:
+        leading = -1
+        while numerator * _pow10(-leading) < denominator:
+            leading -= 1
+
+    shift = precision - 1 - leading
+    rounded, remainder = divmod(numerator * _pow10(shift), denominator)
+    remainder *= 2
+    if remainder > denominator or (remainder == denominator and rounded & 1):
+        rounded += 1
+
+    exponent = decimals - precision - shift
+    if exponent >= 0:
+        return rounded * _pow10(exponent)
+    return rounded // _pow10(-exponent)
+
+
+def to_fixed(number: Number, decimals: int) -> int:
+    """
+    Converts a number to its fixed point integer representation with the
+    given number of decimals, truncating extra precision.
+    e.g. to_fixed(0.512323, 6) == 512323
+    """
+    number_type = type(number)
+    if number_type is float and 0 < number < 1:
+        text = repr(number)
+        if "." in text:
+            numerator, denominator = number.as_integer_ratio()
+            return _scale_rounded(
+                numerator, denominator, len(text) - text.index(".") - 1, decimals
+            )
+
+    digits, exponent = _split_number(number)
+    if number_type is not float and exponent < 0 and 0 < digits < _pow10(-exponent):
+        # non float values below 1, exact except for exponent notations
+        # carrying more significant digits than decimal places (e.g. "123.4e-5")
+        text = str(number)
+        if "." in text:
+            return _scale_rounded(
+                digits, _pow10(-exponent), len(text) - text.index(".") - 1, decimals
+            )
+
+    exponent += decimals
+    if exponent >= 0:
+        result = digits * _pow10(exponent)
+    elif digits >= 0:
+        result = digits // _pow10(-exponent)
+    else:
+        result = -(-digits // _pow10(-exponent))
+
+    if result < MIN_VALUE or result > MAX_VALUE:
+        raise ValueError("Resulting value must be between 0 and 2**256 - 1")
+    return result
+
+
+def from_fixed(number: Union[int, str], decimals: int) -> float:
+    """
+    Converts a fixed point integer (or its string form) with the given number
+    of decimals back to a float.
+    e.g. from_fixed(512323, 6) == 0.512323
+    """
+    if type(number) is not int:
+        number = int(number)
+    if number == 0:
+        return 0.0
+    if number < MIN_VALUE or number > MAX_VALUE:
+        raise ValueError("value must be between 1 and 2**256 - 1")
+    # int / int is correctly rounded for arbitrary sized integers
+    return number / _pow10(decimals)
+
+
+def to_fixed_batch(numbers: Iterable[Number], decimals: int) -> Union[List[int], "numpy.ndarray"]:
+    """
+    Converts a list or NumPy array of numbers to fixed point integers.
+    NumPy input returns an int64 array when every value fits, an object array otherwise.
+    """
+    # numpy is optional and only looked up, an array can't exist unless it was imported
+    numpy = sys.modules.get("numpy")
+    is_array = numpy is not None and isinstance(numbers, numpy.ndarray)
+    values = numbers.tolist() if is_array else numbers
+
+    if is_array and numbers.dtype.kind in "iu":
+        scale = _pow10(decimals)
+        result = [value * scale for value in values]
+        for value in result:
+            if value < MIN_VALUE or value > MAX_VALUE:
+                raise ValueError("Resulting value must be between 0 and 2**256 - 1")
+    else:
+        result = [to_fixed(value, decimals) for value in values]
+
+    if not is_array:
+        return result
+    if not result or max(result) <= numpy.iinfo(numpy.int64).max:
+        return numpy.array(result, dtype=numpy.int64)
+    return numpy.array(result, dtype=object)
+
+
+def from_fixed_batch(numbers: Iterable[Union[int, str]], decimals: int) -> Union[List[float], "numpy.ndarray"]:
+    """
+    Converts a list or NumPy array of fixed point integers (or their string form)
+    to floats. NumPy input returns a float64 array.
+    """
+    numpy = sys.modules.get("numpy")
+    is_array = numpy is not None and isinstance(numbers, numpy.ndarray)
+    values = numbers.tolist() if is_array else numbers
+    result = [from_fixed(value, decimals) for value in values]
+    if is_array:
+        return numpy.array(result, dtype=numpy.float64)
+    return result
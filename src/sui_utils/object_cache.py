@@ -0,0 +1,196 @@
+"""
+Cache of the objects owned by an address, kept current from the effects of the
+transactions it executes, so a transaction following another one doesn't have
+to list coins or read object references from the node again.
+"""
+import threading
+from .sui_interfaces import Coin
+from .utilities import normalize_address
+
+
+class ObjectCache:
+    """
+    Objects owned by an address: object id -> (version, digest, balance).
+    Balance is None for objects that are not coins, or coins whose balance
+    changed by an unknown amount. Coin listings of a type are complete when
+    loaded from suix_getCoins, later updated from effects.
+    """
+
+    def __init__(self, owner: str):
+        self.owner = normalize_address(owner)
+        self.objects = {}
+        # object id -> coin type
+        self.coin_types = {}
+        # coin types whose coins were all listed and are still tracked
+        self.listed = set()
+        self.lock = threading.RLock()
+
+    def get(self, object_id: str):
+        """
+        Returns (version, digest, balance) of an owned object, None if not known
+        """
+        return self.objects.get(normalize_address(object_id))
+
+    def put(self, object_id: str, version, digest: str, balance=None, coin_type: str = None):
+        """
+        Records the reference of an owned object, the balance and coin type are
+        kept when not given
+        """
+        object_id = normalize_address(object_id)
+        with self.lock:
+            known = self.objects.get(object_id)
+            if balance is None and known is not None:
+                balance = known[2]
+            self.objects[object_id] = (int(version), digest, None if balance is None else int(balance))
+            if coin_type is not None:
+                self.coin_types[object_id] = coin_type
+
+    def forget(self, object_id: str):
+        object_id = normalize_address(object_id)
+        with self.lock:
+            self.objects.pop(object_id, None)
+            self.coin_types.pop(object_id, None)
+
+    def invalidate(self, coin_type: str = None):
+        """
+        Forgets everything, or the coins of a type. Used when an execution failed
+        or the owner's objects were used by a transaction sent from elsewhere.
+        """
+        with self.lock:
+            if coin_type is None:
+                self.objects.clear()
+                self.coin_types.clear()
+                self.listed.clear()
+                return
+            for object_id in [i for i, t in self.coin_types.items() if t == coin_type]:
+                self.forget(object_id)
+            self.listed.discard(coin_type)
+
+    def load_coins(self, coin_type: str, coins: list, complete: bool = True):
+        """
+        Records the coins of a type listed by suix_getCoins.
+        Inputs:
+          coin_type: type of the coins
+          coins (List[Coin]): the coins listed
+          complete: False when only a page of the coins was listed
+        """
+        with self.lock:
+            if complete:
+                self.invalidate(coin_type)
+            for coin in coins:
+                self.put(coin.coin_object_id, coin.version, coin.digest, coin.balance, coin_type)
+            if complete:
+                self.listed.add(coin_type)
+
+    def known_coins(self, coin_type: str) -> list:
+        """
+        Returns the coins of a type with a known balance, complete listing or not
+        """
+        with self.lock:
+            return [
+                Coin(
+                    {
+                        "coinType": coin_type,
+                        "coinObjectId": object_id,
+                        "version": str(self.objects[object_id][0]),
+                        "digest": self.objects[object_id][1],
+                        "balance": str(self.objects[object_id][2]),
+                    }
+                )
+                for object_id, object_type in self.coin_types.items()
+                if object_type == coin_type and self.objects[object_id][2] is not None
+            ]
+
+    def get_coins(self, coin_type: str):
+        """
+        Returns the coins (List[Coin]) of a type owned, None when they have
+        to be listed again
+        """
+        with self.lock:
+            if coin_type not in self.listed:
+                return None
+            return self.known_coins(coin_type)
+
+    def track(self, owner, object_id: str, version, digest: str):
+        """
+        Records a reference read or changed with its owner, objects that are
+        not owned by the address anymore are forgotten
+        """
+        if owner == "Immutable" or (isinstance(owner, dict) and normalize_address(owner.get("AddressOwner", "0x0")) == self.owner):
+            self.put(object_id, version, digest)
+        else:
+            # transferred away, shared or wrapped
+            self.forget(object_id)
+
+    def update_from_effects(self, effects: dict, balance_changes: dict = None):
+        """
+        Updates the cache with the effects of an executed transaction.
+        Inputs:
+          effects: effects of the transaction response (showEffects)
+          balance_changes: object id -> change of the balance of the cached coins
+            the transaction used, applied when it succeeded. Coins changed without
+            a known balance change have their type listed again when needed.
+        """
+        success = effects.get("status", {}).get("status") == "success"
+        balance_changes = {normalize_address(i): int(change) for i, change in (balance_changes or {}).items()} if success else {}
+        gas_object = effects.get("gasObject")
+        gas_id = normalize_address(gas_object["reference"]["objectId"]) if gas_object else None
+
+        with self.lock:
+            for key in ("mutated", "unwrapped"):
+                for change in effects.get(key, []):
+                    reference = change["reference"]
+                    object_id = normalize_address(reference["objectId"])
+                    known = self.objects.get(object_id)
+                    self.track(change["owner"], object_id, reference["version"], reference["digest"])
+                    if known is None or known[2] is None or object_id not in self.objects or object_id == gas_id:
+                        continue
+                    if object_id in balance_changes:
+                        self._set_balance(object_id, known[2] + balance_changes[object_id])
+                    else:
+                        self._set_balance(object_id, None)
+            for change in effects.get("created", []):
+                reference = change["reference"]
+                object_id = normalize_address(reference["objectId"])
+                # balance and type of created coins are recorded with put by the caller
+                self.track(change["owner"], object_id, reference["version"], reference["digest"])
+            for key in ("deleted", "wrapped", "unwrappedThenDeleted"):
+                for reference in effects.get(key, []):
+                    self.forget(reference["objectId"])
+
+            if gas_object:
+                known = self.objects.get(gas_id)
+                reference = gas_object["reference"]
+                self.track(gas_object["owner"], gas_id, reference["version"], reference["digest"])
+                if known is not None and known[2] is not None and gas_id in self.objects:
+                    gas_used = effects.get("gasUsed")
+                    if gas_used:
+                        cost = int(gas_used["computationCost"]) + int(gas_used["storageCost"]) - int(gas_used["storageRebate"])
+                        self._set_balance(gas_id, known[2] - cost + balance_changes.get(gas_id, 0))
+                    else:
+                        self._set_balance(gas_id, None)
+
+    def _set_balance(self, object_id: str, balance):
+        version, digest, _ = self.objects[object_id]
+        self.objects[object_id] = (version, digest, balance)
+        if balance is None:
+            # the listing of the type can't be trusted anymore
+            self.listed.discard(self.coin_types.get(object_id))
+
+
+_object_caches = {}
+_object_caches_lock = threading.Lock()
+
+
+def get_object_cache(url: str, owner: str) -> ObjectCache:
+    """
+    Returns the ObjectCache shared by the clients of an owner on a node url
+    """
+    key = (url, normalize_address(owner))
+    cache = _object_caches.get(key)
+    if cache is None:
+        with _object_caches_lock:
+            cache = _object_caches.get(key)
+            if cache is None:
+                cache = _object_caches[key] = ObjectCache(owner)
+    return cache
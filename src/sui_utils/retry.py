@@ -0,0 +1,270 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+
+LOCKED_OBJECT_ERROR_CODE = (
+    "Failed to sign transaction by a quorum of validators because of locked objects"
+)
+
+# messages of JSON-RPC errors worth sending again, other errors are returned as is
+RETRYABLE_ERROR_MESSAGES = (LOCKED_OBJECT_ERROR_CODE,)
+
+
+def is_retryable_result(result) -> bool:
+    """
+    True for JSON-RPC responses holding an error that can clear up on its own,
+    e.g. objects locked by another transaction of the account
+    """
+    if not isinstance(result, dict) or "error" not in result:
+        return False
+    message = str(result["error"].get("message", ""))
+    return any(retryable in message for retryable in RETRYABLE_ERROR_MESSAGES)
+
+
+def is_retryable_exception(exception: BaseException) -> bool:
+    """
+    True for connection errors and timeouts, requests and aiohttp connection
+    errors included. Sending a signed transaction again is safe, the node
+    returns the effects of the digest if it was already executed.
+    """
+    # asyncio.TimeoutError is not the builtin TimeoutError before Python 3.11
+    if isinstance(exception, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    try:
+        import requests
+    except ImportError:
+        pass
+    else:
+        # every requests error is an OSError, only these are transient
+        if isinstance(exception, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True
+    try:
+        import aiohttp
+    except ImportError:
+        return False
+    return isinstance(exception, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+# attempts after which the base delay stops growing
+MAX_BACKOFF_EXPONENT = 64
+
+
+class Backoff:
+    """
+    Jittered exponential backoff, used between retries and reconnect attempts.
+    The n-th delay is drawn uniformly from [base / 2, base] where
+    base = min(maximum, initial * factor**n).
+    """
+
+    def __init__(self, initial=0.5, maximum=30.0, factor=2.0, max_attempts=None):
+        """
+        Inputs:
+            - initial(float): base delay in seconds before the first attempt
+            - maximum(float): cap on the base delay in seconds
+            - factor(float): growth of the base delay per attempt
+            - max_attempts(int): attempts before giving up, None retries forever
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.max_attempts = max_attempts
+
+    def delay(self, attempt: int) -> float:
+        # factor**attempt overflows a float after about 1024 doublings, long past the maximum
+        base = min(self.maximum, self.initial * self.factor ** min(attempt, MAX_BACKOFF_EXPONENT))
+        return base / 2 + random.uniform(0, base / 2)
+
+    def exhausted(self, attempt: int) -> bool:
+        return self.max_attempts is not None and attempt >= self.max_attempts
+
+
+class RetryBudget:
+    """
+    Caps retries across calls to a ratio of the calls made, so a node that
+    keeps failing is not hit with max_attempts times the traffic.
+    Every call deposits `ratio` tokens up to `reserve`, every retry withdraws one.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10):
+        """
+        Inputs:
+          ratio: retries allowed per call once the reserve is spent
+          reserve: retries available in a burst, the budget starts full
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class RetryMetrics:
+    """
+    Retries used by the calls made with a RetryPolicy.
+    retries_per_call maps a retry count to the number of calls that used it.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        # calls given up on while their result was still retryable
+        self.exhausted = 0
+        # retries refused by the retry budget
+        self.budget_exhausted = 0
+        self.retries_per_call = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, retries: int, exhausted: bool, budget_exhausted: bool):
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.retries_per_call[retries] += 1
+            if exhausted:
+                self.exhausted += 1
+            if budget_exhausted:
+                self.budget_exhausted += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "budgetExhausted": self.budget_exhausted,
+                "retriesPerCall": dict(self.retries_per_call),
+            }
+
+
+class RetryPolicy:
+    """
+    Retries a call with jittered exponential backoff (Backoff) while its
+    result or exception is retryable.
+    call sleeps with time.sleep and call_async with asyncio.sleep, so async
+    callers never block their event loop.
+    e.g.
+        policy = RetryPolicy(max_attempts=3)
+        result = await policy.call_async(client.post, payload)
+        policy.metrics.retries_per_call
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        initial: float = 0.25,
+        maximum: float = 4.0,
+        factor: float = 2.0,
+        budget: RetryBudget = None,
+        retryable_result=is_retryable_result,
+        retryable_exception=is_retryable_exception,
+    ):
+        """
+        Inputs:
+          max_attempts: attempts per call, the first one included
+          initial: base delay in seconds before the first retry
+          maximum: cap on the base delay in seconds
+          factor: growth of the base delay per retry
+          budget (RetryBudget): optional budget shared by the calls of the policy
+          retryable_result: returns True for results to retry
+          retryable_exception: returns True for exceptions to retry
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff = Backoff(initial, maximum, factor)
+        self.budget = budget
+        self.retryable_result = retryable_result
+        self.retryable_exception = retryable_exception
+        self.metrics = RetryMetrics()
+
+    def delay(self, retry: int) -> float:
+        return self.backoff.delay(retry)
+
+    def _attempts(self, max_attempts):
+        return self.max_attempts if max_attempts is None else max_attempts
+
+    def _retryable(self, result, exception) -> bool:
+        if exception is not None:
+            return self.retryable_exception(exception)
+        return self.retryable_result(result)
+
+    def _may_retry(self, retry: int, attempts: int) -> str:
+        """
+        Returns None when another attempt can be made, else why it can't
+        """
+        if retry + 1 >= attempts:
+            return "attempts"
+        if self.budget is not None and not self.budget.withdraw():
+            return "budget"
+        return None
+
+    def _finish(self, retries: int, exhausted: bool, refused: str):
+        if self.budget is not None:
+            self.budget.deposit()
+        self.metrics.record(retries, exhausted, refused == "budget")
+
+    def call(self, func, *args, max_attempts: int = None, **kwargs):
+        """
+        Calls func(*args, **kwargs), sleeping between attempts.
+        Returns the first result that is not retryable, else the last result.
+        The last exception is raised when every attempt raised.
+        """
+        attempts = self._attempts(max_attempts)
+        retry = 0
+        while True:
+            result, exception = None, None
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                exception = e
+            if not self._retryable(result, exception):
+                self._finish(retry, False, None)
+                if exception is not None:
+                    raise exception
+                return result
+            refused = self._may_retry(retry, attempts)
+            if refused:
+                self._finish(retry, True, refused)
+                if exception is not None:
+                    raise exception
+                return result
+            time.sleep(self.delay(retry))
+            retry += 1
+
+    async def call_async(self, func, *args, max_attempts: int = None, **kwargs):
+        """
+        Awaits func(*args, **kwargs), sleeping between attempts without
+        blocking the event loop. Same results as call.
+        """
+        attempts = self._attempts(max_attempts)
+        retry = 0
+        while True:
+            result, exception = None, None
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                exception = e
+            if not self._retryable(result, exception):
+                self._finish(retry, False, None)
+                if exception is not None:
+                    raise exception
+                return result
+            refused = self._may_retry(retry, attempts)
+            if refused:
+                self._finish(retry, True, refused)
+                if exception is not None:
+                    raise exception
+                return result
+            await asyncio.sleep(self.delay(retry))
+            retry += 1
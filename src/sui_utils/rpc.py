@@ -1,11 +1,399 @@
-import requests
+import asyncio
 import json
-import time
+import threading
+from typing import AsyncIterator
 from .sui_interfaces import *
+from .enumerations import EXECUTION_FINALITY
+from .retry import LOCKED_OBJECT_ERROR_CODE, RetryPolicy
+
+def _requests():
+    # requests is only needed once a call is made, keep it out of import time
+    import requests
+
+    return requests
+
+
+HEADERS = {"Content-Type": "application/json"}
+
+# connections kept open to each node
+DEFAULT_POOL_SIZE = 10
+
+# calls sent in one batch request body, larger batches are split
+DEFAULT_BATCH_SIZE = 50
+
+# sui_executeTransactionBlock response fields
+FULL_RESPONSE_OPTIONS = {
+    "showInput": True,
+    "showEffects": True,
+    "showEvents": True,
+    "showObjectChanges": True,
+}
+# enough to read effects.status.status, for callers that only check the status
+STATUS_RESPONSE_OPTIONS = {"showEffects": True}
+
+
+def _json_rpc_request(method: str, params: list, id: int = 1) -> dict:
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": params}
+
+
+def _move_call_request(params, function_name, function_library, userAddress, packageId, gasBudget, typeArguments) -> dict:
+    # Optional type arguments for wormhole related calls
+    return _json_rpc_request(
+        "unsafe_moveCall",
+        [userAddress, packageId, function_library, function_name, typeArguments, params, None, str(gasBudget)],
+    )
+
+
+def _execute_transaction_block_request(txBytes: str, signature: str, response_options: dict = None, finality: EXECUTION_FINALITY = None) -> dict:
+    if response_options is None:
+        response_options = FULL_RESPONSE_OPTIONS
+    if finality is None:
+        finality = EXECUTION_FINALITY.WAIT_FOR_LOCAL_EXECUTION
+    return _json_rpc_request(
+        "sui_executeTransactionBlock",
+        [txBytes, [signature], response_options, EXECUTION_FINALITY(finality).value],
+        id=5,
+    )
+
+
+def _dynamic_field_object_request(parentObjectId: str, fieldName: str, fieldSuiObjectType: str) -> dict:
+    return _json_rpc_request(
+        "suix_getDynamicFieldObject",
+        [parentObjectId, {"type": fieldSuiObjectType, "value": fieldName}],
+        id=5,
+    )
+
+
+def _split_coins_request(owner: str, primary_coin_id: str, split_amounts: list, gas_budget: int) -> dict:
+    # Check if split_amounts contains only number strings
+    for amount in split_amounts:
+        if not amount.isdigit():
+            raise ValueError(f"Invalid amount in split_amounts: {amount}")
+    # gas object ID is None, let node pick one
+    return _json_rpc_request(
+        "unsafe_splitCoin", [owner, primary_coin_id, split_amounts, None, str(gas_budget)]
+    )
+
+
+def _merge_coins_request(primary_coin_id: str, coin_id: str, userAddress: str, gasBudget: int) -> dict:
+    return _json_rpc_request(
+        "unsafe_mergeCoins", [userAddress, primary_coin_id, coin_id, None, str(gasBudget)]
+    )
+
+
+def _batch_requests(calls: list) -> list:
+    """
+    Builds the JSON-RPC requests of (method, params) calls, ids are the call indexes
+    """
+    return [_json_rpc_request(method, params, id=index) for index, (method, params) in enumerate(calls)]
+
+
+def _batch_chunks(requests: list, max_batch_size: int) -> list:
+    if not max_batch_size:
+        return [requests]
+    return [requests[i : i + max_batch_size] for i in range(0, len(requests), max_batch_size)]
+
+
+def _demultiplex(count: int, responses: list) -> list:
+    """
+    Orders batch responses by request id, the node may answer in any order.
+    Responses with an id no request was sent with are ignored, their request
+    gets the missing response error.
+    """
+    results = [None] * count
+    for response in responses:
+        if not isinstance(response, dict) or not isinstance(response.get("id"), int):
+            raise Exception(f"Failed to execute batch request due to: {response}")
+        if 0 <= response["id"] < count:
+            results[response["id"]] = response
+    for index, response in enumerate(results):
+        if response is None:
+            results[index] = {"jsonrpc": "2.0", "id": index, "error": {"code": -32603, "message": "Missing response in batch"}}
+    return results
+
+
+def _batch_responses(responseJson) -> list:
+    # a failed batch is answered with a single error object
+    if not isinstance(responseJson, list):
+        raise Exception(f"Failed to execute batch request due to: {responseJson}")
+    return responseJson
+
+
+def _transaction_bytes(responseJson: dict) -> str:
+    if "result" not in responseJson or "txBytes" not in responseJson["result"]:
+        raise Exception(f"Failed to create transaction bytes due to: {responseJson}")
+    return responseJson["result"]["txBytes"]
+
+
+def _coin_metadata(responseJson: dict) -> CoinMetadata:
+    if "result" not in responseJson:
+        raise Exception(f"Failed to fetch coin metadata due to: {responseJson}")
+    return CoinMetadata(responseJson["result"])
+
+
+def _coins_page_params(user_address: str, coin_type: str, cursor) -> list:
+    callArgs = [user_address, coin_type]
+    if cursor:
+        callArgs.append(cursor)
+    return callArgs
+
+
+class SuiRpcClient:
+    """
+    Synchronous JSON-RPC client of a Sui node. Requests go through a
+    requests.Session so connections (and their TLS sessions) are reused.
+    The rpc_* functions of this module use the shared client returned by
+    get_rpc_client for their url.
+    """
+
+    def __init__(self, url: str, session=None, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = None, retry_policy: RetryPolicy = None):
+        """
+        Inputs:
+          url: url of the node
+          session (requests.Session): optional session to send requests with
+          pool_size: connections kept open to the node
+          timeout: optional seconds to wait for a response
+          retry_policy (RetryPolicy): retries of transaction executions and
+            dynamic field reads, defaults to RetryPolicy()
+        """
+        self.url = url
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        if session is None:
+            requests = _requests()
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def close(self):
+        self.session.close()
+
+    def post(self, payload) -> dict:
+        """
+        Sends a JSON-RPC payload (dict or serialized string) and returns the decoded response
+        """
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        response = self.session.post(self.url, headers=HEADERS, data=payload, timeout=self.timeout)
+        return json.loads(response.text)
+
+    def call(self, method: str, params: list) -> dict:
+        return self.post(_json_rpc_request(method, params))
+
+    def batch(self, calls: list, max_batch_size: int = DEFAULT_BATCH_SIZE) -> list:
+        """
+        Sends (method, params) calls as JSON-RPC batches, one request body per
+        max_batch_size calls.
+        Returns:
+          list: the response of each call (with its result or error) in call order
+        """
+        requests = _batch_requests(calls)
+        responses = []
+        for chunk in _batch_chunks(requests, max_batch_size):
+            responses.extend(_batch_responses(self.post(chunk)))
+        return _demultiplex(len(requests), responses)
+
+    def get_transaction_bytes(self, json_rpc_payload) -> str:
+        return _transaction_bytes(self.post(json_rpc_payload))
+
+    def unsafe_moveCall(self, params: list, function_name: str, function_library: str, userAddress: str, packageId: str, gasBudget: int = 100000000, typeArguments: list = []) -> str:
+        return _transaction_bytes(
+            self.post(_move_call_request(params, function_name, function_library, userAddress, packageId, gasBudget, typeArguments))
+        )
+
+    def _post_with_retries(self, payload: dict, maxRetries: int = None) -> dict:
+        return self.retry_policy.call(self.post, json.dumps(payload), max_attempts=maxRetries)
+
+    def execute_transaction_block(self, txBytes: str, signature: str, maxRetries: int = None, response_options: dict = None, finality: EXECUTION_FINALITY = None) -> dict:
+        return self._post_with_retries(
+            _execute_transaction_block_request(txBytes, signature, response_options, finality), maxRetries
+        )
+
+    def get_dynamic_field_object(self, parentObjectId: str, fieldName: str, fieldSuiObjectType: str, maxRetries: int = None) -> dict:
+        return self._post_with_retries(
+            _dynamic_field_object_request(parentObjectId, fieldName, fieldSuiObjectType), maxRetries
+        )
+
+    def call_sui_function(self, params: list, method: str = "suix_getCoins") -> SuiGetResponse:
+        return SuiGetResponse(self.call(method, params)["result"])
+
+    def create_split_coins_transaction(self, owner: str, primary_coin_id: str = None, split_amounts: list = [], gas_budget: int = 100000000) -> str:
+        return _transaction_bytes(self.post(_split_coins_request(owner, primary_coin_id, split_amounts, gas_budget)))
+
+    def create_merge_coins_transaction(self, primary_coin_id: str, coin_id: str, userAddress: str, gasBudget: int = 100000000) -> str:
+        return _transaction_bytes(self.post(_merge_coins_request(primary_coin_id, coin_id, userAddress, gasBudget)))
+
+    def get_coin_balance(self, user_address: str, coin_type: str = "0x::sui::SUI") -> str:
+        return self.call_sui_function([user_address, coin_type], method="suix_getBalance").raw_response["totalBalance"]
+
+    def get_coin_metadata(self, coin_type: str) -> CoinMetadata:
+        return _coin_metadata(self.call("suix_getCoinMetadata", [coin_type]))
+
+    def get_coins_with_type(self, user_address: str, coin_type: str = "0x::sui::SUI") -> list[Coin]:
+        coins = []
+        cursor = None
+        while True:
+            response = self.call_sui_function(_coins_page_params(user_address, coin_type, cursor), method="suix_getCoins")
+            coins.extend([Coin(element) for element in response.data])
+            if not response.has_next_page:
+                return coins
+            cursor = response.next_cursor
+
+
+class AsyncSuiRpcClient:
+    """
+    asyncio JSON-RPC client of a Sui node on an aiohttp session, so calls made
+    from async code don't block the event loop. Mirrors SuiRpcClient.
+    """
+
+    def __init__(self, url: str, session=None, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = None, retry_policy: RetryPolicy = None):
+        """
+        Inputs:
+          url: url of the node
+          session (aiohttp.ClientSession): optional session to share, e.g. the
+            BluefinClient APIService session. It is not closed by close.
+            A session is created on the first call when not provided.
+          pool_size: connections kept open to the node by the created session
+          timeout: optional seconds to wait for a response
+          retry_policy (RetryPolicy): retries of transaction executions and
+            dynamic field reads, defaults to RetryPolicy()
+        """
+        self.url = url
+        self.session = session
+        self.owns_session = session is None
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    async def close(self):
+        if self.owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _client_session(self):
+        if self.session is None:
+            import aiohttp
+
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size, keepalive_timeout=60)
+            )
+        return self.session
+
+    async def post(self, payload) -> dict:
+        """
+        Sends a JSON-RPC payload (dict or serialized string) and returns the decoded response
+        """
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        kwargs = {}
+        if self.timeout is not None:
+            import aiohttp
+
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=self.timeout)
+        async with self._client_session().post(self.url, headers=HEADERS, data=payload, **kwargs) as response:
+            return json.loads(await response.read())
+
+    async def call(self, method: str, params: list) -> dict:
+        return await self.post(_json_rpc_request(method, params))
+
+    async def batch(self, calls: list, max_batch_size: int = DEFAULT_BATCH_SIZE) -> list:
+        """
+        Sends (method, params) calls as JSON-RPC batches, one request body per
+        max_batch_size calls, the bodies are sent concurrently.
+        Returns:
+          list: the response of each call (with its result or error) in call order
+        """
+        requests = _batch_requests(calls)
+        chunks = await asyncio.gather(
+            *[self.post(chunk) for chunk in _batch_chunks(requests, max_batch_size)]
+        )
+        responses = []
+        for chunk in chunks:
+            responses.extend(_batch_responses(chunk))
+        return _demultiplex(len(requests), responses)
+
+    async def get_transaction_bytes(self, json_rpc_payload) -> str:
+        return _transaction_bytes(await self.post(json_rpc_payload))
+
+    async def unsafe_moveCall(self, params: list, function_name: str, function_library: str, userAddress: str, packageId: str, gasBudget: int = 100000000, typeArguments: list = []) -> str:
+        return _transaction_bytes(
+            await self.post(_move_call_request(params, function_name, function_library, userAddress, packageId, gasBudget, typeArguments))
+        )
+
+    async def _post_with_retries(self, payload: dict, maxRetries: int = None) -> dict:
+        return await self.retry_policy.call_async(self.post, json.dumps(payload), max_attempts=maxRetries)
+
+    async def execute_transaction_block(self, txBytes: str, signature: str, maxRetries: int = None, response_options: dict = None, finality: EXECUTION_FINALITY = None) -> dict:
+        return await self._post_with_retries(
+            _execute_transaction_block_request(txBytes, signature, response_options, finality), maxRetries
+        )
+
+    async def get_dynamic_field_object(self, parentObjectId: str, fieldName: str, fieldSuiObjectType: str, maxRetries: int = None) -> dict:
+        return await self._post_with_retries(
+            _dynamic_field_object_request(parentObjectId, fieldName, fieldSuiObjectType), maxRetries
+        )
+
+    async def call_sui_function(self, params: list, method: str = "suix_getCoins") -> SuiGetResponse:
+        return SuiGetResponse((await self.call(method, params))["result"])
+
+    async def create_split_coins_transaction(self, owner: str, primary_coin_id: str = None, split_amounts: list = [], gas_budget: int = 100000000) -> str:
+        return _transaction_bytes(await self.post(_split_coins_request(owner, primary_coin_id, split_amounts, gas_budget)))
+
+    async def create_merge_coins_transaction(self, primary_coin_id: str, coin_id: str, userAddress: str, gasBudget: int = 100000000) -> str:
+        return _transaction_bytes(await self.post(_merge_coins_request(primary_coin_id, coin_id, userAddress, gasBudget)))
+
+    async def get_coin_balance(self, user_address: str, coin_type: str = "0x::sui::SUI") -> str:
+        return (await self.call_sui_function([user_address, coin_type], method="suix_getBalance")).raw_response["totalBalance"]
+
+    async def get_coin_metadata(self, coin_type: str) -> CoinMetadata:
+        return _coin_metadata(await self.call("suix_getCoinMetadata", [coin_type]))
+
+    async def get_coins_with_type(self, user_address: str, coin_type: str = "0x::sui::SUI") -> list[Coin]:
+        return [coin async for coin in self.iter_coins_with_type(user_address, coin_type)]
+
+    async def iter_coins_with_type(self, user_address: str, coin_type: str = "0x::sui::SUI") -> AsyncIterator[Coin]:
+        """
+        Yields the coins of a type owned by the user as their pages arrive. The next
+        page is requested before the coins of a page are yielded, so reading it
+        overlaps building the coins and whatever the caller does with them.
+        Leaving the loop early cancels the page being read.
+        """
+        page = asyncio.ensure_future(self._coins_page(user_address, coin_type, None))
+        try:
+            while page is not None:
+                response = await page
+                page = None
+                if response.has_next_page:
+                    page = asyncio.ensure_future(self._coins_page(user_address, coin_type, response.next_cursor))
+                for element in response.data:
+                    yield Coin(element)
+        finally:
+            if page is not None and not page.cancel():
+                # already read, its error is not raised to anyone
+                page.exception()
+
+    async def _coins_page(self, user_address: str, coin_type: str, cursor) -> SuiGetResponse:
+        return await self.call_sui_function(_coins_page_params(user_address, coin_type, cursor), method="suix_getCoins")
+
+
+_rpc_clients = {}
+_rpc_clients_lock = threading.Lock()
+
+
+def get_rpc_client(url: str) -> SuiRpcClient:
+    """
+    Returns the SuiRpcClient shared by the rpc_* functions for a node url
+    """
+    client = _rpc_clients.get(url)
+    if client is None:
+        with _rpc_clients_lock:
+            client = _rpc_clients.get(url)
+            if client is None:
+                client = _rpc_clients[url] = SuiRpcClient(url)
+    return client
 
-LOCKED_OBJECT_ERROR_CODE = (
-    "Failed to sign transaction by a quorum of validators because of locked objects"
-)
 
 def rpc_sui_getTransactionBytes(url: str, json_rpc_payload: str) -> str:
     """
@@ -18,12 +406,7 @@ def rpc_sui_getTransactionBytes(url: str, json_rpc_payload: str) -> str:
     Output:
       str: The txBytes.
     """
-    headers = {"Content-Type": "application/json"}
-    response = requests.request("POST", url, headers=headers, data=json_rpc_payload)
-    responseJson = json.loads(response.text)
-    if "result" not in responseJson or "txBytes" not in responseJson["result"]:
-        raise Exception(f"Failed to create transaction bytes due to: {responseJson}")
-    return responseJson["result"]["txBytes"]
+    return get_rpc_client(url).get_transaction_bytes(json_rpc_payload)
 
 def rpc_unsafe_moveCall(
     url: str,
@@ -51,72 +434,30 @@ def rpc_unsafe_moveCall(
       Returns the request form serialized in bytes ready to be signed.
 
     """
-    base_dict = {}
-    base_dict["jsonrpc"] = "2.0"
-    base_dict["method"] = "unsafe_moveCall"
-    base_dict["id"] = 1
-    base_dict["params"] = []
-    base_dict["params"].extend(
-        [userAddress, packageId, function_library, function_name]
+    return get_rpc_client(url).unsafe_moveCall(
+        params, function_name, function_library, userAddress, packageId, gasBudget, typeArguments
     )
 
-    # Optional type arguments for wormhole related calls
-    base_dict["params"].append(typeArguments)
-    base_dict["params"].append(params)
-
-    base_dict["params"].append(None)
-    base_dict["params"].append(str(gasBudget))
-
-    payload = json.dumps(base_dict)
-
-    return rpc_sui_getTransactionBytes(url, payload)
-
-def rpc_sui_executeTransactionBlock(url: str, txBytes: str, signature: str , maxRetries=5) -> any:
+def rpc_sui_executeTransactionBlock(url: str, txBytes: str, signature: str , maxRetries=None, response_options: dict = None, finality: EXECUTION_FINALITY = None) -> any:
     """
     Execute the SUI call on sui chain
     Inputs:
       url: url of the node
       txBytes: the call in serialised form
       signature: txBytes signed by signer
+      maxRetries(optional): attempts made, defaults to the client's retry policy
+      response_options(optional): fields included in the response, defaults to
+        FULL_RESPONSE_OPTIONS. STATUS_RESPONSE_OPTIONS is enough to check the status
+      finality(optional): EXECUTION_FINALITY to wait for, defaults to WAIT_FOR_LOCAL_EXECUTION
 
     Output:
       result of transaction
 
 
     """
-    base_dict = {}
-    base_dict["jsonrpc"] = "2.0"
-    base_dict["id"] = 5
-    base_dict["method"] = "sui_executeTransactionBlock"
-    base_dict["params"] = []
-    base_dict["params"].append(txBytes)
-    base_dict["params"].append([signature])
-
-    outputTypeDict = {
-        "showInput": True,
-        "showEffects": True,
-        "showEvents": True,
-        "showObjectChanges": True,
-    }
-    base_dict["params"].append(outputTypeDict)
-    base_dict["params"].append("WaitForLocalExecution")
-    payload = json.dumps(base_dict)
+    return get_rpc_client(url).execute_transaction_block(txBytes, signature, maxRetries, response_options, finality)
 
-    headers = {"Content-Type": "application/json"}
-
-    for i in range(0, maxRetries):
-        response = requests.request("POST", url, headers=headers, data=payload)
-        result = json.loads(response.text)
-        if "error" in result:
-            if result["error"]["message"].find(LOCKED_OBJECT_ERROR_CODE) == -1:
-                return result
-        else:
-            return result
-
-        time.sleep(1)
-    return result
-
-def rpc_sui_getDynamicFieldObject(url:str, parentObjectId: str, fieldName: str,fieldSuiObjectType:str, maxRetries=5):
+def rpc_sui_getDynamicFieldObject(url:str, parentObjectId: str, fieldName: str,fieldSuiObjectType:str, maxRetries=None):
     """
     Fetches the on-chain dynamic field object corresponding to specified input params
     Inputs:
@@ -124,35 +465,27 @@ def rpc_sui_getDynamicFieldObject(url:str, parentObjectId: str, fieldName: str,f
       parentObjectId: id of the parent object for which dynamic field needs to be queried
       fieldName: name of the dynamic field
       fieldSuiObjectType: sui object type for the dynamic field name (eg. for string use , `0x1::string::String`)
+      maxRetries(optional): attempts made, defaults to the client's retry policy
 
     Output:
       sui result object for the dynamic field
     """
-    base_dict = {}
-    base_dict["jsonrpc"] = "2.0"
-    base_dict["id"] = 5
-    base_dict["method"] = "suix_getDynamicFieldObject"
-    base_dict["params"] = []
-    base_dict["params"].append(parentObjectId)
-    base_dict["params"].append({
-         "type": fieldSuiObjectType,
-         "value": fieldName
-    })
-    payload = json.dumps(base_dict)
-
-    headers = {"Content-Type": "application/json"}
-
-    for i in range(0, maxRetries):
-        response = requests.request("POST", url, headers=headers, data=payload)
-        result = json.loads(response.text)
-        if "error" in result:
-            if result["error"]["message"].find(LOCKED_OBJECT_ERROR_CODE) == -1:
-                return result
-        else:
-            return result
-
-        time.sleep(1)
-    return result
+    return get_rpc_client(url).get_dynamic_field_object(
+        parentObjectId, fieldName, fieldSuiObjectType, maxRetries
+    )
+
+def rpc_batch(url: str, calls: list, max_batch_size: int = DEFAULT_BATCH_SIZE) -> list:
+    """
+    Sends many JSON-RPC calls in one request body (array form).
+    Inputs:
+      url: url of node
+      calls: list of (method, params) tuples
+      max_batch_size(optional): calls per request body, larger lists are split
+
+    Output:
+      list: the response of each call (with its result or error) in call order
+    """
+    return get_rpc_client(url).batch(calls, max_batch_size)
 
 def rpc_call_sui_function(url: str, params: list[Any], method: str = "suix_getCoins") -> SuiGetResponse:
     """
@@ -165,17 +498,7 @@ def rpc_call_sui_function(url: str, params: list[Any], method: str = "suix_getCo
     Output:
       SuiGetResponse: The response containing data.
     """
-    base_dict = {}
-    base_dict["jsonrpc"] = "2.0"
-    base_dict["id"] = 1
-    base_dict["method"] = method
-    base_dict["params"] = params
-    payload = json.dumps(base_dict)
-
-    headers = {"Content-Type": "application/json"}
-    response = requests.request("POST", url, headers=headers, data=payload)
-    result = json.loads(response.text)
-    return SuiGetResponse(result["result"])
+    return get_rpc_client(url).call_sui_function(params, method)
 
 def rpc_sui_createSplitCoinsTransaction(owner: str, primary_coin_id: str = None, split_amounts: list[str] = [], url: str = None, gas_budget: int = 100000000):
     """
@@ -192,28 +515,7 @@ def rpc_sui_createSplitCoinsTransaction(owner: str, primary_coin_id: str = None,
       transaction bytes of the split operation.
     """
     try:
-        # Check if split_amounts contains only number strings
-        for amount in split_amounts:
-            if not amount.isdigit():
-                raise ValueError(f"Invalid amount in split_amounts: {amount}")
-            
-        base_dict = {
-            "jsonrpc": "2.0",
-            "method": "unsafe_splitCoin",
-            "id": 1,
-            "params": [
-                owner,
-                primary_coin_id,
-                split_amounts,
-                None,  # gas object ID, let node pick one
-                str(gas_budget)
-            ]
-        }
-
-        payload = json.dumps(base_dict)
-
-        tx_bytes = rpc_sui_getTransactionBytes(url, payload)
-        return tx_bytes
+        return get_rpc_client(url).create_split_coins_transaction(owner, primary_coin_id, split_amounts, gas_budget)
     except Exception as e:
         raise Exception(f"Failed to split coins, Exception: {e}")
 
@@ -232,15 +534,7 @@ def rpc_sui_createMergeCoinsTransaction(url: str, primary_coin_id: str, coin_id:
       str: The transaction bytes.
     """
     try:
-        base_dict = {
-            "jsonrpc": "2.0",
-            "method": "unsafe_mergeCoins",
-            "id": 1,
-            "params": [userAddress, primary_coin_id, coin_id, None, str(gasBudget)]
-        }
-
-        payload = json.dumps(base_dict)
-        return rpc_sui_getTransactionBytes(url, payload)
+        return get_rpc_client(url).create_merge_coins_transaction(primary_coin_id, coin_id, userAddress, gasBudget)
     except Exception as e:
         raise Exception(f"Failed to merge coins, Exception: {e}")
 
@@ -255,17 +549,10 @@ def get_coin_balance(user_address: str = None, coin_type: str = "0x::sui::SUI",
         str: The balance of the coin scaled to coin decimals supported by the coin. Eg: 1000000000 for 1 SUI.
     """
     try:
-        callArgs = []
-        callArgs.append(user_address)
-        callArgs.append(coin_type)
-        result = rpc_call_sui_function(
-            url, callArgs, method="suix_getBalance"
-        )
-        return result.raw["totalBalance"]
+        return get_rpc_client(url).get_coin_balance(user_address, coin_type)
     except Exception as e:
         raise (Exception("Failed to get coin balance, Exception: {}".format(e)))
 
-
 def get_coin_having_balance(user_address: str = None, coin_type: str = "0x::sui::SUI", balance: str = None , url: str = None, exact_match: bool = False) -> str:
     """
     Gets the coin having the specified balance.
@@ -300,20 +587,7 @@ def get_coin_metadata(url: str, coin_type: str) -> CoinMetadata:
     Output:
       CoinMetadata: The metadata of the coin.
     """
-    base_dict = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "suix_getCoinMetadata",
-        "params": [coin_type]
-    }
-
-    payload = json.dumps(base_dict)
-    headers = {"Content-Type": "application/json"}
-    response = requests.request("POST", url, headers=headers, data=payload)
-    responseJson = json.loads(response.text)
-    if "result" not in responseJson:
-        raise Exception(f"Failed to fetch coin metadata due to: {responseJson}")
-    return CoinMetadata(responseJson["result"])
+    return get_rpc_client(url).get_coin_metadata(coin_type)
 
 def get_coins_with_type(user_address: str = None, coin_type: str = "0x::sui::SUI", url: str = None) -> list[Coin]:
     """
@@ -328,17 +602,7 @@ def get_coins_with_type(user_address: str = None, coin_type: str = "0x::sui::SUI
       list[Coin]: A list of Coin objects.
     """
     try:
-        coins = []
-        cursor = None
-        while True:
-            callArgs = [user_address, coin_type]
-            if cursor:
-                callArgs.append(cursor)
-            response = rpc_call_sui_function(url, callArgs, method="suix_getCoins")
-            coins.extend([Coin(element) for element in response.data])
-            if not response.has_next_page:
-                break
-            cursor = response.next_cursor
-        return coins
+        return get_rpc_client(url).get_coins_with_type(user_address, coin_type)
     except Exception as e:
-        raise Exception(f"Failed to get coins, Exception: {e}")
\ No newline at end of file
+        raise Exception(f"Failed to get coins, Exception: {e}")
+
@@ -4,8 +4,8 @@ import json
 import base64
 from nacl.signing import *
 from .sui_interfaces import TransactionResult
-from .enumerations import WALLET_SCHEME
-from .account import SuiWallet
+from .enumerations import EXECUTION_FINALITY, WALLET_SCHEME
+from .account import SuiWallet, get_signing_key
 from .utilities import *
 from .bcs import *
 from .rpc import rpc_sui_executeTransactionBlock
@@ -51,16 +51,16 @@ class Signer:
         intent = intent + tx_bytes
         hash = hashlib.blake2b(intent, digest_size=32).digest()
 
-        result = nacl.signing.SigningKey(sui_wallet.privateKeyBytes).sign(hash)[:64]
+        result = preferred_sui_wallet.getSigningKey().sign(hash)[:64]
         temp = bytearray()
         temp.append(0)
         temp.extend(result)
-        temp.extend(sui_wallet.publicKeyBytes)
+        temp.extend(preferred_sui_wallet.publicKeyBytes)
         res = base64.b64encode(temp)
         return res.decode()
     
   
-    def sign_and_execute_tx(self, tx_bytes: str, sui_wallet: SuiWallet = None, url: str = None) -> TransactionResult:
+    def sign_and_execute_tx(self, tx_bytes: str, sui_wallet: SuiWallet = None, url: str = None, response_options: dict = None, finality: EXECUTION_FINALITY = None) -> TransactionResult:
         """
         Signs the transaction and executes it on the SUI chain.
         
@@ -68,6 +68,9 @@ class Signer:
             tx_bytes (str): The transaction bytes in string format.
             sui_wallet (SuiWallet): The SuiWallet object.
             url (str): The URL of the node.
+            response_options (dict): optional response fields, defaults to FULL_RESPONSE_OPTIONS.
+                The effects have to be included (e.g. STATUS_RESPONSE_OPTIONS).
+            finality (EXECUTION_FINALITY): optional finality to wait for, defaults to WAIT_FOR_LOCAL_EXECUTION.
 
         Output:
             dict: The result of the transaction execution.
@@ -86,7 +89,9 @@ class Signer:
         
         try:
             signature = self.sign_tx(tx_bytes, preferred_sui_wallet)
-            tx = rpc_sui_executeTransactionBlock(url, tx_bytes, signature)
+            tx = rpc_sui_executeTransactionBlock(
+                url, tx_bytes, signature, response_options=response_options, finality=finality
+            )
             return TransactionResult(tx)
         except Exception as e:
             raise Exception(f"Failed to sign and execute transaction, Exception: {e}")
@@ -102,7 +107,7 @@ class Signer:
         Output:
             Returns the signature of the hash in bytes format.
         """
-        result = nacl.signing.SigningKey(private_key).sign(hash)[:64]
+        result = get_signing_key(private_key).sign(hash)[:64]
         return result.hex() + "1" + append
 
     
@@ -160,13 +165,13 @@ class Signer:
         blake2bHash = hashlib.blake2b(intent, digest_size=32).digest()
 
         # Sign the hash
-        signature = nacl.signing.SigningKey(wallet.privateKeyBytes).sign(blake2bHash)[:64]
+        signature = preferred_wallet.getSigningKey().sign(blake2bHash)[:64]
 
         serializer = BCSSerializer()
-        serializer.serialize_u8(WALLET_SCHEME[wallet.getKeyScheme()])
+        serializer.serialize_u8(WALLET_SCHEME[preferred_wallet.getKeyScheme()])
         
         # Construct Signature in accurate format (scheme + signature + publicKey)
-        return serializer.get_bytes() + signature + wallet.publicKeyBytes
+        return serializer.get_bytes() + signature + preferred_wallet.publicKeyBytes
     
     def sign_bytes(self, bytes: bytearray, private_key: bytes = None) -> bytes:
         """
@@ -188,7 +193,7 @@ class Signer:
         if preferred_private_key is None:
             raise ValueError("Private key is not provided")
 
-        result = nacl.signing.SigningKey(preferred_private_key).sign(bytes)[:64]
+        result = get_signing_key(preferred_private_key).sign(bytes)[:64]
         return result
 
     def verify_signature(self, message: bytes, signature: bytes, public_key: bytes, scheme: str) -> bool:
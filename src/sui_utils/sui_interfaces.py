@@ -63,6 +63,9 @@ class CoinMetadata:
 
 
 class Coin:
+    # no instance dict, coin listings can hold thousands of them
+    __slots__ = ("coin_type", "coin_object_id", "version", "digest", "balance", "previous_transaction")
+
     def __init__(self, coin_data: dict):
         self.coin_type : str = coin_data.get("coinType")
         self.coin_object_id : str= coin_data.get("coinObjectId")
@@ -81,6 +84,8 @@ class NextCursor:
 
 
 class SuiGetResponse:
+    __slots__ = ("raw_response", "data", "next_cursor", "has_next_page")
+
     def __init__(self, response: dict):
         self.raw_response : dict = response
         self.data : list[Any] = response.get("data", [])
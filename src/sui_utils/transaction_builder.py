@@ -0,0 +1,774 @@
+"""
+Builds Sui programmable transactions (TransactionData V1) on the client, so an
+on-chain call is a single execute round trip instead of unsafe_moveCall
+followed by the execution.
+Move function signatures, shared objects and the reference gas price are
+cached, references of owned objects and gas coins are kept current from the
+effects of the transactions executed.
+"""
+import base64
+from .bcs import (
+    BCS_ADDRESS,
+    BCS_BOOL,
+    BCS_BYTES,
+    BCS_DIGEST,
+    BCS_STRING,
+    BCS_U16,
+    BCS_U64,
+    BCSEnum,
+    BCSOption,
+    BCSSerializer,
+    BCSStruct,
+    BCSVector,
+)
+from .object_cache import ObjectCache
+from .retry import LOCKED_OBJECT_ERROR_CODE
+from .sui_interfaces import Coin
+from .utilities import hex_address_to_bytes32, normalize_address, strip_hex_prefix
+
+SUI_COIN_TYPE = "0x2::sui::SUI"
+DEFAULT_GAS_BUDGET = 100000000
+
+# BCS enum variants of the transaction types
+TRANSACTION_DATA_V1 = 0
+PROGRAMMABLE_TRANSACTION = 0
+CALL_ARG_PURE = 0
+CALL_ARG_OBJECT = 1
+OBJECT_ARG_IMM_OR_OWNED = 0
+OBJECT_ARG_SHARED = 1
+COMMAND_MOVE_CALL = 0
+COMMAND_MERGE_COINS = 3
+ARGUMENT_GAS_COIN = 0
+ARGUMENT_INPUT = 1
+EXPIRATION_NONE = 0
+
+TYPE_TAGS = {
+    "bool": 0,
+    "u8": 1,
+    "u64": 2,
+    "u128": 3,
+    "address": 4,
+    "signer": 5,
+    "u16": 8,
+    "u32": 9,
+    "u256": 10,
+}
+TYPE_TAG_VECTOR = 6
+TYPE_TAG_STRUCT = 7
+
+# layouts of TransactionData, compiled once, e.g. to read transactions built by the node
+OBJECT_REF = BCSStruct("ObjectRef", [("object_id", BCS_ADDRESS), ("version", BCS_U64), ("digest", BCS_DIGEST)])
+SHARED_OBJECT_REF = BCSStruct(
+    "SharedObjectRef", [("object_id", BCS_ADDRESS), ("initial_shared_version", BCS_U64), ("mutable", BCS_BOOL)]
+)
+TYPE_TAG = BCSEnum("TypeTag")
+STRUCT_TAG = BCSStruct(
+    "StructTag",
+    [("address", BCS_ADDRESS), ("module", BCS_STRING), ("name", BCS_STRING), ("type_params", BCSVector(TYPE_TAG))],
+)
+TYPE_TAG.define(
+    [
+        ("bool", None),
+        ("u8", None),
+        ("u64", None),
+        ("u128", None),
+        ("address", None),
+        ("signer", None),
+        ("vector", TYPE_TAG),
+        ("struct", STRUCT_TAG),
+        ("u16", None),
+        ("u32", None),
+        ("u256", None),
+    ]
+)
+ARGUMENT = BCSEnum(
+    "Argument",
+    [
+        ("GasCoin", None),
+        ("Input", BCS_U16),
+        ("Result", BCS_U16),
+        ("NestedResult", BCSStruct("NestedResult", [("result", BCS_U16), ("index", BCS_U16)])),
+    ],
+)
+CALL_ARG = BCSEnum(
+    "CallArg",
+    [
+        ("Pure", BCS_BYTES),
+        (
+            "Object",
+            BCSEnum(
+                "ObjectArg",
+                [("ImmOrOwnedObject", OBJECT_REF), ("SharedObject", SHARED_OBJECT_REF), ("Receiving", OBJECT_REF)],
+            ),
+        ),
+    ],
+)
+COMMAND = BCSEnum(
+    "Command",
+    [
+        (
+            "MoveCall",
+            BCSStruct(
+                "ProgrammableMoveCall",
+                [
+                    ("package", BCS_ADDRESS),
+                    ("module", BCS_STRING),
+                    ("function", BCS_STRING),
+                    ("type_arguments", BCSVector(TYPE_TAG)),
+                    ("arguments", BCSVector(ARGUMENT)),
+                ],
+            ),
+        ),
+        ("TransferObjects", BCSStruct("TransferObjects", [("objects", BCSVector(ARGUMENT)), ("address", ARGUMENT)])),
+        ("SplitCoins", BCSStruct("SplitCoins", [("coin", ARGUMENT), ("amounts", BCSVector(ARGUMENT))])),
+        ("MergeCoins", BCSStruct("MergeCoins", [("destination", ARGUMENT), ("sources", BCSVector(ARGUMENT))])),
+        ("Publish", BCSStruct("Publish", [("modules", BCSVector(BCS_BYTES)), ("dependencies", BCSVector(BCS_ADDRESS))])),
+        ("MakeMoveVec", BCSStruct("MakeMoveVec", [("type", BCSOption(TYPE_TAG)), ("elements", BCSVector(ARGUMENT))])),
+        (
+            "Upgrade",
+            BCSStruct(
+                "Upgrade",
+                [
+                    ("modules", BCSVector(BCS_BYTES)),
+                    ("dependencies", BCSVector(BCS_ADDRESS)),
+                    ("package", BCS_ADDRESS),
+                    ("ticket", ARGUMENT),
+                ],
+            ),
+        ),
+    ],
+)
+GAS_DATA = BCSStruct(
+    "GasData", [("payment", BCSVector(OBJECT_REF)), ("owner", BCS_ADDRESS), ("price", BCS_U64), ("budget", BCS_U64)]
+)
+# only programmable transactions are sent by clients, the system transaction kinds are not read
+TRANSACTION_KIND = BCSEnum(
+    "TransactionKind",
+    [
+        (
+            "ProgrammableTransaction",
+            BCSStruct("ProgrammableTransaction", [("inputs", BCSVector(CALL_ARG)), ("commands", BCSVector(COMMAND))]),
+        )
+    ],
+)
+TRANSACTION_DATA = BCSEnum(
+    "TransactionData",
+    [
+        (
+            "V1",
+            BCSStruct(
+                "TransactionDataV1",
+                [
+                    ("kind", TRANSACTION_KIND),
+                    ("sender", BCS_ADDRESS),
+                    ("gas_data", GAS_DATA),
+                    ("expiration", BCSEnum("TransactionExpiration", [("None", None), ("Epoch", BCS_U64)])),
+                ],
+            ),
+        )
+    ],
+)
+
+# messages of execution errors caused by out of date owned object references, the
+# transaction was rejected before execution and can be built again with fresh ones
+STALE_OBJECT_ERROR_MESSAGES = (
+    LOCKED_OBJECT_ERROR_CODE,
+    "not available for consumption",
+    "ObjectVersionUnavailableForConsumption",
+    "Could not find the referenced object",
+    "ObjectNotFound",
+)
+
+
+def is_stale_object_error(result) -> bool:
+    """
+    True for JSON-RPC responses holding an error saying owned object versions
+    are stale or locked. Other errors (e.g. a finality timeout) don't tell the
+    transaction was not executed, it must not be sent again.
+    """
+    if not isinstance(result, dict) or "error" not in result:
+        return False
+    message = str(result["error"].get("message", ""))
+    return any(stale in message for stale in STALE_OBJECT_ERROR_MESSAGES)
+
+
+# normalized Move types of pure arguments, with their size in bytes
+UNSIGNED_TYPES = {"U8": 1, "U16": 2, "U32": 4, "U64": 8, "U128": 16, "U256": 32}
+STRING_STRUCTS = {("0x1", "string", "String"), ("0x1", "ascii", "String")}
+ID_STRUCT = ("0x2", "object", "ID")
+OPTION_STRUCT = ("0x1", "option", "Option")
+TX_CONTEXT_STRUCT = ("0x2", "tx_context", "TxContext")
+
+# inputs of a transaction
+PURE_INPUT = "pure"
+SHARED_INPUT = "shared"
+OWNED_INPUT = "owned"
+
+
+def _struct_key(struct: dict) -> tuple:
+    # framework addresses in their short form, 0x1 and 0x2
+    address = strip_hex_prefix(struct["address"].lower()).lstrip("0") or "0"
+    return ("0x" + address, struct["module"], struct["name"])
+
+
+def _reference_type(move_type):
+    """
+    Returns (type, mutable) of a normalized parameter type, references removed
+    """
+    if isinstance(move_type, dict):
+        if "Reference" in move_type:
+            return move_type["Reference"], False
+        if "MutableReference" in move_type:
+            return move_type["MutableReference"], True
+    return move_type, True
+
+
+def _is_tx_context(move_type) -> bool:
+    move_type, _ = _reference_type(move_type)
+    return isinstance(move_type, dict) and "Struct" in move_type and _struct_key(move_type["Struct"]) == TX_CONTEXT_STRUCT
+
+
+def _is_object(move_type) -> bool:
+    move_type, _ = _reference_type(move_type)
+    if isinstance(move_type, dict) and "Struct" in move_type:
+        key = _struct_key(move_type["Struct"])
+        return key not in STRING_STRUCTS and key not in (ID_STRUCT, OPTION_STRUCT)
+    if isinstance(move_type, dict) and "TypeParameter" in move_type:
+        raise ValueError("Generic parameters are not supported by the local builder")
+    return False
+
+
+def serialize_pure(serializer: BCSSerializer, move_type, value):
+    """
+    Serializes a JSON argument as the BCS value of a normalized Move type, the
+    way the node converts unsafe_moveCall arguments: numbers may be strings,
+    vector<u8> strings are hex when 0x prefixed and utf-8 otherwise.
+    """
+    if move_type == "Bool":
+        if isinstance(value, str):
+            value = value.lower() == "true"
+        serializer.serialize_bool(value)
+    elif isinstance(move_type, str) and move_type in UNSIGNED_TYPES:
+        size = UNSIGNED_TYPES[move_type]
+        value = int(value)
+        if not 0 <= value < 2 ** (size * 8):
+            raise ValueError(f"Value out of range for {move_type}: {value}")
+        serializer.serialize_raw_bytes(value.to_bytes(size, "little"))
+    elif move_type == "Address":
+        serializer.serialize_raw_bytes(hex_address_to_bytes32(normalize_address(value)))
+    elif isinstance(move_type, dict) and "Vector" in move_type:
+        element_type = move_type["Vector"]
+        if element_type == "U8" and isinstance(value, str):
+            data = bytes.fromhex(value[2:]) if value.startswith("0x") else value.encode("utf-8")
+            serializer.serialize_uleb128_bytes(data)
+        else:
+            serializer.serialize_uleb128(len(value))
+            for element in value:
+                serialize_pure(serializer, element_type, element)
+    elif isinstance(move_type, dict) and "Struct" in move_type:
+        key = _struct_key(move_type["Struct"])
+        if key in STRING_STRUCTS:
+            serializer.serialize_uleb128_str(str(value))
+        elif key == ID_STRUCT:
+            serializer.serialize_raw_bytes(hex_address_to_bytes32(normalize_address(value)))
+        elif key == OPTION_STRUCT:
+            if isinstance(value, list):
+                value = value[0] if value else None
+            if value is None:
+                serializer.serialize_u8(0)
+            else:
+                serializer.serialize_u8(1)
+                serialize_pure(serializer, move_type["Struct"]["typeArguments"][0], value)
+        else:
+            raise ValueError(f"Struct {key} can not be passed as a pure argument")
+    else:
+        raise ValueError(f"Unsupported pure argument type: {move_type}")
+
+
+def _split_type_arguments(text: str) -> list:
+    arguments = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(text):
+        if char == "<":
+            depth += 1
+        elif char == ">":
+            depth -= 1
+        elif char == "," and depth == 0:
+            arguments.append(text[start:index].strip())
+            start = index + 1
+    arguments.append(text[start:].strip())
+    return arguments
+
+
+def serialize_type_tag(serializer: BCSSerializer, type_tag: str):
+    """
+    Serializes a type argument such as u64, vector<u8> or 0x2::coin::Coin<0x2::sui::SUI>
+    """
+    type_tag = type_tag.strip()
+    if type_tag in TYPE_TAGS:
+        serializer.serialize_u8(TYPE_TAGS[type_tag])
+        return
+    if type_tag.startswith("vector<") and type_tag.endswith(">"):
+        serializer.serialize_u8(TYPE_TAG_VECTOR)
+        serialize_type_tag(serializer, type_tag[len("vector<") : -1])
+        return
+
+    type_parameters = []
+    if type_tag.endswith(">"):
+        start = type_tag.index("<")
+        type_parameters = _split_type_arguments(type_tag[start + 1 : -1])
+        type_tag = type_tag[:start]
+    address, module, name = type_tag.split("::")
+    serializer.serialize_u8(TYPE_TAG_STRUCT)
+    serializer.serialize_raw_bytes(hex_address_to_bytes32(normalize_address(address)))
+    serializer.serialize_uleb128_str(module)
+    serializer.serialize_uleb128_str(name)
+    serializer.serialize_uleb128(len(type_parameters))
+    for type_parameter in type_parameters:
+        serialize_type_tag(serializer, type_parameter)
+
+
+def _serialize_object_ref(serializer: BCSSerializer, object_ref: tuple):
+    # (object id, version, digest), packed at once
+    serializer.serialize_raw_bytes(OBJECT_REF.encode(object_ref))
+
+
+def decode_transaction_data(tx_bytes: str) -> tuple:
+    """
+    Reads base64 transaction bytes, e.g. built by the node, as ("V1", TransactionDataV1 dict)
+    """
+    return TRANSACTION_DATA.decode(base64.b64decode(tx_bytes))
+
+
+def serialize_move_call_transaction(
+    sender: str,
+    inputs: list,
+    package: str,
+    module: str,
+    function: str,
+    type_arguments: list,
+    arguments: list,
+    gas_payment: list,
+    gas_price: int,
+    gas_budget: int,
+) -> bytes:
+    """
+    Serializes TransactionData V1 of a programmable transaction with a single Move call.
+    Inputs:
+      sender: address of the sender and gas owner
+      inputs: ("pure", bcs bytes), ("shared", object id, initial shared version, mutable)
+        or ("owned", object id, version, base58 digest) tuples
+      package, module, function: the Move function called
+      type_arguments: type arguments of the call as strings
+      arguments: index in inputs of each argument of the call
+      gas_payment: (object id, version, base58 digest) of the gas coins
+      gas_price: gas price, at least the reference gas price of the epoch
+      gas_budget: maximum gas paid by the transaction
+
+    Output:
+      bytes of the transaction, to be base64 encoded for signing and execution
+    """
+    serializer = BCSSerializer()
+    _serialize_inputs(serializer, inputs)
+
+    # commands, a single MoveCall
+    serializer.serialize_uleb128(1)
+    serializer.serialize_u8(COMMAND_MOVE_CALL)
+    serializer.serialize_raw_bytes(hex_address_to_bytes32(normalize_address(package)))
+    serializer.serialize_uleb128_str(module)
+    serializer.serialize_uleb128_str(function)
+    serializer.serialize_uleb128(len(type_arguments))
+    for type_argument in type_arguments:
+        serialize_type_tag(serializer, type_argument)
+    serializer.serialize_uleb128(len(arguments))
+    for argument in arguments:
+        _serialize_argument(serializer, argument)
+
+    _serialize_gas_data(serializer, sender, gas_payment, gas_price, gas_budget)
+    return serializer.get_bytes()
+
+
+def serialize_merge_coins_transaction(
+    sender: str,
+    inputs: list,
+    destination,
+    sources: list,
+    gas_payment: list,
+    gas_price: int,
+    gas_budget: int,
+) -> bytes:
+    """
+    Serializes TransactionData V1 of a programmable transaction merging coins with a
+    single MergeCoins command.
+    Inputs:
+      sender: address of the sender and gas owner
+      inputs: ("owned", object id, version, base58 digest) tuples of the coins
+      destination: index in inputs of the coin merged into, None to merge into the gas coin
+      sources: index in inputs of each coin merged
+      gas_payment: (object id, version, base58 digest) of the gas coins
+      gas_price: gas price, at least the reference gas price of the epoch
+      gas_budget: maximum gas paid by the transaction
+
+    Output:
+      bytes of the transaction, to be base64 encoded for signing and execution
+    """
+    serializer = BCSSerializer()
+    _serialize_inputs(serializer, inputs)
+
+    serializer.serialize_uleb128(1)
+    serializer.serialize_u8(COMMAND_MERGE_COINS)
+    _serialize_argument(serializer, destination)
+    serializer.serialize_uleb128(len(sources))
+    for source in sources:
+        _serialize_argument(serializer, source)
+
+    _serialize_gas_data(serializer, sender, gas_payment, gas_price, gas_budget)
+    return serializer.get_bytes()
+
+
+def _serialize_inputs(serializer: BCSSerializer, inputs: list):
+    serializer.serialize_u8(TRANSACTION_DATA_V1)
+    serializer.serialize_u8(PROGRAMMABLE_TRANSACTION)
+
+    serializer.serialize_uleb128(len(inputs))
+    for transaction_input in inputs:
+        kind = transaction_input[0]
+        if kind == PURE_INPUT:
+            serializer.serialize_u8(CALL_ARG_PURE)
+            serializer.serialize_uleb128_bytes(transaction_input[1])
+        elif kind == SHARED_INPUT:
+            _, object_id, initial_shared_version, mutable = transaction_input
+            serializer.serialize_u8(CALL_ARG_OBJECT)
+            serializer.serialize_u8(OBJECT_ARG_SHARED)
+            serializer.serialize_raw_bytes(hex_address_to_bytes32(object_id))
+            serializer.serialize_u64(initial_shared_version)
+            serializer.serialize_bool(mutable)
+        else:
+            serializer.serialize_u8(CALL_ARG_OBJECT)
+            serializer.serialize_u8(OBJECT_ARG_IMM_OR_OWNED)
+            _serialize_object_ref(serializer, transaction_input[1:])
+
+
+def _serialize_argument(serializer: BCSSerializer, argument):
+    # an input index, None for the gas coin
+    if argument is None:
+        serializer.serialize_u8(ARGUMENT_GAS_COIN)
+    else:
+        serializer.serialize_u8(ARGUMENT_INPUT)
+        serializer.serialize_u16(argument)
+
+
+def _serialize_gas_data(serializer: BCSSerializer, sender: str, gas_payment: list, gas_price: int, gas_budget: int):
+    serializer.serialize_raw_bytes(hex_address_to_bytes32(normalize_address(sender)))
+    serializer.serialize_uleb128(len(gas_payment))
+    for object_ref in gas_payment:
+        _serialize_object_ref(serializer, object_ref)
+    serializer.serialize_raw_bytes(hex_address_to_bytes32(normalize_address(sender)))
+    serializer.serialize_u64(gas_price)
+    serializer.serialize_u64(gas_budget)
+    serializer.serialize_u8(EXPIRATION_NONE)
+
+
+def _is_sui_coin_type(coin_type) -> bool:
+    if not coin_type or coin_type.count("::") != 2:
+        return False
+    address, module, name = coin_type.split("::")
+    return _looks_like_object_id(address) and int(address, 16) == 2 and (module, name) == ("sui", "SUI")
+
+
+def _looks_like_object_id(value) -> bool:
+    if not isinstance(value, str) or not value.startswith("0x") or len(value) < 3:
+        return False
+    try:
+        int(value, 16)
+    except ValueError:
+        return False
+    return True
+
+
+class _TransactionBuilder:
+    """
+    State and serialization shared by TransactionBuilder and AsyncTransactionBuilder
+    """
+
+    def __init__(self, sender: str, gas_budget: int = DEFAULT_GAS_BUDGET, objects: ObjectCache = None):
+        self.sender = normalize_address(sender)
+        self.gas_budget = gas_budget
+        # (package, module, function) -> parameter types, TxContext removed
+        self.functions = {}
+        # object id -> initial shared version, never changes
+        self.shared_objects = {}
+        # references and balances of the objects owned by the sender, SUI coins pay for gas
+        self.objects = objects if objects is not None else ObjectCache(sender)
+        self.gas_price = None
+        self.epoch = None
+
+    def invalidate(self):
+        """
+        Forgets the owned object references and the gas price, e.g. after an
+        execution failed or objects were used by a transaction built elsewhere.
+        Function signatures and shared objects are kept, they do not change.
+        """
+        self.objects.invalidate()
+        self.gas_price = None
+
+    def _reads(self, key: tuple, params: list, gas_budget: int) -> list:
+        """
+        Returns the (method, params) calls needed before the call can be built,
+        in one batch: ids not known yet are fetched before the signature tells
+        which arguments are objects, addresses among them are ignored.
+        """
+        calls = []
+        if key in self.functions:
+            candidates = [value for move_type, value in zip(self.functions[key], params) if _is_object(move_type)]
+        else:
+            calls.append(("sui_getNormalizedMoveFunction", list(key)))
+            candidates = params
+        return calls + self._object_and_gas_reads(candidates, gas_budget)
+
+    def _object_and_gas_reads(self, candidates: list, gas_budget: int, gas_coins: bool = True) -> list:
+        calls = []
+        unknown = []
+        for value in candidates:
+            if _looks_like_object_id(value):
+                object_id = normalize_address(value)
+                if object_id not in self.shared_objects and self.objects.get(object_id) is None and object_id not in unknown:
+                    unknown.append(object_id)
+        if unknown:
+            calls.append(("sui_multiGetObjects", [unknown, {"showOwner": True}]))
+        if gas_coins and sum(int(coin.balance) for coin in self.objects.known_coins(SUI_COIN_TYPE)) < gas_budget:
+            # gas coins not listed yet, or changed by an unknown amount
+            calls.append(("suix_getCoins", [self.sender, SUI_COIN_TYPE]))
+        if self.gas_price is None:
+            calls.append(("suix_getReferenceGasPrice", []))
+        return calls
+
+    def _load(self, calls: list, responses: list):
+        for (method, params), response in zip(calls, responses):
+            if "error" in response:
+                raise Exception(f"Failed to build transaction due to: {response['error']}")
+            result = response["result"]
+            if method == "sui_getNormalizedMoveFunction":
+                self.functions[tuple(params)] = [
+                    parameter for parameter in result["parameters"] if not _is_tx_context(parameter)
+                ]
+            elif method == "sui_multiGetObjects":
+                for item in result:
+                    if "data" in item:
+                        data = item["data"]
+                        self._track(data["owner"], data["objectId"], data["version"], data["digest"])
+            elif method == "suix_getCoins":
+                coins = [Coin(coin) for coin in result["data"]]
+                self.objects.load_coins(SUI_COIN_TYPE, coins, complete=not result.get("hasNextPage"))
+            else:
+                self.gas_price = int(result)
+
+    def _track(self, owner, object_id: str, version, digest: str):
+        object_id = normalize_address(object_id)
+        if isinstance(owner, dict) and "Shared" in owner:
+            self.shared_objects[object_id] = int(owner["Shared"]["initial_shared_version"])
+        self.objects.track(owner, object_id, version, digest)
+
+    def update_from_effects(self, effects: dict, balance_changes: dict = None):
+        """
+        Updates the cached references with the effects of an executed transaction,
+        balance_changes as in ObjectCache.update_from_effects
+        """
+        epoch = effects.get("executedEpoch")
+        if epoch != self.epoch:
+            # the reference gas price can change with the epoch
+            if self.epoch is not None:
+                self.gas_price = None
+            self.epoch = epoch
+        for key in ("created", "mutated", "unwrapped"):
+            for change in effects.get(key, []):
+                owner = change["owner"]
+                if isinstance(owner, dict) and "Shared" in owner:
+                    object_id = normalize_address(change["reference"]["objectId"])
+                    self.shared_objects[object_id] = int(owner["Shared"]["initial_shared_version"])
+        self.objects.update_from_effects(effects, balance_changes)
+
+    def _gas_payment(self, gas_budget: int, exclude: set) -> list:
+        """
+        Picks the largest SUI coins not used as inputs until they cover the budget
+        """
+        payment = []
+        total = 0
+        coins = sorted(self.objects.known_coins(SUI_COIN_TYPE), key=lambda coin: int(coin.balance), reverse=True)
+        for coin in coins:
+            if coin.coin_object_id in exclude:
+                continue
+            payment.append((coin.coin_object_id, int(coin.version), coin.digest))
+            total += int(coin.balance)
+            if total >= gas_budget:
+                return payment
+        raise Exception(f"Not enough SUI to pay a gas budget of {gas_budget} for {self.sender}")
+
+    def _build(self, key: tuple, params: list, type_arguments: list, gas_budget: int) -> str:
+        parameters = self.functions[key]
+        if len(parameters) != len(params):
+            raise ValueError(f"{key[1]}::{key[2]} expects {len(parameters)} arguments, got {len(params)}")
+
+        inputs = []
+        # input index of each pure value and object, repeated arguments share their input
+        indexes = {}
+        arguments = []
+        for move_type, value in zip(parameters, params):
+            if _is_object(move_type):
+                object_id = normalize_address(value)
+                _, mutable = _reference_type(move_type)
+                index = indexes.get(object_id)
+                if index is None:
+                    index = indexes[object_id] = len(inputs)
+                    if object_id in self.shared_objects:
+                        inputs.append((SHARED_INPUT, object_id, self.shared_objects[object_id], mutable))
+                    elif self.objects.get(object_id) is not None:
+                        inputs.append((OWNED_INPUT, object_id, *self.objects.get(object_id)[:2]))
+                    else:
+                        raise Exception(f"Object {object_id} is not available to {self.sender}")
+                elif mutable and inputs[index][0] == SHARED_INPUT:
+                    inputs[index] = inputs[index][:3] + (True,)
+            else:
+                serializer = BCSSerializer()
+                serialize_pure(serializer, move_type, value)
+                data = serializer.get_bytes()
+                index = indexes.get(data)
+                if index is None:
+                    index = indexes[data] = len(inputs)
+                    inputs.append((PURE_INPUT, data))
+            arguments.append(index)
+
+        exclude = {transaction_input[1] for transaction_input in inputs if transaction_input[0] == OWNED_INPUT}
+        tx_bytes = serialize_move_call_transaction(
+            self.sender,
+            inputs,
+            key[0],
+            key[1],
+            key[2],
+            type_arguments,
+            arguments,
+            self._gas_payment(gas_budget, exclude),
+            self.gas_price,
+            gas_budget,
+        )
+        return base64.b64encode(tx_bytes).decode()
+
+    def _build_merge(self, destination: str, sources: list, gas_budget: int, pays_gas: bool, exclude) -> tuple:
+        coins = [normalize_address(destination)] + [normalize_address(source) for source in sources]
+        references = []
+        for object_id in coins:
+            known = self.objects.get(object_id)
+            if known is None:
+                raise Exception(f"Coin {object_id} is not available to {self.sender}")
+            references.append((object_id, known[0], known[1]))
+
+        if pays_gas:
+            # SUI coins are merged into the destination paying for gas
+            inputs = [(OWNED_INPUT, *reference) for reference in references[1:]]
+            destination_argument = None
+            sources_arguments = list(range(len(inputs)))
+            gas_payment = [references[0]]
+        else:
+            inputs = [(OWNED_INPUT, *reference) for reference in references]
+            destination_argument = 0
+            sources_arguments = list(range(1, len(inputs)))
+            gas_payment = self._gas_payment(gas_budget, set(coins) | set(exclude))
+
+        tx_bytes = serialize_merge_coins_transaction(
+            self.sender,
+            inputs,
+            destination_argument,
+            sources_arguments,
+            gas_payment,
+            self.gas_price,
+            gas_budget,
+        )
+        return base64.b64encode(tx_bytes).decode(), [payment[0] for payment in gas_payment]
+
+    def _key(self, function_name: str, function_library: str, packageId: str) -> tuple:
+        return (normalize_address(packageId), function_library, function_name)
+
+
+class TransactionBuilder(_TransactionBuilder):
+    """
+    Builds transaction bytes locally with a SuiRpcClient for the reads.
+    The first call of a function fetches its signature, the objects, gas
+    coins and gas price in one batch, later calls need no request as long as
+    update_from_effects is given the effects of the executed transactions.
+    e.g.
+        builder = TransactionBuilder(get_rpc_client(url), wallet.getUserAddress(), objects=get_object_cache(url, wallet.getUserAddress()))
+        tx_bytes = builder.move_call(params, "deposit", "gateway", package_id)
+    """
+
+    def __init__(self, rpc, sender: str, gas_budget: int = DEFAULT_GAS_BUDGET, objects: ObjectCache = None):
+        """
+        Inputs:
+          rpc (SuiRpcClient): client used to read what is not cached
+          sender: address of the signer, paying for gas
+          gas_budget: default gas budget of the transactions
+          objects (ObjectCache): optional cache of the sender's objects to share,
+            e.g. get_object_cache(url, sender)
+        """
+        super().__init__(sender, gas_budget, objects)
+        self.rpc = rpc
+
+    def move_call(self, params: list, function_name: str, function_library: str, packageId: str, gasBudget: int = None, typeArguments: list = []) -> str:
+        """
+        Returns the base64 transaction bytes of a Move call, same arguments as
+        rpc_unsafe_moveCall without the sender
+        """
+        key = self._key(function_name, function_library, packageId)
+        gas_budget = int(gasBudget or self.gas_budget)
+        calls = self._reads(key, params, gas_budget)
+        if calls:
+            self._load(calls, self.rpc.batch(calls))
+        return self._build(key, params, typeArguments, gas_budget)
+
+    def merge_coins(self, destination: str, sources: list, gasBudget: int = None, coin_type: str = None, exclude=()) -> tuple:
+        """
+        Returns (base64 transaction bytes, gas coin ids) of a transaction merging
+        the source coins into the destination coin with one MergeCoins command.
+        SUI coins (coin_type) pay for gas with the destination coin, other coins
+        with SUI coins of the sender not in exclude.
+        """
+        gas_budget = int(gasBudget or self.gas_budget)
+        pays_gas = _is_sui_coin_type(coin_type)
+        calls = self._object_and_gas_reads([destination, *sources], gas_budget, gas_coins=not pays_gas)
+        if calls:
+            self._load(calls, self.rpc.batch(calls))
+        return self._build_merge(destination, sources, gas_budget, pays_gas, exclude)
+
+
+class AsyncTransactionBuilder(_TransactionBuilder):
+    """
+    asyncio version of TransactionBuilder reading with an AsyncSuiRpcClient
+    """
+
+    def __init__(self, rpc, sender: str, gas_budget: int = DEFAULT_GAS_BUDGET, objects: ObjectCache = None):
+        """
+        Inputs:
+          rpc (AsyncSuiRpcClient): client used to read what is not cached
+          sender: address of the signer, paying for gas
+          gas_budget: default gas budget of the transactions
+          objects (ObjectCache): optional cache of the sender's objects to share,
+            e.g. get_object_cache(url, sender)
+        """
+        super().__init__(sender, gas_budget, objects)
+        self.rpc = rpc
+
+    async def move_call(self, params: list, function_name: str, function_library: str, packageId: str, gasBudget: int = None, typeArguments: list = []) -> str:
+        key = self._key(function_name, function_library, packageId)
+        gas_budget = int(gasBudget or self.gas_budget)
+        calls = self._reads(key, params, gas_budget)
+        if calls:
+            self._load(calls, await self.rpc.batch(calls))
+        return self._build(key, params, typeArguments, gas_budget)
+
+    async def merge_coins(self, destination: str, sources: list, gasBudget: int = None, coin_type: str = None, exclude=()) -> tuple:
+        gas_budget = int(gasBudget or self.gas_budget)
+        pays_gas = _is_sui_coin_type(coin_type)
+        calls = self._object_and_gas_reads([destination, *sources], gas_budget, gas_coins=not pays_gas)
+        if calls:
+            self._load(calls, await self.rpc.batch(calls))
+        return self._build_merge(destination, sources, gas_budget, pays_gas, exclude)
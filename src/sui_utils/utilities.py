@@ -1,15 +1,15 @@
 import binascii
 from datetime import datetime
+from functools import lru_cache
 from random import randint
 import time
 import random
 
-from eth_utils import from_wei, to_wei
+from .fixed_point import from_fixed, to_fixed
 
 # from web3 import Web3
 import time
 from typing import Union
-import bip_utils
 import hashlib
 import json
 
@@ -19,6 +19,8 @@ BASE_1E9 = 1000000000
 SUI_STRING_OBJECT_TYPE = "0x1::string::String"
 SUI_CUSTOM_OBJECT_TYPE = "0x1::type_name::TypeName"
 SUI_NATIVE_PACKAGE_ID = "0x2"
+# max number of distinct addresses (makers, markets) kept pre-encoded
+ADDRESS_BYTES_CACHE_SIZE = 1024
 
 
 def getsha256Hash(callArgs: list) -> str:
@@ -28,33 +30,33 @@ def getsha256Hash(callArgs: list) -> str:
 
 def to_base18(number: Union[int, float]) -> int:
     """Takes in a number and multiples it by 1e18"""
-    return to_wei(number, "ether")
+    return to_fixed(number, 18)
 
 
 def from1e18(number: Union[str, int]) -> float:
     """Takes in a number and divides it by 1e18"""
-    return float(from_wei(int(number), "ether"))
+    return from_fixed(number, 18)
 
 
 def fromSuiBase(number: Union[str, int]) -> float:
     """Takes in a number and divides it by 1e9"""
     ## gwei is base9 and sui is also base9
-    return float(from_wei(int(number), "gwei"))
+    return from_fixed(number, 9)
 
 
 def toSuiBase(number: Union[str, int]) -> int:
     """Takes in a number and multiplies it by 1e9"""
-    return to_wei(number, "gwei")
+    return to_fixed(number, 9)
 
 
 def toUsdcBase(number: Union[int, float]) -> int:
     """Converts a number to usdc contract onchain representation i.e. multiply it by 1e6"""
-    return to_wei(number, "mwei")
+    return to_fixed(number, 6)
 
 
 def fromUsdcBase(number: Union[str, int]) -> float:
     """Converts a usdc quantity to number i.e. divide it by 1e6"""
-    return float(from_wei(int(number), "mwei"))
+    return from_fixed(number, 6)
 
 
 def numberToHex(num, pad=32):
@@ -78,6 +80,8 @@ def hexToByteArray(hexStr):
 
 
 def mnemonicToPrivateKey(seedPhrase: str) -> str:
+    import bip_utils
+
     bip39_seed = bip_utils.Bip39SeedGenerator(seedPhrase).Generate()
     bip32_ctx = bip_utils.Bip32Slip10Ed25519.FromSeed(bip39_seed)
     derivation_path = "m/44'/784'/0'/0'/0'"
@@ -92,6 +96,8 @@ def privateKeyToPublicKey(privateKey: str) -> str:
     else:
         privateKeyBytes = bytes(privateKey)
 
+    import bip_utils
+
     bip32_ctx = bip_utils.Bip32Slip10Ed25519.FromPrivateKey(privateKeyBytes)
     public_key: str = bip32_ctx.PublicKey().RawCompressed()
     return public_key
@@ -119,6 +125,46 @@ def address_to_bytes32(addr):
     return "0x000000000000000000000000" + strip_hex_prefix(addr)
 
 
+@lru_cache(maxsize=ADDRESS_BYTES_CACHE_SIZE)
+def hex_address_to_bytes32(address: str) -> bytes:
+    """Encodes a hex address as a 32 byte big-endian block, results are cached"""
+    return int(address, 16).to_bytes(32, "big")
+
+
+def normalize_address(address: str) -> str:
+    """Returns the 0x prefixed, 64 hex characters form of a Sui address or object id"""
+    return "0x" + strip_hex_prefix(address).lower().zfill(64)
+
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+BASE58_CHUNK = 58**10
+BASE58_PAIRS = [high + low for high in BASE58_ALPHABET for low in BASE58_ALPHABET]
+
+
+def base58_decode(value: str) -> bytes:
+    """Decodes a base58 string, e.g. an object or transaction digest"""
+    number = 0
+    for char in value:
+        number = number * 58 + BASE58_INDEX[char]
+    leading_zeros = len(value) - len(value.lstrip("1"))
+    return b"\0" * leading_zeros + number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def base58_encode(data: bytes) -> str:
+    """Encodes bytes as base58, e.g. an object or transaction digest"""
+    number = int.from_bytes(data, "big")
+    pairs = []
+    while number:
+        # ten digits per division of the large number, then two at a time on small ints
+        number, chunk = divmod(number, BASE58_CHUNK)
+        for _ in range(5):
+            chunk, pair = divmod(chunk, 58 * 58)
+            pairs.append(BASE58_PAIRS[pair])
+    leading_zeros = len(data) - len(bytes(data).lstrip(b"\0"))
+    return "1" * leading_zeros + "".join(reversed(pairs)).lstrip("1")
+
+
 def bn_to_bytes8(value: int):
     return str("0x" + "0" * 16 + hex(value)[2:]).encode("utf-8")
 
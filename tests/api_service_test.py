@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import APIService, BluefinClient, Networks
+from bluefin_v2_client.api_service import create_client_session
+
+
+async def start_server(peers):
+    async def status(request):
+        peers.append(request.transport.get_extra_info("peername")[1])
+        # keep requests in flight together so warmup needs one connection each
+        await asyncio.sleep(0.05)
+        return web.json_response({"isAlive": True})
+
+    app = web.Application()
+    app.router.add_get("/status", status)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, "http://127.0.0.1:{}".format(port)
+
+
+@pytest.mark.asyncio
+async def test_warmup_connections_are_reused():
+    peers = []
+    runner, url = await start_server(peers)
+    service = APIService(url)
+    try:
+        assert await service.warmup(3, "/status") == 3
+        assert len(set(peers)) == 3
+
+        assert await service.get("/status") == {"isAlive": True}
+        assert peers[-1] in peers[:3]
+    finally:
+        await service.close_session()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_connector_settings_override_defaults():
+    service = APIService("http://127.0.0.1", connector_settings={"limit_per_host": 7})
+    try:
+        assert service.client.connector.limit_per_host == 7
+        assert service.client.connector.limit == 100
+    finally:
+        await service.close_session()
+
+
+@pytest.mark.asyncio
+async def test_defaults_unknown_to_older_aiohttp_are_left_out(monkeypatch):
+    import aiohttp
+
+    class OldConnector(aiohttp.TCPConnector):
+        # the arguments of aiohttp 3.9, no happy_eyeballs_delay
+        def __init__(self, *, limit=100, limit_per_host=0, keepalive_timeout=None, ttl_dns_cache=10):
+            super().__init__(limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout, ttl_dns_cache=ttl_dns_cache)
+
+    monkeypatch.setattr(aiohttp, "TCPConnector", OldConnector)
+    service = APIService("http://127.0.0.1", connector_settings={"limit_per_host": 7})
+    try:
+        assert isinstance(service.client.connector, OldConnector)
+        assert service.client.connector.limit_per_host == 7
+    finally:
+        await service.close_session()
+
+
+@pytest.mark.asyncio
+async def test_shared_session_is_not_closed_by_services():
+    session = create_client_session()
+    client = BluefinClient(True, Networks["SUI_STAGING"], session=session)
+    other = APIService("http://127.0.0.1", session=session)
+
+    assert client.apis.client is session
+    assert client.dms_api.client is session
+    assert other.client is session
+
+    await client.close_connections()
+    await other.close_session()
+    assert not session.closed
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_client_apis_share_one_owned_session():
+    client = BluefinClient(True, Networks["SUI_STAGING"])
+    assert client.dms_api.client is client.apis.client
+
+    await client.close_connections()
+    assert client.apis.client.closed
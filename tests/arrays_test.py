@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import OrderbookArrays, TradeArrays, parse_fixed_array
+
+SNAPSHOT = {
+    "orderbookUpdateId": 7,
+    "bids": [
+        ["3500000000000000000000", "5957000000000000000"],
+        ["3499900000000000131072", "13610000000000000000"],
+    ],
+    "asks": [
+        ["3500100000000000000000", "17053000000000000000"],
+    ],
+}
+
+TRADES = [
+    {"id": 11, "time": 1718612345678, "price": "3500000000000000000000", "quantity": "100000000000000000", "side": "BUY"},
+    {"id": 10, "time": 1718612345000, "price": "3499500000000000000000", "quantity": "2500000000000000000", "side": "SELL"},
+]
+
+
+def test_parse_fixed_array_is_exact():
+    values = ["3499900000000000131072", "1", str(2**80), 12]
+    expected = [int(value) // 10**9 for value in values]
+    assert parse_fixed_array(values).tolist() == expected
+    assert parse_fixed_array(["1500000"], decimals=6, precision=6).tolist() == [1500000]
+    assert parse_fixed_array(["15"], decimals=0, precision=2).tolist() == [1500]
+
+
+def test_parse_fixed_array_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        parse_fixed_array(["-1"])
+    with pytest.raises(ValueError):
+        parse_fixed_array(["1.5"])
+    with pytest.raises(ValueError):
+        parse_fixed_array([str(10**40)])
+
+
+def test_orderbook_float_arrays():
+    book = OrderbookArrays(capacity=4).update(SNAPSHOT)
+    assert book.bids.dtype == numpy.float64
+    assert book.bids.flags["C_CONTIGUOUS"]
+    assert book.bids.tolist() == [[3500.0, 5.957], [3499.9, 13.61]]
+    assert book.asks.tolist() == [[3500.1, 17.053]]
+    assert book.best_bid().tolist() == [3500.0, 5.957]
+    assert book.sequence == 7
+
+
+def test_orderbook_int_arrays():
+    book = OrderbookArrays(capacity=4, dtype="int64", precision=6).update(SNAPSHOT)
+    assert book.bids.tolist() == [[3500000000, 5957000], [3499900000, 13610000]]
+
+
+def test_orderbook_refresh_reuses_buffers():
+    book = OrderbookArrays(capacity=2)
+    buffer = book.update(SNAPSHOT).bids.base
+    book.update({"bids": SNAPSHOT["asks"], "asks": SNAPSHOT["bids"] * 2})
+    assert book.bids.base is buffer
+    assert book.bids.tolist() == [[3500.1, 17.053]]
+    # levels past the capacity are ignored
+    assert len(book.asks) == 2
+    assert book.update({}).bids.shape == (0, 2)
+
+
+def test_trade_arrays():
+    trades = TradeArrays(capacity=4)
+    records = trades.update(TRADES).trades
+    assert records["id"].tolist() == [11, 10]
+    assert records["price"].tolist() == [3500.0, 3499.5]
+    assert records["quantity"].tolist() == [0.1, 2.5]
+    assert records["side"].tolist() == [1, -1]
+
+    buffer = records.base
+    assert trades.update({"data": TRADES[:1]}).trades.base is buffer
+    assert len(trades.trades) == 1
+    assert TradeArrays(dtype="int64").update(TRADES).trades["price"].tolist() == [
+        3500000000000,
+        3499500000000,
+    ]
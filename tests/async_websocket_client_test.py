@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import AsyncWebsocketClient, MARKET_SYMBOLS, SOCKET_EVENTS
+
+
+class EventServer:
+    """
+    Local websocket server recording received frames, frames sent to
+    `push` are forwarded to every connected client
+    """
+
+    def __init__(self):
+        self.received = []
+        self.sockets = []
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        async for message in ws:
+            self.received.append(json.loads(message.data))
+        return ws
+
+    async def push(self, event_name, data):
+        for ws in self.sockets:
+            await ws.send_str(json.dumps({"eventName": event_name, "data": data}))
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/", self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return "ws://127.0.0.1:{}/".format(port)
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+async def wait_for(condition, timeout=2):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_and_callbacks():
+    server = EventServer()
+    url = await server.start()
+    client = AsyncWebsocketClient(url, token="user-token", api_token="api-token")
+    opened, received, defaults = [], [], []
+
+    async def on_ticker(data):
+        received.append(data)
+
+    client.listen(SOCKET_EVENTS.MARKET_DATA_UPDATE.value, on_ticker)
+    client.listen("default", defaults.append)
+    try:
+        await client.open(on_open=opened.append)
+        assert opened == [client]
+
+        assert await client.subscribe_global_updates_by_symbol(MARKET_SYMBOLS.ETH)
+        assert await client.subscribe_orderbook_depth_streams_by_symbol(
+            MARKET_SYMBOLS.BTC, "10"
+        )
+        assert await client.subscribe_user_update_by_token()
+        await wait_for(lambda: len(server.received) == 3)
+        assert server.received == [
+            ["SUBSCRIBE", [{"e": "globalUpdates", "p": "ETH-PERP"}]],
+            ["SUBSCRIBE", [{"e": "orderbookDepthStream", "p": "BTC-PERP", "d": "10"}]],
+            ["SUBSCRIBE", [{"e": "userUpdates", "t": "user-token", "rt": "api-token"}]],
+        ]
+
+        await server.push(SOCKET_EVENTS.MARKET_DATA_UPDATE.value, {"lastPrice": "1"})
+        await server.push("Unknown", {"a": 1})
+        await wait_for(lambda: received and defaults)
+        assert received == [{"lastPrice": "1"}]
+        assert defaults == [{"event": "Unknown", "data": {"a": 1}}]
+    finally:
+        await client.close()
+        await server.stop()
+
+    assert not client.connected
+    assert not await client.subscribe_global_updates_by_symbol(MARKET_SYMBOLS.ETH)
+
+
+@pytest.mark.asyncio
+async def test_events_iterator_ends_when_connection_closes():
+    server = EventServer()
+    url = await server.start()
+    client = AsyncWebsocketClient(url)
+    closed = []
+    try:
+        await client.open(on_close=closed.append)
+        events = []
+
+        async def consume():
+            async for event in client.events():
+                events.append(event)
+
+        consumer = asyncio.get_running_loop().create_task(consume())
+        await asyncio.sleep(0)
+        await server.push("A", 1)
+        await server.push("B", 2)
+        await wait_for(lambda: len(events) == 2)
+
+        await client.close()
+        await asyncio.wait_for(consumer, 2)
+        assert events == [("A", 1), ("B", 2)]
+        assert closed == [client]
+    finally:
+        await client.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_callback_errors_are_reported_and_reading_continues():
+    server = EventServer()
+    url = await server.start()
+    client = AsyncWebsocketClient(url)
+    errors, received = [], []
+
+    def failing(data):
+        raise ValueError("bad event")
+
+    client.listen("A", failing)
+    client.listen("B", received.append)
+    try:
+        await client.open(on_error=lambda ws, e: errors.append(str(e)))
+        await server.push("A", 1)
+        await server.sockets[0].send_str("not json")
+        await server.push("B", 2)
+        await wait_for(lambda: received)
+        assert received == [2]
+        assert errors[0] == "bad event"
+        assert len(errors) == 2
+    finally:
+        await client.close()
+        await server.stop()
@@ -0,0 +1,216 @@
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_rfq_client import Quote, QUOTE_BCS
+from sui_utils import (
+    BCS_ADDRESS,
+    BCS_BOOL,
+    BCS_BYTES,
+    BCS_DIGEST,
+    BCS_STRING,
+    BCS_U8,
+    BCS_U64,
+    BCS_U128,
+    BCS_U256,
+    OBJECT_REF,
+    TRANSACTION_DATA,
+    BCSEnum,
+    BCSOption,
+    BCSSerializer,
+    BCSStruct,
+    BCSVector,
+    bcs_fixed_bytes,
+    decode_transaction_data,
+    serialize_merge_coins_transaction,
+    serialize_move_call_transaction,
+)
+from transaction_builder_test import COIN, GAS, PACKAGE, SENDER, SEQUENCER, digest, object_ref
+
+ZERO = "0x" + "00" * 32
+
+RECORD = BCSStruct(
+    "Record",
+    [
+        ("owner", BCS_ADDRESS),
+        ("flag", BCS_BOOL),
+        ("amount", BCS_U64),
+        ("big", BCS_U128),
+        ("name", BCS_STRING),
+        ("data", BCS_BYTES),
+        ("tags", BCSVector(BCS_U8)),
+        ("parent", BCSOption(BCS_DIGEST)),
+        ("key", bcs_fixed_bytes(4)),
+        ("huge", BCS_U256),
+    ],
+)
+
+
+def test_struct_round_trip():
+    record = {
+        "owner": SENDER,
+        "flag": True,
+        "amount": 2**64 - 1,
+        "big": 2**127 + 5,
+        "name": "é" * 100,
+        "data": b"\x01" * 300,
+        "tags": [0, 255],
+        "parent": digest(7),
+        "key": b"abcd",
+        "huge": 3,
+    }
+    encoded = RECORD.encode(record)
+    assert encoded[:33] == bytes.fromhex("ab" * 32) + b"\x01"
+    # 200 bytes of utf-8 and 300 bytes, ULEB128 lengths of two bytes
+    assert b"\xc8\x01" + "é".encode() in encoded and b"\xac\x02\x01" in encoded
+    assert RECORD.decode(encoded) == record
+    assert RECORD.decode(bytearray(encoded)) == record
+    # fields in order
+    assert RECORD.encode(tuple(record.values())) == encoded
+
+    record.update(parent=None, tags=[])
+    assert RECORD.decode(RECORD.encode(record)) == record
+
+
+def test_enum_and_nested_vectors():
+    shape = BCSEnum("Shape")
+    shape.define([("Empty", None), ("Square", BCS_U64), ("Group", BCSVector(shape))])
+    value = ("Group", [("Square", 4), ("Empty", None), ("Group", [("Square", 1)])])
+    encoded = shape.encode(value)
+    assert encoded == bytes.fromhex("02 03 01 0400000000000000 00 02 01 01 0100000000000000".replace(" ", ""))
+    assert shape.decode(encoded) == value
+    assert shape.encode("Empty") == b"\x00"
+
+
+def test_decodes_from_an_offset_of_a_larger_buffer():
+    data = b"head" + OBJECT_REF.encode((COIN, 9, digest(3))) + b"tail"
+    view = memoryview(data)
+    value, offset = OBJECT_REF.decode_from(view, 4)
+    assert value == {"object_id": COIN, "version": 9, "digest": digest(3)}
+    assert view[offset:].tobytes() == b"tail"
+    assert OBJECT_REF.encode(value) == object_ref(COIN, 9, 3)
+
+
+@pytest.mark.parametrize(
+    "bcs_type, data",
+    [
+        (BCS_U64, b"\x01\x02"),
+        (BCS_BOOL, b"\x02"),
+        (BCS_STRING, b"\x05ab"),
+        # 0 encoded on two bytes
+        (BCS_BYTES, b"\x80\x00"),
+        (BCSEnum("Unit", [("A", None)]), b"\x01"),
+        (BCSOption(BCS_U8), b"\x02\x00"),
+        (BCS_U8, b"\x01\x02"),
+    ],
+)
+def test_invalid_data_is_rejected(bcs_type, data):
+    with pytest.raises(ValueError):
+        bcs_type.decode(data)
+
+
+def test_invalid_values_are_rejected():
+    with pytest.raises(ValueError):
+        BCS_U64.encode(-1)
+    with pytest.raises(ValueError):
+        BCS_U128.encode(2**128)
+    with pytest.raises(TypeError):
+        BCS_BOOL.encode(1)
+    with pytest.raises(ValueError):
+        bcs_fixed_bytes(4).encode(b"abc")
+    with pytest.raises(ValueError):
+        BCSEnum("Unit", [("A", None)]).encode("B")
+    with pytest.raises(ValueError):
+        OBJECT_REF.encode((COIN, 1))
+
+
+def test_serializer_lengths_are_uleb128():
+    serializer = BCSSerializer()
+    serializer.serialize_str("a" * 200)
+    serializer.serialize_uint8_array([7] * 300)
+    assert serializer.get_bytes() == b"\xc8\x01" + b"a" * 200 + b"\xac\x02" + b"\x07" * 300
+    with pytest.raises(ValueError):
+        BCSSerializer().serialize_uint8_array([256])
+
+
+def test_transaction_data_round_trip():
+    inputs = [
+        ("shared", SEQUENCER, 5, True),
+        ("owned", COIN, 12, digest(3)),
+        ("pure", b"\x40\x42\x0f\x00\x00\x00\x00\x00"),
+    ]
+    gas = [(GAS, 40, digest(14))]
+    tx_bytes = serialize_move_call_transaction(
+        SENDER,
+        inputs,
+        PACKAGE,
+        "margin_bank",
+        "deposit_to_bank",
+        ["0x2::coin::Coin<0x2::sui::SUI>", "vector<u64>"],
+        [0, 1, 2],
+        gas,
+        750,
+        100000000,
+    )
+    version, data = decode_transaction_data(base64.b64encode(tx_bytes).decode())
+    assert version == "V1"
+    kind, transaction = data["kind"]
+    assert kind == "ProgrammableTransaction"
+    assert transaction["inputs"] == [
+        ("Object", ("SharedObject", {"object_id": SEQUENCER, "initial_shared_version": 5, "mutable": True})),
+        ("Object", ("ImmOrOwnedObject", {"object_id": COIN, "version": 12, "digest": digest(3)})),
+        ("Pure", b"\x40\x42\x0f\x00\x00\x00\x00\x00"),
+    ]
+    sui = ("struct", {"address": "0x" + "00" * 31 + "02", "module": "sui", "name": "SUI", "type_params": []})
+    assert transaction["commands"] == [
+        (
+            "MoveCall",
+            {
+                "package": PACKAGE,
+                "module": "margin_bank",
+                "function": "deposit_to_bank",
+                "type_arguments": [
+                    ("struct", {"address": "0x" + "00" * 31 + "02", "module": "coin", "name": "Coin", "type_params": [sui]}),
+                    ("vector", ("u64", None)),
+                ],
+                "arguments": [("Input", 0), ("Input", 1), ("Input", 2)],
+            },
+        )
+    ]
+    assert data["sender"] == SENDER
+    assert data["gas_data"] == {
+        "payment": [{"object_id": GAS, "version": 40, "digest": digest(14)}],
+        "owner": SENDER,
+        "price": 750,
+        "budget": 100000000,
+    }
+    assert data["expiration"] == ("None", None)
+    assert TRANSACTION_DATA.encode((version, data)) == tx_bytes
+
+    merge = serialize_merge_coins_transaction(SENDER, inputs[1:2], None, [0], gas, 750, 100000000)
+    _, data = TRANSACTION_DATA.decode(merge)
+    assert data["kind"][1]["commands"] == [("MergeCoins", {"destination": ("GasCoin", None), "sources": [("Input", 0)]})]
+    assert TRANSACTION_DATA.encode(("V1", data)) == merge
+
+
+def test_quote_round_trip():
+    quote = Quote(
+        vault="0x4f452732b2f1be3fda125eaba2d7fc82e7ed1c6deabefe728386c51e9c5c8469",
+        id="quote_id",
+        taker=ZERO,
+        token_in_amount=1000000,
+        token_out_amount=1000000000,
+        token_in_type="0x2::sui::SUI",
+        token_out_type="usdc_Address::usdc::USDC",
+        created_at=1739649099673,
+        expires_at=1739649109673,
+    )
+    fields = QUOTE_BCS.decode(quote.get_bcs_serialized_quote())
+    assert fields["id"] == "quote_id" and fields["taker"] == ZERO
+    assert fields["expires_at"] - fields["created_at"] == 10000
+    assert QUOTE_BCS.encode(fields) == quote.get_bcs_serialized_quote()
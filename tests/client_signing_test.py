@@ -0,0 +1,113 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import (
+    BluefinClient,
+    Networks,
+    MARKET_SYMBOLS,
+    ORDER_SIDE,
+    ORDER_TYPE,
+    OrderSignatureRequest,
+    TIME_IN_FORCE,
+)
+
+TEST_ACCT_KEY = (
+    "negative repeat fold noodle symptom spirit spend trophy merge ethics math erupt"
+)
+TEST_CONTRACTS = {
+    "auxiliaryContractsAddresses": {"objects": {}},
+    "ETH-PERP": {
+        "Perpetual": {
+            "id": "0x3ff3b4ac6de2d5a0c1d7e3e6d0a5c7d9ab2fb9bf1e2e0a99c6b0d61c33a8c8a0"
+        }
+    },
+}
+
+
+def create_client():
+    client = BluefinClient(True, Networks["SUI_STAGING"], TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(TEST_CONTRACTS)
+    return client
+
+
+def create_requests(count):
+    return [
+        OrderSignatureRequest(
+            symbol=MARKET_SYMBOLS.ETH,
+            price=1770.2 + i,
+            quantity=0.02,
+            side=ORDER_SIDE.BUY if i % 2 else ORDER_SIDE.SELL,
+            orderType=ORDER_TYPE.LIMIT,
+            leverage=4,
+            salt=1000 + i,
+            expiration=1739649099673,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [0, 3])
+async def test_create_signed_orders_matches_single_signing(workers):
+    client = create_client()
+    client.set_signing_pool(workers)
+    try:
+        expected = [client.create_signed_order(req) for req in create_requests(10)]
+        signed = client.create_signed_orders(create_requests(10))
+        assert signed == expected
+    finally:
+        await client.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_create_signed_order_is_stable():
+    client = create_client()
+    try:
+        signed = client.create_signed_order(
+            OrderSignatureRequest(
+                symbol=MARKET_SYMBOLS.ETH,
+                price=1770.2,
+                quantity=0.02,
+                side=ORDER_SIDE.BUY,
+                orderType=ORDER_TYPE.LIMIT,
+                leverage=4,
+                salt=42,
+                expiration=1739649099673,
+                ioc=True,
+                triggerPrice=1700.5,
+            )
+        )
+        assert signed["price"] == 1770200000000000000000
+        assert signed["triggerPrice"] == 1700500000000000000000
+        assert signed["timeInForce"] == TIME_IN_FORCE.IMMEDIATE_OR_CANCEL
+        assert signed["orderSignature"] == (
+            "462e3c888bbf63c0cb737c1ef03414663ca8e21f5d3289cdff9d697f37f59a70"
+            "f45a7d186c6bf8959fbf10bf3068e79ba790307bdc46af420f5639a7d46b7107"
+            "1yRZSMkE0/O80RQTwbmyxvhttpD+VA4JN5CIPCT3lIgc="
+        )
+    finally:
+        await client.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_order_record_posts_same_body_as_signature_response():
+    client = create_client()
+    posted = []
+
+    async def post(service_url, data, auth_required=False, contentType=""):
+        posted.append(data)
+        return {}
+
+    client.apis.post = post
+    try:
+        req = create_requests(1)[0]
+        record = client.create_signed_order_record(req)
+        await client.post_signed_order(record.to_signature_response())
+        await client.post_signed_order(record)
+        assert posted[0] == posted[1]
+    finally:
+        await client.close_connections()
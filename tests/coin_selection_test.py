@@ -0,0 +1,130 @@
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from sui_utils import Coin, CoinIndex, CoinUtils, SuiWallet, get_object_cache, select_coins
+from sui_rpc_test import TEST_ACCT_KEY, FakeNode, node
+from coin_utils_test import SUI, USDC, coin, merge_node, object_id
+from transaction_builder_test import digest
+
+
+def coins(*balances):
+    return [Coin(coin(i + 1, balance)) for i, balance in enumerate(balances)]
+
+
+def balances(selected):
+    return [int(c.balance) for c in selected]
+
+
+def test_single_coin_strategies():
+    index = CoinIndex(coins(70, 10, 40, 40, 500))
+    assert index.exact(40).balance == "40"
+    assert index.exact(41) is None
+    assert index.smallest_sufficient(41).balance == "70"
+    assert index.smallest_sufficient(501) is None
+    assert balances(index.dust(45)) == [10, 40, 40]
+    assert balances(index.dust(45, max_coins=2)) == [10, 40]
+
+    assert select_coins(index, 40) == ([index.exact(40)], 40)
+    selected, total = select_coins(index, 60)
+    assert balances(selected) == [70] and total == 70
+
+
+def test_coins_adding_up_to_the_amount_are_preferred():
+    # 60 + 55 covers it, 55 + 45 needs no split
+    selected, total = select_coins(coins(10, 30, 45, 55, 60), 100)
+    assert balances(selected) == [55, 45] and total == 100
+    # one coin more than the fewest when it saves the split
+    selected, total = select_coins(coins(4, 9, 60, 70), 73)
+    assert balances(selected) == [60, 9, 4] and total == 73
+
+
+def test_fewest_coins_with_the_smallest_completion():
+    selected, total = select_coins(coins(10, 20, 60, 70), 75)
+    assert balances(selected) == [70, 10] and total == 80
+    assert select_coins(coins(10, 20), 31) == ([], 0)
+
+
+def test_selection_against_brute_force():
+    rng = random.Random(7)
+    for _ in range(300):
+        wallet = [rng.choice([rng.randint(1, 20), rng.randint(1, 1000)]) for _ in range(rng.randint(1, 9))]
+        amount = rng.randint(1, sum(wallet))
+        selected, total = select_coins(coins(*wallet), amount)
+        fewest = min(k for k in range(1, len(wallet) + 1) if sum(sorted(wallet)[-k:]) >= amount)
+        exact = [
+            k
+            for k in range(1, len(wallet) + 1)
+            if any(sum(subset) == amount for subset in itertools.combinations(wallet, k))
+        ]
+
+        assert total == sum(balances(selected)) >= amount
+        assert len({c.coin_object_id for c in selected}) == len(selected)
+        if fewest == 1:
+            # a split costs a transaction, as much as merging coins adding up to the amount
+            assert total == min(b for b in wallet if b >= amount)
+        elif exact and exact[0] <= fewest + 1:
+            assert total == amount and len(selected) == exact[0]
+        else:
+            assert len(selected) == fewest
+
+
+def test_exact_search_stops_at_the_limit():
+    # multiples of 3 never add up to the amount, the search gives up
+    index = CoinIndex(coins(*range(3, 6000, 3)))
+    selected, total = select_coins(index, 10**6 + 1, search_limit=1000)
+    assert total > 10**6 + 1
+
+
+def test_create_coin_with_balance_merges_without_a_split(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    executed = merge_node(node, owner, [coin(9000, 10**10, SUI)])
+    get_object_cache(node.url, owner).load_coins(USDC, coins(10, 30, 45, 55, 60))
+
+    assert CoinUtils.create_coin_with_balance(USDC, 100, wallet, node.url) == object_id(4)
+    # a single merge of 45 into 55
+    assert [(destination, sources) for destination, sources, _ in executed] == [(object_id(4), [object_id(3)])]
+    assert "unsafe_splitCoin" not in [r["method"] for r in node.requests]
+
+
+def test_dust_is_merged_along_with_a_split(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    executed = merge_node(node, owner, [coin(9000, 10**10, SUI)])
+    merge = node.handlers["sui_executeTransactionBlock"]
+    splits = []
+
+    def split(params):
+        splits.append((params[1], params[2]))
+        return {"txBytes": "c3BsaXQ="}
+
+    def execute(params):
+        if params[0] != "c3BsaXQ=":
+            return merge(params)
+
+        def reference(index, version):
+            return {"owner": {"AddressOwner": owner}, "reference": {"objectId": object_id(index), "version": version, "digest": digest(version)}}
+
+        effects = {
+            "status": {"status": "success"},
+            "executedEpoch": "512",
+            "gasUsed": {"computationCost": "750000", "storageCost": "2000000", "storageRebate": "1500000"},
+            "mutated": [reference(5, 20), reference(9000, 20)],
+            "created": [reference(50, 20)],
+            "gasObject": reference(9000, 20),
+        }
+        return {"digest": "0xdigest", "effects": effects}
+
+    node.on("unsafe_splitCoin", split)
+    node.on("sui_executeTransactionBlock", execute)
+    get_object_cache(node.url, owner).load_coins(USDC, coins(1, 2, 20, 60, 70))
+
+    assert CoinUtils.create_coin_with_balance(USDC, 125, wallet, node.url, dust_threshold=5) == object_id(50)
+    # 70 + 60 merged with the dust in the same transaction, then split
+    assert executed == [(object_id(5), [object_id(4), object_id(1), object_id(2)], [object_id(9000)])]
+    assert splits == [(object_id(5), ["125"])]
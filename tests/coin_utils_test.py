@@ -0,0 +1,178 @@
+import base64
+import os
+import struct
+import sys
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from sui_utils import Coin, CoinUtils, SuiWallet, get_object_cache, serialize_merge_coins_transaction
+from sui_rpc_test import TEST_ACCT_KEY, FakeNode, node
+from transaction_builder_test import SENDER, address, digest, gas_data, object_ref
+
+USDC = "0x" + "0d" * 32 + "::coin::COIN"
+SUI = "0x2::sui::SUI"
+
+
+def object_id(index):
+    return "0x{:064x}".format(index)
+
+
+def coin(index, balance, coin_type=USDC):
+    return {"coinType": coin_type, "coinObjectId": object_id(index), "version": "1", "digest": digest(index % 256), "balance": str(balance)}
+
+
+def uleb(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, pos
+
+
+def parse_merge(tx_bytes):
+    """
+    Returns (input ids, destination id or "gas", source ids, gas ids) of a MergeCoins transaction
+    """
+    data = base64.b64decode(tx_bytes)
+    assert data[:2] == b"\x00\x00"
+    count, pos = uleb(data, 2)
+    inputs = []
+    for _ in range(count):
+        assert data[pos : pos + 2] == b"\x01\x00"
+        inputs.append("0x" + data[pos + 2 : pos + 34].hex())
+        pos += 2 + 32 + 8 + 33
+    assert data[pos : pos + 2] == b"\x01\x03"
+    pos += 2
+
+    def argument(pos):
+        if data[pos] == 0:
+            return "gas", pos + 1
+        assert data[pos] == 1
+        return inputs[struct.unpack_from("<H", data, pos + 1)[0]], pos + 3
+
+    destination, pos = argument(pos)
+    count, pos = uleb(data, pos)
+    sources = []
+    for _ in range(count):
+        source, pos = argument(pos)
+        sources.append(source)
+    pos += 32
+    count, pos = uleb(data, pos)
+    gas = ["0x" + data[pos + i * 73 : pos + i * 73 + 32].hex() for i in range(count)]
+    assert len(data) == pos + count * 73 + 32 + 8 + 8 + 1
+    return inputs, destination, sources, gas
+
+
+def merge_node(node, owner, gas_coins):
+    """
+    Lists the gas coins and executes MergeCoins transactions, answering with their effects
+    """
+    executed = []
+    node.on("suix_getCoins", lambda params: {"data": gas_coins, "hasNextPage": False})
+    node.on("suix_getReferenceGasPrice", lambda params: "750")
+
+    def execute(params):
+        inputs, destination, sources, gas = parse_merge(params[0])
+        executed.append((destination, sources, gas))
+        version = 10 + len(executed)
+
+        def changed(object_id):
+            return {"owner": {"AddressOwner": owner}, "reference": {"objectId": object_id, "version": version, "digest": digest(version)}}
+
+        mutated = [changed(gas[0])]
+        if destination != "gas":
+            mutated.append(changed(destination))
+        return {
+            "digest": "0xdigest",
+            "effects": {
+                "status": {"status": "success"},
+                "executedEpoch": "512",
+                "gasUsed": {"computationCost": "750000", "storageCost": "2000000", "storageRebate": "1500000"},
+                "mutated": mutated,
+                "deleted": [{"objectId": source, "version": version, "digest": digest(0)} for source in sources],
+                "gasObject": changed(gas[0]),
+            },
+        }
+
+    node.on("sui_executeTransactionBlock", execute)
+    return executed
+
+
+def test_merge_coins_transaction_layout():
+    inputs = [("owned", object_id(1), 3, digest(1)), ("owned", object_id(2), 4, digest(2))]
+    gas = [("0x" + "0e" * 32, 40, digest(14))]
+    expected = (
+        b"\x00\x00"
+        + b"\x02" + b"\x01\x00" + object_ref(object_id(1), 3, 1) + b"\x01\x00" + object_ref(object_id(2), 4, 2)
+        + b"\x01" + b"\x03"  # MergeCoins
+        + b"\x01\x00\x00"  # into Input(0)
+        + b"\x01" + b"\x01\x01\x00"  # [Input(1)]
+        + address(SENDER)
+        + gas_data(40, 14)
+        + b"\x00"
+    )
+    assert serialize_merge_coins_transaction(SENDER, inputs, 0, [1], gas, 750, 100000000) == expected
+    # into the gas coin
+    tx_bytes = serialize_merge_coins_transaction(SENDER, inputs, None, [0, 1], gas, 750, 100000000)
+    assert b"\x03\x00\x02\x01\x00\x00\x01\x01\x00" in tx_bytes
+
+
+def test_merges_in_parallel_chunks(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    gas_coins = [coin(9000 + i, 10**10, SUI) for i in range(3)]
+    executed = merge_node(node, owner, gas_coins)
+    coins = [Coin(coin(i, 10)) for i in range(1, 1201)]
+
+    assert CoinUtils.merge_coins(coins, wallet, node.url, max_coins_per_transaction=500) == object_id(1)
+    methods = [r["method"] for r in node.requests]
+    assert "unsafe_mergeCoins" not in methods
+    # gas coins and price read in one batch, then three chunks at once and the final merge
+    assert node.bodies == 1 + 4
+    # executed at the same time, in any order
+    first_round = sorted(executed[:3])
+    assert [destination for destination, _, _ in first_round] == [object_id(1), object_id(501), object_id(1000)]
+    assert [len(sources) for _, sources, _ in first_round] == [499, 498, 200]
+    assert len({gas[0] for _, _, gas in first_round}) == 3
+    merged = [source for _, sources, _ in executed for source in sources]
+    assert sorted(merged) == sorted(object_id(i) for i in range(2, 1201))
+    assert executed[3][:2] == (object_id(1), [object_id(501), object_id(1000)])
+
+    cache = get_object_cache(node.url, owner)
+    assert cache.get(object_id(1))[2] == 12000
+    assert cache.get(object_id(2)) is None
+
+
+def test_chunks_share_a_single_gas_coin_one_after_another(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    executed = merge_node(node, owner, [coin(9000, 10**10, SUI)])
+    coins = [Coin(coin(i, 10)) for i in range(1, 8)]
+
+    CoinUtils.merge_coins(coins, wallet, node.url, max_coins_per_transaction=3)
+    assert [(destination, len(sources)) for destination, sources, _ in executed] == [
+        (object_id(1), 2),
+        (object_id(4), 1),
+        (object_id(6), 1),
+        (object_id(1), 2),
+    ]
+    versions = [base64.b64decode(r["params"][0])[-90:-82] for r in node.requests if r["method"] == "sui_executeTransactionBlock"]
+    # each transaction pays with the gas coin left by the previous one
+    assert [struct.unpack("<Q", version)[0] for version in versions] == [1, 11, 12, 13]
+
+
+def test_sui_coins_pay_gas_with_the_primary_coin(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    executed = merge_node(node, owner, [])
+    coins = [Coin(coin(i, 10**9, SUI)) for i in range(1, 5)]
+
+    CoinUtils.merge_coins(coins, wallet, node.url)
+    assert executed == [("gas", [object_id(2), object_id(3), object_id(4)], [object_id(1)])]
+    assert "suix_getCoins" not in [r["method"] for r in node.requests]
+    # gas paid: 750000 + 2000000 - 1500000
+    assert get_object_cache(node.url, owner).get(object_id(1))[2] == 4 * 10**9 - 1250000
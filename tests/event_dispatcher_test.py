@@ -0,0 +1,232 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import (
+    AsyncEventDispatcher,
+    EventDispatcher,
+    EventQueue,
+    LocalOrderBook,
+    MARKET_SYMBOLS,
+    ORDER_SIDE,
+    OVERFLOW_POLICY,
+    SOCKET_EVENTS,
+    Sockets,
+    WebsocketClient,
+)
+
+DEPTH = SOCKET_EVENTS.ORDERBOOK_DEPTH_UPDATES.value
+FILL = SOCKET_EVENTS.ORDER_UPDATE.value
+MARKET = SOCKET_EVENTS.MARKET_DATA_UPDATE.value
+
+
+def depth_update(symbol, sequence):
+    return {"symbol": symbol, "sequence": sequence}
+
+
+def test_drop_oldest_keeps_latest_events():
+    queue = EventQueue(maxsize=3, policy=OVERFLOW_POLICY.DROP_OLDEST)
+    for i in range(5):
+        assert queue.push(i)
+
+    assert [queue.pop() for _ in range(len(queue))] == [2, 3, 4]
+    assert queue.stats() == {
+        "policy": "DROP_OLDEST",
+        "depth": 0,
+        "maxsize": 3,
+        "dropped": 2,
+        "coalesced": 0,
+        "delivered": 3,
+    }
+
+
+def test_coalesce_keeps_latest_update_per_symbol():
+    queue = EventQueue(maxsize=2, policy=OVERFLOW_POLICY.COALESCE)
+    assert queue.push(depth_update("ETH-PERP", 1))
+    assert queue.push(depth_update("BTC-PERP", 1))
+    assert not queue.push(depth_update("ETH-PERP", 2))
+    # a third symbol evicts the least recently updated one
+    assert queue.push(depth_update("SUI-PERP", 1))
+
+    assert [queue.pop() for _ in range(len(queue))] == [
+        depth_update("ETH-PERP", 2),
+        depth_update("SUI-PERP", 1),
+    ]
+    assert queue.coalesced == 1
+    assert queue.dropped == 1
+
+
+def test_coalesce_keeps_events_without_symbol():
+    queue = EventQueue(policy=OVERFLOW_POLICY.COALESCE)
+    queue.push({"a": 1})
+    queue.push({"a": 2})
+    assert len(queue) == 2
+
+
+def test_default_policies():
+    dispatcher = EventDispatcher(policies={FILL: OVERFLOW_POLICY.DROP_OLDEST})
+    assert dispatcher.configure(MARKET).policy == OVERFLOW_POLICY.COALESCE
+    # deltas, none can be replaced
+    assert dispatcher.configure(DEPTH).policy == OVERFLOW_POLICY.BLOCK
+    assert dispatcher.configure(FILL).policy == OVERFLOW_POLICY.DROP_OLDEST
+    assert dispatcher.configure("other").policy == OVERFLOW_POLICY.BLOCK
+
+
+def test_slow_handler_receives_coalesced_snapshots():
+    release = threading.Event()
+    received = []
+
+    def handler(event, data):
+        release.wait(5)
+        received.append((event, data["sequence"]))
+
+    dispatcher = EventDispatcher()
+    dispatcher.start(handler)
+    for i in range(100):
+        dispatcher.put(MARKET, depth_update("ETH-PERP", i))
+    release.set()
+    dispatcher.stop(timeout=5)
+
+    # the first update was taken by the handler before the burst was coalesced
+    assert received[-1] == (MARKET, 99)
+    assert len(received) <= 2
+    assert dispatcher.stats()[MARKET]["coalesced"] >= 98
+
+
+def test_block_applies_backpressure():
+    release = threading.Event()
+    received = []
+
+    def handler(event, data):
+        release.wait(5)
+        received.append(data)
+
+    dispatcher = EventDispatcher(maxsize=2)
+    dispatcher.start(handler)
+
+    producer = threading.Thread(
+        target=lambda: [dispatcher.put(FILL, i) for i in range(10)]
+    )
+    producer.start()
+    time.sleep(0.2)
+    # one event in the handler and a full queue, the producer waits
+    assert producer.is_alive()
+    assert dispatcher.depth == 2
+
+    release.set()
+    producer.join(5)
+    dispatcher.stop(timeout=5)
+    assert received == list(range(10))
+    assert dispatcher.dropped == 0
+
+
+def test_handler_errors_do_not_stop_delivery():
+    received = []
+
+    def handler(event, data):
+        if data == 0:
+            raise Exception("boom")
+        received.append(data)
+
+    dispatcher = EventDispatcher()
+    dispatcher.start(handler)
+    for i in range(3):
+        dispatcher.put(FILL, i)
+    dispatcher.stop(timeout=5)
+    assert received == [1, 2]
+
+
+def test_websocket_client_delivers_through_dispatcher():
+    received = []
+    client = WebsocketClient("wss://localhost", dispatcher=EventDispatcher())
+    client.listen(FILL, received.append)
+    client.listen("default", received.append)
+    client.dispatcher.start(client._deliver)
+
+    client.listener(None, json.dumps({"eventName": FILL, "data": {"id": 1}}).encode())
+    client.listener(None, json.dumps({"eventName": "other", "data": 2}).encode())
+    client.dispatcher.stop(timeout=5)
+
+    assert received == [{"id": 1}, {"event": "other", "data": 2}]
+
+
+@pytest.mark.asyncio
+async def test_sockets_listener_does_not_wait_for_slow_callbacks():
+    release = asyncio.Event()
+    received = []
+
+    async def on_market(data):
+        await release.wait()
+        received.append(data["sequence"])
+
+    sockets = Sockets("http://localhost", dispatcher=AsyncEventDispatcher())
+    await sockets.listen(MARKET, on_market)
+    sockets.dispatcher.start(sockets._deliver)
+
+    for i in range(50):
+        await asyncio.wait_for(
+            sockets.listener(MARKET, depth_update("ETH-PERP", i)), 1
+        )
+    release.set()
+    await sockets.dispatcher.stop()
+
+    assert received[-1] == 49
+    assert len(received) <= 2
+
+
+@pytest.mark.asyncio
+async def test_queued_depth_deltas_keep_the_book_whole():
+    release = asyncio.Event()
+    book = LocalOrderBook(MARKET_SYMBOLS.ETH, decimals=0)
+    book.load_snapshot({"orderbookUpdateId": 10, "bids": [[99, 1]], "asks": [[101, 1]]})
+
+    async def handler(event, data):
+        await release.wait()
+        await book.on_update(data)
+
+    dispatcher = AsyncEventDispatcher()
+    dispatcher.start(handler)
+    await dispatcher.put(DEPTH, {"symbol": "ETH-PERP", "orderbookUpdateId": 11, "bids": [[98, 2]], "asks": []})
+    await asyncio.sleep(0)
+    # queued behind the slow handler, each one carries different levels
+    await dispatcher.put(DEPTH, {"symbol": "ETH-PERP", "orderbookUpdateId": 12, "bids": [[97, 3]], "asks": [[101, 0]]})
+    await dispatcher.put(DEPTH, {"symbol": "ETH-PERP", "orderbookUpdateId": 13, "bids": [], "asks": [[102, 4]]})
+    release.set()
+    await dispatcher.stop()
+
+    assert list(book.levels(ORDER_SIDE.BUY)) == [(99, 1), (98, 2), (97, 3)]
+    assert list(book.levels(ORDER_SIDE.SELL)) == [(102, 4)]
+    assert book.sequence == 13 and book.gaps == 0
+    assert dispatcher.stats()[DEPTH]["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_block_applies_backpressure():
+    release = asyncio.Event()
+    received = []
+
+    async def handler(event, data):
+        await release.wait()
+        received.append(data)
+
+    dispatcher = AsyncEventDispatcher(maxsize=1)
+    dispatcher.start(handler)
+    await dispatcher.put(FILL, 0)
+    await asyncio.sleep(0)
+    await dispatcher.put(FILL, 1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(dispatcher.put(FILL, 2), 0.1)
+
+    release.set()
+    await dispatcher.put(FILL, 3)
+    await dispatcher.stop()
+    assert received == [0, 1, 3]
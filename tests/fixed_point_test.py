@@ -0,0 +1,93 @@
+import decimal
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from eth_utils import from_wei, to_wei
+from sui_utils.fixed_point import from_fixed, from_fixed_batch, to_fixed, to_fixed_batch
+
+UNITS = {6: "mwei", 9: "gwei", 18: "ether"}
+
+VALUES = [
+    0,
+    1,
+    7,
+    2**190,
+    0.1,
+    0.1 + 0.2,
+    0.05123234,
+    0.512323,
+    0.09522462283575805,
+    0.9999999999999999,
+    1.23e-7,
+    1e-10,
+    1770.2,
+    123456.789,
+    99999.99999999999,
+    1e16,
+    "0.23423001",
+    "12.5",
+    "1e-5",
+    "1.5e-7",
+    "1234.5e-5",
+    " 0.5 ",
+    decimal.Decimal("0.000001234"),
+    "1.5e3",
+    "2.25E+2",
+    "7e2",
+    decimal.Decimal("9.2E+4"),
+    decimal.Decimal("1.5e3"),
+]
+
+
+@pytest.mark.parametrize("decimals", sorted(UNITS))
+@pytest.mark.parametrize("value", VALUES)
+def test_to_fixed_matches_eth_utils(value, decimals):
+    assert to_fixed(value, decimals) == to_wei(value, UNITS[decimals])
+
+
+@pytest.mark.parametrize("decimals", sorted(UNITS))
+@pytest.mark.parametrize("value", [0, 1, 51232340000000000, "234230010", 10**40 + 7])
+def test_from_fixed_matches_eth_utils(value, decimals):
+    assert from_fixed(value, decimals) == float(from_wei(int(value), UNITS[decimals]))
+
+
+@pytest.mark.parametrize("value", [-1, -0.5, float("nan"), float("inf"), "abc", 2**256])
+def test_to_fixed_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        to_fixed(value, 18)
+
+
+def test_to_fixed_rejects_unsupported_types():
+    with pytest.raises(TypeError):
+        to_fixed(True, 18)
+    with pytest.raises(TypeError):
+        to_fixed([1], 18)
+
+
+def test_batch_conversion_of_lists():
+    prices = [0.05123234, "0.23423001", 1770.2, 3]
+    assert to_fixed_batch(prices, 18) == [to_fixed(price, 18) for price in prices]
+    assert from_fixed_batch([512323, "234230010"], 6) == [0.512323, 234.23001]
+
+
+def test_batch_conversion_of_numpy_arrays():
+    numpy = pytest.importorskip("numpy")
+
+    prices = numpy.array([0.05123234, 1770.2, 0.5])
+    result = to_fixed_batch(prices, 6)
+    assert result.dtype == numpy.int64
+    assert result.tolist() == [51232, 1770200000, 500000]
+
+    # values past int64 fall back to python ints
+    result = to_fixed_batch(numpy.array([1770, 3]), 18)
+    assert result.dtype == object
+    assert result.tolist() == [1770 * 10**18, 3 * 10**18]
+
+    result = from_fixed_batch(numpy.array([51232340000000000, 10**18]), 18)
+    assert result.dtype == numpy.float64
+    assert result.tolist() == [0.05123234, 1.0]
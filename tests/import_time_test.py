@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.getcwd(), "src")
+
+# cold import budget in milliseconds, override with BLUEFIN_IMPORT_BUDGET_MS on slow machines
+IMPORT_BUDGET_MS = float(os.environ.get("BLUEFIN_IMPORT_BUDGET_MS", 250))
+
+# dependencies that must only be imported once they are used
+DEFERRED_MODULES = [
+    "aiohttp",
+    "bip_utils",
+    "eth_utils",
+    "numpy",
+    "requests",
+    "socketio",
+    "websocket",
+]
+
+
+def run_python(*args):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def cumulative_import_time_us(stderr: str, module: str) -> int:
+    """
+    Returns the cumulative time reported by `python -X importtime` for a module
+    """
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError("{} not found in importtime output".format(module))
+
+
+def test_heavy_dependencies_are_not_imported_eagerly():
+    result = run_python(
+        "-c",
+        "import sys, bluefin_v2_client; "
+        "print(','.join(m for m in {!r} if m in sys.modules))".format(DEFERRED_MODULES),
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_cold_import_within_budget():
+    # warm the bytecode cache so only the import itself is measured
+    run_python("-c", "import bluefin_v2_client")
+    timings = [
+        cumulative_import_time_us(
+            run_python("-X", "importtime", "-c", "import bluefin_v2_client").stderr,
+            "bluefin_v2_client",
+        )
+        for _ in range(3)
+    ]
+    assert min(timings) / 1000 < IMPORT_BUDGET_MS
+
+
+def test_socketio_client_is_created_on_first_use():
+    result = run_python(
+        "-c",
+        "import sys; from bluefin_v2_client.sockets_lib import Sockets; "
+        "sockets = Sockets('http://localhost'); "
+        "assert 'socketio' not in sys.modules; "
+        "assert sockets.sio is sockets.sio; "
+        "assert 'socketio' in sys.modules",
+    )
+    assert result.returncode == 0
@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import WebsocketClient, SOCKET_EVENTS
+from bluefin_v2_client import json_codec
+from bluefin_v2_client.json_codec import CODECS, JSONCodec, get_codec, set_codec
+
+PAYLOAD = os.path.join(
+    os.getcwd(), "benchmarks", "payloads", "orderbook_depth_update.json"
+)
+
+
+def installed_codecs():
+    codecs = []
+    for codec_class in CODECS.values():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.fixture(autouse=True)
+def restore_codec():
+    codec = json_codec._codec
+    yield
+    json_codec._codec = codec
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_codecs_decode_bytes_and_str(codec):
+    with open(PAYLOAD, "rb") as f:
+        frame = f.read()
+    expected = json.loads(frame)
+
+    assert codec.loads(frame) == expected
+    assert codec.loads(frame.decode("utf-8")) == expected
+    assert json.loads(codec.dumps(expected)) == expected
+    assert json.loads(codec.dumps_bytes(expected)) == expected
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_codecs_encode_wide_integers(codec):
+    message = {"price": 3500 * 10**18}
+    assert json.loads(codec.dumps(message)) == message
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_codecs_decode_wide_integers_exactly(codec):
+    # 123456.789012345678901234 scaled by 1e18, wider than 64 bits
+    quantity = 123456789012345678901234
+    frame = '{{"data": {{"quantity": {}, "price": [{}, -{}], "id": "{}"}}}}'.format(
+        quantity, quantity, quantity, quantity
+    )
+    expected = {"data": {"quantity": quantity, "price": [quantity, -quantity], "id": str(quantity)}}
+
+    assert codec.loads(frame) == expected
+    assert codec.loads(frame.encode("utf-8")) == expected
+    assert type(codec.loads(frame)["data"]["quantity"]) is int
+    # 64 bit integers stay on the fast path
+    assert codec.loads(b'{"a": 9223372036854775807}') == {"a": 2**63 - 1}
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_codecs_raise_value_error_on_invalid_json(codec):
+    with pytest.raises(ValueError):
+        codec.loads(b"not json")
+
+
+def test_auto_prefers_installed_fast_codec():
+    installed = [codec.name for codec in installed_codecs()]
+    expected = next(name for name in json_codec.AUTO_CODECS if name in installed)
+
+    codec = set_codec("auto")
+    assert get_codec() is codec
+    assert codec.name == expected
+
+
+def test_set_codec_by_name_and_instance():
+    assert set_codec("json").name == "json"
+    custom = JSONCodec()
+    assert set_codec(custom) is get_codec() is custom
+    with pytest.raises(ValueError):
+        set_codec("yaml")
+
+
+def test_websocket_listener_decodes_bytes_frames():
+    received = []
+    client = WebsocketClient("wss://localhost")
+    client.listen(SOCKET_EVENTS.ORDERBOOK_DEPTH_UPDATES.value, received.append)
+
+    with open(PAYLOAD, "rb") as f:
+        frame = f.read()
+    client.listener(None, frame)
+
+    assert received == [json.loads(frame)["data"]]
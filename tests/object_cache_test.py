@@ -0,0 +1,168 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import BluefinClient, Networks
+from sui_utils import Coin, CoinUtils, ObjectCache, SuiWallet, get_object_cache
+from sui_rpc_test import TEST_ACCT_KEY, FakeNode, node
+
+OWNER = "0x" + "ab" * 32
+USDC = "0x" + "0d" * 32 + "::coin::COIN"
+GAS = "0x" + "0e" * 32
+GAS_USED = {"computationCost": "1000", "storageCost": "2000", "storageRebate": "500"}
+
+
+def object_id(index):
+    return "0x{:064x}".format(index)
+
+
+def coin(index, balance, version=1):
+    return {"coinObjectId": object_id(index), "version": str(version), "digest": "d{}".format(index), "balance": str(balance)}
+
+
+def owned(owner, index, version, digest="x"):
+    return {"owner": {"AddressOwner": owner}, "reference": {"objectId": object_id(index), "version": version, "digest": digest}}
+
+
+def executed(*args, **kwargs):
+    return {"digest": "0xdigest", "effects": effects(*args, **kwargs)}
+
+
+def effects(owner, mutated=(), created=(), deleted=(), gas=14, status="success"):
+    return {
+        "status": {"status": status},
+        "executedEpoch": "512",
+        "gasUsed": GAS_USED,
+        "mutated": list(mutated) + [owned(owner, gas, 9)],
+        "created": list(created),
+        "deleted": [{"objectId": object_id(i), "version": 9, "digest": "x"} for i in deleted],
+        "gasObject": owned(owner, gas, 9),
+    }
+
+
+def test_balances_follow_effects():
+    cache = ObjectCache(OWNER)
+    cache.load_coins(USDC, [Coin(coin(1, 100)), Coin(coin(2, 50))])
+    cache.load_coins("0x2::sui::SUI", [Coin(coin(14, 10000))])
+
+    cache.update_from_effects(effects(OWNER, mutated=[owned(OWNER, 1, 9, "new")], deleted=[2]), {object_id(1): 50})
+    assert cache.get(object_id(1)) == (9, "new", 150)
+    assert cache.get(object_id(2)) is None
+    # gas paid: computation + storage - rebate
+    assert cache.get(object_id(14)) == (9, "x", 7500)
+    assert [(c.coin_object_id, c.balance) for c in cache.get_coins(USDC)] == [(object_id(1), "150")]
+
+    # a failed transaction only pays for gas
+    cache.update_from_effects(effects(OWNER, gas=14, status="failure"), {object_id(14): -100})
+    assert cache.get(object_id(14))[2] == 5000
+
+
+def test_unknown_changes_list_the_coins_again():
+    cache = ObjectCache(OWNER)
+    assert cache.get_coins(USDC) is None
+    cache.load_coins(USDC, [Coin(coin(1, 100)), Coin(coin(2, 50))])
+
+    # a coin changed by an unknown amount
+    cache.update_from_effects(effects(OWNER, mutated=[owned(OWNER, 1, 9)]))
+    assert cache.get_coins(USDC) is None
+    assert [c.coin_object_id for c in cache.known_coins(USDC)] == [object_id(2)]
+
+    # transferred away
+    cache.load_coins(USDC, [Coin(coin(1, 100))])
+    cache.update_from_effects(effects(OWNER, mutated=[owned("0x" + "cd" * 32, 1, 9)]))
+    assert cache.get_coins(USDC) == []
+
+    cache.invalidate()
+    assert cache.get(object_id(14)) is None and cache.get_coins(USDC) is None
+
+
+def split_node(node, owner, coins):
+    """
+    suix_getCoins lists the coins, unsafe_splitCoin executions are answered with
+    the effects of the split
+    """
+    pending = []
+    node.on("suix_getCoins", lambda params: {"data": coins, "hasNextPage": False})
+
+    def split(params):
+        pending.append(("split", params[1], int(params[2][0])))
+        return {"txBytes": "c3BsaXQ="}
+
+    def execute(params):
+        _, primary, _ = pending.pop(0)
+        created = owned(owner, 100 + len(node.requests), 1)
+        return executed(owner, mutated=[owned(owner, int(primary, 16), 9)], created=[created])
+
+    node.on("unsafe_splitCoin", split)
+    node.on("sui_executeTransactionBlock", execute)
+
+
+def test_create_coin_with_balance_lists_coins_once(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    split_node(node, owner, [coin(1, 1000), coin(2, 30)])
+
+    CoinUtils.create_coin_with_balance(USDC, 100, wallet, node.url)
+    CoinUtils.create_coin_with_balance(USDC, 200, wallet, node.url)
+    methods = [r["method"] for r in node.requests]
+    assert methods.count("suix_getCoins") == 1
+    assert methods.count("unsafe_splitCoin") == 2
+
+    cache = get_object_cache(node.url, owner)
+    balances = sorted(int(c.balance) for c in cache.get_coins(USDC))
+    assert balances == [30, 100, 200, 700]
+
+    # exact coin from the cache, no transaction
+    CoinUtils.create_coin_with_balance(USDC, 700, wallet, node.url)
+    assert len(node.requests) == len(methods)
+
+
+def test_create_coin_with_balance_lists_again_on_error(node):
+    wallet = SuiWallet(seed=TEST_ACCT_KEY)
+    owner = wallet.getUserAddress()
+    split_node(node, owner, [coin(1, 1000)])
+    cache = get_object_cache(node.url, owner)
+    # stale: the coin was spent elsewhere
+    cache.load_coins(USDC, [Coin(coin(3, 1000))])
+    node.on("unsafe_splitCoin", lambda params: {"error": {"code": -32602, "message": "not found"}} if params[1] == object_id(3) else {"txBytes": "c3BsaXQ="})
+    node.on("sui_executeTransactionBlock", lambda params: executed(owner, mutated=[owned(owner, 1, 9)], created=[owned(owner, 50, 1)]))
+
+    assert CoinUtils.create_coin_with_balance(USDC, 100, wallet, node.url) == object_id(50)
+    assert [r["method"] for r in node.requests] == ["unsafe_splitCoin", "suix_getCoins", "unsafe_splitCoin", "sui_executeTransactionBlock"]
+    assert sorted(int(c.balance) for c in cache.get_coins(USDC)) == [100, 900]
+
+
+@pytest.mark.asyncio
+async def test_deposit_uses_cached_usdc_coins(node):
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(
+        {
+            "auxiliaryContractsAddresses": {
+                "objects": {
+                    "Bank": {"id": object_id(201)},
+                    "Sequencer": {"id": object_id(202)},
+                    "Currency": {"dataType": USDC},
+                    "package": {"id": object_id(203)},
+                }
+            }
+        }
+    )
+    owner = client.account.getUserAddress()
+    node.on("suix_getCoins", lambda params: {"data": [coin(1, 5000000)], "hasNextPage": False})
+    node.on("unsafe_moveCall", lambda params: {"txBytes": "dHg="})
+    node.on("sui_executeTransactionBlock", lambda params: executed(owner, mutated=[owned(owner, 1, 9)]))
+    try:
+        assert await client.deposit_margin_to_bank(2)
+        assert await client.deposit_margin_to_bank(3)
+    finally:
+        await client.close_connections()
+    methods = [r["method"] for r in node.requests]
+    usdc_listings = [r for r in node.requests if r["method"] == "suix_getCoins" and r["params"][1] == USDC]
+    assert len(usdc_listings) == 1
+    assert methods.count("sui_executeTransactionBlock") == 2
+    assert client.objects.get(object_id(1))[2] == 0
@@ -0,0 +1,90 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from sui_utils import numberToHex, hexToByteArray, hex_address_to_bytes32
+from bluefin_v2_client.order_signer import OrderSigner
+from bluefin_v2_client.contracts import Contracts
+
+MAKER = "0x1c2a0f8e3b5d4c6a79e8f0d1b2c3a4e5f60718293a4b5c6d7e8f90a1b2c3d4e5"
+MARKET = "0x3ff3b4ac6de2d5a0c1d7e3e6d0a5c7d9ab2fb9bf1e2e0a99c6b0d61c33a8c8a0"
+
+
+def legacy_serialized_order(signer, order):
+    """Byte layout produced by the original hex based serializer"""
+    flags = hexToByteArray(numberToHex(signer.get_order_flags(order), 2))
+    return (
+        hexToByteArray(numberToHex(int(order["price"])))
+        + hexToByteArray(numberToHex(int(order["quantity"])))
+        + hexToByteArray(numberToHex(int(order["leverage"])))
+        + hexToByteArray(numberToHex(int(order["salt"])))
+        + hexToByteArray(numberToHex(int(order["expiration"]), 16))
+        + hexToByteArray(numberToHex(int(order["maker"], 16), 64))
+        + hexToByteArray(numberToHex(int(order["market"], 16), 64))
+        + flags
+        + bytearray("Bluefin", encoding="utf-8")
+    )
+
+
+def make_order(**overrides):
+    order = {
+        "market": MARKET,
+        "isBuy": True,
+        "price": 1770200000000000000000,
+        "quantity": 20000000000000000,
+        "leverage": 4000000000000000000,
+        "maker": MAKER,
+        "reduceOnly": False,
+        "postOnly": False,
+        "cancelOnRevert": False,
+        "orderbookOnly": True,
+        "expiration": 1739649099673,
+        "salt": 1739653234,
+        "ioc": False,
+    }
+    order.update(overrides)
+    return order
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"price": 0, "quantity": 1, "salt": 0},
+        {"price": 2**128 - 1, "quantity": 2**64, "leverage": 2**64 - 1},
+        {"expiration": 2**64 - 1},
+        {"maker": "0x2", "market": "0x" + "f" * 64},
+        {"isBuy": False, "ioc": True, "postOnly": True, "reduceOnly": True},
+        {"orderbookOnly": False},
+    ],
+)
+def test_serialized_order_matches_legacy_layout(overrides):
+    signer = OrderSigner()
+    order = make_order(**overrides)
+    serialized = signer.get_serialized_order(order)
+    assert len(serialized) == 144
+    assert serialized == legacy_serialized_order(signer, order)
+
+
+def test_serialized_order_rejects_out_of_range_values():
+    signer = OrderSigner()
+    with pytest.raises(Exception):
+        signer.get_serialized_order(make_order(price=2**128))
+
+
+def test_set_contract_addresses_pre_encodes_perpetual_ids():
+    hex_address_to_bytes32.cache_clear()
+    contracts = Contracts()
+    contracts.set_contract_addresses(
+        {
+            "auxiliaryContractsAddresses": {"objects": {}},
+            "ETH-PERP": {"Perpetual": {"id": MARKET}},
+        }
+    )
+    assert hex_address_to_bytes32.cache_info().currsize == 1
+
+    OrderSigner().get_serialized_order(make_order())
+    assert hex_address_to_bytes32.cache_info().hits == 1
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import LocalOrderBook, MARKET_SYMBOLS, ORDER_SIDE
+
+
+def base(value):
+    return str(int(value * 10**18))
+
+
+def levels(*pairs):
+    return [[base(price), base(size)] for price, size in pairs]
+
+
+def snapshot(sequence, bids, asks):
+    return {
+        "symbol": "ETH-PERP",
+        "orderbookUpdateId": sequence,
+        "bids": levels(*bids),
+        "asks": levels(*asks),
+    }
+
+
+def update(sequence, bids=(), asks=(), symbol="ETH-PERP"):
+    return {
+        "symbol": symbol,
+        "orderbookUpdateId": sequence,
+        "bids": levels(*bids),
+        "asks": levels(*asks),
+    }
+
+
+class SnapshotClient:
+    """
+    Stands in for BluefinClient.get_orderbook, returns the queued snapshots in order
+    """
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.requests = []
+
+    async def get_orderbook(self, params):
+        self.requests.append(params)
+        await asyncio.sleep(0)
+        return self.snapshots.pop(0)
+
+
+def seeded_book():
+    book = LocalOrderBook(MARKET_SYMBOLS.ETH)
+    book.load_snapshot(
+        snapshot(
+            10,
+            bids=[(99, 1), (98, 2), (97, 3)],
+            asks=[(101, 1), (102, 2), (103, 3)],
+        )
+    )
+    return book
+
+
+def test_snapshot_queries():
+    book = seeded_book()
+    assert book.best_bid() == (99, 1)
+    assert book.best_ask() == (101, 1)
+    assert book.mid() == 100
+    assert book.spread() == 2
+    assert book.level(ORDER_SIDE.BUY, 2) == (97, 3)
+    assert book.level(ORDER_SIDE.BUY, 3) is None
+    assert list(book.levels(ORDER_SIDE.SELL, 2)) == [(101, 1), (102, 2)]
+    assert book.depth(ORDER_SIDE.BUY, 2) == 3
+    assert book.cumulative_size(ORDER_SIDE.BUY, 98) == 3
+    assert book.cumulative_size(ORDER_SIDE.SELL, 102.5) == 3
+    # 1 @ 101 + 2 @ 102
+    assert book.vwap(ORDER_SIDE.SELL, 3) == pytest.approx(305 / 3)
+    assert book.vwap(ORDER_SIDE.SELL, 7) is None
+
+
+def test_updates_insert_replace_and_remove_levels():
+    book = seeded_book()
+    assert book.apply(update(11, bids=[(99.5, 4), (98, 0)], asks=[(101, 0)]))
+    assert list(book.levels(ORDER_SIDE.BUY)) == [(99.5, 4), (99, 1), (97, 3)]
+    assert list(book.levels(ORDER_SIDE.SELL)) == [(102, 2), (103, 3)]
+    assert book.sequence == 11
+
+    assert book.apply(update(12, asks=[(102, 5)]))
+    assert book.best_ask() == (102, 5)
+
+
+def test_stale_and_other_market_updates_are_ignored():
+    book = seeded_book()
+    assert not book.apply(update(10, bids=[(100, 1)]))
+    assert not book.apply(update(11, bids=[(100, 1)], symbol="BTC-PERP"))
+    assert book.best_bid() == (99, 1)
+
+
+def test_gap_without_client_waits_for_a_snapshot():
+    book = seeded_book()
+    assert not book.apply(update(13, bids=[(100, 1)]))
+    assert not book.synced
+    assert book.gaps == 1
+
+    book.load_snapshot(snapshot(12, bids=[(99, 2)], asks=[(101, 2)]))
+    # the buffered update follows the new snapshot
+    assert book.synced
+    assert book.sequence == 13
+    assert book.best_bid() == (100, 1)
+
+
+@pytest.mark.asyncio
+async def test_gap_resyncs_from_client():
+    client = SnapshotClient(
+        snapshot(1, bids=[(99, 1)], asks=[(101, 1)]),
+        snapshot(5, bids=[(98, 1)], asks=[(102, 1)]),
+    )
+    resyncs = []
+    book = LocalOrderBook("ETH-PERP", client, limit=20, on_resync=resyncs.append)
+    await book.sync()
+    assert client.requests == [{"symbol": MARKET_SYMBOLS.ETH, "limit": 20}]
+
+    await book.on_update(update(2, bids=[(99, 3)]))
+    await book.on_update(update(4, bids=[(97, 1)]))
+    # updates received while the snapshot is fetched are buffered
+    await book.on_update(update(6, asks=[(101.5, 1)]))
+    assert not book.synced
+    await book._resync_task
+
+    assert book.synced
+    assert book.sequence == 6
+    assert book.best_bid() == (98, 1)
+    assert book.best_ask() == (101.5, 1)
+    assert len(resyncs) == 2
+
+
+def test_human_readable_levels():
+    book = LocalOrderBook(MARKET_SYMBOLS.ETH, decimals=0)
+    book.load_snapshot({"bids": [["99.5", "1"]], "asks": [[100.5, 2]]})
+    assert book.mid() == 100
@@ -8,7 +8,7 @@ sys.path.insert(1, os.path.join(os.getcwd(), "src"))
 sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
 
 
-from bluefin_v2_client.utilities import *
+from sui_utils.utilities import *
 def test_precision_base18():
     assert (str(to_base18(0.05123234))=="51232340000000000") 
     
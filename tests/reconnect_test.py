@@ -0,0 +1,258 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import AsyncWebsocketClient, WebsocketClient, MARKET_SYMBOLS
+from bluefin_v2_client.reconnect import (
+    GAP_EVENT,
+    RECONNECT_EVENT,
+    Backoff,
+    SubscriptionRegistry,
+)
+
+FAST_BACKOFF = Backoff(initial=0.01, maximum=0.05)
+
+
+class DroppingServer:
+    """
+    Websocket server on its own thread and loop that records the frames
+    received on each connection and can drop every connection on demand
+    """
+
+    def __init__(self):
+        self.connections = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.url = self._call(self._start())
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    async def _handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        received = []
+        self.connections.append((request, ws, received))
+        async for message in ws:
+            received.append(json.loads(message.data))
+        return ws
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get("/", self._handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return "ws://127.0.0.1:{}/".format(site._server.sockets[0].getsockname()[1])
+
+    def received(self, connection=-1):
+        # the client can be connected before the handler has registered it
+        if not self.connections:
+            return []
+        return self.connections[connection][2]
+
+    def drop(self):
+        """
+        Aborts every open connection without a close handshake
+        """
+
+        async def _drop():
+            for request, _, _ in self.connections:
+                if request.transport is not None:
+                    request.transport.abort()
+
+        self._call(_drop())
+
+    def push(self, event_name, data):
+        async def _push():
+            _, ws, _ = self.connections[-1]
+            await ws.send_str(json.dumps({"eventName": event_name, "data": data}))
+
+        self._call(_push())
+
+    def stop(self):
+        self.drop()
+        self._call(self.runner.cleanup())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met")
+        time.sleep(0.01)
+
+
+async def async_wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met")
+        await asyncio.sleep(0.01)
+
+
+def test_backoff_is_jittered_exponential_and_capped():
+    backoff = Backoff(initial=1, maximum=8, factor=2, max_attempts=3)
+    for attempt, base in enumerate([1, 2, 4, 8, 8]):
+        for _ in range(20):
+            assert base / 2 <= backoff.delay(attempt) <= base
+    assert not backoff.exhausted(2)
+    assert backoff.exhausted(3)
+    assert not Backoff().exhausted(10**6)
+    # retrying forever, the delay stays at the maximum
+    assert 15 <= Backoff().delay(10**6) <= 30
+
+
+def test_subscription_registry_tracks_active_rooms():
+    registry = SubscriptionRegistry()
+    registry.update("SUBSCRIBE", {"e": "globalUpdates", "p": "ETH-PERP"})
+    registry.update("SUBSCRIBE", {"e": "globalUpdates", "p": "BTC-PERP"})
+    registry.update("SUBSCRIBE", {"p": "ETH-PERP", "e": "globalUpdates"})
+    registry.update("UNSUBSCRIBE", {"e": "globalUpdates", "p": "BTC-PERP"})
+    assert registry.rooms() == [{"e": "globalUpdates", "p": "ETH-PERP"}]
+    assert len(registry) == 1
+
+
+def test_threaded_client_reconnects_and_replays_subscriptions():
+    server = DroppingServer()
+    client = WebsocketClient(server.url, token="user-token")
+    events = []
+    client.listen(RECONNECT_EVENT, lambda data: events.append((RECONNECT_EVENT, data)))
+    client.listen(GAP_EVENT, lambda data: events.append((GAP_EVENT, data)))
+    client.listen("OrderUpdate", lambda data: events.append(("OrderUpdate", data)))
+    try:
+        client.initialize_socket(on_open=None, backoff=FAST_BACKOFF)
+        assert client.subscribe_global_updates_by_symbol(MARKET_SYMBOLS.ETH)
+        assert client.subscribe_global_updates_by_symbol(MARKET_SYMBOLS.BTC)
+        assert client.unsubscribe_global_updates_by_symbol(MARKET_SYMBOLS.BTC)
+        assert client.subscribe_user_update_by_token()
+        wait_until(lambda: len(server.received(0)) == 4)
+
+        server.drop()
+        wait_until(lambda: len(server.connections) == 2 and len(server.received()) == 2)
+        assert server.received() == [
+            ["SUBSCRIBE", [{"e": "globalUpdates", "p": "ETH-PERP"}]],
+            ["SUBSCRIBE", [{"e": "userUpdates", "t": "user-token", "rt": None}]],
+        ]
+
+        server.push("OrderUpdate", {"id": 1})
+        wait_until(lambda: len(events) == 3)
+        (reconnect, outage), (gap, timing), update = events
+        assert reconnect == RECONNECT_EVENT and outage["attempts"] >= 1
+        assert len(outage["subscriptions"]) == 2
+        assert gap == GAP_EVENT
+        assert timing["outageToFirstMessage"] >= outage["downtime"] > 0
+        assert timing["disconnectedAt"] <= timing["reconnectedAt"] <= timing["firstMessageAt"]
+        assert update == ("OrderUpdate", {"id": 1})
+    finally:
+        client.stop()
+        client.socket_manager.join(5)
+        server.stop()
+
+    assert not client.socket_manager.is_alive()
+    assert len(server.connections) == 2
+
+
+def test_threaded_client_gives_up_after_max_attempts():
+    server = DroppingServer()
+    client = WebsocketClient(server.url)
+    client.initialize_socket(
+        on_open=None, backoff=Backoff(initial=0.01, maximum=0.01, max_attempts=2)
+    )
+    server.stop()
+    client.socket_manager.join(5)
+    assert not client.socket_manager.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_async_client_reconnects_and_replays_subscriptions():
+    server = DroppingServer()
+    client = AsyncWebsocketClient(server.url)
+    events = []
+    client.listen(RECONNECT_EVENT, lambda data: events.append(RECONNECT_EVENT))
+    client.listen(GAP_EVENT, lambda data: events.append(data))
+    closed = []
+    try:
+        await client.open(on_close=closed.append, backoff=FAST_BACKOFF)
+        assert await client.subscribe_orderbook_depth_streams_by_symbol(
+            MARKET_SYMBOLS.ETH, "10"
+        )
+        await async_wait_until(lambda: len(server.received(0)) == 1)
+
+        server.drop()
+        await async_wait_until(
+            lambda: len(server.connections) == 2 and len(server.received()) == 1
+        )
+        assert server.received() == [
+            ["SUBSCRIBE", [{"e": "orderbookDepthStream", "p": "ETH-PERP", "d": "10"}]]
+        ]
+
+        server.push("OrderbookDepthUpdate", {})
+        await async_wait_until(lambda: len(events) == 2)
+        assert events[0] == RECONNECT_EVENT
+        assert events[1]["outageToFirstMessage"] > 0
+        assert closed == []
+    finally:
+        await client.close()
+        server.stop()
+    assert closed == [client]
+
+
+@pytest.mark.asyncio
+async def test_async_client_closes_after_max_attempts():
+    server = DroppingServer()
+    client = AsyncWebsocketClient(server.url)
+    closed = []
+    await client.open(
+        on_close=closed.append,
+        backoff=Backoff(initial=0.01, maximum=0.01, max_attempts=2),
+    )
+    server.stop()
+    await async_wait_until(lambda: closed == [client])
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_closes_sockets_it_could_not_subscribe_on():
+    server = DroppingServer()
+    client = AsyncWebsocketClient(server.url)
+    sockets = []
+    try:
+        await client.open(backoff=FAST_BACKOFF)
+        assert await client.subscribe_orderbook_depth_streams_by_symbol(
+            MARKET_SYMBOLS.ETH, "10"
+        )
+        await async_wait_until(lambda: len(server.received(0)) == 1)
+
+        connect = client.session.ws_connect
+        send = client.send
+
+        async def ws_connect(*args, **kwargs):
+            sockets.append(await connect(*args, **kwargs))
+            return sockets[-1]
+
+        async def send_failing_once(message):
+            if len(sockets) == 1:
+                raise ConnectionResetError("dropped while subscribing")
+            await send(message)
+
+        client.session.ws_connect = ws_connect
+        client.send = send_failing_once
+        server.drop()
+        await async_wait_until(lambda: len(sockets) == 2 and len(server.received()) == 1)
+        assert sockets[0].closed and not sockets[1].closed
+    finally:
+        await client.close()
+        server.stop()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from sui_utils import (
+    LOCKED_OBJECT_ERROR_CODE,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable_exception,
+    is_retryable_result,
+)
+
+LOCKED = {"error": {"code": -32002, "message": LOCKED_OBJECT_ERROR_CODE + " [0x1]"}}
+OK = {"result": {"digest": "abc"}}
+
+
+class Flaky:
+    """
+    Returns (or raises) the queued outcomes in order, then OK
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else OK
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def run(self):
+        return self()
+
+
+def fast_policy(**kwargs):
+    return RetryPolicy(initial=0.001, maximum=0.004, **kwargs)
+
+
+def test_delays_grow_with_jitter_up_to_the_maximum():
+    policy = RetryPolicy(initial=1, maximum=4, factor=2)
+    for retry, base in [(0, 1), (1, 2), (2, 4), (5, 4)]:
+        delays = [policy.delay(retry) for _ in range(50)]
+        assert all(base / 2 <= delay <= base for delay in delays)
+        assert len(set(delays)) > 1
+    # the exponent is capped, factor**retry would overflow a float
+    assert 2 <= policy.delay(10**6) <= 4
+
+
+def test_classification():
+    assert is_retryable_result(LOCKED)
+    assert not is_retryable_result(OK)
+    assert not is_retryable_result({"error": {"code": -32602, "message": "Invalid params"}})
+    assert is_retryable_exception(ConnectionResetError())
+    assert is_retryable_exception(asyncio.TimeoutError())
+    assert not is_retryable_exception(ValueError("bad json"))
+
+
+def test_retries_until_the_result_is_not_retryable():
+    policy = fast_policy()
+    flaky = Flaky(LOCKED, ConnectionError("reset"), LOCKED)
+    assert policy.call(flaky) == OK
+    assert flaky.calls == 4
+    assert policy.metrics.as_dict() == {
+        "calls": 1,
+        "retries": 3,
+        "exhausted": 0,
+        "budgetExhausted": 0,
+        "retriesPerCall": {3: 1},
+    }
+
+
+def test_gives_up_after_max_attempts():
+    policy = fast_policy(max_attempts=3)
+    flaky = Flaky(*[LOCKED] * 5)
+    # the last result is returned for the caller to report
+    assert policy.call(flaky) == LOCKED
+    assert flaky.calls == 3
+
+    with pytest.raises(ConnectionError):
+        policy.call(Flaky(*[ConnectionError("reset")] * 5), max_attempts=2)
+    assert policy.metrics.exhausted == 2
+    assert policy.metrics.retries_per_call == {2: 1, 1: 1}
+
+
+def test_errors_that_are_not_retryable_are_not_retried():
+    policy = fast_policy()
+    flaky = Flaky(ValueError("bad json"))
+    with pytest.raises(ValueError):
+        policy.call(flaky)
+    assert flaky.calls == 1
+    assert policy.metrics.retries == 0
+
+
+def test_only_transient_requests_errors_are_retried():
+    requests = pytest.importorskip("requests")
+    assert is_retryable_exception(requests.exceptions.ConnectionError())
+    assert is_retryable_exception(requests.exceptions.ReadTimeout())
+    for error in (
+        requests.exceptions.MissingSchema(),
+        requests.exceptions.InvalidURL(),
+        requests.exceptions.HTTPError(),
+        requests.exceptions.TooManyRedirects(),
+    ):
+        assert not is_retryable_exception(error)
+
+    policy = fast_policy()
+    flaky = Flaky(requests.exceptions.MissingSchema("no scheme"))
+    with pytest.raises(requests.exceptions.MissingSchema):
+        policy.call(flaky)
+    assert flaky.calls == 1
+    assert policy.metrics.retries == 0
+
+
+def test_budget_caps_retries_across_calls():
+    policy = fast_policy(budget=RetryBudget(ratio=0.5, reserve=2))
+    outcomes = [LOCKED] * 20
+    assert policy.call(Flaky(*outcomes)) == LOCKED
+    # two retries from the reserve, then half a token per call
+    assert policy.metrics.retries == 2
+    assert policy.metrics.budget_exhausted == 1
+    assert policy.call(Flaky(*outcomes)) == LOCKED
+    assert policy.metrics.retries == 2
+    policy.call(Flaky())
+    assert policy.call(Flaky(LOCKED)) == OK
+    assert policy.metrics.retries == 3
+
+
+@pytest.mark.asyncio
+async def test_async_retries_do_not_block_the_loop():
+    policy = RetryPolicy(initial=0.02, maximum=0.02)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    flaky = Flaky(LOCKED, LOCKED, LOCKED)
+    try:
+        assert await policy.call_async(flaky.run) == OK
+    finally:
+        task.cancel()
+    assert flaky.calls == 4
+    assert ticks > 5
+    assert policy.metrics.retries_per_call == {3: 1}
@@ -0,0 +1,28 @@
+import hashlib
+import os
+import sys
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from nacl.signing import SigningKey
+from sui_utils import SuiWallet, Signer, get_signing_key
+
+TEST_ACCT_SEED = "lawsuit pony abuse faint call ship attract slender arrange expire despair orbit"
+
+
+def test_signing_key_is_shared_between_wallet_and_signers():
+    wallet = SuiWallet(seed=TEST_ACCT_SEED)
+    assert wallet.getSigningKey() is wallet.getSigningKey()
+    assert get_signing_key(wallet.privateKeyBytes) is wallet.getSigningKey()
+    assert get_signing_key(bytearray(wallet.privateKeyBytes)) is wallet.getSigningKey()
+
+
+def test_cached_signatures_match_fresh_signing_key():
+    wallet = SuiWallet(seed=TEST_ACCT_SEED)
+    signer = Signer()
+    msg_hash = hashlib.sha256(b"bluefin").digest()
+    expected = SigningKey(wallet.privateKeyBytes).sign(msg_hash)[:64]
+
+    assert signer.sign_hash(msg_hash, wallet.privateKeyBytes) == expected.hex() + "1"
+    assert signer.sign_bytes(msg_hash, wallet.privateKeyBytes) == expected
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sys
+
+import pytest
+import socketio
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import Sockets, SocketsPool, account_address
+
+
+class SocketServer:
+    """
+    Local socket.io server acknowledging room subscriptions and recording them per connection
+    """
+
+    def __init__(self):
+        self.sio = socketio.AsyncServer(async_mode="aiohttp")
+        self.rooms = {}
+        self.sio.on("connect", self.on_connect)
+        self.sio.on("SUBSCRIBE", self.on_subscribe)
+        self.sio.on("UNSUBSCRIBE", self.on_unsubscribe)
+
+    async def on_connect(self, sid, environ):
+        self.rooms[sid] = []
+
+    async def on_subscribe(self, sid, rooms):
+        self.rooms[sid].extend(room["t"] for room in rooms)
+        return {"success": True}
+
+    async def on_unsubscribe(self, sid, rooms):
+        for room in rooms:
+            self.rooms[sid].remove(room["t"])
+        return {"success": True}
+
+    def sid_of(self, token):
+        return next(sid for sid, tokens in self.rooms.items() if token in tokens)
+
+    async def start(self):
+        app = web.Application()
+        self.sio.attach(app)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return "http://127.0.0.1:{}".format(site._server.sockets[0].getsockname()[1])
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+async def wait_for(condition, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+def test_account_address_resolution():
+    address = "0xAbC"
+    assert account_address({"order": {"userAddress": address}}) == "0xabc"
+    assert account_address({"accountData": {"address": address}}) == "0xabc"
+    assert account_address({"userAddress": address, "position": {}}) == "0xabc"
+    assert account_address({"price": "1"}) is None
+    assert account_address("0xabc") is None
+
+
+@pytest.mark.asyncio
+async def test_instances_have_their_own_connection_and_callbacks():
+    server = SocketServer()
+    url = await server.start()
+    first, second = Sockets(url, token="first"), Sockets(url, token="second")
+    received = {"first": [], "second": []}
+
+    async def on_first(data):
+        received["first"].append(data)
+
+    async def on_second(data):
+        received["second"].append(data)
+
+    await first.listen("OrderUpdate", on_first)
+    await second.listen("OrderUpdate", on_second)
+    try:
+        await first.open()
+        await second.open()
+        assert first.sio is not second.sio
+        assert await first.subscribe_user_update_by_token()
+        assert await second.subscribe_user_update_by_token()
+
+        await server.sio.emit("OrderUpdate", {"id": 1}, to=server.sid_of("first"))
+        await server.sio.emit("OrderUpdate", {"id": 2}, to=server.sid_of("second"))
+        await wait_for(lambda: received["first"] and received["second"])
+        assert received == {"first": [{"id": 1}], "second": [{"id": 2}]}
+    finally:
+        await first.close()
+        await second.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_multiplexes_accounts_over_connections():
+    server = SocketServer()
+    url = await server.start()
+    pool = SocketsPool(url, max_connections=2, accounts_per_connection=2)
+    received, unrouted = [], []
+    try:
+        for i in range(4):
+            assert await pool.add_account("0xA{}".format(i), "token-{}".format(i))
+        assert len(pool.connections) == 2
+        assert sorted(len(tokens) for tokens in server.rooms.values()) == [2, 2]
+
+        with pytest.raises(Exception):
+            await pool.add_account("0xA4", "token-4")
+        with pytest.raises(ValueError, match="not in the sockets pool"):
+            await pool.listen("OrderUpdate", lambda data: None, address="0xA4")
+
+        async def on_order(data):
+            received.append(data["order"]["id"])
+
+        async def on_default(payload):
+            unrouted.append(payload["event"])
+
+        await pool.listen("OrderUpdate", on_order, address="0xa2")
+        await pool.listen("default", on_default)
+
+        sid = server.sid_of("token-2")
+        await server.sio.emit("OrderUpdate", {"order": {"id": 7, "userAddress": "0xA2"}}, to=sid)
+        await server.sio.emit("OrderUpdate", {"order": {"id": 8, "userAddress": "0xA9"}}, to=sid)
+        await wait_for(lambda: received and unrouted)
+        assert received == [7]
+        assert unrouted == ["OrderUpdate"]
+
+        # freed slots are reused before the pool is considered full
+        assert await pool.remove_account("0xA2")
+        await wait_for(lambda: "token-2" not in server.rooms[sid])
+        assert await pool.add_account("0xA4", "token-4")
+        assert server.sid_of("token-4") == sid
+    finally:
+        await pool.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_resubscribes_accounts_on_reconnect():
+    server = SocketServer()
+    url = await server.start()
+    pool = SocketsPool(url)
+    try:
+        assert await pool.add_account("0xA0", "token-0")
+        connection = next(iter(pool.connections))
+        sid = server.sid_of("token-0")
+        server.rooms[sid] = []
+
+        # the connect callback runs every time socketio (re)connects
+        await connection.callbacks["connect"]()
+        assert server.rooms[sid] == ["token-0"]
+    finally:
+        await pool.close()
+        await server.stop()
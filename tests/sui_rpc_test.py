@@ -0,0 +1,411 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import BluefinClient, MARKET_SYMBOLS, Networks
+from sui_utils import (
+    EXECUTION_FINALITY,
+    FULL_RESPONSE_OPTIONS,
+    LOCKED_OBJECT_ERROR_CODE,
+    STATUS_RESPONSE_OPTIONS,
+    AsyncSuiRpcClient,
+    RetryPolicy,
+    SuiRpcClient,
+    get_coins_with_type,
+    get_rpc_client,
+    rpc_batch,
+    rpc_call_sui_function,
+    rpc_unsafe_moveCall,
+)
+
+TEST_ACCT_KEY = (
+    "negative repeat fold noodle symptom spirit spend trophy merge ethics math erupt"
+)
+USER = "0x" + "ab" * 32
+COIN_TYPE = "0x2::sui::SUI"
+
+
+class FakeNode:
+    """
+    JSON-RPC server on its own thread and loop answering with the handler
+    registered for each method, records requests and the client port they came from
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.requests = []
+        self.ports = []
+        self.bodies = 0
+        # answer batches in reverse order, nodes may answer in any order
+        self.reverse_batches = False
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.url = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(5)
+
+    def on(self, method, handler):
+        """
+        handler(params) returns the result, or a dict with an "error" to answer
+        with an error, results holding an "error" are returned under "result"
+        """
+        self.handlers[method] = handler
+
+    def _answer(self, request):
+        self.requests.append(request)
+        if request["method"] not in self.handlers:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "Method not found"}}
+        result = self.handlers[request["method"]](request["params"])
+        if isinstance(result, dict) and "result" in result:
+            return {"jsonrpc": "2.0", "id": request["id"], "result": result["result"]}
+        if isinstance(result, dict) and "error" in result:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": result["error"]}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    async def _handler(self, request):
+        self.ports.append(request.transport.get_extra_info("peername")[1])
+        self.bodies += 1
+        body = json.loads(await request.read())
+        if isinstance(body, list):
+            answers = [self._answer(item) for item in body]
+            if self.reverse_batches:
+                answers.reverse()
+            return web.json_response(answers)
+        return web.json_response(self._answer(body))
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post("/", self._handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return "http://127.0.0.1:{}/".format(site._server.sockets[0].getsockname()[1])
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+@pytest.fixture
+def node():
+    node = FakeNode()
+    yield node
+    node.stop()
+
+
+def coin(index, balance):
+    return {"coinType": COIN_TYPE, "coinObjectId": "0x{:064x}".format(index), "balance": str(balance)}
+
+
+def paged_coins(params):
+    # two coins per page, the cursor is the index of the next coin
+    coins = [coin(i, 100 * (i + 1)) for i in range(5)]
+    start = int(params[2]) if len(params) > 2 else 0
+    return {
+        "data": coins[start : start + 2],
+        "nextCursor": str(start + 2),
+        "hasNextPage": start + 2 < len(coins),
+    }
+
+
+def test_sync_client_reuses_its_connection(node):
+    node.on("suix_getBalance", lambda params: {"totalBalance": "42"})
+    client = SuiRpcClient(node.url)
+    try:
+        assert [client.get_coin_balance(USER, COIN_TYPE) for _ in range(3)] == ["42"] * 3
+    finally:
+        client.close()
+    assert len(set(node.ports)) == 1
+    assert node.requests[0] == {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "suix_getBalance",
+        "params": [USER, COIN_TYPE],
+    }
+
+
+def test_module_functions_share_a_pooled_client(node):
+    node.on("unsafe_moveCall", lambda params: {"txBytes": "dHg="})
+    node.on("suix_getCoins", paged_coins)
+    assert get_rpc_client(node.url) is get_rpc_client(node.url)
+
+    assert rpc_unsafe_moveCall(node.url, ["0x1", "5"], "deposit", "bank", USER, "0x2", typeArguments=["T"]) == "dHg="
+    assert node.requests[0]["params"] == [USER, "0x2", "bank", "deposit", ["T"], ["0x1", "5"], None, "100000000"]
+
+    coins = get_coins_with_type(USER, COIN_TYPE, node.url)
+    assert [int(c.balance) for c in coins] == [100, 200, 300, 400, 500]
+    assert rpc_call_sui_function(node.url, [USER, COIN_TYPE]).has_next_page
+    assert len(set(node.ports)) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_reuses_its_connection(node):
+    node.on("suix_getCoins", paged_coins)
+    node.on("suix_getCoinMetadata", lambda params: {"decimals": 9, "symbol": "SUI"})
+    client = AsyncSuiRpcClient(node.url)
+    try:
+        coins = await client.get_coins_with_type(USER, COIN_TYPE)
+        metadata = await client.get_coin_metadata(COIN_TYPE)
+    finally:
+        await client.close()
+    assert len(coins) == 5
+    assert metadata.decimals == 9
+    assert len(set(node.ports)) == 1
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_coin_pages_are_read_ahead(node):
+    node.on("suix_getCoins", paged_coins)
+    client = AsyncSuiRpcClient(node.url)
+
+    async def requested(count):
+        for _ in range(200):
+            if len(node.requests) >= count:
+                return True
+            await asyncio.sleep(0.01)
+        return False
+
+    balances = []
+    try:
+        coins = client.iter_coins_with_type(USER, COIN_TYPE)
+        async for coin in coins:
+            balances.append(int(coin.balance))
+            if len(balances) == 1:
+                # the second page is on its way before the first one is used
+                assert await requested(2)
+                assert node.requests[1]["params"] == [USER, COIN_TYPE, "2"]
+            if len(balances) == 3:
+                break
+        await coins.aclose()
+    finally:
+        await client.close()
+    assert balances == [100, 200, 300]
+    # the third page, read ahead of the second one's coins, is cancelled on leaving the loop
+    await asyncio.sleep(0.05)
+    assert len(node.requests) == 2
+    assert not hasattr(coin, "__dict__")
+
+
+@pytest.mark.asyncio
+async def test_async_transaction_bytes_errors(node):
+    node.on("unsafe_moveCall", lambda params: {"error": {"code": -32602, "message": "bad"}})
+    client = AsyncSuiRpcClient(node.url)
+    try:
+        with pytest.raises(Exception, match="Failed to create transaction bytes"):
+            await client.unsafe_moveCall([], "f", "m", USER, "0x2")
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_bluefin_client_awaits_the_node(node):
+    node.on("suix_getBalance", lambda params: {"totalBalance": "1500000000"})
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    try:
+        assert client.rpc.session is client.apis.client
+        assert await client.get_native_chain_token_balance() == 1.5
+    finally:
+        await client.close_connections()
+    assert node.requests[0]["params"] == [client.account.getUserAddress(), "0x2::sui::SUI"]
+
+
+def echo_balance(params):
+    return {"totalBalance": str(len(params[1]))}
+
+
+def test_batch_demultiplexes_responses_by_id(node):
+    node.on("suix_getBalance", echo_balance)
+    node.on("suix_getCoinMetadata", lambda params: {"error": {"code": -32602, "message": "unknown coin"}})
+    node.reverse_batches = True
+    calls = [("suix_getBalance", [USER, "0x" + "1" * i]) for i in range(1, 6)]
+    calls.insert(2, ("suix_getCoinMetadata", ["0x9::x::X"]))
+
+    responses = rpc_batch(node.url, calls)
+    assert [response["id"] for response in responses] == list(range(6))
+    assert responses[2]["error"]["message"] == "unknown coin"
+    assert [r["result"]["totalBalance"] for r in responses if "result" in r] == ["3", "4", "5", "6", "7"]
+    assert node.bodies == 1
+
+
+@pytest.mark.asyncio
+async def test_async_batch_splits_large_batches(node):
+    node.on("suix_getBalance", echo_balance)
+    client = AsyncSuiRpcClient(node.url)
+    try:
+        calls = [("suix_getBalance", [USER, "0x" + "1" * i]) for i in range(1, 6)]
+        responses = await client.batch(calls, max_batch_size=2)
+    finally:
+        await client.close()
+    assert [r["result"]["totalBalance"] for r in responses] == ["3", "4", "5", "6", "7"]
+    assert node.bodies == 3
+
+
+@pytest.mark.parametrize("unknown_id", [2, 10, -1])
+def test_batch_ignores_responses_with_unknown_ids(unknown_id):
+    client = SuiRpcClient("http://localhost")
+    # the response to request 1 comes back with an id no request was sent with
+    client.post = lambda payload: [
+        {"jsonrpc": "2.0", "id": 0, "result": {"totalBalance": "1"}},
+        {"jsonrpc": "2.0", "id": unknown_id, "result": {"totalBalance": "2"}},
+    ]
+    responses = client.batch([("suix_getBalance", [USER, COIN_TYPE])] * 2)
+    assert responses[0]["result"] == {"totalBalance": "1"}
+    assert responses[1] == {"jsonrpc": "2.0", "id": 1, "error": {"code": -32603, "message": "Missing response in batch"}}
+
+
+def test_batch_raises_when_the_batch_fails(node):
+    client = SuiRpcClient(node.url)
+    client.post = lambda payload: {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "too many"}}
+    with pytest.raises(Exception, match="Failed to execute batch request"):
+        client.batch([("suix_getBalance", [USER, COIN_TYPE])])
+
+
+SNAPSHOT_CONTRACTS = {
+    "auxiliaryContractsAddresses": {
+        "objects": {
+            "BankTable": {"id": "0xbank"},
+            "Currency": {"dataType": "0xusdc::coin::COIN"},
+        }
+    },
+    "ETH-PERP": {"PositionsTable": {"id": "0xeth"}},
+    "BTC-PERP": {"PositionsTable": {"id": "0xbtc"}},
+}
+
+
+def dynamic_field(parent, owner):
+    if parent == "0xbank":
+        return {"data": {"content": {"fields": {"value": {"fields": {"balance": "2500000000"}}}}}}
+    if parent == "0xeth" and owner == USER:
+        return {"data": {"content": {"fields": {"value": {"fields": {"qPos": "1000000000000000000"}}}}}}
+    return {"error": {"code": "dynamicFieldNotFound", "parent_object_id": parent}}
+
+
+@pytest.mark.asyncio
+async def test_chain_snapshot_in_one_round_trip(node):
+    balances = {"0x2::sui::SUI": "3000000000", "0xusdc::coin::COIN": "7000000"}
+    node.on("suix_getBalance", lambda params: {"totalBalance": balances[params[1]]})
+    # dynamic field not found comes back as a result holding an error
+    node.on(
+        "suix_getDynamicFieldObject",
+        lambda params: {"result": dynamic_field(params[0], params[1]["value"])},
+    )
+    other = "0x" + "cd" * 32
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(SNAPSHOT_CONTRACTS)
+    try:
+        snapshot = await client.get_chain_snapshot(
+            [MARKET_SYMBOLS.ETH, MARKET_SYMBOLS.BTC], [USER, other]
+        )
+    finally:
+        await client.close_connections()
+
+    assert node.bodies == 1
+    assert len(node.requests) == 10
+    assert snapshot[USER] == {
+        "suiBalance": 3,
+        "usdcBalance": 7,
+        "marginBankBalance": 2.5,
+        "positions": {"ETH-PERP": {"qPos": "1000000000000000000"}, "BTC-PERP": None},
+    }
+    assert snapshot[other]["positions"] == {"ETH-PERP": None, "BTC-PERP": None}
+
+
+def locked_then_executed(failures):
+    calls = []
+
+    def handler(params):
+        calls.append(params)
+        if len(calls) <= failures:
+            return {"error": {"code": -32002, "message": LOCKED_OBJECT_ERROR_CODE}}
+        return {"digest": "0xdigest", "effects": {"status": {"status": "success"}}}
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_async_execute_retries_locked_objects(node):
+    node.on("sui_executeTransactionBlock", locked_then_executed(2))
+    policy = RetryPolicy(initial=0.001, maximum=0.001)
+    client = AsyncSuiRpcClient(node.url, retry_policy=policy)
+    try:
+        result = await client.execute_transaction_block("dHg=", "c2ln")
+    finally:
+        await client.close()
+    assert result["result"]["digest"] == "0xdigest"
+    assert len(node.requests) == 3
+    assert policy.metrics.retries_per_call == {2: 1}
+
+
+def test_execute_returns_the_error_once_attempts_are_used(node):
+    node.on("sui_executeTransactionBlock", locked_then_executed(10))
+    client = SuiRpcClient(node.url, retry_policy=RetryPolicy(initial=0.001, maximum=0.001))
+    try:
+        result = client.execute_transaction_block("dHg=", "c2ln", maxRetries=2)
+    finally:
+        client.close()
+    assert LOCKED_OBJECT_ERROR_CODE in result["error"]["message"]
+    assert len(node.requests) == 2
+    assert client.retry_policy.metrics.exhausted == 1
+
+
+def test_execute_response_options_and_finality(node):
+    node.on("sui_executeTransactionBlock", locked_then_executed(0))
+    client = SuiRpcClient(node.url)
+    try:
+        client.execute_transaction_block("dHg=", "c2ln")
+        client.execute_transaction_block(
+            "dHg=",
+            "c2ln",
+            response_options=STATUS_RESPONSE_OPTIONS,
+            finality=EXECUTION_FINALITY.WAIT_FOR_EFFECTS_CERT,
+        )
+        client.execute_transaction_block("dHg=", "c2ln", finality="WaitForEffectsCert")
+        with pytest.raises(ValueError):
+            client.execute_transaction_block("dHg=", "c2ln", finality="WaitForever")
+    finally:
+        client.close()
+    assert node.requests[0]["params"] == ["dHg=", ["c2ln"], FULL_RESPONSE_OPTIONS, "WaitForLocalExecution"]
+    assert node.requests[1]["params"] == ["dHg=", ["c2ln"], {"showEffects": True}, "WaitForEffectsCert"]
+    assert node.requests[2]["params"][3] == "WaitForEffectsCert"
+
+
+@pytest.mark.asyncio
+async def test_margin_methods_request_the_status_only(node):
+    node.on("unsafe_moveCall", lambda params: {"txBytes": "dHg="})
+    node.on("sui_executeTransactionBlock", locked_then_executed(0))
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(
+        {
+            "auxiliaryContractsAddresses": {
+                "objects": {
+                    "Bank": {"id": "0xbank"},
+                    "Sequencer": {"id": "0xsequencer"},
+                    "package": {"id": "0xpackage"},
+                    "Currency": {"dataType": "0xusdc::coin::COIN"},
+                }
+            }
+        }
+    )
+    try:
+        assert await client.withdraw_margin_from_bank(10)
+        assert await client.withdraw_all_margin_from_bank(
+            response_options=FULL_RESPONSE_OPTIONS,
+            finality=EXECUTION_FINALITY.WAIT_FOR_EFFECTS_CERT,
+        )
+    finally:
+        await client.close_connections()
+    executions = [r["params"] for r in node.requests if r["method"] == "sui_executeTransactionBlock"]
+    assert executions[0][2:] == [STATUS_RESPONSE_OPTIONS, "WaitForLocalExecution"]
+    assert executions[1][2:] == [FULL_RESPONSE_OPTIONS, "WaitForEffectsCert"]
@@ -0,0 +1,363 @@
+import base64
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_rfq_client import RFQClient, RFQContracts
+from bluefin_v2_client import BluefinClient, Networks
+from sui_utils import (
+    BASE58_ALPHABET,
+    BCSSerializer,
+    SuiRpcClient,
+    SuiWallet,
+    TransactionBuilder,
+    serialize_move_call_transaction,
+    serialize_pure,
+    serialize_type_tag,
+)
+from sui_rpc_test import TEST_ACCT_KEY, FakeNode, node
+
+SENDER = "0x" + "ab" * 32
+PACKAGE = "0x" + "cc" * 32
+BANK = "0x" + "01" * 32
+SEQUENCER = "0x" + "02" * 32
+COIN = "0x" + "03" * 32
+GAS = "0x" + "0e" * 32
+
+
+def b58(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    text = ""
+    while number:
+        number, digit = divmod(number, 58)
+        text = BASE58_ALPHABET[digit] + text
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + text
+
+
+def digest(byte: int) -> str:
+    return b58(bytes([byte]) * 32)
+
+
+def address(value: str) -> bytes:
+    return bytes.fromhex(value[2:])
+
+
+def object_ref(object_id: str, version: int, byte: int) -> bytes:
+    # object id, u64 version, digest as a vector<u8>
+    return address(object_id) + struct.pack("<Q", version) + b"\x20" + bytes([byte]) * 32
+
+
+def gas_data(version: int, byte: int, price=750, budget=100000000) -> bytes:
+    return (
+        b"\x01"
+        + object_ref(GAS, version, byte)
+        + address(SENDER)
+        + struct.pack("<Q", price)
+        + struct.pack("<Q", budget)
+    )
+
+
+def pure(move_type, value) -> bytes:
+    serializer = BCSSerializer()
+    serialize_pure(serializer, move_type, value)
+    return serializer.get_bytes()
+
+
+def type_tag(value: str) -> bytes:
+    serializer = BCSSerializer()
+    serialize_type_tag(serializer, value)
+    return serializer.get_bytes()
+
+
+def struct_type(address, module, name):
+    return {"Struct": {"address": address, "module": module, "name": name, "typeArguments": []}}
+
+
+TX_CONTEXT = {"MutableReference": struct_type("0x2", "tx_context", "TxContext")}
+DEPOSIT_PARAMETERS = [
+    {"MutableReference": struct_type(PACKAGE, "margin_bank", "Bank")},
+    {"Reference": struct_type(PACKAGE, "roles", "Sequencer")},
+    "Address",
+    "U64",
+    struct_type("0x2", "coin", "Coin"),
+    TX_CONTEXT,
+]
+
+
+def test_pure_values():
+    assert pure("U64", "1000000") == struct.pack("<Q", 1000000)
+    assert pure("U128", 5) == (5).to_bytes(16, "little")
+    assert pure("Bool", True) == b"\x01"
+    assert pure("Address", "0x2") == bytes(31) + b"\x02"
+    assert pure({"Vector": "U8"}, "0x0aff") == b"\x02\x0a\xff"
+    assert pure({"Vector": "U8"}, "ab") == b"\x02ab"
+    assert pure({"Vector": "U64"}, ["1", "2"]) == b"\x02" + struct.pack("<QQ", 1, 2)
+    assert pure(struct_type("0x1", "string", "String"), "x" * 200) == b"\xc8\x01" + b"x" * 200
+    option = {"Struct": {"address": "0x1", "module": "option", "name": "Option", "typeArguments": ["U8"]}}
+    assert pure(option, None) == b"\x00"
+    assert pure(option, [7]) == b"\x01\x07"
+    with pytest.raises(ValueError):
+        pure("U8", 256)
+
+
+def test_type_tags():
+    sui = b"\x07" + bytes(31) + b"\x02" + b"\x03sui" + b"\x03SUI" + b"\x00"
+    assert type_tag("0x2::sui::SUI") == sui
+    assert type_tag("0x2::coin::Coin<0x2::sui::SUI>") == b"\x07" + bytes(31) + b"\x02" + b"\x04coin\x04Coin\x01" + sui
+    assert type_tag("vector<u8>") == b"\x06\x01"
+    assert type_tag("0x2::table::Table<address, vector<u64>>")[-4:] == b"\x02\x04\x06\x02"
+
+
+def test_transaction_data_layout():
+    tx_bytes = serialize_move_call_transaction(
+        SENDER,
+        [
+            ("shared", BANK, 12, True),
+            ("pure", struct.pack("<Q", 5)),
+            ("owned", COIN, 7, digest(3)),
+        ],
+        PACKAGE,
+        "margin_bank",
+        "deposit_to_bank",
+        ["0x2::sui::SUI"],
+        [0, 1, 2, 1],
+        [(GAS, 40, digest(14))],
+        750,
+        100000000,
+    )
+    expected = (
+        b"\x00"  # TransactionData::V1
+        + b"\x00"  # TransactionKind::ProgrammableTransaction
+        + b"\x03"  # inputs
+        + b"\x01\x01" + address(BANK) + struct.pack("<Q", 12) + b"\x01"  # Object(SharedObject)
+        + b"\x00\x08" + struct.pack("<Q", 5)  # Pure(vector<u8>)
+        + b"\x01\x00" + object_ref(COIN, 7, 3)  # Object(ImmOrOwnedObject)
+        + b"\x01"  # commands
+        + b"\x00" + address(PACKAGE) + b"\x0bmargin_bank" + b"\x0fdeposit_to_bank"  # MoveCall
+        + b"\x01" + type_tag("0x2::sui::SUI")
+        + b"\x04" + b"\x01\x00\x00" + b"\x01\x01\x00" + b"\x01\x02\x00" + b"\x01\x01\x00"  # Argument::Input(u16)
+        + address(SENDER)
+        + gas_data(40, 14)
+        + b"\x00"  # TransactionExpiration::None
+    )
+    assert tx_bytes == expected
+
+
+def deposit_node(node):
+    node.on("sui_getNormalizedMoveFunction", lambda params: {"parameters": DEPOSIT_PARAMETERS})
+    objects = {
+        BANK: {"Shared": {"initial_shared_version": 12}},
+        SEQUENCER: {"Shared": {"initial_shared_version": 13}},
+        COIN: {"AddressOwner": SENDER},
+    }
+    node.on(
+        "sui_multiGetObjects",
+        lambda params: [
+            {"data": {"objectId": i, "version": "7", "digest": digest(3), "owner": objects[i]}}
+            if i in objects
+            else {"error": {"code": "notExists", "object_id": i}}
+            for i in params[0]
+        ],
+    )
+    node.on(
+        "suix_getCoins",
+        lambda params: {
+            "data": [
+                {"coinObjectId": GAS, "version": "40", "digest": digest(14), "balance": "5000000000"},
+                {"coinObjectId": "0x" + "0f" * 32, "version": "2", "digest": digest(15), "balance": "10"},
+            ],
+            "hasNextPage": False,
+        },
+    )
+    node.on("suix_getReferenceGasPrice", lambda params: "750")
+
+
+def test_builder_reads_once_then_builds_from_effects(node):
+    deposit_node(node)
+    builder = TransactionBuilder(SuiRpcClient(node.url), SENDER)
+    params = [BANK, SEQUENCER, SENDER, "5", COIN]
+
+    tx_bytes = base64.b64decode(builder.move_call(params, "deposit_to_bank", "margin_bank", PACKAGE))
+    # signature, objects (the sender address included), gas coins and price in one batch
+    assert node.bodies == 1
+    assert [r["method"] for r in node.requests] == [
+        "sui_getNormalizedMoveFunction",
+        "sui_multiGetObjects",
+        "suix_getCoins",
+        "suix_getReferenceGasPrice",
+    ]
+    inputs = (
+        b"\x05"
+        + b"\x01\x01" + address(BANK) + struct.pack("<Q", 12) + b"\x01"
+        # by reference, immutable
+        + b"\x01\x01" + address(SEQUENCER) + struct.pack("<Q", 13) + b"\x00"
+        + b"\x00\x20" + address(SENDER)
+        + b"\x00\x08" + struct.pack("<Q", 5)
+        + b"\x01\x00" + object_ref(COIN, 7, 3)
+    )
+    assert tx_bytes[2 : 2 + len(inputs)] == inputs
+    assert tx_bytes.endswith(gas_data(40, 14) + b"\x00")
+
+    builder.update_from_effects(
+        {
+            "status": {"status": "success"},
+            "executedEpoch": "512",
+            "gasUsed": {"computationCost": "1000", "storageCost": "2000", "storageRebate": "500"},
+            "mutated": [
+                {"owner": {"Shared": {"initial_shared_version": 12}}, "reference": {"objectId": BANK, "version": 41, "digest": digest(20)}},
+                {"owner": {"AddressOwner": SENDER}, "reference": {"objectId": GAS, "version": 41, "digest": digest(21)}},
+            ],
+            "deleted": [{"objectId": COIN, "version": 41, "digest": digest(22)}],
+            "gasObject": {"owner": {"AddressOwner": SENDER}, "reference": {"objectId": GAS, "version": 41, "digest": digest(21)}},
+        }
+    )
+    assert builder.objects.get(COIN) is None
+
+    params = [BANK, SEQUENCER, SENDER, "6", GAS.replace("0e", "0f")]
+    tx_bytes = base64.b64decode(builder.move_call(params, "deposit_to_bank", "margin_bank", PACKAGE))
+    # no request, the coin and gas references come from the cache
+    assert node.bodies == 1
+    assert tx_bytes.endswith(gas_data(41, 21) + b"\x00")
+
+
+def test_builder_rejects_what_it_can_not_build(node):
+    deposit_node(node)
+    builder = TransactionBuilder(SuiRpcClient(node.url), SENDER)
+    with pytest.raises(ValueError):
+        builder.move_call([BANK], "deposit_to_bank", "margin_bank", PACKAGE)
+    builder.invalidate()
+    node.on("suix_getCoins", lambda params: {"data": [], "hasNextPage": False})
+    with pytest.raises(Exception, match="Not enough SUI"):
+        builder.move_call([BANK, SEQUENCER, SENDER, "5", COIN], "deposit_to_bank", "margin_bank", PACKAGE)
+
+
+CONTRACTS = {
+    "auxiliaryContractsAddresses": {
+        "objects": {
+            "Bank": {"id": BANK},
+            "Sequencer": {"id": SEQUENCER},
+            "package": {"id": PACKAGE},
+            "Currency": {"dataType": "0x" + "0d" * 32 + "::coin::COIN"},
+        }
+    }
+}
+WITHDRAW_PARAMETERS = [
+    {"MutableReference": struct_type(PACKAGE, "margin_bank", "Bank")},
+    {"MutableReference": struct_type(PACKAGE, "roles", "Sequencer")},
+    {"Vector": "U8"},
+    "Address",
+    "U64",
+    TX_CONTEXT,
+]
+
+
+def executed(params):
+    return {
+        "digest": "0xdigest",
+        "effects": {
+            "status": {"status": "success"},
+            "executedEpoch": "512",
+            "gasUsed": {"computationCost": "1000", "storageCost": "2000", "storageRebate": "500"},
+            "gasObject": {"owner": {"AddressOwner": params[-1]}, "reference": {"objectId": GAS, "version": 50, "digest": digest(50)}},
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_bluefin_client_skips_unsafe_move_call(node):
+    deposit_node(node)
+    node.on("sui_getNormalizedMoveFunction", lambda params: {"parameters": WITHDRAW_PARAMETERS})
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(CONTRACTS)
+    user = client.account.getUserAddress()
+    node.on("sui_executeTransactionBlock", lambda params: executed(params + [user]))
+    try:
+        assert await client.withdraw_margin_from_bank(10)
+        assert await client.withdraw_margin_from_bank(20)
+    finally:
+        await client.close_connections()
+
+    methods = [r["method"] for r in node.requests]
+    assert "unsafe_moveCall" not in methods
+    assert methods.count("sui_executeTransactionBlock") == 2
+    # one batch of reads, then the two executions
+    assert node.bodies == 3
+    second = base64.b64decode(node.requests[-1]["params"][0])
+    assert object_ref(GAS, 50, 50) in second
+
+
+@pytest.mark.asyncio
+async def test_bluefin_client_falls_back_to_the_node(node):
+    deposit_node(node)
+    node.on("sui_getNormalizedMoveFunction", lambda params: {"parameters": WITHDRAW_PARAMETERS})
+    node.on("unsafe_moveCall", lambda params: {"txBytes": "dHg="})
+    executions = []
+
+    def execute(params):
+        executions.append(params[0])
+        if len(executions) == 1:
+            return {"error": {"code": -32002, "message": "Object is not available for consumption"}}
+        return executed(params + [SENDER])
+
+    node.on("sui_executeTransactionBlock", execute)
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(CONTRACTS)
+    try:
+        assert await client.withdraw_margin_from_bank(10)
+    finally:
+        await client.close_connections()
+    # the locally built transaction was rejected, the node built the second one
+    assert executions[0] != "dHg=" and executions[1] == "dHg="
+    assert [r["method"] for r in node.requests].count("unsafe_moveCall") == 1
+
+
+@pytest.mark.asyncio
+async def test_bluefin_client_does_not_send_again_on_other_errors(node):
+    deposit_node(node)
+    node.on("sui_getNormalizedMoveFunction", lambda params: {"parameters": WITHDRAW_PARAMETERS})
+    node.on("unsafe_moveCall", lambda params: {"txBytes": "dHg="})
+    timeout = {"error": {"code": -32050, "message": "Transaction timed out before reaching finality"}}
+    node.on("sui_executeTransactionBlock", lambda params: timeout)
+    network = dict(Networks["SUI_STAGING"], url=node.url)
+    client = BluefinClient(True, network, TEST_ACCT_KEY)
+    client.contracts.set_contract_addresses(CONTRACTS)
+    try:
+        # the transaction may still execute, it is not built and sent again
+        assert (await client.withdraw_margin_from_bank(10))["error"] == timeout["error"]
+    finally:
+        await client.close_connections()
+    methods = [r["method"] for r in node.requests]
+    assert methods.count("sui_executeTransactionBlock") == 1
+    assert "unsafe_moveCall" not in methods
+    assert client.tx_builder.objects.get(GAS) is None
+
+
+def test_rfq_client_does_not_send_again_on_other_errors(node):
+    deposit_node(node)
+    # the vault and the protocol config are the shared objects of deposit_node
+    parameters = [
+        {"MutableReference": struct_type(PACKAGE, "vault", "Vault")},
+        {"Reference": struct_type(PACKAGE, "config", "ProtocolConfig")},
+        "U64",
+        TX_CONTEXT,
+    ]
+    node.on("sui_getNormalizedMoveFunction", lambda params: {"parameters": parameters})
+    node.on("unsafe_moveCall", lambda params: {"txBytes": "dHg="})
+    timeout = {"error": {"code": -32050, "message": "Transaction timed out before reaching finality"}}
+    node.on("sui_executeTransactionBlock", lambda params: timeout)
+    contracts = RFQContracts({"ProtocolConfig": SEQUENCER, "Package": PACKAGE})
+    client = RFQClient(wallet=SuiWallet(seed=TEST_ACCT_KEY), url=node.url, rfq_contracts=contracts)
+
+    # the params withdraw_from_vault passes, the transaction may still execute
+    res = client._execute_move_call([BANK, SEQUENCER, "10"], "withdraw", 100000000, ["0x2::sui::SUI"])
+    assert res["error"] == timeout["error"]
+    methods = [r["method"] for r in node.requests]
+    assert methods.count("sui_executeTransactionBlock") == 1
+    assert "unsafe_moveCall" not in methods
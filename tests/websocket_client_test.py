@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(os.getcwd(), "src"))
+sys.path.insert(1, os.path.join(os.getcwd(), "tests"))
+
+from bluefin_v2_client import WebsocketClient, MARKET_SYMBOLS
+
+
+class RecordingSocketManager:
+    def __init__(self):
+        self.sent = []
+        self.ws = self
+        self.connected = True
+
+    def send_message(self, message):
+        self.sent.append(json.loads(message))
+
+
+@pytest.mark.asyncio
+async def test_subscription_messages():
+    client = WebsocketClient("wss://localhost", token="user-token", api_token="api-token")
+    client.socket_manager = RecordingSocketManager()
+
+    assert client.subscribe_global_updates_by_symbol(MARKET_SYMBOLS.ETH)
+    assert await client.subscribe_orderbook_depth_streams_by_symbol(MARKET_SYMBOLS.ETH, "5")
+    assert await client.unsubscribe_orderbook_depth_streams_by_symbol(MARKET_SYMBOLS.ETH, "5")
+    assert client.subscribe_user_update_by_token("other-token")
+    assert client.unsubscribe_user_update_by_token()
+    assert client.unsubscribe_global_updates_by_symbol(MARKET_SYMBOLS.ETH)
+
+    assert client.socket_manager.sent == [
+        ["SUBSCRIBE", [{"e": "globalUpdates", "p": "ETH-PERP"}]],
+        ["SUBSCRIBE", [{"e": "orderbookDepthStream", "p": "ETH-PERP", "d": "5"}]],
+        ["UNSUBSCRIBE", [{"e": "orderbookDepthStream", "p": "ETH-PERP", "d": "5"}]],
+        ["SUBSCRIBE", [{"e": "userUpdates", "t": "other-token", "rt": "api-token"}]],
+        ["UNSUBSCRIBE", [{"e": "userUpdates", "t": "user-token", "rt": "api-token"}]],
+        ["UNSUBSCRIBE", [{"e": "globalUpdates", "p": "ETH-PERP"}]],
+    ]
+
+
+def test_subscriptions_fail_without_connection():
+    client = WebsocketClient("wss://localhost")
+    client.socket_manager = RecordingSocketManager()
+    client.socket_manager.connected = False
+
+    assert not client.subscribe_global_updates_by_symbol(MARKET_SYMBOLS.ETH)
+    assert not client.subscribe_user_update_by_token()
+    assert client.socket_manager.sent == []